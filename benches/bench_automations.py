@@ -0,0 +1,103 @@
+from datetime import timedelta
+from typing import Generator, List
+from uuid import uuid4
+
+import pendulum
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from syntask.server.events import actions, triggers
+from syntask.server.events.schemas.automations import (
+    Automation,
+    EventTrigger,
+    Posture,
+)
+from syntask.server.events.schemas.events import ReceivedEvent
+
+
+def make_automations(count: int) -> List[Automation]:
+    """A mix of the kinds of automations users commonly set up"""
+    automations = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            # a specific flow run failing
+            trigger = EventTrigger(
+                expect={"syntask.flow-run.Failed"},
+                match={"syntask.resource.id": f"syntask.flow-run.{i}"},
+                posture=Posture.Reactive,
+                threshold=1,
+            )
+        elif kind == 1:
+            # any flow run of a deployment crashing
+            trigger = EventTrigger(
+                expect={"syntask.flow-run.Crashed"},
+                match_related={
+                    "syntask.resource.id": f"syntask.deployment.{i}",
+                    "syntask.resource.role": "deployment",
+                },
+                posture=Posture.Reactive,
+                threshold=1,
+            )
+        elif kind == 2:
+            # a work pool not becoming ready in time
+            trigger = EventTrigger(
+                expect={f"syntask.work-pool.{i}.ready"},
+                posture=Posture.Proactive,
+                threshold=1,
+                within=timedelta(seconds=60),
+            )
+        else:
+            # several of any event from a custom resource
+            trigger = EventTrigger(
+                expect={"custom.*"},
+                match={"syntask.resource.id": f"custom.resource.{i}"},
+                posture=Posture.Reactive,
+                threshold=5,
+                within=timedelta(seconds=30),
+            )
+
+        automations.append(
+            Automation(
+                name=f"automation {i}",
+                trigger=trigger,
+                actions=[actions.DoNothing()],
+            )
+        )
+    return automations
+
+
+@pytest.fixture(params=[10, 100, 1000, 10000])
+def loaded_automations(request) -> Generator[int, None, None]:
+    for automation in make_automations(request.param):
+        triggers.load_automation(automation)
+    yield request.param
+    triggers.automations_by_id.clear()
+    triggers.triggers.clear()
+    triggers.trigger_index.clear()
+
+
+@pytest.mark.benchmark(group="automations")
+def bench_find_interested_triggers(
+    benchmark: BenchmarkFixture, loaded_automations: int
+):
+    event = ReceivedEvent(
+        occurred=pendulum.now("UTC"),
+        event="syntask.flow-run.Crashed",
+        resource={"syntask.resource.id": "syntask.flow-run.5"},
+        related=[
+            {
+                "syntask.resource.id": "syntask.deployment.5",
+                "syntask.resource.role": "deployment",
+            },
+            {
+                "syntask.resource.id": "syntask.flow.5",
+                "syntask.resource.role": "flow",
+            },
+        ],
+        id=uuid4(),
+    )
+
+    interested = benchmark(triggers.find_interested_triggers, event)
+
+    assert len(interested) == 1
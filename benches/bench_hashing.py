@@ -0,0 +1,70 @@
+from typing import Any, Callable, Dict
+
+import cloudpickle
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from syntask.serializers import JSONSerializer
+from syntask.utilities.hashing import fast_hash, hash_objects, stable_hash
+
+
+def legacy_hash_objects(*args, **kwargs):
+    """`hash_objects` as it was before objects could be hashed in place"""
+    try:
+        serializer = JSONSerializer(dumps_kwargs={"sort_keys": True})
+        return stable_hash(serializer.dumps((args, kwargs)))
+    except Exception:
+        pass
+
+    try:
+        return stable_hash(cloudpickle.dumps((args, kwargs)))
+    except Exception:
+        pass
+
+    return None
+
+
+def make_inputs() -> Dict[str, Callable[[], Any]]:
+    inputs = {
+        "small-json": lambda: {"x": 1, "name": "hello", "values": [1.5, 2.5, 3.5]},
+        "large-json": lambda: {"values": list(range(100_000))},
+        "bytes-10mb": lambda: {"data": b"\x01" * 10_000_000},
+    }
+    try:
+        import numpy as np
+
+        inputs["ndarray-10mb"] = lambda: {"array": np.ones(1_250_000)}
+    except ImportError:
+        pass
+    try:
+        import pandas as pd
+
+        inputs["dataframe-100k-rows"] = lambda: {
+            "frame": pd.DataFrame({"a": range(100_000), "b": ["x"] * 100_000})
+        }
+    except ImportError:
+        pass
+    return inputs
+
+
+INPUTS = make_inputs()
+
+
+@pytest.mark.benchmark(group="hash-objects")
+@pytest.mark.parametrize("kind", list(INPUTS))
+@pytest.mark.parametrize(
+    "implementation",
+    ["legacy", "in-place", "in-place-fast-hash", "in-place-memoized"],
+)
+def bench_hash_objects(benchmark: BenchmarkFixture, kind: str, implementation: str):
+    inputs = INPUTS[kind]()
+
+    if implementation == "legacy":
+        benchmark(legacy_hash_objects, inputs)
+    elif implementation == "in-place":
+        benchmark(hash_objects, inputs)
+    elif implementation == "in-place-fast-hash":
+        benchmark(hash_objects, inputs, hash_algo=fast_hash)
+    else:
+        memo = {}
+        benchmark(hash_objects, inputs, memo=memo)
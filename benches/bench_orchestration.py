@@ -0,0 +1,131 @@
+"""
+Benchmarks for orchestrating flow and task run state transitions.  Each benchmarked
+call is a single transition, so operations per second are transitions per second.
+"""
+
+import asyncio
+from typing import Any, Callable, Coroutine, Generator, Tuple
+from uuid import UUID, uuid4
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from syntask.server import models, schemas
+from syntask.server.database.dependencies import provide_database_interface
+from syntask.server.database.interface import SyntaskDBInterface
+from syntask.server.orchestration.core_policy import CoreFlowPolicy, CoreTaskPolicy
+from syntask.server.orchestration.global_policy import GlobalFlowPolicy
+
+
+@pytest.fixture(scope="module")
+def loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def db(loop: asyncio.AbstractEventLoop) -> SyntaskDBInterface:
+    db = provide_database_interface()
+    loop.run_until_complete(db.create_db())
+    return db
+
+
+@pytest.fixture(scope="module")
+def flow_id(loop: asyncio.AbstractEventLoop, db: SyntaskDBInterface) -> UUID:
+    async def create_flow() -> UUID:
+        async with db.session_context(begin_transaction=True) as session:
+            flow = await models.flows.create_flow(
+                session=session, flow=schemas.core.Flow(name="bench-orchestration")
+            )
+            return flow.id
+
+    return loop.run_until_complete(create_flow())
+
+
+def run_transition(
+    loop: asyncio.AbstractEventLoop,
+    create_run: Callable[[], Coroutine[Any, Any, UUID]],
+    set_state: Callable[[UUID], Coroutine[Any, Any, Any]],
+) -> Tuple[Callable[[UUID], Any], Callable[[], Tuple[Tuple[UUID], dict]]]:
+    def setup() -> Tuple[Tuple[UUID], dict]:
+        return (loop.run_until_complete(create_run()),), {}
+
+    def transition(run_id: UUID) -> Any:
+        return loop.run_until_complete(set_state(run_id))
+
+    return transition, setup
+
+
+@pytest.mark.benchmark(group="orchestration")
+def bench_compile_transition_rules(benchmark: BenchmarkFixture):
+    transition = (schemas.states.StateType.PENDING, schemas.states.StateType.RUNNING)
+
+    def compile_rules():
+        CoreFlowPolicy.compile_transition_rules(*transition)
+        GlobalFlowPolicy.compile_transition_rules(*transition)
+
+    benchmark(compile_rules)
+
+
+@pytest.mark.benchmark(group="orchestration")
+def bench_set_flow_run_state(
+    benchmark: BenchmarkFixture,
+    loop: asyncio.AbstractEventLoop,
+    db: SyntaskDBInterface,
+    flow_id: UUID,
+):
+    async def create_run() -> UUID:
+        async with db.session_context(begin_transaction=True) as session:
+            flow_run = await models.flow_runs.create_flow_run(
+                session=session,
+                flow_run=schemas.core.FlowRun(
+                    flow_id=flow_id, state=schemas.states.Pending()
+                ),
+            )
+            return flow_run.id
+
+    async def set_running(flow_run_id: UUID):
+        async with db.session_context(begin_transaction=True) as session:
+            result = await models.flow_runs.set_flow_run_state(
+                session=session,
+                flow_run_id=flow_run_id,
+                state=schemas.states.Running(),
+                flow_policy=CoreFlowPolicy,
+            )
+        assert result.status == schemas.responses.SetStateStatus.ACCEPT
+
+    transition, setup = run_transition(loop, create_run, set_running)
+    benchmark.pedantic(transition, setup=setup, rounds=200)
+
+
+@pytest.mark.benchmark(group="orchestration")
+def bench_set_task_run_state(
+    benchmark: BenchmarkFixture,
+    loop: asyncio.AbstractEventLoop,
+    db: SyntaskDBInterface,
+):
+    async def create_run() -> UUID:
+        async with db.session_context(begin_transaction=True) as session:
+            task_run = await models.task_runs.create_task_run(
+                session=session,
+                task_run=schemas.core.TaskRun(
+                    task_key="bench-orchestration",
+                    dynamic_key=str(uuid4()),
+                    state=schemas.states.Pending(),
+                ),
+            )
+            return task_run.id
+
+    async def set_running(task_run_id: UUID):
+        async with db.session_context(begin_transaction=True) as session:
+            result = await models.task_runs.set_task_run_state(
+                session=session,
+                task_run_id=task_run_id,
+                state=schemas.states.Running(),
+                task_policy=CoreTaskPolicy,
+            )
+        assert result.status == schemas.responses.SetStateStatus.ACCEPT
+
+    transition, setup = run_transition(loop, create_run, set_running)
+    benchmark.pedantic(transition, setup=setup, rounds=200)
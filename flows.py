@@ -0,0 +1,5 @@
+from syntask import flow
+
+@flow
+def test_flow():
+    return 1
@@ -0,0 +1,160 @@
+"""
+An index of the cache keys that have result records in result storage.
+
+Checking whether a cached result exists normally means reading the result record (or
+its metadata) from storage, which is a network round trip for remote storage.  The index
+remembers the keys that were written or found, along with when their records expire, so
+that cache hits can be answered without touching storage.  Keys are remembered in memory
+for this process and in a SQLite database shared by every process on the machine.
+
+The index only ever answers that a key _is_ cached; keys that aren't in the index are
+still looked up in storage, since they may have been written from another machine.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pendulum
+from cachetools import LRUCache
+from pendulum.datetime import DateTime
+
+from syntask.logging import get_logger
+from syntask.settings import (
+    SYNTASK_RESULTS_CACHE_INDEX_ENABLED,
+    SYNTASK_RESULTS_CACHE_INDEX_PATH,
+)
+
+logger = get_logger(__name__)
+
+# SQLite's default limit on the number of variables in a statement is 999
+_MAX_KEYS_PER_QUERY = 900
+
+# the most keys remembered in memory; the rest are read from the shared index as needed
+_MAX_KNOWN_KEYS = 10_000
+
+
+class CacheKeyIndex:
+    """
+    Remembers which cache keys have a result record in a storage location, and when
+    each of those records expires.
+
+    Attributes:
+        path: the path to the SQLite database shared by all processes on this machine
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._known: LRUCache[Tuple[str, str], Optional[float]] = LRUCache(
+            maxsize=_MAX_KNOWN_KEYS
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path,
+                timeout=5,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_keys ("
+                "  storage TEXT NOT NULL,"
+                "  key TEXT NOT NULL,"
+                "  expiration REAL,"
+                "  PRIMARY KEY (storage, key)"
+                ")"
+            )
+            self._connection = connection
+        return self._connection
+
+    def add(self, storage: str, key: str, expiration: Optional[DateTime]) -> None:
+        """Records that the given key has a result record in the given storage"""
+        expires_at = expiration.timestamp() if expiration is not None else None
+        with self._lock:
+            self._known[(storage, key)] = expires_at
+            try:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO cache_keys (storage, key, expiration) "
+                    "VALUES (?, ?, ?)",
+                    (storage, key, expires_at),
+                )
+            except sqlite3.Error:
+                logger.debug("Unable to write to the cache key index", exc_info=True)
+
+    def discard(self, storage: str, key: str) -> None:
+        """Forgets the given key, if it was known"""
+        with self._lock:
+            self._known.pop((storage, key), None)
+            try:
+                self._connect().execute(
+                    "DELETE FROM cache_keys WHERE storage = ? AND key = ?",
+                    (storage, key),
+                )
+            except sqlite3.Error:
+                logger.debug("Unable to write to the cache key index", exc_info=True)
+
+    def cached(self, storage: str, keys: Iterable[str]) -> Set[str]:
+        """
+        Returns which of the given keys are known to have an unexpired result record in
+        the given storage, reading the keys this process doesn't know about from the
+        shared index all at once.
+        """
+        now = pendulum.now("UTC").timestamp()
+        found: Set[str] = set()
+        unknown: List[str] = []
+
+        with self._lock:
+            for key in keys:
+                if (storage, key) not in self._known:
+                    unknown.append(key)
+                    continue
+                expires_at = self._known[(storage, key)]
+                if expires_at is None or expires_at > now:
+                    found.add(key)
+
+            try:
+                connection = self._connect()
+                for i in range(0, len(unknown), _MAX_KEYS_PER_QUERY):
+                    chunk = unknown[i : i + _MAX_KEYS_PER_QUERY]
+                    rows = connection.execute(
+                        "SELECT key, expiration FROM cache_keys "
+                        f"WHERE storage = ? AND key IN ({','.join('?' * len(chunk))})",
+                        (storage, *chunk),
+                    ).fetchall()
+                    for key, expires_at in rows:
+                        self._known[(storage, key)] = expires_at
+                        if expires_at is None or expires_at > now:
+                            found.add(key)
+            except sqlite3.Error:
+                logger.debug("Unable to read the cache key index", exc_info=True)
+
+        return found
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._known.clear()
+
+
+_indexes: Dict[Path, CacheKeyIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_cache_key_index() -> Optional[CacheKeyIndex]:
+    """Returns the cache key index for the current settings, if it's enabled"""
+    if not SYNTASK_RESULTS_CACHE_INDEX_ENABLED.value():
+        return None
+
+    path = SYNTASK_RESULTS_CACHE_INDEX_PATH.value()
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = CacheKeyIndex(path)
+        return _indexes[path]
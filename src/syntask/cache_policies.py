@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional,
 
 from typing_extensions import Self
 
-from syntask.context import TaskRunContext
+from syntask.context import FlowRunContext, TaskRunContext
 from syntask.utilities.hashing import hash_objects
 
 if TYPE_CHECKING:
@@ -293,7 +293,11 @@ class Inputs(CachePolicy):
             if key not in exclude:
                 hashed_inputs[key] = val
 
-        return hash_objects(hashed_inputs)
+        flow_run_context = FlowRunContext.get()
+        return hash_objects(
+            hashed_inputs,
+            memo=flow_run_context.input_hashes if flow_run_context else None,
+        )
 
     def __sub__(self, other: str) -> "CachePolicy":
         if not isinstance(other, str):
@@ -104,6 +104,7 @@ from syntask.client.schemas.objects import (
     WorkQueueStatusDetail,
 )
 from syntask.client.schemas.responses import (
+    ConcurrencyLimitLeaseResponse,
     DeploymentResponse,
     FlowRunResponse,
     GlobalConcurrencyLimitResponse,
@@ -2422,6 +2423,42 @@ class SyntaskClient:
         ]
         await self._client.post("/logs/", json=serialized_logs)
 
+    async def create_logs_compact(
+        self, logs: Iterable[Union[LogCreate, dict]], encoding: str
+    ) -> None:
+        """
+        Create logs for a flow or task run, sending them in the compact encoding of
+        `syntask.logging.compact`.
+
+        Args:
+            logs: An iterable of `LogCreate` objects or already json-compatible dicts
+            encoding: The compression to use, one of
+                `syntask.logging.compact.supported_encodings()`
+
+        Raises:
+            httpx.HTTPStatusError: With a `404 Not Found` status if the server doesn't
+                accept compact logs, or with a `415 Unsupported Media Type` status and an
+                `Accept-Encoding` header if it doesn't accept the given compression.
+        """
+        from syntask.logging.compact import (
+            COMPACT_LOGS_CONTENT_TYPE,
+            compress,
+            encode_logs,
+        )
+
+        serialized_logs = [
+            log.model_dump(mode="json") if isinstance(log, LogCreate) else log
+            for log in logs
+        ]
+        await self._client.post(
+            "/logs/compact",
+            content=compress(encode_logs(serialized_logs), encoding),
+            headers={
+                "Content-Type": COMPACT_LOGS_CONTENT_TYPE,
+                "Content-Encoding": encoding,
+            },
+        )
+
     async def create_flow_run_notification_policy(
         self,
         block_document_id: UUID,
@@ -2573,9 +2610,22 @@ class SyntaskClient:
         limit: Optional[int] = None,
         offset: Optional[int] = None,
         sort: LogSort = LogSort.TIMESTAMP_ASC,
+        after: Optional[Log] = None,
     ) -> List[Log]:
         """
         Read flow and task run logs.
+
+        Args:
+            log_filter: filter criteria for logs
+            limit: the maximum number of logs to read
+            offset: the number of logs to skip
+            sort: the order to read logs in
+            after: only read the logs after this one in the sort order; passing the
+                last log of the previous page reads the next page without the cost of
+                an offset
+
+        Returns:
+            a list of logs
         """
         body = {
             "logs": log_filter.model_dump(mode="json") if log_filter else None,
@@ -2583,6 +2633,11 @@ class SyntaskClient:
             "offset": offset,
             "sort": sort,
         }
+        if after is not None:
+            body["after"] = {
+                "timestamp": after.timestamp.isoformat(),
+                "id": str(after.id),
+            }
 
         response = await self._client.post("/logs/filter", json=body)
         return pydantic.TypeAdapter(List[Log]).validate_python(response.json())
@@ -3077,16 +3132,22 @@ class SyntaskClient:
         slots: int,
         mode: str,
         create_if_missing: Optional[bool] = None,
+        wait_seconds: Optional[float] = None,
     ) -> httpx.Response:
-        return await self._client.post(
-            "/v2/concurrency_limits/increment",
-            json={
-                "names": names,
-                "slots": slots,
-                "mode": mode,
-                "create_if_missing": create_if_missing if create_if_missing else False,
-            },
-        )
+        body = {
+            "names": names,
+            "slots": slots,
+            "mode": mode,
+            "create_if_missing": create_if_missing if create_if_missing else False,
+        }
+        if wait_seconds:
+            # Leave the server time to answer before this client's own timeout
+            read_timeout = self._client.timeout.read
+            if read_timeout is not None:
+                wait_seconds = min(wait_seconds, read_timeout / 2)
+            body["wait_seconds"] = wait_seconds
+
+        return await self._client.post("/v2/concurrency_limits/increment", json=body)
 
     async def release_concurrency_slots(
         self, names: List[str], slots: int, occupancy_seconds: float
@@ -3113,6 +3174,79 @@ class SyntaskClient:
             },
         )
 
+    async def acquire_concurrency_slot_lease(
+        self,
+        names: List[str],
+        slots: int,
+        minimum_slots: int,
+        ttl_seconds: float,
+        create_if_missing: Optional[bool] = None,
+    ) -> ConcurrencyLimitLeaseResponse:
+        """
+        Lease a batch of concurrency slots on each of the specified limits.
+
+        Args:
+            names (List[str]): A list of limit names to lease slots on.
+            slots (int): The most slots to lease.
+            minimum_slots (int): The fewest slots to lease.
+            ttl_seconds (float): How long the lease lasts unless it's renewed.
+            create_if_missing (bool, optional): Whether to create missing limits, as
+                inactive limits.
+
+        Returns:
+            ConcurrencyLimitLeaseResponse: The lease.
+
+        Raises:
+            httpx.HTTPStatusError: With a `423 Locked` status and a `Retry-After`
+                header if fewer than `minimum_slots` are free.
+        """
+        response = await self._client.post(
+            "/v2/concurrency_limits/leases",
+            json={
+                "names": names,
+                "slots": slots,
+                "minimum_slots": minimum_slots,
+                "ttl_seconds": ttl_seconds,
+                "create_if_missing": create_if_missing if create_if_missing else False,
+            },
+        )
+        return ConcurrencyLimitLeaseResponse.model_validate(response.json())
+
+    async def renew_concurrency_slot_leases(
+        self, lease_ids: List[UUID], ttl_seconds: float
+    ) -> List[UUID]:
+        """
+        Renew concurrency slot leases.
+
+        Args:
+            lease_ids (List[UUID]): The leases to renew.
+            ttl_seconds (float): How long the leases last from now.
+
+        Returns:
+            List[UUID]: The IDs of the leases that were renewed; expired leases can't
+                be renewed.
+        """
+        response = await self._client.post(
+            "/v2/concurrency_limits/leases/renew",
+            json={
+                "lease_ids": [str(lease_id) for lease_id in lease_ids],
+                "ttl_seconds": ttl_seconds,
+            },
+        )
+        return [UUID(lease_id) for lease_id in response.json()]
+
+    async def release_concurrency_slot_leases(self, lease_ids: List[UUID]) -> None:
+        """
+        Release concurrency slot leases, and all of the slots they hold.
+
+        Args:
+            lease_ids (List[UUID]): The leases to release.
+        """
+        await self._client.post(
+            "/v2/concurrency_limits/leases/release",
+            json={"lease_ids": [str(lease_id) for lease_id in lease_ids]},
+        )
+
     async def create_global_concurrency_limit(
         self, concurrency_limit: GlobalConcurrencyLimitCreate
     ) -> UUID:
@@ -599,6 +599,20 @@ class LogFilterTaskRunId(SyntaskBaseModel):
     )
 
 
+class LogFilterMessage(SyntaskBaseModel):
+    """Filter by `Log.message`."""
+
+    like_: Optional[str] = Field(
+        default=None,
+        description=(
+            "A case-insensitive partial match. For example, "
+            " passing 'marvin' will match "
+            "'marvin', 'sad-Marvin', and 'marvin-robot'."
+        ),
+        examples=["marvin"],
+    )
+
+
 class LogFilter(SyntaskBaseModel, OperatorMixin):
     """Filter logs. Only logs matching all criteria will be returned"""
 
@@ -614,6 +628,9 @@ class LogFilter(SyntaskBaseModel, OperatorMixin):
     task_run_id: Optional[LogFilterTaskRunId] = Field(
         default=None, description="Filter criteria for `Log.task_run_id`"
     )
+    message: Optional[LogFilterMessage] = Field(
+        default=None, description="Filter criteria for `Log.message`"
+    )
 
 
 class FilterSet(SyntaskBaseModel):
@@ -427,6 +427,15 @@ class MinimalConcurrencyLimitResponse(SyntaskBaseModel):
     limit: int
 
 
+class ConcurrencyLimitLeaseResponse(SyntaskBaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    id: UUID
+    expiration: DateTime
+    slots: int
+    limits: List[MinimalConcurrencyLimitResponse]
+
+
 class GlobalConcurrencyLimitResponse(ObjectBaseModel):
     """
     A response object for global concurrency limits.
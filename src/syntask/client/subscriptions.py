@@ -1,5 +1,5 @@
 import asyncio
-from typing import Any, Dict, Generic, Iterable, Optional, Type, TypeVar
+from typing import Any, Dict, Generic, Iterable, List, Optional, Type, TypeVar
 
 import orjson
 import websockets
@@ -24,9 +24,11 @@ class Subscription(Generic[S]):
         keys: Iterable[str],
         client_id: Optional[str] = None,
         base_url: Optional[str] = None,
+        batch_size: Optional[int] = None,
     ):
         self.model = model
         self.client_id = client_id
+        self.batch_size = batch_size
         base_url = base_url.replace("http", "ws", 1)
         self.subscription_url = f"{base_url}{path}"
 
@@ -38,10 +40,16 @@ class Subscription(Generic[S]):
         )
         self._websocket = None
 
+        # items received in a batch that have not been yielded yet
+        self._pending: List[S] = []
+
     def __aiter__(self) -> Self:
         return self
 
     async def __anext__(self) -> S:
+        if self._pending:
+            return self._pending.pop(0)
+
         while True:
             try:
                 await self._ensure_connected()
@@ -49,7 +57,14 @@ class Subscription(Generic[S]):
 
                 await self._websocket.send(orjson.dumps({"type": "ack"}).decode())
 
-                return self.model.model_validate_json(message)
+                if self.batch_size is None:
+                    return self.model.model_validate_json(message)
+
+                self._pending.extend(
+                    self.model.model_validate(item) for item in orjson.loads(message)
+                )
+                if self._pending:
+                    return self._pending.pop(0)
             except (
                 ConnectionRefusedError,
                 websockets.exceptions.ConnectionClosedError,
@@ -78,6 +93,8 @@ class Subscription(Generic[S]):
             message = {"type": "subscribe", "keys": self.keys}
             if self.client_id:
                 message.update({"client_id": self.client_id})
+            if self.batch_size is not None:
+                message.update({"batch_size": self.batch_size})
 
             await websocket.send(orjson.dumps(message).decode())
         except (
@@ -17,6 +17,11 @@ except ImportError:
 from syntask.client.orchestration import get_client
 from syntask.client.schemas.responses import MinimalConcurrencyLimitResponse
 from syntask.logging.loggers import get_run_logger
+from syntask.settings import (
+    SYNTASK_CLIENT_CONCURRENCY_LEASE_SLOTS,
+    SYNTASK_CLIENT_CONCURRENCY_LEASE_TTL_SECONDS,
+    SYNTASK_CLIENT_CONCURRENCY_LEASES_ENABLED,
+)
 from syntask.utilities.asyncutils import sync_compatible
 
 from .context import ConcurrencyContext
@@ -24,7 +29,7 @@ from .events import (
     _emit_concurrency_acquisition_events,
     _emit_concurrency_release_events,
 )
-from .services import ConcurrencySlotAcquisitionService
+from .services import ConcurrencySlotAcquisitionService, ConcurrencySlotLeaseService
 
 
 class ConcurrencySlotAcquisitionError(Exception):
@@ -96,7 +101,7 @@ async def concurrency(
         occupancy_period = cast(Interval, (pendulum.now("UTC") - acquisition_time))
         try:
             await _release_concurrency_slots(
-                names, occupy, occupancy_period.total_seconds()
+                names, occupy, occupancy_period.total_seconds(), acquired=limits
             )
         except anyio.get_cancelled_exc_class():
             # The task was cancelled before it could release the slots. Add the
@@ -166,10 +171,15 @@ async def _acquire_concurrency_slots(
     max_retries: Optional[int] = None,
     strict: bool = False,
 ) -> List[MinimalConcurrencyLimitResponse]:
-    service = ConcurrencySlotAcquisitionService.instance(frozenset(names))
-    future = service.send(
-        (slots, mode, timeout_seconds, create_if_missing, max_retries)
-    )
+    if mode == "concurrency" and SYNTASK_CLIENT_CONCURRENCY_LEASES_ENABLED.value():
+        future = _lease_service(names).send(
+            (slots, timeout_seconds, max_retries, create_if_missing)
+        )
+    else:
+        service = ConcurrencySlotAcquisitionService.instance(frozenset(names))
+        future = service.send(
+            (slots, mode, timeout_seconds, create_if_missing, max_retries)
+        )
     response_or_exception = await asyncio.wrap_future(future)
 
     if isinstance(response_or_exception, Exception):
@@ -182,7 +192,10 @@ async def _acquire_concurrency_slots(
             f"Unable to acquire concurrency slots on {names!r}"
         ) from response_or_exception
 
-    retval = _response_to_minimal_concurrency_limit_response(response_or_exception)
+    if isinstance(response_or_exception, list):
+        retval = response_or_exception
+    else:
+        retval = _response_to_minimal_concurrency_limit_response(response_or_exception)
 
     if strict and not retval:
         raise ConcurrencySlotAcquisitionError(
@@ -201,8 +214,17 @@ async def _acquire_concurrency_slots(
 
 @sync_compatible
 async def _release_concurrency_slots(
-    names: List[str], slots: int, occupancy_seconds: float
+    names: List[str],
+    slots: int,
+    occupancy_seconds: float,
+    acquired: Optional[List[MinimalConcurrencyLimitResponse]] = None,
 ) -> List[MinimalConcurrencyLimitResponse]:
+    if SYNTASK_CLIENT_CONCURRENCY_LEASES_ENABLED.value():
+        # Slots that came from a lease go back into this process's pool
+        slots = _lease_service(names).release(slots, acquired)
+        if not slots:
+            return []
+
     async with get_client() as client:
         response = await client.release_concurrency_slots(
             names=names, slots=slots, occupancy_seconds=occupancy_seconds
@@ -210,6 +232,14 @@ async def _release_concurrency_slots(
         return _response_to_minimal_concurrency_limit_response(response)
 
 
+def _lease_service(names: List[str]) -> ConcurrencySlotLeaseService:
+    return ConcurrencySlotLeaseService.instance(
+        frozenset(names),
+        SYNTASK_CLIENT_CONCURRENCY_LEASE_SLOTS.value(),
+        SYNTASK_CLIENT_CONCURRENCY_LEASE_TTL_SECONDS.value(),
+    )
+
+
 def _response_to_minimal_concurrency_limit_response(
     response: httpx.Response,
 ) -> List[MinimalConcurrencyLimitResponse]:
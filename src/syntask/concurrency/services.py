@@ -1,13 +1,18 @@
 import asyncio
 import concurrent.futures
+import threading
+import time
 from contextlib import asynccontextmanager
 from typing import (
     TYPE_CHECKING,
     AsyncGenerator,
+    Dict,
     FrozenSet,
+    List,
     Optional,
     Tuple,
 )
+from uuid import UUID
 
 import httpx
 from starlette import status
@@ -15,6 +20,8 @@ from starlette import status
 from syntask._internal.concurrency import logger
 from syntask._internal.concurrency.services import QueueService
 from syntask.client.orchestration import get_client
+from syntask.client.schemas.responses import MinimalConcurrencyLimitResponse
+from syntask.settings import SYNTASK_CLIENT_CONCURRENCY_WAIT_SECONDS
 from syntask.utilities.timeout import timeout_async
 
 if TYPE_CHECKING:
@@ -42,12 +49,26 @@ class ConcurrencySlotAcquisitionService(QueueService):
             concurrent.futures.Future,
             Optional[bool],
             Optional[int],
+            float,
         ],
     ) -> None:
-        occupy, mode, timeout_seconds, future, create_if_missing, max_retries = item
+        (
+            occupy,
+            mode,
+            timeout_seconds,
+            future,
+            create_if_missing,
+            max_retries,
+            wait_seconds,
+        ) = item
         try:
             response = await self.acquire_slots(
-                occupy, mode, timeout_seconds, create_if_missing, max_retries
+                occupy,
+                mode,
+                timeout_seconds,
+                create_if_missing,
+                max_retries,
+                wait_seconds,
             )
         except Exception as exc:
             # If the request to the increment endpoint fails in a non-standard
@@ -65,15 +86,23 @@ class ConcurrencySlotAcquisitionService(QueueService):
         timeout_seconds: Optional[float] = None,
         create_if_missing: Optional[bool] = None,
         max_retries: Optional[int] = None,
+        wait_seconds: float = 0.0,
     ) -> httpx.Response:
+        # Waiting in line on the server only makes sense if we'd retry anyway
+        wait = {}
+        if wait_seconds and max_retries != 0:
+            wait["wait_seconds"] = wait_seconds
+
         with timeout_async(seconds=timeout_seconds):
             while True:
+                started = time.monotonic()
                 try:
                     response = await self._client.increment_concurrency_slots(
                         names=self.concurrency_limit_names,
                         slots=slots,
                         mode=mode,
                         create_if_missing=create_if_missing,
+                        **wait,
                     )
                 except Exception as exc:
                     if (
@@ -83,7 +112,10 @@ class ConcurrencySlotAcquisitionService(QueueService):
                         if max_retries is not None and max_retries <= 0:
                             raise exc
                         retry_after = float(exc.response.headers["Retry-After"])
-                        await asyncio.sleep(retry_after)
+                        if wait:
+                            # The time spent waiting in line counts toward the delay
+                            retry_after -= time.monotonic() - started
+                        await asyncio.sleep(max(retry_after, 0.0))
                         if max_retries is not None:
                             max_retries -= 1
                     else:
@@ -103,7 +135,295 @@ class ConcurrencySlotAcquisitionService(QueueService):
 
             occupy, mode, timeout_seconds, create_if_missing, max_retries = item
             self._queue.put_nowait(
-                (occupy, mode, timeout_seconds, future, create_if_missing, max_retries)
+                (
+                    occupy,
+                    mode,
+                    timeout_seconds,
+                    future,
+                    create_if_missing,
+                    max_retries,
+                    # Settings are read here, in the context of the caller
+                    SYNTASK_CLIENT_CONCURRENCY_WAIT_SECONDS.value(),
+                )
+            )
+
+        return future
+
+
+class PooledConcurrencyLimits(List[MinimalConcurrencyLimitResponse]):
+    """
+    The limits that slots were acquired on, when those slots were handed out from a
+    `ConcurrencySlotLeaseService`'s pool rather than acquired with the API.  They're
+    passed back to `ConcurrencySlotLeaseService.release` to return the slots to the
+    pool.
+    """
+
+
+class ConcurrencySlotLeaseService(QueueService):
+    """
+    Hands out concurrency slots from leases on batches of slots, so that most
+    acquisitions and releases don't need a request to the API.
+
+    Slots are leased from the API as they're needed, a batch at a time, and go back
+    into this process's pool when they're released.  Waiters are woken as soon as slots
+    come back into the pool, rather than sleeping until they retry.  Leases are renewed
+    while they're held, and given back once they've sat idle for a while.
+    """
+
+    def __init__(
+        self,
+        concurrency_limit_names: FrozenSet[str],
+        lease_slots: int,
+        ttl_seconds: float,
+    ):
+        super().__init__(concurrency_limit_names, lease_slots, ttl_seconds)
+        self._client: "SyntaskClient"
+        self.concurrency_limit_names = sorted(list(concurrency_limit_names))
+        self.lease_slots = lease_slots
+        self.ttl_seconds = ttl_seconds
+
+        # The pool is shared with the threads that release slots
+        self._pool_lock = threading.Lock()
+        self._leases: Dict[UUID, int] = {}
+        self._limits: List[MinimalConcurrencyLimitResponse] = []
+        self._capacity = 0
+        self._in_use = 0
+        self._fewest_idle = 0
+        self._leasing = True
+        self._slots_returned: Optional[asyncio.Event] = None
+
+    @asynccontextmanager
+    async def _lifespan(self) -> AsyncGenerator[None, None]:
+        async with get_client() as client:
+            self._client = client
+            self._slots_returned = asyncio.Event()
+            maintainer = asyncio.create_task(self._maintain_leases())
+            try:
+                yield
+            finally:
+                maintainer.cancel()
+                with self._pool_lock:
+                    lease_ids = list(self._leases)
+                    self._leases.clear()
+                    self._capacity = 0
+                if lease_ids:
+                    try:
+                        await client.release_concurrency_slot_leases(lease_ids)
+                    except Exception:
+                        logger.debug(
+                            "Failed to release concurrency leases", exc_info=True
+                        )
+
+    async def _maintain_leases(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl_seconds / 3)
+            try:
+                await self._renew_leases()
+            except Exception:
+                logger.debug("Failed to renew concurrency leases", exc_info=True)
+
+    async def _renew_leases(self) -> None:
+        with self._pool_lock:
+            # Give back any leases whose slots weren't needed at any point since the
+            # last time we checked
+            idle = self._fewest_idle
+            unneeded = []
+            for lease_id, slots in sorted(self._leases.items(), key=lambda kv: kv[1]):
+                if slots <= idle:
+                    unneeded.append(lease_id)
+                    idle -= slots
+                    self._capacity -= self._leases.pop(lease_id)
+            self._fewest_idle = self._capacity - self._in_use
+            lease_ids = list(self._leases)
+
+        if unneeded:
+            await self._client.release_concurrency_slot_leases(unneeded)
+
+        if lease_ids:
+            renewed = set(
+                await self._client.renew_concurrency_slot_leases(
+                    lease_ids, ttl_seconds=self.ttl_seconds
+                )
+            )
+            with self._pool_lock:
+                for lease_id in lease_ids:
+                    if lease_id not in renewed and lease_id in self._leases:
+                        # The lease expired, and its slots went back to the server
+                        self._capacity -= self._leases.pop(lease_id)
+                self._fewest_idle = min(
+                    self._fewest_idle, self._capacity - self._in_use
+                )
+
+    def _take(self, slots: int) -> Optional[PooledConcurrencyLimits]:
+        with self._pool_lock:
+            if self._capacity - self._in_use < slots:
+                return None
+            self._in_use += slots
+            self._fewest_idle = min(self._fewest_idle, self._capacity - self._in_use)
+            return PooledConcurrencyLimits(self._limits)
+
+    def _add_lease(
+        self, lease_id: UUID, slots: int, limits: List[MinimalConcurrencyLimitResponse]
+    ) -> None:
+        with self._pool_lock:
+            self._leases[lease_id] = slots
+            self._limits = limits
+            self._capacity += slots
+
+    def release(
+        self, slots: int, acquired: Optional[List[MinimalConcurrencyLimitResponse]]
+    ) -> int:
+        """
+        Returns slots to the pool, waking anyone waiting for them, if they came from
+        the pool; `acquired` are the limits that were returned when the slots were
+        acquired.  This may be called from any thread.
+
+        Returns the number of slots that didn't come from the pool, which must be
+        released with the API instead.
+        """
+        if not isinstance(acquired, PooledConcurrencyLimits):
+            return slots
+
+        with self._pool_lock:
+            self._in_use -= min(slots, self._in_use)
+
+        if self._loop is not None and self._slots_returned is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._slots_returned.set)
+            except RuntimeError:
+                # The event loop has already been closed
+                pass
+
+        return 0
+
+    async def _handle(
+        self,
+        item: Tuple[
+            int,
+            Optional[float],
+            concurrent.futures.Future,
+            Optional[int],
+            Optional[bool],
+        ],
+    ) -> None:
+        occupy, timeout_seconds, future, max_retries, create_if_missing = item
+        try:
+            limits = await self.acquire_slots(
+                occupy, timeout_seconds, max_retries, create_if_missing
+            )
+        except Exception as exc:
+            # If leasing slots fails in a non-standard way, we need to set the
+            # future's result so that the caller can handle the exception and then
+            # re-raise.
+            future.set_result(exc)
+            raise exc
+        else:
+            future.set_result(limits)
+
+    async def acquire_slots(
+        self,
+        slots: int,
+        timeout_seconds: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        create_if_missing: Optional[bool] = None,
+    ) -> List[MinimalConcurrencyLimitResponse]:
+        assert self._slots_returned is not None
+
+        with timeout_async(seconds=timeout_seconds):
+            while True:
+                self._slots_returned.clear()
+                limits = self._take(slots)
+                if limits is not None:
+                    return limits
+
+                if not self._leasing:
+                    return await self._acquire_directly(
+                        slots, max_retries, create_if_missing
+                    )
+
+                with self._pool_lock:
+                    shortfall = slots - max(self._capacity - self._in_use, 0)
+
+                try:
+                    lease = await self._client.acquire_concurrency_slot_lease(
+                        names=self.concurrency_limit_names,
+                        slots=max(shortfall, self.lease_slots),
+                        minimum_slots=shortfall,
+                        ttl_seconds=self.ttl_seconds,
+                        create_if_missing=create_if_missing,
+                    )
+                except httpx.HTTPStatusError as exc:
+                    if exc.response.status_code == status.HTTP_423_LOCKED:
+                        if max_retries is not None and max_retries <= 0:
+                            raise exc
+                        retry_after = float(exc.response.headers["Retry-After"])
+                        await self._wait_for_slots(retry_after)
+                        if max_retries is not None:
+                            max_retries -= 1
+                    elif exc.response.status_code in (
+                        status.HTTP_404_NOT_FOUND,
+                        status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    ):
+                        # Either the server can't lease slots, or these limits can't
+                        # be leased from, so acquire slots one request at a time
+                        self._leasing = False
+                    else:
+                        raise exc
+                else:
+                    if not lease.limits:
+                        # None of the limits exist, so there's nothing to hold
+                        await self._client.release_concurrency_slot_leases([lease.id])
+                        return []
+                    self._add_lease(lease.id, lease.slots, lease.limits)
+
+    async def _wait_for_slots(self, timeout: float) -> None:
+        assert self._slots_returned is not None
+        try:
+            await asyncio.wait_for(self._slots_returned.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _acquire_directly(
+        self,
+        slots: int,
+        max_retries: Optional[int],
+        create_if_missing: Optional[bool] = None,
+    ) -> List[MinimalConcurrencyLimitResponse]:
+        while True:
+            try:
+                response = await self._client.increment_concurrency_slots(
+                    names=self.concurrency_limit_names,
+                    slots=slots,
+                    mode="concurrency",
+                    create_if_missing=create_if_missing,
+                )
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code != status.HTTP_423_LOCKED:
+                    raise exc
+                if max_retries is not None and max_retries <= 0:
+                    raise exc
+                await asyncio.sleep(float(exc.response.headers["Retry-After"]))
+                if max_retries is not None:
+                    max_retries -= 1
+            else:
+                return [
+                    MinimalConcurrencyLimitResponse.model_validate(obj_)
+                    for obj_ in response.json()
+                ]
+
+    def send(
+        self, item: Tuple[int, Optional[float], Optional[int], Optional[bool]]
+    ) -> concurrent.futures.Future:
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("Cannot put items in a stopped service instance.")
+
+            logger.debug("Service %r enqueuing item %r", self, item)
+            future: concurrent.futures.Future = concurrent.futures.Future()
+
+            occupy, timeout_seconds, max_retries, create_if_missing = item
+            self._queue.put_nowait(
+                (occupy, timeout_seconds, future, max_retries, create_if_missing)
             )
 
         return future
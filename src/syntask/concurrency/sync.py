@@ -94,6 +94,7 @@ def concurrency(
             names,
             occupy,
             occupancy_period.total_seconds(),
+            acquired=limits,
             _sync=True,
         )
         _emit_concurrency_release_events(limits, occupy, emitted_events)
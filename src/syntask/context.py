@@ -18,8 +18,10 @@ from typing import (
     Dict,
     Generator,
     Mapping,
+    MutableMapping,
     Optional,
     Set,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -42,6 +44,7 @@ from syntask.results import ResultStore, get_default_persist_setting
 from syntask.settings import Profile, Settings
 from syntask.states import State
 from syntask.task_runners import TaskRunner
+from syntask.utilities.hashing import hash_memo
 from syntask.utilities.services import start_client_metrics_server
 
 T = TypeVar("T")
@@ -355,6 +358,12 @@ class EngineContext(RunContext):
     # Holds the ID of the object returned by the task run and task run state
     task_run_results: Mapping[int, State] = Field(default_factory=dict)
 
+    # Hashes of large immutable task inputs, so that inputs passed to many task runs
+    # are only hashed once when computing cache keys
+    input_hashes: MutableMapping[Any, Tuple[Any, str]] = Field(
+        default_factory=hash_memo
+    )
+
     # Events worker to emit events
     events: Optional[EventsWorker] = None
 
@@ -0,0 +1,148 @@
+"""
+Detection of flow runs that are being cancelled, for the runners and workers that run
+their processes.
+
+When a flow run is moved into a Cancelling state, the server emits a
+`syntask.flow-run.Cancelling` event.  Runners and workers subscribe to those events so
+that they find out about a cancellation as soon as it's requested, rather than on their
+next query for cancelling flow runs.  They still query for cancelling flow runs, but
+only as a fallback for the events they might miss, so those queries can be far less
+frequent, and they go back to querying as often as they used to whenever they can't
+subscribe to events.
+"""
+
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+import anyio
+import pendulum
+from prometheus_client import Histogram
+
+from syntask.events.clients import get_events_subscriber
+from syntask.events.filters import (
+    EventFilter,
+    EventNameFilter,
+    EventRelatedFilter,
+    EventResourceFilter,
+)
+from syntask.logging import get_logger
+from syntask.settings import SYNTASK_API_URL
+
+CANCELLING_EVENT = "syntask.flow-run.Cancelling"
+
+CANCELLATION_LATENCY = Histogram(
+    "syntask_flow_run_cancellation_latency_seconds",
+    (
+        "How long after a flow run was moved into a Cancelling state a runner or "
+        "worker found out about it, broken down by whether it was found by an event "
+        "or by a query"
+    ),
+    labelnames=["client", "source"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+
+logger = get_logger(__name__)
+
+
+class CancellationWatcher:
+    """
+    Watches for flow runs moving into a Cancelling state, on behalf of a runner or
+    worker.
+
+    Args:
+        client_name: the kind of client watching, for the cancellation latency metric
+        poll_interval: how often the client queries for cancelling flow runs when it
+            isn't subscribed to events
+        fallback_poll_interval: how often the client queries for cancelling flow runs
+            while it's subscribed to events
+    """
+
+    def __init__(
+        self,
+        client_name: str,
+        poll_interval: float,
+        fallback_poll_interval: float,
+    ):
+        self.client_name = client_name
+        self.poll_interval = poll_interval
+        self.fallback_poll_interval = fallback_poll_interval
+        self.subscribed = False
+        self._last_polled: Optional[float] = None
+
+    @property
+    def can_subscribe(self) -> bool:
+        # Without an API URL, subscribing would start an ephemeral server of its own
+        return bool(SYNTASK_API_URL.value())
+
+    def should_poll(self) -> bool:
+        """
+        Whether the client should query for cancelling flow runs now, which it always
+        should while it isn't subscribed to events.  Calling this counts as a query
+        when it returns `True`.
+        """
+        now = time.monotonic()
+        if (
+            self.subscribed
+            and self._last_polled is not None
+            and now - self._last_polled < self.fallback_poll_interval
+        ):
+            return False
+        self._last_polled = now
+        return True
+
+    def observe(self, source: str, cancelling_since: Optional[datetime]) -> None:
+        """Records how long after it was requested a cancellation was found, by
+        `"event"` or by `"poll"`"""
+        if cancelling_since is None:
+            return
+        latency = (pendulum.now("UTC") - cancelling_since).total_seconds()
+        CANCELLATION_LATENCY.labels(self.client_name, source).observe(max(latency, 0))
+
+    async def watch(
+        self,
+        on_cancelling: Callable[[UUID, datetime], Awaitable[None]],
+        related: Optional[EventRelatedFilter] = None,
+        resource: Optional[EventResourceFilter] = None,
+    ) -> None:
+        """
+        Calls `on_cancelling` with the ID of each flow run that moves into a Cancelling
+        state and the time it did, resubscribing whenever the subscription is lost,
+        until cancelled.
+
+        Args:
+            on_cancelling: called for each flow run moving into a Cancelling state
+            related: if given, only flow runs with matching related resources (like
+                their work pool or deployment) are watched
+            resource: if given, only matching flow runs are watched
+        """
+        if not self.can_subscribe:
+            return
+
+        event_filter = EventFilter(
+            event=EventNameFilter(name=[CANCELLING_EVENT]),
+            related=related,
+            resource=resource,
+        )
+        while True:
+            try:
+                async with get_events_subscriber(filter=event_filter) as subscriber:
+                    self.subscribed = True
+                    logger.debug("Subscribed to flow run cancellation events")
+                    async for event in subscriber:
+                        try:
+                            flow_run_id = UUID(event.resource.id.rsplit(".", 1)[-1])
+                        except ValueError:
+                            continue
+                        await on_cancelling(flow_run_id, event.occurred)
+            except Exception:
+                logger.debug(
+                    "Unable to subscribe to flow run cancellation events; falling back"
+                    " to querying for cancelling flow runs.",
+                    exc_info=True,
+                )
+            finally:
+                self.subscribed = False
+
+            await anyio.sleep(self.poll_interval)
@@ -29,12 +29,14 @@ from websockets.exceptions import (
 )
 
 from syntask.events import Event
+from syntask.events.compact import COMPACT_EVENTS_SUBPROTOCOL, CompactEventEncoder
 from syntask.logging import get_logger
 from syntask.settings import (
     SYNTASK_API_KEY,
     SYNTASK_API_URL,
     SYNTASK_CLOUD_API_URL,
     SYNTASK_DEBUG_MODE,
+    SYNTASK_EVENTS_COMPACT_WIRE_FORMAT,
     SYNTASK_SERVER_ALLOW_EPHEMERAL_MODE,
 )
 
@@ -243,6 +245,7 @@ class SyntaskEventsClient(EventsClient):
 
     _websocket: Optional[WebSocketClientProtocol]
     _unconfirmed_events: List[Event]
+    _encoder: Optional[CompactEventEncoder]
 
     def __init__(
         self,
@@ -265,8 +268,17 @@ class SyntaskEventsClient(EventsClient):
             )
 
         self._events_socket_url = events_in_socket_from_api_url(api_url)
-        self._connect = connect(self._events_socket_url)
+        self._connect = connect(
+            self._events_socket_url,
+            # offer the compact encoding, which the server may decline
+            subprotocols=(
+                [Subprotocol(COMPACT_EVENTS_SUBPROTOCOL)]
+                if SYNTASK_EVENTS_COMPACT_WIRE_FORMAT.value()
+                else None
+            ),
+        )
         self._websocket = None
+        self._encoder = None
         self._reconnection_attempts = reconnection_attempts
         self._unconfirmed_events = []
         self._checkpoint_every = checkpoint_every
@@ -291,6 +303,7 @@ class SyntaskEventsClient(EventsClient):
     async def _reconnect(self) -> None:
         if self._websocket:
             self._websocket = None
+            self._encoder = None
             await self._connect.__aexit__(None, None, None)
 
         try:
@@ -314,6 +327,10 @@ class SyntaskEventsClient(EventsClient):
             )
             raise
 
+        # the compact encoding is stateful, so each connection needs its own encoder
+        if self._websocket.subprotocol == COMPACT_EVENTS_SUBPROTOCOL:
+            self._encoder = CompactEventEncoder()
+
         events_to_resend = self._unconfirmed_events
         # Clear the unconfirmed events here, because they are going back through emit
         # and will be added again through the normal checkpointing process
@@ -353,7 +370,10 @@ class SyntaskEventsClient(EventsClient):
                     await self._reconnect()
                     assert self._websocket
 
-                await self._websocket.send(event.model_dump_json())
+                if self._encoder:
+                    await self._websocket.send(self._encoder.encode(event))
+                else:
+                    await self._websocket.send(event.model_dump_json())
                 await self._checkpoint(event)
 
                 return
@@ -1,10 +1,14 @@
 import abc
+import os
 import urllib.parse
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Generator, Optional
 
 import anyio
 import fsspec
+from fsspec.spec import AbstractBufferedFile
 from pydantic import BaseModel, Field, SecretStr, field_validator
 
 from syntask._internal.schemas.validators import (
@@ -12,12 +16,17 @@ from syntask._internal.schemas.validators import (
     validate_basepath,
 )
 from syntask.blocks.core import Block
+from syntask.settings import SYNTASK_RESULTS_STREAMING_CHUNK_SIZE
 from syntask.utilities.asyncutils import run_sync_in_worker_thread, sync_compatible
 from syntask.utilities.compat import copytree
 from syntask.utilities.filesystem import filter_files
 
 from ._internal.compatibility.migration import getattr_migration
 
+# fsspec protocols whose files are written in place as soon as they are opened, rather
+# than buffered and only published when they are closed
+_IN_PLACE_WRITE_PROTOCOLS = {"memory", "file", "local", "ftp", "sftp", "ssh", "smb"}
+
 
 class ReadableFileSystem(Block, abc.ABC):
     _block_schema_capabilities = ["read-path"]
@@ -238,6 +247,45 @@ class LocalFileSystem(WritableFileSystem, WritableDeploymentStorage):
         # Leave path stringify to the OS
         return str(path)
 
+    @contextmanager
+    def open_path(self, path: str, mode: str = "rb") -> Generator[BinaryIO, None, None]:
+        """
+        Opens a file for streaming reads (`"rb"`) or writes (`"wb"`), without holding
+        all of its content in memory.
+
+        Writes go to a temporary file next to the destination, which replaces the
+        destination only if the block exits without an error.
+        """
+        path: Path = self._resolve_path(path)
+
+        if mode == "rb":
+            if not path.exists():
+                raise ValueError(f"Path {path} does not exist.")
+            if not path.is_file():
+                raise ValueError(f"Path {path} is not a file.")
+            with open(path, mode="rb") as f:
+                yield f
+            return
+
+        if mode != "wb":
+            raise ValueError(f"Unsupported mode {mode!r}; use 'rb' or 'wb'.")
+
+        path.parent.mkdir(exist_ok=True, parents=True)
+        if path.exists() and not path.is_file():
+            raise ValueError(f"Path {path} already exists and is not a file.")
+
+        temporary = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(
+                temporary,
+                mode="wb",
+                buffering=SYNTASK_RESULTS_STREAMING_CHUNK_SIZE.value(),
+            ) as f:
+                yield f
+            os.replace(temporary, path)
+        finally:
+            temporary.unlink(missing_ok=True)
+
 
 class RemoteFileSystem(WritableFileSystem, WritableDeploymentStorage):
     """
@@ -395,6 +443,83 @@ class RemoteFileSystem(WritableFileSystem, WritableDeploymentStorage):
             await run_sync_in_worker_thread(file.write, content)
         return path
 
+    @contextmanager
+    def open_path(self, path: str, mode: str = "rb") -> Generator[BinaryIO, None, None]:
+        """
+        Opens a file for streaming reads (`"rb"`) or writes (`"wb"`), without holding
+        all of its content in memory.
+
+        Content is transferred in blocks of `SYNTASK_RESULTS_STREAMING_CHUNK_SIZE`
+        bytes, which file systems that support it (like S3, GCS, and Azure) upload as
+        the parts of a multipart upload.
+
+        Writes go straight to the destination on file systems with buffered files,
+        which only publish a file once it is closed; if the block exits with an error,
+        the upload is discarded instead.  File systems that write files in place as
+        soon as they are opened (like the memory file system) write to a temporary
+        file next to the destination instead, which is moved into place only if the
+        block exits without an error.
+        """
+        path = self._resolve_path(path)
+        block_size = SYNTASK_RESULTS_STREAMING_CHUNK_SIZE.value()
+
+        if mode == "rb":
+            with self.filesystem.open(path, "rb", block_size=block_size) as file:
+                yield file
+            return
+
+        if mode != "wb":
+            raise ValueError(f"Unsupported mode {mode!r}; use 'rb' or 'wb'.")
+
+        directory, _, name = path.rpartition("/")
+        self.filesystem.makedirs(directory, exist_ok=True)
+
+        if self._writes_in_place():
+            temporary = f"{directory}/.{name}.{uuid.uuid4().hex}.tmp"
+            moved = False
+            try:
+                with self.filesystem.open(
+                    temporary, "wb", block_size=block_size
+                ) as file:
+                    yield file
+                self.filesystem.mv(temporary, path)
+                moved = True
+            finally:
+                if not moved:
+                    try:
+                        self.filesystem.rm(temporary)
+                    except FileNotFoundError:
+                        pass
+            return
+
+        file = self.filesystem.open(path, "wb", block_size=block_size)
+        try:
+            yield file
+        except BaseException:
+            if isinstance(file, AbstractBufferedFile):
+                # abort the upload rather than letting `close` commit it
+                file.discard()
+                file.closed = True
+            else:
+                file.close()
+                try:
+                    self.filesystem.rm(path)
+                except FileNotFoundError:
+                    pass
+            raise
+        else:
+            file.close()
+
+    def _writes_in_place(self) -> bool:
+        """
+        Whether this file system writes files in place as they are opened, rather than
+        through buffered files that are only published when they are closed
+        """
+        protocols = self.filesystem.protocol
+        if isinstance(protocols, str):
+            protocols = (protocols,)
+        return bool(_IN_PLACE_WRITE_PROTOCOLS.intersection(protocols))
+
     @property
     def filesystem(self) -> fsspec.AbstractFileSystem:
         if not self._filesystem:
@@ -512,6 +637,11 @@ class SMB(WritableFileSystem, WritableDeploymentStorage):
     async def write_path(self, path: str, content: bytes) -> str:
         return await self.filesystem.write_path(path=path, content=content)
 
+    @contextmanager
+    def open_path(self, path: str, mode: str = "rb") -> Generator[BinaryIO, None, None]:
+        with self.filesystem.open_path(path, mode) as file:
+            yield file
+
 
 class NullFileSystem(BaseModel):
     """
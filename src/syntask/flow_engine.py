@@ -75,6 +75,7 @@ from syntask.utilities.engine import (
     _get_hook_name,
     _resolve_custom_flow_run_name,
     capture_sigterm,
+    has_inputs_to_resolve,
     link_state_to_result,
     propose_state_sync,
     resolve_to_final_result,
@@ -148,6 +149,10 @@ class FlowRunEngine(Generic[P, R]):
 
         resolved_parameters = {}
         for parameter, value in self.parameters.items():
+            if not has_inputs_to_resolve(value):
+                resolved_parameters[parameter] = value
+                continue
+
             try:
                 resolved_parameters[parameter] = visit_collection(
                     value,
@@ -0,0 +1,133 @@
+"""
+A compact encoding for sending batches of logs to the API.
+
+A batch is encoded as a JSON object in which the values that repeat from log to log
+(logger names, and flow and task run IDs) are listed once, with each log referring to
+them by their index in that list.  The encoded batch is then compressed, with zstd when
+the `zstandard` package is installed and with gzip otherwise.
+
+Clients send compact batches to `POST /logs/compact`, naming the compression in the
+`Content-Encoding` header.  A server that can't decompress the batch responds with
+`415 Unsupported Media Type` and lists the encodings it accepts in its
+`Accept-Encoding` header, and a server without the route responds with `404 Not Found`,
+after which clients send logs as plain JSON to `POST /logs/` instead.
+"""
+
+import zlib
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+import orjson
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPACT_LOGS_CONTENT_TYPE = "application/vnd.syntask.logs.compact.v1+json"
+
+# The most a batch may decompress to, which guards the server against batches that
+# decompress to far more than they were sent as
+MAXIMUM_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+
+# Logs are compressed for speed rather than for the smallest size, since logs repeat so
+# much that even the fastest compression shrinks them several times over
+_GZIP_LEVEL = 1
+_ZSTD_LEVEL = 3
+
+
+class CompactLogsError(ValueError):
+    """Raised when a batch of logs can't be decompressed or decoded"""
+
+
+def supported_encodings() -> List[str]:
+    """The compressions this process can read and write, most preferred first"""
+    if zstandard is not None:
+        return ["zstd", "gzip"]
+    return ["gzip"]
+
+
+def _index(table: Dict[Hashable, int], value: Hashable) -> int:
+    index = table.get(value)
+    if index is None:
+        index = table[value] = len(table)
+    return index
+
+
+def encode_logs(logs: Iterable[Dict[str, Any]]) -> bytes:
+    """Encodes JSON-compatible log dicts as an uncompressed batch"""
+    names: Dict[Hashable, int] = {}
+    run_ids: Dict[Hashable, int] = {}
+    rows = []
+    for log in logs:
+        task_run_id = log.get("task_run_id")
+        rows.append(
+            [
+                _index(names, log["name"]),
+                log["level"],
+                _index(run_ids, log.get("flow_run_id")),
+                _index(run_ids, task_run_id) if task_run_id is not None else None,
+                log["timestamp"],
+                log["message"],
+            ]
+        )
+
+    return orjson.dumps({"names": list(names), "run_ids": list(run_ids), "logs": rows})
+
+
+def decode_logs(data: bytes) -> List[Dict[str, Any]]:
+    """Decodes an uncompressed batch into JSON-compatible log dicts"""
+    try:
+        batch = orjson.loads(data)
+        names: List[str] = batch["names"]
+        run_ids: List[Optional[str]] = batch["run_ids"]
+        return [
+            {
+                "name": names[name],
+                "level": level,
+                "flow_run_id": run_ids[flow_run_id],
+                "task_run_id": run_ids[task_run_id]
+                if task_run_id is not None
+                else None,
+                "timestamp": timestamp,
+                "message": message,
+            }
+            for name, level, flow_run_id, task_run_id, timestamp, message in batch[
+                "logs"
+            ]
+        ]
+    except (orjson.JSONDecodeError, KeyError, IndexError, TypeError, ValueError) as exc:
+        raise CompactLogsError(f"Malformed batch of logs: {exc}") from exc
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+    if encoding == "gzip":
+        compressor = zlib.compressobj(_GZIP_LEVEL, wbits=zlib.MAX_WBITS | 16)
+        return compressor.compress(data) + compressor.flush()
+    raise CompactLogsError(f"Unsupported encoding {encoding!r}")
+
+
+def decompress(
+    data: bytes, encoding: str, maximum_size: int = MAXIMUM_DECOMPRESSED_SIZE
+) -> bytes:
+    if encoding == "zstd" and zstandard is not None:
+        try:
+            with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+                decompressed = reader.read(maximum_size + 1)
+        except zstandard.ZstdError as exc:
+            raise CompactLogsError(f"Malformed zstd data: {exc}") from exc
+    elif encoding == "gzip":
+        decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        try:
+            decompressed = decompressor.decompress(data, maximum_size + 1)
+        except zlib.error as exc:
+            raise CompactLogsError(f"Malformed gzip data: {exc}") from exc
+    else:
+        raise CompactLogsError(f"Unsupported encoding {encoding!r}")
+
+    if len(decompressed) > maximum_size:
+        raise CompactLogsError(
+            f"Batch of logs decompresses to more than {maximum_size} bytes"
+        )
+    return decompressed
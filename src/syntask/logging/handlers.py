@@ -8,6 +8,7 @@ import warnings
 from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional, Type, Union
 
+import httpx
 import pendulum
 from rich.console import Console
 from rich.highlighter import Highlighter, NullHighlighter
@@ -22,6 +23,7 @@ from syntask._internal.concurrency.threads import in_global_loop
 from syntask.client.orchestration import get_client
 from syntask.client.schemas.actions import LogCreate
 from syntask.exceptions import MissingContextError
+from syntask.logging.compact import supported_encodings
 from syntask.logging.highlighters import SyntaskConsoleHighlighter
 from syntask.settings import (
     SYNTASK_API_URL,
@@ -30,12 +32,26 @@ from syntask.settings import (
     SYNTASK_LOGGING_MARKUP,
     SYNTASK_LOGGING_TO_API_BATCH_INTERVAL,
     SYNTASK_LOGGING_TO_API_BATCH_SIZE,
+    SYNTASK_LOGGING_TO_API_COMPACT_TRANSPORT,
     SYNTASK_LOGGING_TO_API_MAX_LOG_SIZE,
     SYNTASK_LOGGING_TO_API_WHEN_MISSING_FLOW,
 )
 
 
 class APILogWorker(BatchedQueueService[Dict[str, Any]]):
+    def __init__(
+        self,
+        batch_size: int,
+        api_url: Optional[str],
+        max_log_size: int,
+        compact_transport: bool = False,
+    ) -> None:
+        super().__init__(batch_size, api_url, max_log_size, compact_transport)
+        # The compression to send compact batches with, until the server turns it down
+        self._compact_encoding: Optional[str] = (
+            supported_encodings()[0] if compact_transport else None
+        )
+
     @property
     def _max_batch_size(self):
         return max(
@@ -50,6 +66,15 @@ class APILogWorker(BatchedQueueService[Dict[str, Any]]):
 
     async def _handle_batch(self, items: List):
         try:
+            while self._compact_encoding:
+                try:
+                    await self._client.create_logs_compact(
+                        items, encoding=self._compact_encoding
+                    )
+                    return
+                except httpx.HTTPStatusError as exc:
+                    self._negotiate_compact_encoding(exc)
+
             await self._client.create_logs(items)
         except Exception as e:
             # Roughly replicate the behavior of the stdlib logger error handling
@@ -66,12 +91,40 @@ class APILogWorker(BatchedQueueService[Dict[str, Any]]):
         async with get_client() as self._client:
             yield
 
+    def _negotiate_compact_encoding(self, exc: httpx.HTTPStatusError) -> None:
+        """
+        Picks another compression for compact batches after the server turned one
+        down, or stops sending compact batches if it can't take any of them
+        """
+        response = exc.response
+        if response.status_code == httpx.codes.UNSUPPORTED_MEDIA_TYPE:
+            accepted = {
+                encoding.strip()
+                for encoding in response.headers.get("Accept-Encoding", "").split(",")
+            }
+            self._compact_encoding = next(
+                (
+                    encoding
+                    for encoding in supported_encodings()
+                    if encoding in accepted and encoding != self._compact_encoding
+                ),
+                None,
+            )
+        elif response.status_code in (
+            httpx.codes.NOT_FOUND,
+            httpx.codes.METHOD_NOT_ALLOWED,
+        ):
+            self._compact_encoding = None
+        else:
+            raise exc
+
     @classmethod
     def instance(cls: Type[Self]) -> Self:
         settings = (
             SYNTASK_LOGGING_TO_API_BATCH_SIZE.value(),
             SYNTASK_API_URL.value(),
             SYNTASK_LOGGING_TO_API_MAX_LOG_SIZE.value(),
+            SYNTASK_LOGGING_TO_API_COMPACT_TRANSPORT.value(),
         )
 
         # Ensure a unique worker is retrieved per relevant logging settings
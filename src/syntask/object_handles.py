@@ -0,0 +1,159 @@
+"""
+Handles to the results of task runs that are held in memory by this process.
+
+When a task run submitted to the `ThreadPoolTaskRunner` completes, its result is already
+in memory.  The runner keeps a handle to that result, recording the task run that
+produced it and whether it holds any futures, states or annotations.  A task run
+submitted to the same runner that takes the result (or the future for it) as a
+parameter is given the object by reference, without walking it to resolve inputs or to
+track dependencies and without serializing it.  Results are still only written to
+result storage when they are persisted, or when a task run in another process needs
+them, like a background task.
+
+Handles are reference counted.  The future for a task run holds a reference to its
+handle, as does each task run submitted with the result as a parameter until it
+finishes, and a handle is dropped with its last reference, so that it never keeps a
+result in memory for longer than the futures and parameters that refer to it.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from syntask.client.schemas.objects import State
+from syntask.futures import SyntaskFuture
+from syntask.results import ResultRecord
+
+# Objects of these types are never looked up by identity, since equal values may be
+# shared by unrelated code (small integers and interned strings, for example)
+_UNTRACKABLE_TYPES = frozenset(
+    {type(None), type(...), type(NotImplemented), bool, int, float, complex, str, bytes}
+)
+
+
+class ObjectHandle:
+    """
+    A reference to the result of a task run held in this process.
+
+    Attributes:
+        task_run_id: the ID of the task run that returned the value
+        value: the value returned by the task run
+    """
+
+    __slots__ = ("task_run_id", "value", "_needs_resolving")
+
+    def __init__(self, task_run_id: UUID, value: Any):
+        self.task_run_id = task_run_id
+        self.value = value
+        self._needs_resolving: Optional[bool] = None
+
+    def needs_resolving(self) -> bool:
+        """
+        Whether the value holds futures, states or annotations, in which case it has to
+        be resolved like any other input.  This is worked out the first time it's
+        asked and remembered for every later task run that takes the value.
+        """
+        if self._needs_resolving is None:
+            from syntask.utilities.engine import has_inputs_to_resolve
+
+            self._needs_resolving = has_inputs_to_resolve(self.value)
+        return self._needs_resolving
+
+
+class ObjectHandles:
+    """
+    The handles to the results of the task runs submitted to a task runner, counting
+    the references to each.
+    """
+
+    def __init__(self):
+        # Reentrant, since references may be released by finalizers that run while a
+        # handle is being added or looked up on the same thread
+        self._lock = threading.RLock()
+        self._references: Dict[UUID, int] = {}
+        self._handles: Dict[UUID, ObjectHandle] = {}
+        self._by_object: Dict[int, ObjectHandle] = {}
+
+    def acquire(self, task_run_ids: Iterable[UUID]) -> None:
+        """Takes a reference to the results of the given task runs, which need not
+        have finished yet"""
+        with self._lock:
+            for task_run_id in task_run_ids:
+                self._references[task_run_id] = self._references.get(task_run_id, 0) + 1
+
+    def release(self, task_run_ids: Iterable[UUID]) -> None:
+        """Releases a reference to the results of the given task runs, dropping the
+        handles that have no references left"""
+        with self._lock:
+            for task_run_id in task_run_ids:
+                count = self._references.get(task_run_id, 0) - 1
+                if count > 0:
+                    self._references[task_run_id] = count
+                    continue
+
+                self._references.pop(task_run_id, None)
+                handle = self._handles.pop(task_run_id, None)
+                if (
+                    handle is not None
+                    and self._by_object.get(id(handle.value)) is handle
+                ):
+                    del self._by_object[id(handle.value)]
+
+    def add(self, task_run_id: UUID, state: State) -> Optional[ObjectHandle]:
+        """
+        Adds a handle to the result of a finished task run, if the run completed with
+        its result in memory and anything still holds a reference to it.
+        """
+        if not state.is_completed() or not isinstance(state.data, ResultRecord):
+            return None
+
+        handle = ObjectHandle(task_run_id, state.data.result)
+        with self._lock:
+            if task_run_id not in self._references:
+                return None
+            self._handles[task_run_id] = handle
+            if type(handle.value) not in _UNTRACKABLE_TYPES:
+                self._by_object[id(handle.value)] = handle
+        return handle
+
+    def references(self, value: Any) -> Optional[UUID]:
+        """Returns the ID of the task run whose result the given parameter refers to, if
+        it's a future for or the result of a task run submitted to this runner"""
+        if isinstance(value, SyntaskFuture):
+            with self._lock:
+                if value.task_run_id in self._references:
+                    return value.task_run_id
+            return None
+
+        handle = self._by_object.get(id(value))
+        if handle is not None and handle.value is value:
+            return handle.task_run_id
+        return None
+
+    def find(self, value: Any, wait: bool = True) -> Optional[ObjectHandle]:
+        """
+        Returns the handle to the result that the given parameter refers to, if there
+        is one.  Futures for task runs submitted to this runner are waited for unless
+        `wait` is `False`, so that their results can be handed over once they complete.
+        """
+        if isinstance(value, SyntaskFuture):
+            if self.references(value) is None:
+                return None
+            if wait:
+                value.wait()
+            return self._handles.get(value.task_run_id)
+
+        handle = self._by_object.get(id(value))
+        if handle is not None and handle.value is value:
+            return handle
+        return None
+
+    def __reduce__(self):
+        # Handles refer to objects in this process, so copies start out empty
+        return (type(self), ())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._references.clear()
+            self._handles.clear()
+            self._by_object.clear()
@@ -1,7 +1,10 @@
 import abc
+import asyncio
 import inspect
+import mmap
 import os
 import socket
+import struct
 import threading
 import uuid
 from functools import partial
@@ -10,10 +13,13 @@ from typing import (
     TYPE_CHECKING,
     Annotated,
     Any,
+    BinaryIO,
     Callable,
     Dict,
     Generic,
+    Iterable,
     Optional,
+    Set,
     Tuple,
     Type,
     TypeVar,
@@ -42,10 +48,12 @@ import syntask
 from syntask._internal.compatibility import deprecated
 from syntask._internal.compatibility.deprecated import deprecated_field
 from syntask.blocks.core import Block
+from syntask.cache_index import get_cache_key_index
 from syntask.client.utilities import inject_client
 from syntask.exceptions import (
     ConfigurationError,
     MissingContextError,
+    MissingResult,
     SerializationError,
 )
 from syntask.filesystems import (
@@ -61,10 +69,11 @@ from syntask.settings import (
     SYNTASK_LOCAL_STORAGE_PATH,
     SYNTASK_RESULTS_DEFAULT_SERIALIZER,
     SYNTASK_RESULTS_PERSIST_BY_DEFAULT,
+    SYNTASK_RESULTS_STREAMING_CHUNK_SIZE,
     SYNTASK_TASK_SCHEDULING_DEFAULT_STORAGE_BLOCK,
 )
 from syntask.utilities.annotations import NotSet
-from syntask.utilities.asyncutils import sync_compatible
+from syntask.utilities.asyncutils import run_sync_in_worker_thread, sync_compatible
 from syntask.utilities.pydantic import get_dispatch_key, lookup_type, register_base_type
 
 if TYPE_CHECKING:
@@ -372,16 +381,42 @@ class ResultStore(BaseModel):
         thread_id = threading.get_ident()
         return f"{hostname}:{pid}:{thread_id}:{thread_name}"
 
-    @sync_compatible
-    async def _exists(self, key: str) -> bool:
+    def _cache_key_storage(self) -> Optional[str]:
         """
-        Check if a result record exists in storage.
+        Identifies the storage that holds this store's cache keys in the cache key
+        index, or returns `None` if that storage can't be identified.
+        """
+        storage = (
+            self.metadata_storage
+            if self.metadata_storage is not None
+            else self.result_storage
+        )
+        if storage is None or isinstance(storage, NullFileSystem):
+            return None
+        if storage._block_document_id is not None:
+            return str(storage._block_document_id)
+        if hasattr(storage, "_resolve_path"):
+            return str(storage._resolve_path(""))
+        return None
 
-        Args:
-            key: The key to check for the existence of a result record.
+    def _is_still_stored(self, key: str) -> bool:
+        """
+        Confirms that a key found in the cache key index is still in storage, where
+        that is cheap enough to do (i.e. for local storage).
+        """
+        storage = (
+            self.metadata_storage
+            if self.metadata_storage is not None
+            else self.result_storage
+        )
+        if isinstance(storage, LocalFileSystem):
+            return storage._resolve_path(key).exists()
+        return True
 
-        Returns:
-            bool: True if the result record exists, False otherwise.
+    async def _probe(self, key: str) -> bool:
+        """
+        Check if a result record exists by reading it from storage, adding it to the
+        cache key index if it does.
         """
         if self.metadata_storage is not None:
             # TODO: Add an `exists` method to commonly used storage blocks
@@ -394,6 +429,13 @@ class ResultStore(BaseModel):
 
             except Exception:
                 return False
+        elif hasattr(self.result_storage, "open_path"):
+            try:
+                metadata = await run_sync_in_worker_thread(
+                    self._stream_metadata_from_storage, key
+                )
+            except Exception:
+                return False
         else:
             try:
                 content = await self.result_storage.read_path(key)
@@ -410,8 +452,68 @@ class ResultStore(BaseModel):
             exists = metadata.expiration > pendulum.now("utc")
         else:
             exists = True
+
+        if exists and (index := get_cache_key_index()):
+            if storage := self._cache_key_storage():
+                index.add(storage, key, metadata.expiration)
+
         return exists
 
+    @sync_compatible
+    async def _exists(self, key: str) -> bool:
+        """
+        Check if a result record exists in storage.
+
+        Args:
+            key: The key to check for the existence of a result record.
+
+        Returns:
+            bool: True if the result record exists, False otherwise.
+        """
+        return (await self._exists_many(keys=[key], _sync=False))[key]
+
+    @sync_compatible
+    async def _exists_many(self, keys: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check if result records exist in storage for many keys at once.
+
+        Keys in the cache key index are answered without reading storage, looking them
+        all up in the index at once, and the rest are read from storage concurrently.
+
+        Args:
+            keys: The keys to check for the existence of result records.
+
+        Returns:
+            Dict[str, bool]: Whether a result record exists for each key.
+        """
+        keys = list(dict.fromkeys(keys))
+
+        cached: Set[str] = set()
+        if (index := get_cache_key_index()) and (storage := self._cache_key_storage()):
+            for key in index.cached(storage, keys):
+                if self._is_still_stored(key):
+                    cached.add(key)
+                else:
+                    index.discard(storage, key)
+
+        uncached = [key for key in keys if key not in cached]
+        probed = await asyncio.gather(*(self._probe(key) for key in uncached))
+
+        exists = {key: True for key in cached}
+        exists.update(zip(uncached, probed))
+        return {key: exists[key] for key in keys}
+
+    def _forget_cache_key(self, key: str) -> bool:
+        """
+        Removes a key from the cache key index, returning whether it was indexed as a
+        cache hit.
+        """
+        if (index := get_cache_key_index()) and (storage := self._cache_key_storage()):
+            if index.cached(storage, [key]):
+                index.discard(storage, key)
+                return True
+        return False
+
     def exists(self, key: str) -> bool:
         """
         Check if a result record exists in storage.
@@ -436,6 +538,32 @@ class ResultStore(BaseModel):
         """
         return await self._exists(key=key, _sync=False)
 
+    def exists_many(self, keys: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check if result records exist in storage for many keys at once, such as the
+        cache keys of the runs of a mapped task.
+
+        Args:
+            keys: The keys to check for the existence of result records.
+
+        Returns:
+            Dict[str, bool]: Whether a result record exists for each key.
+        """
+        return self._exists_many(keys=keys, _sync=True)
+
+    async def aexists_many(self, keys: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check if result records exist in storage for many keys at once, such as the
+        cache keys of the runs of a mapped task.
+
+        Args:
+            keys: The keys to check for the existence of result records.
+
+        Returns:
+            Dict[str, bool]: Whether a result record exists for each key.
+        """
+        return await self._exists_many(keys=keys, _sync=False)
+
     @sync_compatible
     async def _read(self, key: str, holder: str) -> "ResultRecord":
         """
@@ -461,21 +589,30 @@ class ResultStore(BaseModel):
         if self.result_storage is None:
             self.result_storage = await get_default_result_storage()
 
-        if self.metadata_storage is not None:
-            metadata_content = await self.metadata_storage.read_path(key)
-            metadata = ResultRecordMetadata.load_bytes(metadata_content)
-            assert (
-                metadata.storage_key is not None
-            ), "Did not find storage key in metadata"
-            result_content = await self.result_storage.read_path(metadata.storage_key)
-            result_record = ResultRecord.deserialize_from_result_and_metadata(
-                result=result_content, metadata=metadata_content
-            )
-        else:
-            content = await self.result_storage.read_path(key)
-            result_record = ResultRecord.deserialize(
-                content, backup_serializer=self.serializer
-            )
+        try:
+            if self.metadata_storage is not None:
+                metadata_content = await self.metadata_storage.read_path(key)
+                metadata = ResultRecordMetadata.load_bytes(metadata_content)
+                assert (
+                    metadata.storage_key is not None
+                ), "Did not find storage key in metadata"
+                result_content = await self.result_storage.read_path(
+                    metadata.storage_key
+                )
+                result_record = ResultRecord.deserialize_from_result_and_metadata(
+                    result=result_content, metadata=metadata_content
+                )
+            else:
+                result_record = await self._read_record(key)
+        except Exception as exc:
+            # hits in the cache key index aren't confirmed against remote storage, so
+            # a record that has since been deleted or expired is only noticed here
+            if self._forget_cache_key(key):
+                raise MissingResult(
+                    f"The result record for cache key {key!r} could not be read from"
+                    " storage."
+                ) from exc
+            raise
 
         if self.cache_result_in_memory:
             if self.result_storage_block_id is None and hasattr(
@@ -488,6 +625,61 @@ class ResultStore(BaseModel):
             self.cache[cache_key] = result_record
         return result_record
 
+    async def _read_record(self, key: str) -> "ResultRecord":
+        """
+        Read a whole result record from result storage, streaming it from storage
+        blocks that can be opened as files.  Large local records are memory-mapped
+        instead, so that their pages are only read as the result is loaded.
+        """
+        if isinstance(self.result_storage, LocalFileSystem):
+            try:
+                size = self.result_storage._resolve_path(key).stat().st_size
+            except OSError:
+                size = 0
+            # small local records are cheaper to read whole than to map
+            if size >= SYNTASK_RESULTS_STREAMING_CHUNK_SIZE.value():
+                return await run_sync_in_worker_thread(
+                    self._map_record_from_storage, key
+                )
+        elif hasattr(self.result_storage, "open_path"):
+            return await run_sync_in_worker_thread(
+                self._stream_record_from_storage, key
+            )
+
+        content = await self.result_storage.read_path(key)
+        return ResultRecord.deserialize(content, backup_serializer=self.serializer)
+
+    def _map_record_from_storage(self, key: str) -> "ResultRecord":
+        with self.result_storage.open_path(key, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return ResultRecord.deserialize(
+                memoryview(mapped), backup_serializer=self.serializer
+            )
+        finally:
+            try:
+                mapped.close()
+            except BufferError:
+                # a view of the mapping is still referenced (e.g. by the traceback of
+                # a failed load), and it will be unmapped when it's garbage collected
+                pass
+
+    def _stream_record_from_storage(self, key: str) -> "ResultRecord":
+        with self.result_storage.open_path(key, "rb") as file:
+            return ResultRecord.deserialize_from(
+                file, backup_serializer=self.serializer
+            )
+
+    def _stream_metadata_from_storage(self, key: str) -> "ResultRecordMetadata":
+        with self.result_storage.open_path(key, "rb") as file:
+            return ResultRecord.deserialize_metadata_from(file)
+
+    def _stream_record_to_storage(self, result_record: "ResultRecord") -> None:
+        with self.result_storage.open_path(
+            result_record.metadata.storage_key, "wb"
+        ) as file:
+            result_record.serialize_to(file)
+
     def read(
         self,
         key: str,
@@ -653,12 +845,20 @@ class ResultStore(BaseModel):
                 base_key,
                 content=result_record.serialize_metadata(),
             )
-        # Otherwise, write the result metadata and result together
+        # Otherwise, write the result metadata and result together, streaming them
+        # into storage blocks that can be opened as files
+        elif hasattr(self.result_storage, "open_path"):
+            await run_sync_in_worker_thread(
+                self._stream_record_to_storage, result_record
+            )
         else:
             await self.result_storage.write_path(
                 result_record.metadata.storage_key, content=result_record.serialize()
             )
 
+        if (index := get_cache_key_index()) and (storage := self._cache_key_storage()):
+            index.add(storage, base_key, result_record.metadata.expiration)
+
         if self.cache_result_in_memory:
             self.cache[key] = result_record
 
@@ -957,6 +1157,16 @@ class ResultRecordMetadata(BaseModel):
         )
 
 
+# Result records whose serializer has a binary form are written as a header, the
+# record's metadata as JSON, and then the raw serialized result, instead of as a JSON
+# document with the result base64-encoded inside of it.  The header starts with a byte
+# that can't start a JSON document or a base64 payload, so records written in the older
+# JSON format are still recognized.
+RESULT_RECORD_MAGIC = b"\x93SRR"
+RESULT_RECORD_FORMAT_VERSION = 1
+_RESULT_RECORD_HEADER = struct.Struct(">4sBI")
+
+
 class ResultRecord(BaseModel, Generic[R]):
     """
     A record of a result.
@@ -1071,19 +1281,101 @@ class ResultRecord(BaseModel, Generic[R]):
             bytes: the serialized record
 
         """
+        if self.serializer.has_binary_form:
+            metadata = self.serialize_metadata()
+            header = _RESULT_RECORD_HEADER.pack(
+                RESULT_RECORD_MAGIC, RESULT_RECORD_FORMAT_VERSION, len(metadata)
+            )
+            return b"".join([header, metadata, self._serialize_binary_result()])
+
         return (
             self.model_copy(update={"result": self.serialize_result()})
             .model_dump_json(serialize_as_any=True)
             .encode()
         )
 
+    def _serialize_binary_result(self) -> bytes:
+        try:
+            return self.serializer.dumps_binary(self.result)
+        except Exception:
+            # defer to `serialize_result` for a helpful error message
+            self.serialize_result()
+            raise
+
+    def serialize_to(self, file: BinaryIO) -> None:
+        """
+        Serialize the record into a file.
+
+        For serializers with a binary form, the result is written to the file as it is
+        serialized, rather than being built up in memory first.
+
+        Args:
+            file: a binary file open for writing
+        """
+        if not self.serializer.has_binary_form:
+            file.write(self.serialize())
+            return
+
+        metadata = self.serialize_metadata()
+        file.write(
+            _RESULT_RECORD_HEADER.pack(
+                RESULT_RECORD_MAGIC, RESULT_RECORD_FORMAT_VERSION, len(metadata)
+            )
+        )
+        file.write(metadata)
+        try:
+            self.serializer.dump_binary(self.result, file)
+        except Exception:
+            # defer to `serialize_result` for a helpful error message
+            self.serialize_result()
+            raise
+
+    @staticmethod
+    def is_binary_record(data: Union[bytes, memoryview]) -> bool:
+        """
+        Whether the given data is a record in the binary format, rather than the JSON
+        format.
+        """
+        return bytes(data[: len(RESULT_RECORD_MAGIC)]) == RESULT_RECORD_MAGIC
+
+    @staticmethod
+    def _read_binary_header(header: Union[bytes, memoryview]) -> int:
+        """Checks the header of a binary record, returning the length of its metadata"""
+        _, version, metadata_length = _RESULT_RECORD_HEADER.unpack_from(header)
+        if version > RESULT_RECORD_FORMAT_VERSION:
+            raise ValueError(
+                f"Result record format version {version} is not supported by this "
+                f"version of Syntask ({syntask.__version__}); please upgrade Syntask."
+            )
+        return metadata_length
+
+    @classmethod
+    def _deserialize_binary(cls, data: Union[bytes, memoryview]) -> "ResultRecord[R]":
+        view = memoryview(data)
+        metadata_length = cls._read_binary_header(view)
+
+        metadata_start = _RESULT_RECORD_HEADER.size
+        result_start = metadata_start + metadata_length
+        metadata = ResultRecordMetadata.load_bytes(
+            bytes(view[metadata_start:result_start])
+        )
+        return cls(
+            metadata=metadata,
+            result=metadata.serializer.loads_binary(view[result_start:]),
+        )
+
     @classmethod
     def deserialize(
-        cls, data: bytes, backup_serializer: Optional[Serializer] = None
+        cls,
+        data: Union[bytes, memoryview],
+        backup_serializer: Optional[Serializer] = None,
     ) -> "ResultRecord[R]":
         """
         Deserialize a record from bytes.
 
+        Records in the binary format may be given as a `memoryview` (for example, of
+        a memory-mapped file), in which case the result is read without copying it.
+
         Args:
             data: the serialized record
             backup_serializer: The serializer to use to deserialize the result record. Only
@@ -1092,6 +1384,10 @@ class ResultRecord(BaseModel, Generic[R]):
         Returns:
             ResultRecord: the deserialized record
         """
+        if cls.is_binary_record(data):
+            return cls._deserialize_binary(data)
+
+        data = bytes(data)
         try:
             instance = cls.model_validate_json(data)
         except ValidationError:
@@ -1109,6 +1405,55 @@ class ResultRecord(BaseModel, Generic[R]):
             instance.result = instance.serializer.loads(instance.result.encode())
         return instance
 
+    @classmethod
+    def deserialize_from(
+        cls,
+        file: BinaryIO,
+        backup_serializer: Optional[Serializer] = None,
+    ) -> "ResultRecord[R]":
+        """
+        Deserialize a record from a file.
+
+        Results of records in the binary format are read from the file as they are
+        deserialized, rather than being read into memory first.
+
+        Args:
+            file: a binary file open for reading
+            backup_serializer: The serializer to use to deserialize the result record. Only
+                necessary if the provided data does not specify a serializer.
+
+        Returns:
+            ResultRecord: the deserialized record
+        """
+        header = file.read(_RESULT_RECORD_HEADER.size)
+        if not cls.is_binary_record(header):
+            return cls.deserialize(
+                header + file.read(), backup_serializer=backup_serializer
+            )
+
+        metadata_length = cls._read_binary_header(header)
+        metadata = ResultRecordMetadata.load_bytes(file.read(metadata_length))
+        return cls(metadata=metadata, result=metadata.serializer.load_binary(file))
+
+    @classmethod
+    def deserialize_metadata_from(cls, file: BinaryIO) -> ResultRecordMetadata:
+        """
+        Deserialize only the metadata of a record from a file.  For records in the
+        binary format, the result is not read at all.
+
+        Args:
+            file: a binary file open for reading
+
+        Returns:
+            ResultRecordMetadata: the deserialized metadata
+        """
+        header = file.read(_RESULT_RECORD_HEADER.size)
+        if not cls.is_binary_record(header):
+            return cls.deserialize(header + file.read()).metadata
+
+        metadata_length = cls._read_binary_header(header)
+        return ResultRecordMetadata.load_bytes(file.read(metadata_length))
+
     @classmethod
     def deserialize_from_result_and_metadata(
         cls, result: bytes, metadata: bytes
@@ -1170,7 +1515,8 @@ class BaseResult(BaseModel, abc.ABC, Generic[R]):
 
     @abc.abstractmethod
     @sync_compatible
-    async def get(self) -> R: ...
+    async def get(self) -> R:
+        ...
 
     @abc.abstractclassmethod
     @sync_compatible
@@ -1178,7 +1524,8 @@ class BaseResult(BaseModel, abc.ABC, Generic[R]):
         cls: "Type[BaseResult[R]]",
         obj: R,
         **kwargs: Any,
-    ) -> "BaseResult[R]": ...
+    ) -> "BaseResult[R]":
+        ...
 
     @classmethod
     def __dispatch_key__(cls, **kwargs):
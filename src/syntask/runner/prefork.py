@@ -0,0 +1,452 @@
+"""
+A fork server that starts flow run processes from a process that has already imported
+Syntask.
+
+Starting a flow run process normally means starting a new Python interpreter, which
+then imports Syntask and its dependencies before the flow run can begin.  When the
+runner's pre-fork mode is enabled, it starts a fork server process that does those
+imports once (along with the flows of the runner's deployments, if asked to) and then
+forks a new process for each flow run.  Each flow run still runs in a process of its
+own, with the environment variables, working directory and output streams it would
+have had otherwise, so flow runs stay isolated from each other and from the runner and
+are cancelled and detected as crashed the same way.
+
+The runner sends the fork server a request for each flow run over a Unix socket, with
+three pipes attached: two for the flow run process's output, and one on which the fork
+server reports the process's ID once it's forked and its exit code once it exits.
+Once the runner stops sending requests, the fork server keeps running until the flow
+run processes it forked have exited, so that their exit codes are still reported.
+
+Pre-forking is only supported on POSIX systems.
+"""
+
+import asyncio
+import gc
+import importlib
+import json
+import os
+import runpy
+import select
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import anyio
+import anyio.abc
+import anyio.to_thread
+
+from syntask.logging import get_logger
+from syntask.utilities.processutils import (
+    TextSink,
+    consume_process_output,
+    get_sys_executable,
+)
+
+# Requests are framed by their length, and carry the write ends of the flow run
+# process's stdout and stderr, and of the pipe its status is reported on
+_HEADER = struct.Struct("!I")
+_PIPES_PER_REQUEST = 3
+
+# How often the fork server checks for flow run processes that have exited, and how
+# often the runner does once the fork server can't tell it
+_REAP_INTERVAL = 0.1
+
+# Modules imported by every flow run process, other than `syntask.engine` itself, which
+# is run as `__main__` in each process
+_PRELOADED_MODULES = (
+    "syntask.flow_engine",
+    "syntask.flows",
+    "syntask.client.orchestration",
+)
+
+# The exit code reported for flow run processes that outlive the fork server, once they
+# have exited, since their actual exit codes can't be known
+UNKNOWN_EXIT_CODE = 1
+
+
+def is_supported() -> bool:
+    """Whether flow run processes can be forked on this platform"""
+    return sys.platform != "win32" and hasattr(socket, "send_fds")
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class _PipeReceiveStream(anyio.abc.ByteReceiveStream):
+    """Reads from the read end of a pipe on the event loop"""
+
+    def __init__(self, reader: asyncio.StreamReader, transport: asyncio.BaseTransport):
+        self._reader = reader
+        self._transport = transport
+
+    @classmethod
+    async def open(cls, fd: int) -> "_PipeReceiveStream":
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(fd, "rb", 0)
+        )
+        return cls(reader, transport)
+
+    async def receive(self, max_bytes: int = 65536) -> bytes:
+        data = await self._reader.read(max_bytes)
+        if not data:
+            raise anyio.EndOfStream
+        return data
+
+    async def readline(self) -> bytes:
+        return await self._reader.readline()
+
+    async def aclose(self) -> None:
+        self._transport.close()
+
+
+class ForkedProcess:
+    """
+    A flow run process forked by the fork server, which can be used like the processes
+    returned by `run_process`.
+
+    Attributes:
+        pid: the ID of the process
+        returncode: the exit code of the process once it has exited, which is negative
+            if the process was ended by a signal
+    """
+
+    def __init__(
+        self,
+        pid: int,
+        stdout: _PipeReceiveStream,
+        stderr: _PipeReceiveStream,
+        status: _PipeReceiveStream,
+    ):
+        self.pid = pid
+        self.stdout = stdout
+        self.stderr = stderr
+        self._status = status
+        self.returncode: Optional[int] = None
+
+    async def wait(self) -> int:
+        if self.returncode is None:
+            line = await self._status.readline()
+            if line.strip():
+                self.returncode = int(line)
+            else:
+                # The fork server is gone, so wait for the process itself to exit
+                while _is_running(self.pid):
+                    await anyio.sleep(_REAP_INTERVAL)
+                self.returncode = UNKNOWN_EXIT_CODE
+            for stream in (self.stdout, self.stderr, self._status):
+                await stream.aclose()
+        return self.returncode
+
+
+class ForkServer:
+    """
+    Starts and talks to a fork server process.
+
+    Attributes:
+        preload: the entrypoints of flows to import in the fork server, so that the
+            modules they import are already imported in each flow run process
+    """
+
+    def __init__(self, preload: Iterable[str] = ()):
+        self.preload = list(preload)
+        self._process: Optional[subprocess.Popen] = None
+        self._socket: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._logger = get_logger("runner.fork_server")
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._process = subprocess.Popen(
+                [
+                    get_sys_executable(),
+                    "-c",
+                    # Not run with `-m`, since `syntask.runner` imports this module
+                    "import sys; from syntask.runner.prefork import main;"
+                    " main(sys.argv[1:])",
+                    str(child.fileno()),
+                    *self.preload,
+                ],
+                pass_fds=(child.fileno(),),
+            )
+        except BaseException:
+            parent.close()
+            raise
+        finally:
+            child.close()
+        self._socket = parent
+        self._logger.debug("Started fork server with PID %s", self._process.pid)
+
+    def stop(self, timeout: float = 10) -> None:
+        """
+        Stops the fork server from forking flow run processes, and waits for it to exit
+        once the flow run processes it forked have exited.  If it hasn't exited by
+        `timeout`, it's killed, and flow run processes that are still running carry on
+        without it.
+        """
+        if self._socket is not None:
+            # The fork server exits once it sees the other end of the socket close
+            self._socket.close()
+            self._socket = None
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+
+    def _send(self, request: bytes, fds: List[int]) -> None:
+        with self._lock:
+            if self._socket is None:
+                raise ConnectionError("The fork server isn't running.")
+            message = _HEADER.pack(len(request)) + request
+            sent = socket.send_fds(self._socket, [message], fds)
+            if sent < len(message):
+                self._socket.sendall(message[sent:])
+
+    async def run_process(
+        self,
+        env: Mapping[str, str],
+        cwd: Union[str, os.PathLike, None] = None,
+        stream_output: Union[
+            bool, Tuple[Optional[TextSink], Optional[TextSink]]
+        ] = False,
+        task_status: Optional[anyio.abc.TaskStatus] = None,
+    ) -> Optional[ForkedProcess]:
+        """
+        Runs `syntask.engine` in a process forked by the fork server, like
+        `run_process` does in a new process.
+
+        Returns:
+            the process once it has exited, or `None` if the fork server couldn't
+            fork it, in which case no process was started
+        """
+        if stream_output is True:
+            stream_output = (sys.stdout, sys.stderr)
+
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        status_r, status_w = os.pipe()
+        request = json.dumps(
+            {"env": dict(env), "cwd": str(cwd) if cwd is not None else None}
+        ).encode()
+        try:
+            await anyio.to_thread.run_sync(
+                self._send, request, [stdout_w, stderr_w, status_w]
+            )
+        except OSError:
+            self._logger.debug("Unable to send request to fork server", exc_info=True)
+            for fd in (stdout_r, stderr_r, status_r):
+                os.close(fd)
+            return None
+        finally:
+            for fd in (stdout_w, stderr_w, status_w):
+                os.close(fd)
+
+        stdout = await _PipeReceiveStream.open(stdout_r)
+        stderr = await _PipeReceiveStream.open(stderr_r)
+        status = await _PipeReceiveStream.open(status_r)
+
+        pid = await status.readline()
+        if not pid.strip():
+            self._logger.debug("The fork server exited without forking a process")
+            for stream in (stdout, stderr, status):
+                await stream.aclose()
+            return None
+
+        process = ForkedProcess(int(pid), stdout, stderr, status)
+        if task_status is not None:
+            task_status.started(process.pid)
+
+        # Output that isn't streamed is read and discarded, as it would be written to
+        # `/dev/null` by a new process
+        await consume_process_output(
+            process,
+            stdout_sink=stream_output[0] if stream_output else None,
+            stderr_sink=stream_output[1] if stream_output else None,
+        )
+
+        await process.wait()
+        return process
+
+
+def _receive(sock: socket.socket) -> Optional[Tuple[Dict[str, Any], List[int]]]:
+    """Receives a request from the runner, or `None` once the runner has gone away"""
+    header, fds, _, _ = socket.recv_fds(sock, _HEADER.size, _PIPES_PER_REQUEST)
+    while header and len(header) < _HEADER.size:
+        more = sock.recv(_HEADER.size - len(header))
+        if not more:
+            break
+        header += more
+    if len(header) < _HEADER.size:
+        for fd in fds:
+            os.close(fd)
+        return None
+
+    (length,) = _HEADER.unpack(header)
+    payload = b""
+    while len(payload) < length:
+        more = sock.recv(length - len(payload))
+        if not more:
+            for fd in fds:
+                os.close(fd)
+            return None
+        payload += more
+    return json.loads(payload), fds
+
+
+def _report(fd: int, value: int) -> None:
+    try:
+        os.write(fd, f"{value}\n".encode())
+    except OSError:
+        # The runner is no longer waiting on this flow run
+        pass
+
+
+def _reap(status_fds: Dict[int, int]) -> None:
+    """Reports the exit codes of flow run processes that have exited"""
+    while status_fds:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        fd = status_fds.pop(pid, None)
+        if fd is not None:
+            _report(fd, os.waitstatus_to_exitcode(status))
+            os.close(fd)
+
+
+def _serve(
+    sock: socket.socket, preload: List[str]
+) -> Optional[Tuple[Dict[str, Any], List[int]]]:
+    """
+    Forks a flow run process for each request until the runner goes away.  Returns
+    the request in each forked process, and `None` in the fork server once it's done.
+    """
+    # Interrupts are for the runner to handle, which stops the fork server in turn
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    for module in _PRELOADED_MODULES:
+        importlib.import_module(module)
+
+    from syntask.flows import load_flow_from_entrypoint
+
+    for entrypoint in preload:
+        try:
+            load_flow_from_entrypoint(entrypoint, use_placeholder_flow=False)
+        except Exception as exc:
+            print(
+                f"Unable to preload flow from {entrypoint!r} in the fork server: {exc}",
+                file=sys.stderr,
+            )
+
+    if threading.active_count() > 1:
+        # Forking a process with other threads running can leave it deadlocked
+        print(
+            "Threads were started while preloading flows; the fork server can't fork "
+            "flow run processes safely and will exit.",
+            file=sys.stderr,
+        )
+        return None
+
+    # Keep the objects imported so far out of garbage collection, so that collections in
+    # flow run processes don't copy the memory they share with the fork server
+    gc.collect()
+    gc.freeze()
+
+    status_fds: Dict[int, int] = {}
+    while True:
+        readable, _, _ = select.select([sock], [], [], _REAP_INTERVAL)
+        _reap(status_fds)
+        if not readable:
+            continue
+
+        received = _receive(sock)
+        if received is None:
+            # Report the exit codes of the flow run processes that are still running,
+            # which the runner may still be waiting on
+            while status_fds:
+                time.sleep(_REAP_INTERVAL)
+                _reap(status_fds)
+            return None
+        request, fds = received
+        if len(fds) != _PIPES_PER_REQUEST:
+            for fd in fds:
+                os.close(fd)
+            continue
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            for fd in status_fds.values():
+                os.close(fd)
+            return request, fds
+
+        stdout_w, stderr_w, status_w = fds
+        os.close(stdout_w)
+        os.close(stderr_w)
+        _report(status_w, pid)
+        status_fds[pid] = status_w
+
+
+def _run_flow_run_process(request: Dict[str, Any], fds: List[int]) -> None:
+    """Sets up a forked process like a new flow run process, and runs the engine"""
+    stdout_w, stderr_w, status_w = fds
+    os.close(status_w)
+    os.dup2(stdout_w, 1)
+    os.dup2(stderr_w, 2)
+    os.close(stdout_w)
+    os.close(stderr_w)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    if request["cwd"] is not None:
+        os.chdir(request["cwd"])
+        sys.path[0] = os.getcwd()
+    os.environ.clear()
+    os.environ.update(request["env"])
+    sys.argv = sys.argv[:1]
+
+    # Load settings and configure logging for the new environment, as importing
+    # Syntask would have done
+    import syntask.context
+    from syntask.logging.configuration import setup_logging
+
+    syntask.context.GLOBAL_SETTINGS_CONTEXT = syntask.context.root_settings_context()
+    setup_logging(incremental=False)
+
+    runpy.run_module("syntask.engine", run_name="__main__", alter_sys=True)
+
+
+def main(argv: List[str]) -> None:
+    """
+    Runs the fork server, given the file descriptor of its end of the runner's socket
+    and the entrypoints of the flows to preload.  Returns in forked flow run processes
+    once they have run their flow run.
+    """
+    control_socket = socket.socket(fileno=int(argv[0]))
+    forked = _serve(control_socket, preload=argv[1:])
+    if forked is not None:
+        _run_flow_run_process(*forked)
@@ -49,6 +49,7 @@ from uuid import UUID, uuid4
 
 import anyio
 import anyio.abc
+import anyio.to_thread
 import pendulum
 
 from syntask._internal.concurrency.api import (
@@ -76,16 +77,22 @@ from syntask.concurrency.asyncio import (
     ConcurrencySlotAcquisitionError,
 )
 from syntask.events import DeploymentTriggerTypes, TriggerTypes
+from syntask.events.cancellation import CancellationWatcher
+from syntask.events.filters import EventRelatedFilter, EventResourceFilter
 from syntask.events.related import tags_as_related_resources
 from syntask.events.schemas.events import RelatedResource
 from syntask.events.utilities import emit_event
 from syntask.exceptions import Abort, ObjectNotFound
 from syntask.flows import Flow, load_flow_from_flow_run
 from syntask.logging.loggers import SyntaskLogAdapter, flow_run_logger, get_logger
+from syntask.runner import prefork
 from syntask.runner.storage import RunnerStorage
 from syntask.settings import (
     SYNTASK_API_URL,
+    SYNTASK_RUNNER_CANCELLATION_FALLBACK_POLL_FREQUENCY,
     SYNTASK_RUNNER_POLL_FREQUENCY,
+    SYNTASK_RUNNER_PREFORK_ENABLED,
+    SYNTASK_RUNNER_PREFORK_PRELOAD_ENTRYPOINTS,
     SYNTASK_RUNNER_PROCESS_LIMIT,
     SYNTASK_RUNNER_SERVER_ENABLE,
     get_current_settings,
@@ -189,6 +196,13 @@ class Runner:
         self._client = get_client()
         self._submitting_flow_run_ids = set()
         self._cancelling_flow_run_ids = set()
+        self._cancellation_watcher = CancellationWatcher(
+            client_name="runner",
+            poll_interval=self.query_seconds * 2,
+            fallback_poll_interval=(
+                SYNTASK_RUNNER_CANCELLATION_FALLBACK_POLL_FREQUENCY.value()
+            ),
+        )
         self._scheduled_task_scopes = set()
         self._deployment_ids: Set[UUID] = set()
         self._flow_run_process_map: Dict[UUID, Dict] = dict()
@@ -198,6 +212,9 @@ class Runner:
         )
         self._storage_objs: List[RunnerStorage] = []
         self._deployment_storage_map: Dict[UUID, RunnerStorage] = {}
+        self._deployment_entrypoints: List[str] = []
+        self._fork_server: Optional[prefork.ForkServer] = None
+        self._prefork_failed = False
 
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
@@ -218,6 +235,9 @@ class Runner:
         if storage is not None:
             storage = await self._add_storage(storage)
             self._deployment_storage_map[deployment_id] = storage
+        elif deployment.entrypoint:
+            # Only flows whose code is already local can be preloaded
+            self._deployment_entrypoints.append(deployment.entrypoint)
         self._deployment_ids.add(deployment_id)
 
         return deployment_id
@@ -430,6 +450,20 @@ class Runner:
                         jitter_range=0.3,
                     )
                 )
+                if not run_once and self._deployment_ids:
+                    # Only the runs of this runner's deployments are of interest
+                    tg.start_soon(
+                        partial(
+                            self._cancellation_watcher.watch,
+                            self._on_cancelling_flow_run,
+                            related=EventRelatedFilter(
+                                id=[
+                                    f"syntask.deployment.{deployment_id}"
+                                    for deployment_id in self._deployment_ids
+                                ]
+                            ),
+                        )
+                    )
 
     def execute_in_background(self, func, *args, **kwargs):
         """
@@ -494,13 +528,21 @@ class Runner:
                     self._submitting_flow_run_ids.add(flow_run_id)
                     flow_run = await self._client.read_flow_run(flow_run_id)
 
-                    pid = await self._runs_task_group.start(
-                        partial(
-                            self._submit_run_and_capture_errors,
-                            flow_run=flow_run,
-                            entrypoint=entrypoint,
-                        ),
-                    )
+                    async def run_and_stop_watching(
+                        task_status: anyio.abc.TaskStatus = anyio.TASK_STATUS_IGNORED,
+                    ) -> None:
+                        # Stop watching for cancellation as soon as the flow run
+                        # process exits, rather than on the next cancellation check
+                        try:
+                            await self._submit_run_and_capture_errors(
+                                flow_run=flow_run,
+                                task_status=task_status,
+                                entrypoint=entrypoint,
+                            )
+                        finally:
+                            tg.cancel_scope.cancel()
+
+                    pid = await self._runs_task_group.start(run_and_stop_watching)
 
                     self._flow_run_process_map[flow_run.id] = dict(
                         pid=pid, flow_run=flow_run
@@ -523,6 +565,15 @@ class Runner:
                             jitter_range=0.3,
                         )
                     )
+                    tg.start_soon(
+                        partial(
+                            self._cancellation_watcher.watch,
+                            self._on_cancelling_flow_run,
+                            resource=EventResourceFilter(
+                                id=[f"syntask.flow-run.{flow_run.id}"]
+                            ),
+                        )
+                    )
 
     def _get_flow_run_logger(self, flow_run: "FlowRun") -> SyntaskLogAdapter:
         return flow_run_logger(flow_run=flow_run).getChild(
@@ -595,14 +646,34 @@ class Runner:
                 await storage.pull_code()
                 setattr(storage, "last_adhoc_pull", datetime.datetime.now())
 
-        process = await run_process(
-            command=command,
-            stream_output=True,
-            task_status=task_status,
-            env=env,
-            **kwargs,
-            cwd=storage.destination if storage else None,
-        )
+        process = None
+        fork_server = await self._get_fork_server()
+        if fork_server is not None:
+            process = await fork_server.run_process(
+                env=env,
+                cwd=storage.destination if storage else None,
+                stream_output=True,
+                task_status=task_status,
+            )
+            if process is None:
+                self._logger.warning(
+                    "Unable to fork a process for flow run %s; flow runs will be"
+                    " started in new processes instead.",
+                    flow_run.id,
+                )
+                # The fork server is left running until the runner stops, so that it
+                # reports the exit codes of the flow run processes it already forked
+                self._prefork_failed = True
+
+        if process is None:
+            process = await run_process(
+                command=command,
+                stream_output=True,
+                task_status=task_status,
+                env=env,
+                **kwargs,
+                cwd=storage.destination if storage else None,
+            )
 
         # Use the pid for display if no name was given
 
@@ -650,6 +721,35 @@ class Runner:
 
         return process.returncode
 
+    async def _get_fork_server(self) -> Optional[prefork.ForkServer]:
+        """
+        Returns the fork server to start flow run processes with, starting it if it
+        isn't running, or `None` if flow run processes should be started from scratch.
+        """
+        if (
+            not SYNTASK_RUNNER_PREFORK_ENABLED.value()
+            or self._prefork_failed
+            or not prefork.is_supported()
+        ):
+            return None
+
+        if self._fork_server is None or not self._fork_server.is_running:
+            await self._stop_fork_server()
+            self._fork_server = prefork.ForkServer(
+                preload=(
+                    self._deployment_entrypoints
+                    if SYNTASK_RUNNER_PREFORK_PRELOAD_ENTRYPOINTS.value()
+                    else ()
+                )
+            )
+            self._fork_server.start()
+        return self._fork_server
+
+    async def _stop_fork_server(self):
+        if self._fork_server is not None:
+            fork_server, self._fork_server = self._fork_server, None
+            await anyio.to_thread.run_sync(fork_server.stop)
+
     async def _kill_process(
         self,
         pid: int,
@@ -749,6 +849,10 @@ class Runner:
             )
             on_stop()
 
+        if not self._cancellation_watcher.should_poll():
+            # Cancellations are found as they happen while subscribed to events
+            return []
+
         self._logger.debug("Checking for cancelled flow runs...")
 
         named_cancelling_flow_runs = await self._client.read_flow_runs(
@@ -791,10 +895,51 @@ class Runner:
 
         for flow_run in cancelling_flow_runs:
             self._cancelling_flow_run_ids.add(flow_run.id)
+            self._cancellation_watcher.observe(
+                "poll", flow_run.state.timestamp if flow_run.state else None
+            )
             self._runs_task_group.start_soon(self._cancel_run, flow_run)
 
         return cancelling_flow_runs
 
+    async def _on_cancelling_flow_run(
+        self, flow_run_id: UUID, cancelling_since: datetime.datetime
+    ):
+        """
+        Cancels a flow run that's been moved into a Cancelling state, if its process is
+        being run by this runner.
+        """
+        if (
+            self.stopping
+            or flow_run_id not in self._flow_run_process_map
+            or flow_run_id in self._cancelling_flow_run_ids
+        ):
+            return
+
+        try:
+            flow_run = await self._client.read_flow_run(flow_run_id)
+        except ObjectNotFound:
+            # The flow run was deleted since the event was emitted
+            return
+        except Exception:
+            self._logger.exception(
+                "Unable to read flow run %s after its cancellation was requested; it"
+                " will be cancelled when querying for cancelling flow runs finds it.",
+                flow_run_id,
+            )
+            return
+        if not flow_run.state or not (
+            flow_run.state.is_cancelling()
+            or (flow_run.state.is_cancelled() and flow_run.state.name == "Cancelling")
+        ):
+            # The flow run has moved on since the event was emitted
+            return
+
+        self._logger.info(f"Flow run '{flow_run.name}' is awaiting cancellation.")
+        self._cancelling_flow_run_ids.add(flow_run.id)
+        self._cancellation_watcher.observe("event", cancelling_since)
+        self._runs_task_group.start_soon(self._cancel_run, flow_run)
+
     async def _cancel_run(self, flow_run: "FlowRun", state_msg: Optional[str] = None):
         run_logger = self._get_flow_run_logger(flow_run)
 
@@ -1285,6 +1430,7 @@ class Runner:
             scope.cancel()
         if self._runs_task_group:
             await self._runs_task_group.__aexit__(*exc_info)
+        await self._stop_fork_server()
         if self._client:
             await self._client.__aexit__(*exc_info)
         shutil.rmtree(str(self._tmp_dir))
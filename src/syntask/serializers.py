@@ -13,7 +13,7 @@ bytes to an object respectively.
 
 import abc
 import base64
-from typing import Any, Dict, Generic, Optional, Type
+from typing import Any, BinaryIO, Dict, Generic, Optional, Type, Union
 
 from pydantic import (
     BaseModel,
@@ -101,6 +101,33 @@ class Serializer(BaseModel, Generic[D], abc.ABC):
     def loads(self, blob: bytes) -> D:
         """Decode the blob of bytes into an object."""
 
+    @property
+    def has_binary_form(self) -> bool:
+        """
+        Whether `dumps_binary` and `loads_binary` are supported, for serializers whose
+        output is binary data that `dumps` wraps in a text-safe encoding.
+        """
+        return False
+
+    def dumps_binary(self, obj: D) -> bytes:
+        """Encode the object into raw bytes, without any text-safe encoding."""
+        raise NotImplementedError(f"{type(self).__name__} has no binary form.")
+
+    def loads_binary(self, data: Union[bytes, memoryview]) -> D:
+        """Decode an object from the raw bytes produced by `dumps_binary`."""
+        raise NotImplementedError(f"{type(self).__name__} has no binary form.")
+
+    def dump_binary(self, obj: D, file: BinaryIO) -> None:
+        """
+        Write the binary form of the object to a file.  Serializers that can encode
+        incrementally should override this to avoid building the whole blob in memory.
+        """
+        file.write(self.dumps_binary(obj))
+
+    def load_binary(self, file: BinaryIO) -> D:
+        """Read an object in its binary form from the rest of a file."""
+        return self.loads_binary(file.read())
+
     model_config = ConfigDict(extra="forbid")
 
     @classmethod
@@ -141,6 +168,30 @@ class PickleSerializer(Serializer):
         pickler = from_qualified_name(self.picklelib)
         return pickler.loads(base64.decodebytes(blob))
 
+    @property
+    def has_binary_form(self) -> bool:
+        return True
+
+    def dumps_binary(self, obj: Any) -> bytes:
+        pickler = from_qualified_name(self.picklelib)
+        return pickler.dumps(obj)
+
+    def loads_binary(self, data: Union[bytes, memoryview]) -> Any:
+        pickler = from_qualified_name(self.picklelib)
+        return pickler.loads(data)
+
+    def dump_binary(self, obj: Any, file: BinaryIO) -> None:
+        pickler = from_qualified_name(self.picklelib)
+        if not hasattr(pickler, "dump"):
+            return super().dump_binary(obj, file)
+        pickler.dump(obj, file)
+
+    def load_binary(self, file: BinaryIO) -> Any:
+        pickler = from_qualified_name(self.picklelib)
+        if not hasattr(pickler, "load"):
+            return super().load_binary(file)
+        return pickler.load(file)
+
 
 class JSONSerializer(Serializer):
     """
@@ -236,6 +287,25 @@ class CompressedSerializer(Serializer):
         uncompressed = compressor.decompress(base64.decodebytes(blob))
         return self.serializer.loads(uncompressed)
 
+    @property
+    def has_binary_form(self) -> bool:
+        return True
+
+    def dumps_binary(self, obj: Any) -> bytes:
+        if self.serializer.has_binary_form:
+            blob = self.serializer.dumps_binary(obj)
+        else:
+            blob = self.serializer.dumps(obj)
+        compressor = from_qualified_name(self.compressionlib)
+        return compressor.compress(blob)
+
+    def loads_binary(self, data: Union[bytes, memoryview]) -> Any:
+        compressor = from_qualified_name(self.compressionlib)
+        uncompressed = compressor.decompress(data)
+        if self.serializer.has_binary_form:
+            return self.serializer.loads_binary(uncompressed)
+        return self.serializer.loads(uncompressed)
+
 
 class CompressedPickleSerializer(CompressedSerializer):
     """
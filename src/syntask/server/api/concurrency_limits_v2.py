@@ -1,7 +1,10 @@
-from typing import List, Literal, Optional, Union
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Literal, Optional, Tuple, Union
 from uuid import UUID
 
-from fastapi import Body, Depends, HTTPException, Path, status
+from fastapi import Body, Depends, HTTPException, Path, Request, status
+from pydantic_extra_types.pendulum_dt import DateTime
 
 import syntask.server.models as models
 import syntask.server.schemas as schemas
@@ -11,6 +14,7 @@ from syntask.server.database.interface import SyntaskDBInterface
 from syntask.server.schemas import actions
 from syntask.server.utilities.schemas import SyntaskBaseModel
 from syntask.server.utilities.server import SyntaskRouter
+from syntask.settings import SYNTASK_API_REQUEST_TIMEOUT
 
 router = SyntaskRouter(prefix="/v2/concurrency_limits", tags=["Concurrency Limits V2"])
 
@@ -145,12 +149,146 @@ class MinimalConcurrencyLimitResponse(SyntaskBaseModel):
     limit: int
 
 
+class SlotWaitQueue:
+    """
+    First-in, first-out queues of the requests to this server that are waiting for
+    slots on each concurrency limit.
+
+    A waiter may only try to take slots once it's at the front of the queue for every
+    limit it's waiting on, so slots go to waiters in the order they arrived.  Waiters
+    are woken as soon as slots are released through this server, and check again every
+    `poll_interval` seconds in case slots were released through another server or
+    decayed.
+    """
+
+    # The longest a waiter at the front of its queues goes without checking for slots,
+    # which bounds how long it takes to notice slots that were freed without a
+    # notification
+    poll_interval: float = 1.0
+
+    _Waiter = Tuple[asyncio.AbstractEventLoop, asyncio.Event]
+
+    def __init__(self) -> None:
+        self._queues: Dict[UUID, Deque[SlotWaitQueue._Waiter]] = {}
+
+    @property
+    def maximum_wait_seconds(self) -> float:
+        """
+        The longest a request may wait for slots, well short of the API request
+        timeout, so that a client hears back that the slots are locked before it gives
+        up on the request
+        """
+        return SYNTASK_API_REQUEST_TIMEOUT.value() / 2
+
+    def has_waiters(self, concurrency_limit_ids: Iterable[UUID]) -> bool:
+        return any(limit_id in self._queues for limit_id in concurrency_limit_ids)
+
+    def enqueue(self, concurrency_limit_ids: Iterable[UUID]) -> "SlotWaitQueue._Waiter":
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        for limit_id in concurrency_limit_ids:
+            self._queues.setdefault(limit_id, deque()).append(waiter)
+        return waiter
+
+    def is_next(
+        self, waiter: "SlotWaitQueue._Waiter", concurrency_limit_ids: Iterable[UUID]
+    ) -> bool:
+        return all(
+            self._queues[limit_id][0] is waiter for limit_id in concurrency_limit_ids
+        )
+
+    def remove(
+        self, waiter: "SlotWaitQueue._Waiter", concurrency_limit_ids: Iterable[UUID]
+    ) -> None:
+        concurrency_limit_ids = list(concurrency_limit_ids)
+        for limit_id in concurrency_limit_ids:
+            queue = self._queues.get(limit_id)
+            if queue is None:
+                continue
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[limit_id]
+
+        # Whoever is now at the front may be able to take the slots this waiter didn't
+        self.notify(concurrency_limit_ids)
+
+    def notify(self, concurrency_limit_ids: Iterable[UUID]) -> None:
+        """Wakes the waiters at the front of the queues for the given limits"""
+        for limit_id in concurrency_limit_ids:
+            queue = self._queues.get(limit_id)
+            if queue:
+                loop, event = queue[0]
+                loop.call_soon_threadsafe(event.set)
+
+
+slot_waiters = SlotWaitQueue()
+
+
+async def _increment_active_slots(
+    db: SyntaskDBInterface, concurrency_limit_ids: List[UUID], slots: int
+) -> bool:
+    async with db.session_context(begin_transaction=True) as session:
+        acquired = await models.concurrency_limits_v2.bulk_increment_active_slots(
+            session=session,
+            concurrency_limit_ids=concurrency_limit_ids,
+            slots=slots,
+        )
+        if not acquired:
+            await session.rollback()
+    return acquired
+
+
+async def _wait_for_slots(
+    db: SyntaskDBInterface,
+    request: Request,
+    concurrency_limit_ids: List[UUID],
+    slots: int,
+    wait_seconds: float,
+) -> bool:
+    """
+    Waits in line for up to `wait_seconds` to take slots on the given limits, returning
+    whether they were taken.
+    """
+    waiter = slot_waiters.enqueue(concurrency_limit_ids)
+    loop, event = waiter
+    deadline = loop.time() + min(wait_seconds, slot_waiters.maximum_wait_seconds)
+    try:
+        while True:
+            event.clear()
+            if slot_waiters.is_next(waiter, concurrency_limit_ids):
+                # Don't take slots for a client that has already given up
+                if await request.is_disconnected():
+                    return False
+                if await _increment_active_slots(db, concurrency_limit_ids, slots):
+                    return True
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(
+                    event.wait(), timeout=min(remaining, slot_waiters.poll_interval)
+                )
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        slot_waiters.remove(waiter, concurrency_limit_ids)
+
+
 @router.post("/increment", status_code=status.HTTP_200_OK)
 async def bulk_increment_active_slots(
+    request: Request,
     slots: int = Body(..., gt=0),
     names: List[str] = Body(..., min_items=1),
     mode: Literal["concurrency", "rate_limit"] = Body("concurrency"),
     create_if_missing: Optional[bool] = Body(None),
+    wait_seconds: float = Body(
+        0.0,
+        ge=0.0,
+        description=(
+            "How long to wait in line for slots before giving up, of at most half "
+            "of the API request timeout.  By default, the request doesn't wait."
+        ),
+    ),
     db: SyntaskDBInterface = Depends(provide_database_interface),
 ) -> List[MinimalConcurrencyLimitResponse]:
     async with db.session_context(begin_transaction=True) as session:
@@ -186,14 +324,19 @@ async def bulk_increment_active_slots(
                     f"configured: {','.join(non_decaying)!r}"
                 ),
             )
-        acquired = await models.concurrency_limits_v2.bulk_increment_active_slots(
-            session=session,
-            concurrency_limit_ids=[limit.id for limit in active_limits],
-            slots=slots,
-        )
 
-        if not acquired:
-            await session.rollback()
+    concurrency_limit_ids = [limit.id for limit in active_limits]
+
+    # Requests that are willing to wait don't jump ahead of those already waiting
+    if wait_seconds and slot_waiters.has_waiters(concurrency_limit_ids):
+        acquired = False
+    else:
+        acquired = await _increment_active_slots(db, concurrency_limit_ids, slots)
+
+    if not acquired and wait_seconds:
+        acquired = await _wait_for_slots(
+            db, request, concurrency_limit_ids, slots, wait_seconds
+        )
 
     if acquired:
         return [
@@ -203,36 +346,48 @@ async def bulk_increment_active_slots(
             for limit in limits
         ]
     else:
-        async with db.session_context(begin_transaction=True) as session:
-            await models.concurrency_limits_v2.bulk_update_denied_slots(
-                session=session,
-                concurrency_limit_ids=[limit.id for limit in active_limits],
-                slots=slots,
-            )
+        raise await _deny_slots(db, active_limits, slots)
+
+
+async def _deny_slots(
+    db: SyntaskDBInterface,
+    active_limits: List[schemas.core.ConcurrencyLimitV2],
+    slots: int,
+) -> HTTPException:
+    """
+    Records that slots were denied on the given limits, returning the `423 Locked`
+    error to raise with a best guess at when slots will be available again.
+    """
+    async with db.session_context(begin_transaction=True) as session:
+        await models.concurrency_limits_v2.bulk_update_denied_slots(
+            session=session,
+            concurrency_limit_ids=[limit.id for limit in active_limits],
+            slots=slots,
+        )
 
-        def num_blocking_slots(limit: schemas.core.ConcurrencyLimitV2) -> float:
-            if limit.slot_decay_per_second > 0.0:
-                return slots + limit.denied_slots
-            else:
-                return (slots + limit.denied_slots) / limit.limit
+    def num_blocking_slots(limit: schemas.core.ConcurrencyLimitV2) -> float:
+        if limit.slot_decay_per_second > 0.0:
+            return slots + limit.denied_slots
+        else:
+            return (slots + limit.denied_slots) / limit.limit
 
-        blocking_limit = max((limit for limit in active_limits), key=num_blocking_slots)
-        blocking_slots = num_blocking_slots(blocking_limit)
+    blocking_limit = max((limit for limit in active_limits), key=num_blocking_slots)
+    blocking_slots = num_blocking_slots(blocking_limit)
 
-        wait_time_per_slot = (
-            blocking_limit.avg_slot_occupancy_seconds
-            if blocking_limit.slot_decay_per_second == 0.0
-            else (1.0 / blocking_limit.slot_decay_per_second)
-        )
+    wait_time_per_slot = (
+        blocking_limit.avg_slot_occupancy_seconds
+        if blocking_limit.slot_decay_per_second == 0.0
+        else (1.0 / blocking_limit.slot_decay_per_second)
+    )
 
-        retry_after = wait_time_per_slot * blocking_slots
+    retry_after = wait_time_per_slot * blocking_slots
 
-        raise HTTPException(
-            status_code=status.HTTP_423_LOCKED,
-            headers={
-                "Retry-After": str(retry_after),
-            },
-        )
+    return HTTPException(
+        status_code=status.HTTP_423_LOCKED,
+        headers={
+            "Retry-After": str(retry_after),
+        },
+    )
 
 
 @router.post("/decrement", status_code=status.HTTP_200_OK)
@@ -260,9 +415,132 @@ async def bulk_decrement_active_slots(
             occupancy_seconds=occupancy_seconds,
         )
 
+    slot_waiters.notify(limit.id for limit in limits)
+
     return [
         MinimalConcurrencyLimitResponse(
             id=limit.id, name=str(limit.name), limit=limit.limit
         )
         for limit in limits
     ]
+
+
+class ConcurrencyLimitLeaseResponse(SyntaskBaseModel):
+    id: UUID
+    expiration: DateTime
+    slots: int
+    limits: List[MinimalConcurrencyLimitResponse]
+
+
+@router.post("/leases", status_code=status.HTTP_200_OK)
+async def acquire_concurrency_limit_lease(
+    names: List[str] = Body(..., min_items=1),
+    slots: int = Body(..., gt=0, description="The most slots to lease."),
+    minimum_slots: Optional[int] = Body(
+        None, gt=0, description="The fewest slots to lease; defaults to `slots`."
+    ),
+    ttl_seconds: float = Body(
+        60.0, gt=0.0, description="How long the lease lasts unless it's renewed."
+    ),
+    create_if_missing: Optional[bool] = Body(None),
+    db: SyntaskDBInterface = Depends(provide_database_interface),
+) -> ConcurrencyLimitLeaseResponse:
+    """
+    Leases a batch of slots on each of the given concurrency limits, for a client to
+    hand out to its own tasks.  As many slots as are free are leased, up to `slots`,
+    as long as at least `minimum_slots` are free.
+    """
+    minimum_slots = min(minimum_slots or slots, slots)
+
+    async with db.session_context(begin_transaction=True) as session:
+        _, expired = await models.concurrency_limits_v2.expire_leases(session=session)
+    slot_waiters.notify(expired)
+
+    async with db.session_context(begin_transaction=True) as session:
+        limits = [
+            schemas.core.ConcurrencyLimitV2.model_validate(limit)
+            for limit in (
+                await models.concurrency_limits_v2.bulk_read_or_create_concurrency_limits(
+                    session=session, names=names, create_if_missing=create_if_missing
+                )
+            )
+        ]
+        active_limits = [limit for limit in limits if bool(limit.active)]
+
+        if any(limit.limit < minimum_slots for limit in active_limits):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Slots requested is greater than the limit",
+            )
+
+        decaying = [
+            str(limit.name)
+            for limit in active_limits
+            if limit.slot_decay_per_second > 0.0
+        ]
+        if decaying:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=(
+                    "Slots can't be leased from concurrency limits with slot decay. "
+                    "The following limits have a decay configured: "
+                    f"{','.join(decaying)!r}"
+                ),
+            )
+
+        lease = await models.concurrency_limits_v2.create_lease(
+            session=session,
+            concurrency_limit_ids=[limit.id for limit in active_limits],
+            slots=slots,
+            minimum_slots=minimum_slots,
+            ttl_seconds=ttl_seconds,
+        )
+        if lease is None:
+            await session.rollback()
+        else:
+            response = ConcurrencyLimitLeaseResponse(
+                id=lease.id,
+                expiration=lease.expiration,
+                slots=lease.slots,
+                limits=[
+                    MinimalConcurrencyLimitResponse(
+                        id=limit.id, name=str(limit.name), limit=limit.limit
+                    )
+                    for limit in limits
+                ],
+            )
+
+    if lease is None:
+        raise await _deny_slots(db, active_limits, minimum_slots)
+
+    return response
+
+
+@router.post("/leases/renew", status_code=status.HTTP_200_OK)
+async def renew_concurrency_limit_leases(
+    lease_ids: List[UUID] = Body(..., min_items=1),
+    ttl_seconds: float = Body(60.0, gt=0.0),
+    db: SyntaskDBInterface = Depends(provide_database_interface),
+) -> List[UUID]:
+    """
+    Extends the given leases, returning the IDs of those that were renewed.  Leases
+    that have already expired can't be renewed.
+    """
+    async with db.session_context(begin_transaction=True) as session:
+        return await models.concurrency_limits_v2.renew_leases(
+            session=session, lease_ids=lease_ids, ttl_seconds=ttl_seconds
+        )
+
+
+@router.post("/leases/release", status_code=status.HTTP_204_NO_CONTENT)
+async def release_concurrency_limit_leases(
+    lease_ids: List[UUID] = Body(..., min_items=1, embed=True),
+    db: SyntaskDBInterface = Depends(provide_database_interface),
+):
+    """Ends the given leases, releasing their slots."""
+    async with db.session_context(begin_transaction=True) as session:
+        released = await models.concurrency_limits_v2.release_leases(
+            session=session, lease_ids=lease_ids
+        )
+
+    slot_waiters.notify(released)
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 from starlette.status import WS_1002_PROTOCOL_ERROR
 
+from syntask.events import compact
 from syntask.logging import get_logger
 from syntask.server.api.dependencies import is_ephemeral_request
 from syntask.server.database.dependencies import provide_database_interface
@@ -58,13 +59,20 @@ async def create_events(
 async def stream_events_in(websocket: WebSocket) -> None:
     """Open a WebSocket to stream incoming Events"""
 
-    await websocket.accept()
+    subprotocol = compact.negotiate(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
 
     try:
         async with messaging.create_event_publisher() as publisher:
-            async for event_json in websocket.iter_text():
-                event = Event.model_validate_json(event_json)
-                await publisher.publish_event(event.receive())
+            if subprotocol == compact.COMPACT_EVENTS_SUBPROTOCOL:
+                decoder = compact.CompactEventDecoder()
+                async for frame in websocket.iter_bytes():
+                    event = Event.model_validate(decoder.decode(frame))
+                    await publisher.publish_event(event.receive())
+            else:
+                async for event_json in websocket.iter_text():
+                    event = Event.model_validate_json(event_json)
+                    await publisher.publish_event(event.receive())
     except subscriptions.NORMAL_DISCONNECT_EXCEPTIONS:  # pragma: no cover
         pass  # it's fine if a client disconnects either normally or abnormally
 
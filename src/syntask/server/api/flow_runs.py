@@ -797,7 +797,7 @@ async def download_logs(
                 ["timestamp", "level", "flow_run_id", "task_run_id", "message"]
             )
 
-            offset = 0
+            after = None
             limit = FLOW_RUN_LOGS_DOWNLOAD_PAGE_LIMIT
 
             while True:
@@ -806,15 +806,17 @@ async def download_logs(
                     log_filter=schemas.filters.LogFilter(
                         flow_run_id={"any_": [flow_run_id]}
                     ),
-                    offset=offset,
                     limit=limit,
                     sort=schemas.sorting.LogSort.TIMESTAMP_ASC,
+                    after=after,
                 )
 
                 if not results:
                     break
 
-                offset += limit
+                after = schemas.core.LogCursor(
+                    timestamp=results[-1].timestamp, id=results[-1].id
+                )
 
                 for log in results:
                     csv_writer.writerow(
@@ -2,19 +2,137 @@
 Routes for interacting with log objects.
 """
 
-from typing import List
+import asyncio
+import time
+import weakref
+from typing import List, MutableMapping, Optional, Sequence, Set, Tuple
 
-from fastapi import Body, Depends, status
+from fastapi import Body, Depends, HTTPException, Request, status
+from prometheus_client import Counter, Histogram
+from pydantic import ValidationError
 
 import syntask.server.api.dependencies as dependencies
 import syntask.server.models as models
 import syntask.server.schemas as schemas
+from syntask.logging.compact import (
+    CompactLogsError,
+    decode_logs,
+    decompress,
+    supported_encodings,
+)
 from syntask.server.database.dependencies import provide_database_interface
 from syntask.server.database.interface import SyntaskDBInterface
+from syntask.server.schemas.actions import LogCreate
 from syntask.server.utilities.server import SyntaskRouter
+from syntask.settings import (
+    SYNTASK_API_LOGS_BULK_INGESTION_BUFFER_SIZE,
+    SYNTASK_API_LOGS_BULK_INGESTION_ENABLED,
+)
 
 router = SyntaskRouter(prefix="/logs", tags=["Logs"])
 
+LOGS_INGESTED = Counter(
+    "syntask_logs_ingested",
+    "The number of logs written by bulk log ingestion",
+)
+LOG_INGESTION_BATCH_SIZE = Histogram(
+    "syntask_log_ingestion_batch_size",
+    "The number of logs written in each batch by bulk log ingestion",
+    buckets=(1, 10, 100, 500, 1000, 5000, 10000, 25000, 50000),
+)
+LOG_INGESTION_FLUSH_SECONDS = Histogram(
+    "syntask_log_ingestion_flush_seconds",
+    "The number of seconds taken to write each batch by bulk log ingestion",
+)
+
+
+class LogIngestionBuffer:
+    """
+    Gathers the logs from concurrent requests so they can be written together.
+
+    Each request adds its logs to the buffer and then waits its turn to write; whoever
+    gets to write takes everything that has been buffered so far, including the logs
+    of the requests waiting behind it.  Under load, every write carries the logs that
+    arrived while the previous one was in progress, without delaying any request when
+    the server is idle.
+
+    Since a write carries the logs of other requests, it runs on its own and finishes
+    even if the request that started it is cancelled.
+    """
+
+    def __init__(self, max_buffered_logs: int):
+        self.max_buffered_logs = max_buffered_logs
+        self._pending: List[Tuple[Sequence[LogCreate], asyncio.Future]] = []
+        self._buffered = 0
+        self._room = asyncio.Condition()
+        self._write_lock = asyncio.Lock()
+        self._writes: Set[asyncio.Task] = set()
+
+    async def write(self, db: SyntaskDBInterface, logs: Sequence[LogCreate]) -> None:
+        """Writes the given logs, returning once they have been committed"""
+        async with self._room:
+            await self._room.wait_for(
+                lambda: not self._buffered
+                or self._buffered + len(logs) <= self.max_buffered_logs
+            )
+            self._buffered += len(logs)
+            written = asyncio.get_running_loop().create_future()
+            self._pending.append((logs, written))
+
+        write = asyncio.create_task(self._write_in_turn(db, written))
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+        await asyncio.shield(write)
+
+        written.result()
+
+    async def _write_in_turn(
+        self, db: SyntaskDBInterface, written: asyncio.Future
+    ) -> None:
+        async with self._write_lock:
+            if not written.done():
+                await self._flush(db)
+
+    async def _flush(self, db: SyntaskDBInterface) -> None:
+        batch, self._pending = self._pending, []
+        logs = [log for request_logs, _ in batch for log in request_logs]
+
+        started = time.monotonic()
+        try:
+            async with db.session_context(begin_transaction=True) as session:
+                await models.logs.bulk_create_logs(session=session, logs=logs)
+        except asyncio.CancelledError:
+            for _, written in batch:
+                written.cancel()
+            raise
+        except Exception as exc:
+            for _, written in batch:
+                written.set_exception(exc)
+        else:
+            LOGS_INGESTED.inc(len(logs))
+            LOG_INGESTION_BATCH_SIZE.observe(len(logs))
+            LOG_INGESTION_FLUSH_SECONDS.observe(time.monotonic() - started)
+            for _, written in batch:
+                written.set_result(None)
+        finally:
+            async with self._room:
+                self._buffered -= len(logs)
+                self._room.notify_all()
+
+
+# There is one buffer for each event loop serving the API
+_log_ingestion_buffers: MutableMapping[asyncio.AbstractEventLoop, LogIngestionBuffer]
+_log_ingestion_buffers = weakref.WeakKeyDictionary()
+
+
+def get_log_ingestion_buffer() -> LogIngestionBuffer:
+    loop = asyncio.get_running_loop()
+    if loop not in _log_ingestion_buffers:
+        _log_ingestion_buffers[loop] = LogIngestionBuffer(
+            max_buffered_logs=SYNTASK_API_LOGS_BULK_INGESTION_BUFFER_SIZE.value()
+        )
+    return _log_ingestion_buffers[loop]
+
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_logs(
@@ -22,6 +140,44 @@ async def create_logs(
     db: SyntaskDBInterface = Depends(provide_database_interface),
 ):
     """Create new logs from the provided schema."""
+    await _write_logs(db, logs)
+
+
+@router.post("/compact", status_code=status.HTTP_201_CREATED)
+async def create_logs_compact(
+    request: Request,
+    db: SyntaskDBInterface = Depends(provide_database_interface),
+):
+    """
+    Create new logs from a batch in the compact encoding of `syntask.logging.compact`,
+    compressed as named by the `Content-Encoding` header.
+    """
+    encoding = request.headers.get("Content-Encoding", "")
+    if encoding not in supported_encodings():
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported Content-Encoding {encoding!r}",
+            headers={"Accept-Encoding": ", ".join(supported_encodings())},
+        )
+
+    try:
+        logs = [
+            LogCreate.model_validate(log)
+            for log in decode_logs(decompress(await request.body(), encoding))
+        ]
+    except (CompactLogsError, ValidationError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        )
+
+    await _write_logs(db, logs)
+
+
+async def _write_logs(db: SyntaskDBInterface, logs: List[LogCreate]) -> None:
+    if SYNTASK_API_LOGS_BULK_INGESTION_ENABLED.value():
+        await get_log_ingestion_buffer().write(db, logs)
+        return
+
     for batch in models.logs.split_logs_into_batches(logs):
         async with db.session_context(begin_transaction=True) as session:
             await models.logs.create_logs(session=session, logs=batch)
@@ -33,6 +189,13 @@ async def read_logs(
     offset: int = Body(0, ge=0),
     logs: schemas.filters.LogFilter = None,
     sort: schemas.sorting.LogSort = Body(schemas.sorting.LogSort.TIMESTAMP_ASC),
+    after: Optional[schemas.core.LogCursor] = Body(
+        None,
+        description=(
+            "Only include logs after this one in the sort, given by its timestamp and"
+            " ID. Paging with the last log of each page is faster than an offset."
+        ),
+    ),
     db: SyntaskDBInterface = Depends(provide_database_interface),
 ) -> List[schemas.core.Log]:
     """
@@ -40,5 +203,10 @@ async def read_logs(
     """
     async with db.session_context() as session:
         return await models.logs.read_logs(
-            session=session, log_filter=logs, offset=offset, limit=limit, sort=sort
+            session=session,
+            log_filter=logs,
+            offset=offset,
+            limit=limit,
+            sort=sort,
+            after=after,
         )
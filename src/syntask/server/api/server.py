@@ -540,6 +540,14 @@ def create_app(
         if syntask.settings.SYNTASK_API_SERVICES_PAUSE_EXPIRATIONS_ENABLED.value():
             service_instances.append(services.pause_expirations.FailExpiredPauses())
 
+        if syntask.settings.SYNTASK_API_SERVICES_LEASE_EXPIRATIONS_ENABLED.value():
+            service_instances.append(
+                services.lease_expirations.ExpireConcurrencyLimitLeases()
+            )
+
+        if syntask.settings.SYNTASK_API_SERVICES_LOG_RETENTION_ENABLED.value():
+            service_instances.append(services.log_retention.LogRetention())
+
         if syntask.settings.SYNTASK_API_SERVICES_CANCELLATION_CLEANUP_ENABLED.value():
             service_instances.append(
                 services.cancellation_cleanup.CancellationCleanup()
@@ -303,6 +303,19 @@ async def scheduled_task_subscription(websocket: WebSocket):
             reason="Protocol violation: expected 'client_id' in subscribe message",
         )
 
+    # Task workers may ask for several task runs per message, in which case each
+    # message is a list of task runs and is acknowledged as a whole
+    batch_size = subscription.get("batch_size")
+    if batch_size is not None and (
+        not isinstance(batch_size, int)
+        or isinstance(batch_size, bool)
+        or batch_size < 1
+    ):
+        return await websocket.close(
+            code=4001,
+            reason="Protocol violation: expected 'batch_size' to be a positive integer",
+        )
+
     subscribed_queue = MultiQueue(task_keys)
 
     logger.info(f"Task worker {client_id!r} subscribed to task keys {task_keys!r}")
@@ -311,7 +324,9 @@ async def scheduled_task_subscription(websocket: WebSocket):
         try:
             # observe here so that all workers with active websockets are tracked
             await models.task_workers.observe_worker(task_keys, client_id)
-            task_run = await asyncio.wait_for(subscribed_queue.get(), timeout=1)
+            task_runs = await asyncio.wait_for(
+                subscribed_queue.get_many(batch_size or 1), timeout=1
+            )
         except asyncio.TimeoutError:
             if not await subscriptions.still_connected(websocket):
                 await models.task_workers.forget_worker(client_id)
@@ -319,7 +334,12 @@ async def scheduled_task_subscription(websocket: WebSocket):
             continue
 
         try:
-            await websocket.send_json(task_run.model_dump(mode="json"))
+            if batch_size is None:
+                await websocket.send_json(task_runs[0].model_dump(mode="json"))
+            else:
+                await websocket.send_json(
+                    [task_run.model_dump(mode="json") for task_run in task_runs]
+                )
 
             acknowledgement = await websocket.receive_json()
             ack_type = acknowledgement.get("type")
@@ -331,11 +351,14 @@ async def scheduled_task_subscription(websocket: WebSocket):
                     code=4001, reason="Protocol violation: expected 'ack' message"
                 )
 
-            await models.task_workers.observe_worker([task_run.task_key], client_id)
+            await subscribed_queue.ack_many(task_runs)
+            await models.task_workers.observe_worker(
+                list({task_run.task_key for task_run in task_runs}), client_id
+            )
 
         except subscriptions.NORMAL_DISCONNECT_EXCEPTIONS:
-            # If sending fails or pong fails, put the task back into the retry queue
-            await asyncio.shield(TaskQueue.for_key(task_run.task_key).retry(task_run))
+            # If sending fails or pong fails, put the tasks back into the retry queue
+            await asyncio.shield(TaskQueue.retry_many(task_runs))
             return
         finally:
             await models.task_workers.forget_worker(client_id)
@@ -205,6 +205,11 @@ class SyntaskDBInterface(metaclass=DBSingleton):
         """A v2 concurrency model"""
         return orm_models.ConcurrencyLimitV2
 
+    @property
+    def ConcurrencyLimitLease(self):
+        """A concurrency limit lease model"""
+        return orm_models.ConcurrencyLimitLease
+
     @property
     def CsrfToken(self):
         """A csrf token model"""
@@ -305,6 +310,16 @@ class SyntaskDBInterface(metaclass=DBSingleton):
         """An event resource model"""
         return orm_models.EventResource
 
+    @property
+    def EventCountRollup(self):
+        """An event count rollup model"""
+        return orm_models.EventCountRollup
+
+    @property
+    def TaskQueueItem(self):
+        """A task queue item model"""
+        return orm_models.TaskQueueItem
+
     @property
     def deployment_unique_upsert_columns(self):
         """Unique columns for upserting a Deployment"""
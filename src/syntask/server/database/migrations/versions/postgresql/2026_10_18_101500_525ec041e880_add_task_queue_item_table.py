@@ -0,0 +1,79 @@
+"""Add task_queue_item table
+
+Revision ID: 525ec041e880
+Revises: eaec5004771f
+Create Date: 2026-10-18 10:15:00.483190
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+import syntask
+
+# revision identifiers, used by Alembic.
+revision = "525ec041e880"
+down_revision = "eaec5004771f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "task_queue_item",
+        sa.Column("task_key", sa.String(), nullable=False),
+        sa.Column(
+            "task_run_id", syntask.server.utilities.database.UUID(), nullable=False
+        ),
+        sa.Column("task_run", syntask.server.utilities.database.JSON(), nullable=False),
+        sa.Column("is_retry", sa.Boolean(), server_default="0", nullable=False),
+        sa.Column(
+            "visible_after",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("delivery_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "id",
+            syntask.server.utilities.database.UUID(),
+            server_default=sa.text("(GEN_RANDOM_UUID())"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_task_queue_item")),
+        sa.UniqueConstraint(
+            "task_run_id", name=op.f("uq_task_queue_item__task_run_id")
+        ),
+    )
+    op.create_index(
+        op.f("ix_task_queue_item__updated"),
+        "task_queue_item",
+        ["updated"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_task_queue_item__task_key__visible_after",
+        "task_queue_item",
+        ["task_key", "visible_after"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_task_queue_item__task_key__visible_after", table_name="task_queue_item"
+    )
+    op.drop_index(op.f("ix_task_queue_item__updated"), table_name="task_queue_item")
+    op.drop_table("task_queue_item")
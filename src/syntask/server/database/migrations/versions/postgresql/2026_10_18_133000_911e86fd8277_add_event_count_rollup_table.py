@@ -0,0 +1,115 @@
+"""Add event_count_rollup table
+
+Revision ID: 911e86fd8277
+Revises: 525ec041e880
+Create Date: 2026-10-18 13:30:00.794651
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+import syntask
+
+# revision identifiers, used by Alembic.
+revision = "911e86fd8277"
+down_revision = "525ec041e880"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "event_count_rollup",
+        sa.Column("granularity", sa.String(), nullable=False),
+        sa.Column(
+            "bucket_start",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            nullable=False,
+        ),
+        sa.Column("event", sa.Text(), nullable=False),
+        sa.Column("resource_id", sa.Text(), nullable=False),
+        sa.Column("resource_label", sa.Text(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column(
+            "oldest",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            nullable=False,
+        ),
+        sa.Column(
+            "latest",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            nullable=False,
+        ),
+        sa.Column(
+            "id",
+            syntask.server.utilities.database.UUID(),
+            server_default=sa.text("(GEN_RANDOM_UUID())"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_event_count_rollup")),
+    )
+    op.create_index(
+        op.f("ix_event_count_rollup__updated"),
+        "event_count_rollup",
+        ["updated"],
+        unique=False,
+    )
+    op.create_index(
+        "uq_event_count_rollup__granularity__bucket_start__event__resource_id",
+        "event_count_rollup",
+        ["granularity", "bucket_start", "event", "resource_id"],
+        unique=True,
+    )
+
+    # Roll up the events that are already stored
+    for granularity in ["minute", "hour", "day"]:
+        op.execute(
+            sa.text(
+                f"""
+                INSERT INTO event_count_rollup (
+                    granularity, bucket_start, event, resource_id, resource_label,
+                    count, oldest, latest
+                )
+                SELECT
+                    '{granularity}',
+                    date_trunc('{granularity}', occurred AT TIME ZONE 'UTC')
+                        AT TIME ZONE 'UTC',
+                    event,
+                    resource_id,
+                    max(coalesce(
+                        resource->>'syntask.resource.name',
+                        resource->>'syntask.name',
+                        resource_id
+                    )),
+                    count(*),
+                    min(occurred),
+                    max(occurred)
+                FROM events
+                GROUP BY 2, event, resource_id
+                """
+            )
+        )
+
+
+def downgrade():
+    op.drop_index(
+        "uq_event_count_rollup__granularity__bucket_start__event__resource_id",
+        table_name="event_count_rollup",
+    )
+    op.drop_index(
+        op.f("ix_event_count_rollup__updated"), table_name="event_count_rollup"
+    )
+    op.drop_table("event_count_rollup")
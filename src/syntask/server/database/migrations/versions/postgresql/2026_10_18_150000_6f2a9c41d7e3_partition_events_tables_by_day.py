@@ -0,0 +1,93 @@
+"""Partition the events and event_resources tables by day
+
+Revision ID: 6f2a9c41d7e3
+Revises: 911e86fd8277
+Create Date: 2026-10-18 15:00:00.312554
+
+"""
+
+import pendulum
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6f2a9c41d7e3"
+down_revision = "911e86fd8277"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "events": {
+        "ix_events__event__id": "event, id",
+        "ix_events__event_occurred_id": "event, occurred, id",
+        "ix_events__event_related_occurred": "event, related, occurred",
+        "ix_events__event_resource_id_occurred": "event, resource_id, occurred",
+        "ix_events__occurred": "occurred",
+        "ix_events__occurred_id": "occurred, id",
+        "ix_events__related_resource_ids": "related_resource_ids",
+        "ix_events__updated": "updated",
+    },
+    "event_resources": {
+        "ix_event_resources__resource_id__occurred": "resource_id, occurred",
+        "ix_event_resources__updated": "updated",
+    },
+}
+
+
+def upgrade():
+    # Everything that has already happened stays where it is, and becomes a single
+    # partition for all time before tomorrow.  Daily partitions from tomorrow onward
+    # are created by the event persister, with a default partition catching anything
+    # that doesn't have a daily partition yet.
+    cutover = pendulum.now("UTC").start_of("day").add(days=1).isoformat()
+
+    for table, indexes in INDEXES.items():
+        legacy = f"{table}_legacy"
+
+        op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        op.execute(f"ALTER TABLE {legacy} DROP CONSTRAINT pk_{table}")
+        for index in indexes:
+            op.execute(f"ALTER INDEX {index} RENAME TO {index}_legacy")
+
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (occurred)"
+        )
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT pk_{table} PRIMARY KEY (id, occurred)"
+        )
+        for index, columns in indexes.items():
+            op.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        op.execute(
+            f"INSERT INTO {table} SELECT * FROM {legacy} "
+            f"WHERE occurred >= '{cutover}'"
+        )
+        op.execute(f"DELETE FROM {legacy} WHERE occurred >= '{cutover}'")
+
+        # With this constraint in place, attaching the partition doesn't need to scan
+        # the whole table to prove that it fits in its range
+        op.execute(
+            f"ALTER TABLE {legacy} ADD CONSTRAINT {legacy}_range "
+            f"CHECK (occurred IS NOT NULL AND occurred < '{cutover}')"
+        )
+        op.execute(
+            f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+            f"FOR VALUES FROM (MINVALUE) TO ('{cutover}')"
+        )
+        op.execute(f"ALTER TABLE {legacy} DROP CONSTRAINT {legacy}_range")
+
+
+def downgrade():
+    for table, indexes in INDEXES.items():
+        partitioned = f"{table}_partitioned"
+
+        op.execute(f"ALTER TABLE {table} RENAME TO {partitioned}")
+        op.execute(f"CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {partitioned}")
+        op.execute(f"DROP TABLE {partitioned} CASCADE")
+
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT pk_{table} PRIMARY KEY (id)")
+        for index, columns in indexes.items():
+            op.execute(f"CREATE INDEX {index} ON {table} ({columns})")
@@ -0,0 +1,79 @@
+"""Add concurrency_limit_lease table
+
+Revision ID: b7d04e2c6a13
+Revises: 6f2a9c41d7e3
+Create Date: 2026-10-18 17:00:00.642310
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+import syntask
+
+# revision identifiers, used by Alembic.
+revision = "b7d04e2c6a13"
+down_revision = "6f2a9c41d7e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "concurrency_limit_lease",
+        sa.Column(
+            "expiration",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            nullable=False,
+        ),
+        sa.Column("slots", sa.Integer(), nullable=False),
+        sa.Column(
+            "concurrency_limit_ids",
+            syntask.server.utilities.database.JSON(astext_type=sa.Text()),
+            server_default="[]",
+            nullable=False,
+        ),
+        sa.Column(
+            "id",
+            syntask.server.utilities.database.UUID(),
+            server_default=sa.text("(GEN_RANDOM_UUID())"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_concurrency_limit_lease")),
+    )
+    op.create_index(
+        op.f("ix_concurrency_limit_lease__expiration"),
+        "concurrency_limit_lease",
+        ["expiration"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_concurrency_limit_lease__updated"),
+        "concurrency_limit_lease",
+        ["updated"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_concurrency_limit_lease__updated"),
+        table_name="concurrency_limit_lease",
+    )
+    op.drop_index(
+        op.f("ix_concurrency_limit_lease__expiration"),
+        table_name="concurrency_limit_lease",
+    )
+    op.drop_table("concurrency_limit_lease")
@@ -0,0 +1,74 @@
+"""Partition the log table by day
+
+Revision ID: 4d9b2f7c1a58
+Revises: b7d04e2c6a13
+Create Date: 2026-10-18 19:00:00.518239
+
+"""
+
+import pendulum
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4d9b2f7c1a58"
+down_revision = "b7d04e2c6a13"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_log__flow_run_id": "flow_run_id",
+    "ix_log__flow_run_id_timestamp": "flow_run_id, timestamp",
+    "ix_log__level": "level",
+    "ix_log__task_run_id": "task_run_id",
+    "ix_log__timestamp": "timestamp",
+    "ix_log__updated": "updated",
+}
+
+
+def upgrade():
+    # As with the events tables, the existing logs stay where they are and become a
+    # single partition for all time before tomorrow.  Daily partitions from tomorrow
+    # onward are created by the log retention service, with a default partition
+    # catching anything that doesn't have a daily partition yet.
+    cutover = pendulum.now("UTC").start_of("day").add(days=1).isoformat()
+
+    op.execute("ALTER TABLE log RENAME TO log_legacy")
+    op.execute("ALTER TABLE log_legacy DROP CONSTRAINT pk_log")
+    for index in INDEXES:
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}_legacy")
+
+    op.execute(
+        "CREATE TABLE log (LIKE log_legacy INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (timestamp)"
+    )
+    op.execute("ALTER TABLE log ADD CONSTRAINT pk_log PRIMARY KEY (id, timestamp)")
+    for index, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {index} ON log ({columns})")
+
+    op.execute("CREATE TABLE log_default PARTITION OF log DEFAULT")
+    op.execute(
+        f"INSERT INTO log SELECT * FROM log_legacy WHERE timestamp >= '{cutover}'"
+    )
+    op.execute(f"DELETE FROM log_legacy WHERE timestamp >= '{cutover}'")
+
+    op.execute(
+        "ALTER TABLE log_legacy ADD CONSTRAINT log_legacy_range "
+        f"CHECK (timestamp IS NOT NULL AND timestamp < '{cutover}')"
+    )
+    op.execute(
+        "ALTER TABLE log ATTACH PARTITION log_legacy "
+        f"FOR VALUES FROM (MINVALUE) TO ('{cutover}')"
+    )
+    op.execute("ALTER TABLE log_legacy DROP CONSTRAINT log_legacy_range")
+
+
+def downgrade():
+    op.execute("ALTER TABLE log RENAME TO log_partitioned")
+    op.execute("CREATE TABLE log (LIKE log_partitioned INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO log SELECT * FROM log_partitioned")
+    op.execute("DROP TABLE log_partitioned CASCADE")
+
+    op.execute("ALTER TABLE log ADD CONSTRAINT pk_log PRIMARY KEY (id)")
+    for index, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {index} ON log ({columns})")
@@ -0,0 +1,78 @@
+"""Add task_queue_item table
+
+Revision ID: 90cd67b7ce72
+Revises: 4ad4658cbefe
+Create Date: 2026-10-18 10:15:00.214538
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+import syntask
+
+# revision identifiers, used by Alembic.
+revision = "90cd67b7ce72"
+down_revision = "4ad4658cbefe"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "task_queue_item",
+        sa.Column("task_key", sa.String(), nullable=False),
+        sa.Column(
+            "task_run_id", syntask.server.utilities.database.UUID(), nullable=False
+        ),
+        sa.Column("task_run", syntask.server.utilities.database.JSON(), nullable=False),
+        sa.Column("is_retry", sa.Boolean(), server_default="0", nullable=False),
+        sa.Column(
+            "visible_after",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"),
+            nullable=False,
+        ),
+        sa.Column("delivery_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "id",
+            syntask.server.utilities.database.UUID(),
+            server_default=sa.text(
+                "(\n    (\n        lower(hex(randomblob(4)))\n        || '-'\n        || lower(hex(randomblob(2)))\n        || '-4'\n        || substr(lower(hex(randomblob(2))),2)\n        || '-'\n        || substr('89ab',abs(random()) % 4 + 1, 1)\n        || substr(lower(hex(randomblob(2))),2)\n        || '-'\n        || lower(hex(randomblob(6)))\n    )\n    )"
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "created",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_task_queue_item")),
+        sa.UniqueConstraint(
+            "task_run_id", name=op.f("uq_task_queue_item__task_run_id")
+        ),
+    )
+    with op.batch_alter_table("task_queue_item", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_task_queue_item__updated"), ["updated"], unique=False
+        )
+        batch_op.create_index(
+            "ix_task_queue_item__task_key__visible_after",
+            ["task_key", "visible_after"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("task_queue_item", schema=None) as batch_op:
+        batch_op.drop_index("ix_task_queue_item__task_key__visible_after")
+        batch_op.drop_index(batch_op.f("ix_task_queue_item__updated"))
+
+    op.drop_table("task_queue_item")
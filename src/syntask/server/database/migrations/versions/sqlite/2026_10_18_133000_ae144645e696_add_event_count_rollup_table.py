@@ -0,0 +1,116 @@
+"""Add event_count_rollup table
+
+Revision ID: ae144645e696
+Revises: 90cd67b7ce72
+Create Date: 2026-10-18 13:30:00.518204
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+import syntask
+
+# revision identifiers, used by Alembic.
+revision = "ae144645e696"
+down_revision = "90cd67b7ce72"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "event_count_rollup",
+        sa.Column("granularity", sa.String(), nullable=False),
+        sa.Column(
+            "bucket_start",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            nullable=False,
+        ),
+        sa.Column("event", sa.Text(), nullable=False),
+        sa.Column("resource_id", sa.Text(), nullable=False),
+        sa.Column("resource_label", sa.Text(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column(
+            "oldest",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            nullable=False,
+        ),
+        sa.Column(
+            "latest",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            nullable=False,
+        ),
+        sa.Column(
+            "id",
+            syntask.server.utilities.database.UUID(),
+            server_default=sa.text(
+                "(\n    (\n        lower(hex(randomblob(4)))\n        || '-'\n        || lower(hex(randomblob(2)))\n        || '-4'\n        || substr(lower(hex(randomblob(2))),2)\n        || '-'\n        || substr('89ab',abs(random()) % 4 + 1, 1)\n        || substr(lower(hex(randomblob(2))),2)\n        || '-'\n        || lower(hex(randomblob(6)))\n    )\n    )"
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "created",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_event_count_rollup")),
+    )
+    with op.batch_alter_table("event_count_rollup", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_event_count_rollup__updated"), ["updated"], unique=False
+        )
+        batch_op.create_index(
+            "uq_event_count_rollup__granularity__bucket_start__event__resource_id",
+            ["granularity", "bucket_start", "event", "resource_id"],
+            unique=True,
+        )
+
+    # Roll up the events that are already stored
+    for granularity, bucket_format in [
+        ("minute", "%Y-%m-%d %H:%M:00.000000"),
+        ("hour", "%Y-%m-%d %H:00:00.000000"),
+        ("day", "%Y-%m-%d 00:00:00.000000"),
+    ]:
+        op.execute(
+            sa.text(
+                f"""
+                INSERT INTO event_count_rollup (
+                    granularity, bucket_start, event, resource_id, resource_label,
+                    count, oldest, latest
+                )
+                SELECT
+                    '{granularity}',
+                    strftime('{bucket_format}', occurred),
+                    event,
+                    resource_id,
+                    max(coalesce(
+                        json_extract(resource, '$."syntask.resource.name"'),
+                        json_extract(resource, '$."syntask.name"'),
+                        resource_id
+                    )),
+                    count(*),
+                    min(occurred),
+                    max(occurred)
+                FROM events
+                GROUP BY strftime('{bucket_format}', occurred), event, resource_id
+                """
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("event_count_rollup", schema=None) as batch_op:
+        batch_op.drop_index(
+            "uq_event_count_rollup__granularity__bucket_start__event__resource_id"
+        )
+        batch_op.drop_index(batch_op.f("ix_event_count_rollup__updated"))
+
+    op.drop_table("event_count_rollup")
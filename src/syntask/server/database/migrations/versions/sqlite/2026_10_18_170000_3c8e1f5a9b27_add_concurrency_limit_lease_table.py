@@ -0,0 +1,74 @@
+"""Add concurrency_limit_lease table
+
+Revision ID: 3c8e1f5a9b27
+Revises: ae144645e696
+Create Date: 2026-10-18 17:00:00.271845
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+import syntask
+
+# revision identifiers, used by Alembic.
+revision = "3c8e1f5a9b27"
+down_revision = "ae144645e696"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "concurrency_limit_lease",
+        sa.Column(
+            "expiration",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            nullable=False,
+        ),
+        sa.Column("slots", sa.Integer(), nullable=False),
+        sa.Column(
+            "concurrency_limit_ids",
+            syntask.server.utilities.database.JSON(),
+            server_default="[]",
+            nullable=False,
+        ),
+        sa.Column(
+            "id",
+            syntask.server.utilities.database.UUID(),
+            server_default=sa.text(
+                "(\n    (\n        lower(hex(randomblob(4)))\n        || '-'\n        || lower(hex(randomblob(2)))\n        || '-4'\n        || substr(lower(hex(randomblob(2))),2)\n        || '-'\n        || substr('89ab',abs(random()) % 4 + 1, 1)\n        || substr(lower(hex(randomblob(2))),2)\n        || '-'\n        || lower(hex(randomblob(6)))\n    )\n    )"
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "created",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated",
+            syntask.server.utilities.database.Timestamp(timezone=True),
+            server_default=sa.text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_concurrency_limit_lease")),
+    )
+    with op.batch_alter_table("concurrency_limit_lease", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_concurrency_limit_lease__expiration"),
+            ["expiration"],
+            unique=False,
+        )
+        batch_op.create_index(
+            batch_op.f("ix_concurrency_limit_lease__updated"), ["updated"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("concurrency_limit_lease", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_concurrency_limit_lease__updated"))
+        batch_op.drop_index(batch_op.f("ix_concurrency_limit_lease__expiration"))
+
+    op.drop_table("concurrency_limit_lease")
@@ -961,6 +961,9 @@ class Log(Base):
     SQLAlchemy model of a logging statement.
     """
 
+    # On Postgres, this table is partitioned by day on `timestamp`, so its primary key
+    # there is `(id, timestamp)`
+
     name = sa.Column(sa.String, nullable=False)
     level = sa.Column(sa.SmallInteger, nullable=False, index=True)
     flow_run_id = sa.Column(UUID(), nullable=True, index=True)
@@ -1002,6 +1005,20 @@ class ConcurrencyLimitV2(Base):
     __table_args__ = (sa.UniqueConstraint("name"),)
 
 
+class ConcurrencyLimitLease(Base):
+    """
+    A batch of slots held on one or more concurrency limits by a client, which hands
+    them out to its own tasks.  The slots of leases that expire without being renewed
+    are released.
+    """
+
+    expiration = sa.Column(Timestamp(), nullable=False, index=True)
+    slots = sa.Column(sa.Integer, nullable=False)
+    concurrency_limit_ids = sa.Column(
+        JSON, server_default="[]", default=list, nullable=False
+    )
+
+
 class BlockType(Base):
     name = sa.Column(sa.String, nullable=False)
     slug = sa.Column(sa.String, nullable=False)
@@ -1477,6 +1494,8 @@ class AutomationEventFollower(Base):
 
 
 class Event(Base):
+    # On Postgres, this table and `event_resources` are partitioned by day on
+    # `occurred`, so their primary keys there are `(id, occurred)`
     @declared_attr
     def __tablename__(cls):
         return "events"
@@ -1530,6 +1549,64 @@ class EventResource(Base):
     event_id = sa.Column("event_id", UUID(), nullable=False)
 
 
+class EventCountRollup(Base):
+    """
+    The number of events with a given name and resource that occurred in one minute,
+    hour, or day, maintained as events are written so that counting events over long
+    periods of time doesn't have to scan the events table.
+    """
+
+    __table_args__ = (
+        sa.Index(
+            "uq_event_count_rollup__granularity__bucket_start__event__resource_id",
+            "granularity",
+            "bucket_start",
+            "event",
+            "resource_id",
+            unique=True,
+        ),
+    )
+
+    granularity = sa.Column(sa.String, nullable=False)
+    bucket_start = sa.Column(Timestamp(), nullable=False)
+    event = sa.Column(sa.Text(), nullable=False)
+    resource_id = sa.Column(sa.Text(), nullable=False)
+    # the display name of the resource as of the latest event in this bucket
+    resource_label = sa.Column(sa.Text(), nullable=False)
+    count = sa.Column(sa.Integer, nullable=False)
+    oldest = sa.Column(Timestamp(), nullable=False)
+    latest = sa.Column(Timestamp(), nullable=False)
+
+
+class TaskQueueItem(Base):
+    """
+    A background task run waiting to be delivered to a task worker, used by the
+    database task queue backend.
+    """
+
+    __table_args__ = (
+        sa.Index(
+            "ix_task_queue_item__task_key__visible_after",
+            "task_key",
+            "visible_after",
+        ),
+    )
+
+    task_key = sa.Column(sa.String, nullable=False)
+    task_run_id = sa.Column(UUID(), nullable=False, unique=True)
+    task_run = sa.Column(Pydantic(schemas.core.TaskRun), nullable=False)
+    is_retry = sa.Column(sa.Boolean, server_default="0", default=False, nullable=False)
+    visible_after = sa.Column(
+        Timestamp(),
+        nullable=False,
+        server_default=now(),
+        default=lambda: pendulum.now("UTC"),
+    )
+    delivery_count = sa.Column(
+        sa.Integer, server_default="0", default=0, nullable=False
+    )
+
+
 # These are temporary until we've migrated all the references to the new,
 # non-ORM names
 
@@ -1547,6 +1624,7 @@ ORMDeployment = Deployment
 ORMLog = Log
 ORMConcurrencyLimit = ConcurrencyLimit
 ORMConcurrencyLimitV2 = ConcurrencyLimitV2
+ORMConcurrencyLimitLease = ConcurrencyLimitLease
 ORMBlockType = BlockType
 ORMBlockSchema = BlockSchema
 ORMBlockSchemaReference = BlockSchemaReference
@@ -1570,6 +1648,8 @@ ORMCompositeTriggerChildFiring = CompositeTriggerChildFiring
 ORMAutomationEventFollower = AutomationEventFollower
 ORMEvent = Event
 ORMEventResource = EventResource
+ORMEventCountRollup = EventCountRollup
+ORMTaskQueueItem = TaskQueueItem
 
 
 class BaseORMConfiguration(ABC):
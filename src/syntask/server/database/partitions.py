@@ -0,0 +1,149 @@
+"""
+Maintenance of tables that are range-partitioned by day on PostgreSQL.
+
+A partitioned table has a partition for each day, named for the table and the day (for
+example `events_20261018`), and a default partition named `<table>_default` that catches
+rows for days that don't have a partition yet.  Partitions are created a few days ahead
+of time, and old rows are removed by dropping whole partitions rather than by deleting
+rows one at a time.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+import pendulum
+import sqlalchemy as sa
+from pendulum.datetime import DateTime
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from syntask.logging import get_logger
+
+logger = get_logger(__name__)
+
+Partition = Tuple[str, Optional[DateTime], Optional[DateTime]]
+
+_PARTITION_BOUND = re.compile(r"FROM \((?P<lower>.+?)\) TO \((?P<upper>.+?)\)")
+
+
+def parse_partition_bound(
+    bound: str,
+) -> Tuple[Optional[DateTime], Optional[DateTime]]:
+    """Parses the lower and upper bounds of a range partition, as described by
+    `pg_get_expr(relpartbound, oid)`, where `None` stands for an unbounded side or the
+    default partition"""
+    match = _PARTITION_BOUND.search(bound)
+    if not match:
+        return None, None
+
+    def parse(value: str) -> Optional[DateTime]:
+        if value in ("MINVALUE", "MAXVALUE"):
+            return None
+        return pendulum.parse(value.strip("'")).in_timezone("UTC")
+
+    return parse(match["lower"]), parse(match["upper"])
+
+
+async def read_partitions(session: AsyncSession, table: str) -> List[Partition]:
+    """Returns the name and bounds of each partition of the given table, which is an
+    empty list if the table isn't partitioned"""
+    result = await session.execute(
+        sa.text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits "
+            "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )
+    return [(name, *parse_partition_bound(bound)) for name, bound in result.all()]
+
+
+async def lock_partitions(session: AsyncSession, key: str) -> None:
+    """Serializes changes to a set of partitions among all of the servers, until the
+    end of the session's transaction"""
+    await session.execute(
+        sa.text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": key}
+    )
+
+
+async def ensure_daily_partitions(
+    session: AsyncSession,
+    table: str,
+    column: str,
+    today: DateTime,
+    days_ahead: int,
+) -> List[str]:
+    """
+    Creates the daily partitions of a table for today and the next few days, moving any
+    rows for those days out of the default partition.  Callers are expected to hold the
+    lock for the table's partitions.
+
+    Args:
+        session: a database session
+        table: the name of the partitioned table
+        column: the column the table is partitioned on
+        today: the start of the first day to create a partition for
+        days_ahead: how many days after today to create partitions for
+
+    Returns:
+        the names of the partitions created
+    """
+    partitions = await read_partitions(session, table)
+    if not partitions:
+        return []
+
+    created: List[str] = []
+    for day in range(days_ahead + 1):
+        start = today.add(days=day)
+        end = start.add(days=1)
+
+        if any(
+            (lower is None or lower < end) and (upper is None or start < upper)
+            for name, lower, upper in partitions
+            if not name.endswith("_default")
+        ):
+            continue
+
+        name = f"{table}_{start.format('YYYYMMDD')}"
+        await session.execute(
+            sa.text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)")
+        )
+        await session.execute(
+            sa.text(
+                f"WITH moved AS ("
+                f"  DELETE FROM {table}_default "
+                f"  WHERE {column} >= :start AND {column} < :end "
+                f"  RETURNING *"
+                f") INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"start": start, "end": end},
+        )
+        await session.execute(
+            sa.text(
+                f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+        partitions.append((name, start, end))
+        created.append(name)
+
+    return created
+
+
+async def drop_partitions_before(
+    session: AsyncSession, table: str, older_than: DateTime
+) -> List[str]:
+    """
+    Drops the partitions of a table that only hold rows from before the given time.
+    Callers are expected to hold the lock for the table's partitions.
+
+    Returns:
+        the names of the partitions dropped
+    """
+    dropped: List[str] = []
+    for name, _, upper in await read_partitions(session, table):
+        if upper is not None and upper <= older_than:
+            await session.execute(sa.text(f"DROP TABLE {name}"))
+            logger.debug("Dropped partition %s of %s.", name, table)
+            dropped.append(name)
+    return dropped
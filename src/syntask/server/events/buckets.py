@@ -0,0 +1,279 @@
+"""
+Keeps the buckets of the reactive triggers service in memory.
+
+Every event that matches a trigger reads and updates that trigger's bucket, so the
+buckets are kept in a write-back store rather than read from and written to the
+database for each event.  Buckets are loaded from the database the first time they are
+needed, changes are made in memory, and the changed buckets are checkpointed back to
+the database periodically and when the service stops.  Buckets that haven't been used
+between two checkpoints are evicted, so only the hot buckets stay in memory.
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from pendulum.datetime import DateTime
+from prometheus_client import Counter, Gauge
+
+from syntask.server.events.schemas.events import ReceivedEvent
+
+if TYPE_CHECKING:
+    from syntask.server.database.orm_models import ORMAutomationBucket
+
+
+AUTOMATION_BUCKET_CACHE_HITS = Counter(
+    "syntask_automation_bucket_cache_hits",
+    "The number of times an automation bucket was found in memory",
+)
+AUTOMATION_BUCKET_CACHE_MISSES = Counter(
+    "syntask_automation_bucket_cache_misses",
+    "The number of times an automation bucket had to be read from the database",
+)
+AUTOMATION_BUCKETS_CHECKPOINTED = Counter(
+    "syntask_automation_buckets_checkpointed",
+    "The number of changed automation buckets written back to the database",
+)
+AUTOMATION_BUCKETS_IN_MEMORY = Gauge(
+    "syntask_automation_buckets_in_memory",
+    "The number of automation buckets held in memory",
+)
+
+
+BucketKey = Tuple[UUID, UUID, Tuple[str, ...]]
+
+
+class AutomationBucket:
+    """The in-memory copy of an `automation_bucket` row"""
+
+    __slots__ = (
+        "automation_id",
+        "trigger_id",
+        "bucketing_key",
+        "start",
+        "end",
+        "count",
+        "last_event",
+        "last_operation",
+        "triggered_at",
+    )
+
+    automation_id: UUID
+    trigger_id: UUID
+    bucketing_key: Tuple[str, ...]
+    start: DateTime
+    end: DateTime
+    count: int
+    last_event: Optional[ReceivedEvent]
+    last_operation: Optional[str]
+    triggered_at: Optional[DateTime]
+
+    def __init__(
+        self,
+        automation_id: UUID,
+        trigger_id: UUID,
+        bucketing_key: Iterable[str],
+        start: DateTime,
+        end: DateTime,
+        count: int,
+        last_event: Optional[ReceivedEvent] = None,
+        last_operation: Optional[str] = None,
+        triggered_at: Optional[DateTime] = None,
+    ):
+        self.automation_id = automation_id
+        self.trigger_id = trigger_id
+        self.bucketing_key = tuple(bucketing_key)
+        self.start = start
+        self.end = end
+        self.count = count
+        self.last_event = last_event
+        self.last_operation = last_operation
+        self.triggered_at = triggered_at
+
+    @classmethod
+    def from_orm(cls, row: "ORMAutomationBucket") -> "AutomationBucket":
+        return cls(
+            automation_id=row.automation_id,
+            trigger_id=row.trigger_id,
+            bucketing_key=row.bucketing_key,
+            start=row.start,
+            end=row.end,
+            count=row.count,
+            last_event=row.last_event,
+            last_operation=row.last_operation,
+            triggered_at=row.triggered_at,
+        )
+
+    @property
+    def key(self) -> BucketKey:
+        return (self.automation_id, self.trigger_id, self.bucketing_key)
+
+    def to_row(self) -> dict:
+        return {
+            "automation_id": self.automation_id,
+            "trigger_id": self.trigger_id,
+            "bucketing_key": list(self.bucketing_key),
+            "start": self.start,
+            "end": self.end,
+            "count": self.count,
+            "last_event": self.last_event,
+            "last_operation": self.last_operation,
+            "triggered_at": self.triggered_at,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"AutomationBucket(automation_id={self.automation_id!r}, "
+            f"trigger_id={self.trigger_id!r}, bucketing_key={self.bucketing_key!r}, "
+            f"start={self.start!r}, end={self.end!r}, count={self.count!r})"
+        )
+
+
+def bucket_key(
+    automation_id: UUID, trigger_id: UUID, bucketing_key: Iterable[str]
+) -> BucketKey:
+    return (automation_id, trigger_id, tuple(bucketing_key))
+
+
+class BucketStore:
+    """
+    A write-back cache of automation buckets.
+
+    The store remembers both the buckets it holds and the keys that are known not to
+    have a bucket in the database (as `None`), so that events which don't start a
+    bucket don't cause a database read every time.
+    """
+
+    _buckets: Dict[BucketKey, Optional[AutomationBucket]]
+    _dirty: Set[BucketKey]
+    _touched: Set[BucketKey]
+
+    # the keys of the buckets in the store that have a row in the database
+    _persisted: Set[BucketKey]
+
+    def __init__(self) -> None:
+        self._buckets = {}
+        self._dirty = set()
+        self._touched = set()
+        self._persisted = set()
+
+    def __len__(self) -> int:
+        return sum(1 for bucket in self._buckets.values() if bucket is not None)
+
+    def __contains__(self, key: BucketKey) -> bool:
+        return key in self._buckets
+
+    def get(self, key: BucketKey) -> Optional[AutomationBucket]:
+        """Returns the bucket for the key, which must be in the store"""
+        AUTOMATION_BUCKET_CACHE_HITS.inc()
+        self._touched.add(key)
+        return self._buckets[key]
+
+    def may_be_persisted(self, key: BucketKey) -> bool:
+        """Whether there may be a row in the database for the given key"""
+        return key not in self._buckets or key in self._persisted
+
+    def holds(self, bucket: AutomationBucket) -> bool:
+        """Whether the given bucket is the one currently held for its key"""
+        return self._buckets.get(bucket.key) is bucket
+
+    def put(self, bucket: AutomationBucket, dirty: bool = True) -> AutomationBucket:
+        self._buckets[bucket.key] = bucket
+        self._touched.add(bucket.key)
+        if dirty:
+            self._dirty.add(bucket.key)
+        return bucket
+
+    def loaded(
+        self, key: BucketKey, bucket: Optional[AutomationBucket]
+    ) -> Optional[AutomationBucket]:
+        """Records what was read from the database for the given key"""
+        AUTOMATION_BUCKET_CACHE_MISSES.inc()
+        self._buckets[key] = bucket
+        self._touched.add(key)
+        if bucket is not None:
+            self._persisted.add(key)
+        return bucket
+
+    def mark_dirty(self, bucket: AutomationBucket) -> None:
+        self._dirty.add(bucket.key)
+        self._touched.add(bucket.key)
+
+    def removed(self, key: BucketKey) -> None:
+        """Records that the bucket for the given key was deleted from the database"""
+        self._buckets[key] = None
+        self._dirty.discard(key)
+        self._persisted.discard(key)
+        self._touched.add(key)
+
+    def dirty(
+        self, automation_id: Optional[UUID] = None, trigger_id: Optional[UUID] = None
+    ) -> List[AutomationBucket]:
+        """The buckets changed since they were last checkpointed"""
+        buckets: List[AutomationBucket] = []
+        for key in self._dirty:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            if automation_id and bucket.automation_id != automation_id:
+                continue
+            if trigger_id and bucket.trigger_id != trigger_id:
+                continue
+            buckets.append(bucket)
+        return buckets
+
+    def checkpointed(self, buckets: Iterable[AutomationBucket]) -> None:
+        """Records that the given buckets were written to the database"""
+        for bucket in buckets:
+            self._dirty.discard(bucket.key)
+            self._persisted.add(bucket.key)
+
+    def _forget(self, key: BucketKey) -> None:
+        del self._buckets[key]
+        self._dirty.discard(key)
+        self._persisted.discard(key)
+
+    def evict_idle(self) -> None:
+        """
+        Forgets the clean buckets that haven't been used since the last time this was
+        called, along with all of the keys known to be absent from the database
+        """
+        for key, bucket in list(self._buckets.items()):
+            if key in self._dirty:
+                continue
+            if bucket is None or key not in self._touched:
+                self._forget(key)
+        self._touched.clear()
+        AUTOMATION_BUCKETS_IN_MEMORY.set(len(self))
+
+    def evict(self, automation_id: UUID) -> None:
+        """Forgets the buckets for an automation, including any changes that have not
+        been checkpointed"""
+        for key in list(self._buckets):
+            if key[0] == automation_id:
+                self._forget(key)
+        AUTOMATION_BUCKETS_IN_MEMORY.set(len(self))
+
+    def remove_exceeding(
+        self, automation_id: UUID, trigger_id: UUID, threshold: int
+    ) -> None:
+        """Records that the buckets for a trigger with at least `threshold` events were
+        deleted from the database"""
+        for key, bucket in list(self._buckets.items()):
+            if bucket is None or key[0] != automation_id or key[1] != trigger_id:
+                continue
+            if bucket.count >= threshold:
+                self.removed(key)
+
+    def evict_closed(self, older_than: DateTime) -> None:
+        """Forgets the buckets that ended before the given time"""
+        for key, bucket in list(self._buckets.items()):
+            if bucket is not None and bucket.end <= older_than:
+                self._forget(key)
+        AUTOMATION_BUCKETS_IN_MEMORY.set(len(self))
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._dirty.clear()
+        self._touched.clear()
+        self._persisted.clear()
+        AUTOMATION_BUCKETS_IN_MEMORY.set(0)
@@ -1,6 +1,6 @@
 import math
 from datetime import timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Sequence, Tuple
 
 import pendulum
 import sqlalchemy as sa
@@ -50,6 +50,17 @@ class TimeUnit(AutoEnum):
         else:
             raise NotImplementedError()
 
+    def truncate(self, value: DateTime) -> DateTime:
+        """The start of the minute, hour, or day containing the given time"""
+        if self == self.day:
+            return value.replace(hour=0, minute=0, second=0, microsecond=0)
+        elif self == self.hour:
+            return value.replace(minute=0, second=0, microsecond=0)
+        elif self == self.minute:
+            return value.replace(second=0, microsecond=0)
+        else:
+            raise NotImplementedError()
+
     def validate_buckets(
         self, start_datetime: DateTime, end_datetime: DateTime, interval: float
     ):
@@ -102,11 +113,13 @@ class TimeUnit(AutoEnum):
             yield (span_start, next_span_start - timedelta(microseconds=1))
             span_start = next_span_start
 
-    def database_value_expression(self, time_interval: float):
+    def database_value_expression(self, time_interval: float, column=None):
         """Returns the SQL expression to place an event in a time bucket"""
         # The date_bin function can do the bucketing for us:
         # https://www.postgresql.org/docs/14/functions-datetime.html#FUNCTIONS-DATETIME-BIN
         db = provide_database_interface()
+        if column is None:
+            column = db.Event.occurred
         delta = self.as_timedelta(time_interval)
         if db.dialect.name == "postgresql":
             return sa.cast(
@@ -114,7 +127,7 @@ class TimeUnit(AutoEnum):
                     sa.extract(
                         "epoch",
                         (
-                            sa.func.date_bin(delta, db.Event.occurred, PIVOT_DATETIME)
+                            sa.func.date_bin(delta, column, PIVOT_DATETIME)
                             - PIVOT_DATETIME
                         ),
                     )
@@ -127,7 +140,7 @@ class TimeUnit(AutoEnum):
             pivot_timestamp = sa.func.strftime(
                 "%s", PIVOT_DATETIME.strftime("%Y-%m-%d %H:%M:%S")
             )
-            event_timestamp = sa.func.strftime("%s", db.Event.occurred)
+            event_timestamp = sa.func.strftime("%s", column)
             seconds_since_pivot = event_timestamp - pivot_timestamp
             # Calculate the bucket index by dividing by the interval in seconds and flooring the result
             bucket_index = sa.func.floor(
@@ -137,19 +150,23 @@ class TimeUnit(AutoEnum):
         else:
             raise NotImplementedError(f"Dialect {db.dialect.name} is not supported.")
 
-    def database_label_expression(self, db: SyntaskDBInterface, time_interval: float):
+    def database_label_expression(
+        self, db: SyntaskDBInterface, time_interval: float, column=None
+    ):
         """Returns the SQL expression to label a time bucket"""
+        if column is None:
+            column = db.Event.occurred
         time_delta = self.as_timedelta(time_interval)
         if db.dialect.name == "postgresql":
             # The date_bin function can do the bucketing for us:
             # https://www.postgresql.org/docs/14/functions-datetime.html#FUNCTIONS-DATETIME-BIN
             return sa.func.to_char(
-                sa.func.date_bin(time_delta, db.Event.occurred, PIVOT_DATETIME),
+                sa.func.date_bin(time_delta, column, PIVOT_DATETIME),
                 'YYYY-MM-DD"T"HH24:MI:SSTZH:TZM',
             )
         elif db.dialect.name == "sqlite":
             # We can't use date_bin in SQLite, so we have to do the bucketing manually
-            seconds_since_epoch = sa.func.strftime("%s", db.Event.occurred)
+            seconds_since_epoch = sa.func.strftime("%s", column)
             # Convert the total seconds of the timedelta to a constant in SQL
             bucket_size = time_delta.total_seconds()
             # Perform integer division and multiplication to find the bucket start epoch using SQL functions
@@ -165,6 +182,61 @@ class TimeUnit(AutoEnum):
             raise NotImplementedError(f"Dialect {db.dialect.name} is not supported.")
 
 
+# The granularities of the `event_count_rollup` table, from the coarsest to the finest
+ROLLUP_GRANULARITIES: Tuple[TimeUnit, ...] = (
+    TimeUnit.day,
+    TimeUnit.hour,
+    TimeUnit.minute,
+)
+
+RollupSpan = Tuple[TimeUnit, DateTime, DateTime]
+RawSpan = Tuple[DateTime, DateTime]
+
+
+def plan_rollup_spans(
+    start: DateTime, end: DateTime, granularities: Sequence[TimeUnit]
+) -> Tuple[List[RollupSpan], List[RawSpan]]:
+    """
+    Divides the half-open range [start, end) into the spans that can be counted from
+    whole rollup buckets, using the coarsest granularity possible, and the spans at the
+    edges that must be counted from the raw events.
+    """
+    if start >= end:
+        return [], []
+
+    if not granularities:
+        return [], [(start, end)]
+
+    granularity, finer = granularities[0], granularities[1:]
+
+    aligned_start = granularity.truncate(start)
+    if aligned_start < start:
+        aligned_start += granularity.as_timedelta(1)
+    aligned_end = granularity.truncate(end)
+
+    if aligned_start >= aligned_end:
+        return plan_rollup_spans(start, end, finer)
+
+    head_rollups, head_raw = plan_rollup_spans(start, aligned_start, finer)
+    tail_rollups, tail_raw = plan_rollup_spans(aligned_end, end, finer)
+
+    return (
+        head_rollups + [(granularity, aligned_start, aligned_end)] + tail_rollups,
+        head_raw + tail_raw,
+    )
+
+
+def can_count_from_rollups(filter: "EventFilter") -> bool:
+    """Whether the given filter only uses criteria that the rollups can answer"""
+    if filter.any_resource or filter.related or filter.id.id:
+        return False
+
+    if filter.resource and (filter.resource.labels or filter.resource.distinct):
+        return False
+
+    return True
+
+
 class Countable(AutoEnum):
     day = AutoEnum.auto()  # `day` will be translated into an equivalent `time`
     time = AutoEnum.auto()
@@ -183,7 +255,7 @@ class Countable(AutoEnum):
         # The innermost SELECT pulls the matching events and groups them up by their
         # buckets.  At this point, there may be duplicate buckets for each value, since
         # the label of the thing referred to might have changed
-        fundamental_counts = (
+        raw_counts = (
             sa.select(
                 (
                     self._database_value_expression(
@@ -207,11 +279,38 @@ class Countable(AutoEnum):
             .group_by("value", "label")
         )
 
-        fundamental_counts = fundamental_counts.select_from(db.Event)
+        raw_counts = raw_counts.select_from(db.Event)
+
+        rollup_spans: List[RollupSpan] = []
+        if can_count_from_rollups(filter):
+            rollup_spans, raw_spans = plan_rollup_spans(
+                filter.occurred.since.in_timezone("UTC"),
+                filter.occurred.until.in_timezone("UTC") + timedelta(microseconds=1),
+                self._rollup_granularities(time_unit, time_interval),
+            )
+
+        if rollup_spans:
+            # Whole minutes, hours, and days in the middle of the range are counted
+            # from the pre-aggregated rollups, leaving only the edges of the range to
+            # be counted from the events themselves
+            raw_counts = raw_counts.where(
+                sa.or_(
+                    sa.false(),
+                    *[
+                        sa.and_(db.Event.occurred >= start, db.Event.occurred < end)
+                        for start, end in raw_spans
+                    ],
+                )
+            )
+            fundamental = sa.union_all(
+                raw_counts,
+                self._rollup_query(db, filter, rollup_spans, time_unit, time_interval),
+            ).subquery("fundamental_counts")
+        else:
+            fundamental = raw_counts.subquery("fundamental_counts")
 
         # An intermediate SELECT takes the fundamental counts and reprojects it with the
         # most recent value for the labels of that bucket.
-        fundamental = fundamental_counts.subquery("fundamental_counts")
         with_latest_labels = (
             sa.select(
                 fundamental.c.value,
@@ -257,6 +356,83 @@ class Countable(AutoEnum):
 
         return reaggregated
 
+    def _rollup_granularities(
+        self, time_unit: TimeUnit, time_interval: float
+    ) -> Sequence[TimeUnit]:
+        """The rollup granularities that never straddle two of the requested buckets"""
+        if self == self.day:
+            bucket_seconds = TimeUnit.day.as_timedelta(1).total_seconds()
+        elif self == self.time:
+            bucket_seconds = time_unit.as_timedelta(time_interval).total_seconds()
+        else:
+            return ROLLUP_GRANULARITIES
+
+        return [
+            granularity
+            for granularity in ROLLUP_GRANULARITIES
+            if bucket_seconds % granularity.as_timedelta(1).total_seconds() == 0
+        ]
+
+    def _rollup_query(
+        self,
+        db: SyntaskDBInterface,
+        filter: "EventFilter",
+        spans: List[RollupSpan],
+        time_unit: TimeUnit,
+        time_interval: float,
+    ) -> Select:
+        """Selects the fundamental counts for the given spans from the rollups"""
+        rollup = db.EventCountRollup
+
+        clauses = [
+            sa.or_(
+                *[
+                    sa.and_(
+                        rollup.granularity == granularity.value,
+                        rollup.bucket_start >= start,
+                        rollup.bucket_start < end,
+                    )
+                    for granularity, start, end in spans
+                ]
+            )
+        ]
+        if filter.event:
+            clauses.extend(filter.event.build_where_clauses_for(rollup.event))
+        if filter.resource:
+            clauses.extend(
+                filter.resource.build_resource_id_clauses_for(rollup.resource_id)
+            )
+
+        if self == self.day:
+            value = TimeUnit.day.database_value_expression(1, rollup.bucket_start)
+            label = TimeUnit.day.database_label_expression(db, 1, rollup.bucket_start)
+        elif self == self.time:
+            value = time_unit.database_value_expression(
+                time_interval, rollup.bucket_start
+            )
+            label = time_unit.database_label_expression(
+                db, time_interval, rollup.bucket_start
+            )
+        elif self == self.event:
+            value = label = rollup.event
+        elif self == self.resource:
+            value, label = rollup.resource_id, rollup.resource_label
+        else:
+            raise NotImplementedError()
+
+        return (
+            sa.select(
+                value.label("value"),
+                label.label("label"),
+                sa.func.max(rollup.latest).label("latest"),
+                sa.func.min(rollup.oldest).label("oldest"),
+                sa.func.sum(rollup.count).label("count"),
+            )
+            .select_from(rollup)
+            .where(sa.and_(*clauses))
+            .group_by("value", "label")
+        )
+
     def _database_value_expression(
         self,
         db: SyntaskDBInterface,
@@ -22,6 +22,7 @@ from syntask.utilities.collections import AutoEnum
 from .schemas.events import Event, Resource, ResourceSpecification
 
 if TYPE_CHECKING:
+    from sqlalchemy.orm import InstrumentedAttribute
     from sqlalchemy.sql.expression import ColumnElement, ColumnExpressionArgument
 
 
@@ -172,33 +173,34 @@ class EventNameFilter(EventDataFilter):
         return True
 
     def build_where_clauses(self) -> Sequence["ColumnExpressionArgument[bool]"]:
+        return self.build_where_clauses_for(orm_models.Event.event)
+
+    def build_where_clauses_for(
+        self, column: "InstrumentedAttribute[str]"
+    ) -> Sequence["ColumnExpressionArgument[bool]"]:
+        """Builds the WHERE clauses for the given column of event names"""
         filters: List["ColumnExpressionArgument[bool]"] = []
 
         if self.prefix:
             filters.append(
-                sa.or_(
-                    *[
-                        orm_models.Event.event.startswith(prefix)
-                        for prefix in self.prefix
-                    ]
-                )
+                sa.or_(*[column.startswith(prefix) for prefix in self.prefix])
             )
 
         if self.exclude_prefix:
             filters.append(
                 sa.and_(
                     *[
-                        sa.not_(orm_models.Event.event.startswith(prefix))
+                        sa.not_(column.startswith(prefix))
                         for prefix in self.exclude_prefix
                     ]
                 )
             )
 
         if self.name:
-            filters.append(orm_models.Event.event.in_(self.name))
+            filters.append(column.in_(self.name))
 
         if self.exclude_name:
-            filters.append(orm_models.Event.event.not_in(self.exclude_name))
+            filters.append(column.not_in(self.exclude_name))
 
         return filters
 
@@ -263,25 +265,28 @@ class EventResourceFilter(EventDataFilter):
 
         return True
 
-    def build_where_clauses(self) -> Sequence["ColumnExpressionArgument[bool]"]:
+    def build_resource_id_clauses_for(
+        self, column: "InstrumentedAttribute[str]"
+    ) -> List["ColumnExpressionArgument[bool]"]:
+        """Builds the WHERE clauses for the `id` and `id_prefix` criteria, for the given
+        column of resource IDs"""
         filters: List["ColumnExpressionArgument[bool]"] = []
 
-        # If we're doing an exact or prefix search on resource_id, this is efficient
-        # enough to do on the events table without going to the event_resources table
-
         if self.id:
-            filters.append(orm_models.Event.resource_id.in_(self.id))
+            filters.append(column.in_(self.id))
 
         if self.id_prefix:
             filters.append(
-                sa.or_(
-                    *[
-                        orm_models.Event.resource_id.startswith(prefix)
-                        for prefix in self.id_prefix
-                    ]
-                )
+                sa.or_(*[column.startswith(prefix) for prefix in self.id_prefix])
             )
 
+        return filters
+
+    def build_where_clauses(self) -> Sequence["ColumnExpressionArgument[bool]"]:
+        # If we're doing an exact or prefix search on resource_id, this is efficient
+        # enough to do on the events table without going to the event_resources table
+        filters = self.build_resource_id_clauses_for(orm_models.Event.resource_id)
+
         if self.labels:
             labels = self.labels.deepcopy()
 
@@ -2,11 +2,38 @@ from typing import Iterable
 
 from syntask.logging import get_logger
 from syntask.server.events.schemas.events import ReceivedEvent
-from syntask.server.utilities.messaging import Publisher, create_publisher
+from syntask.server.utilities.messaging import Message, Publisher, create_publisher
 from syntask.settings import SYNTASK_EVENTS_MAXIMUM_SIZE_BYTES
 
 logger = get_logger(__name__)
 
+# The attribute of a message where its decoded event is kept
+_DECODED_EVENT = "_syntask_decoded_event"
+
+
+def event_from_message(message: Message) -> ReceivedEvent:
+    """
+    Returns the event carried by a message, decoding it only the first time it is
+    requested.  When several consumers receive the same message object, as they do
+    with the in-memory broker, they will all share one decoded event, so consumers must
+    not modify it.
+    """
+    event = getattr(message, _DECODED_EVENT, None)
+    if event is None:
+        event = ReceivedEvent.model_validate_json(message.data)
+        attach_event(message, event)
+    return event
+
+
+def attach_event(message: Message, event: ReceivedEvent) -> None:
+    """Records the decoded event for a message that was made from that event"""
+    try:
+        setattr(message, _DECODED_EVENT, event)
+    except AttributeError:
+        # some brokers' messages can't hold extra attributes, in which case each
+        # consumer will decode the message for itself
+        pass
+
 
 async def publish(events: Iterable[ReceivedEvent]):
     """Send the given events as a batch via the default publisher"""
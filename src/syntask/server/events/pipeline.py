@@ -1,5 +1,6 @@
 from typing import List
 
+from syntask.server.events.messaging import attach_event
 from syntask.server.events.schemas.events import Event, ReceivedEvent
 from syntask.server.events.services import event_persister
 from syntask.server.services import task_run_recorder
@@ -16,6 +17,7 @@ class EventsPipeline:
                 data=received_event.model_dump_json().encode(),
                 attributes={"id": str(event.id), "event": event.event},
             )
+            attach_event(message, received_event)
             messages.append(message)
         return messages
 
@@ -5,6 +5,7 @@ import pendulum
 import rich
 
 from syntask.logging import get_logger
+from syntask.server.events.messaging import event_from_message
 from syntask.server.events.schemas.events import ReceivedEvent
 from syntask.server.utilities.messaging import Message, create_consumer
 
@@ -26,7 +27,7 @@ class EventLogger:
 
         async def handler(message: Message):
             now = pendulum.now("UTC")
-            event: ReceivedEvent = ReceivedEvent.model_validate_json(message.data)
+            event: ReceivedEvent = event_from_message(message)
 
             console.print(
                 "Event:",
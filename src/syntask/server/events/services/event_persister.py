@@ -9,12 +9,16 @@ from datetime import timedelta
 from typing import AsyncGenerator, List, Optional
 
 import pendulum
-import sqlalchemy as sa
 
 from syntask.logging import get_logger
 from syntask.server.database.dependencies import provide_database_interface
+from syntask.server.events.messaging import event_from_message
 from syntask.server.events.schemas.events import ReceivedEvent
-from syntask.server.events.storage.database import write_events
+from syntask.server.events.storage.database import (
+    ensure_event_partitions,
+    trim_events,
+    write_events,
+)
 from syntask.server.utilities.messaging import Message, MessageHandler, create_consumer
 from syntask.settings import (
     SYNTASK_API_SERVICES_EVENT_PERSISTER_BATCH_SIZE,
@@ -116,13 +120,12 @@ async def create_handler(
 
         try:
             async with db.session_context() as session:
-                result = await session.execute(
-                    sa.delete(db.Event).where(db.Event.occurred < older_than)
-                )
+                await ensure_event_partitions(session)
+                trimmed = await trim_events(session, older_than)
                 await session.commit()
-                if result.rowcount:
+                if trimmed:
                     logger.debug(
-                        "Trimmed %s events older than %s.", result.rowcount, older_than
+                        "Trimmed %s events older than %s.", trimmed, older_than
                     )
         except Exception:
             logger.exception("Error trimming events", exc_info=True)
@@ -148,7 +151,7 @@ async def create_handler(
         if not message.data:
             return
 
-        event = ReceivedEvent.model_validate_json(message.data)
+        event = event_from_message(message)
 
         logger.debug(
             "Received event: %s with id: %s for resource: %s",
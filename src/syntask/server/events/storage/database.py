@@ -1,14 +1,21 @@
 from typing import TYPE_CHECKING, Any, Dict, Generator, List, Optional, Sequence, Tuple
 
+import pendulum
 import pydantic
 import sqlalchemy as sa
+from pendulum.datetime import DateTime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 
 from syntask.logging.loggers import get_logger
 from syntask.server.database.dependencies import db_injector, provide_database_interface
 from syntask.server.database.interface import SyntaskDBInterface
-from syntask.server.events.counting import Countable, TimeUnit
+from syntask.server.database.partitions import (
+    drop_partitions_before,
+    ensure_daily_partitions,
+    lock_partitions,
+)
+from syntask.server.events.counting import ROLLUP_GRANULARITIES, Countable, TimeUnit
 from syntask.server.events.filters import EventFilter, EventOrder
 from syntask.server.events.schemas.events import EventCount, ReceivedEvent
 from syntask.server.events.storage import (
@@ -231,9 +238,14 @@ async def _write_sqlite_events(
         events_to_insert = [
             event for event in batch if event.id not in existing_event_ids
         ]
+        if not events_to_insert:
+            continue
+
         event_rows = [event.as_database_row() for event in events_to_insert]
         await session.execute(db.insert(db.Event).values(event_rows))
 
+        await _write_event_count_rollups(session, events_to_insert)
+
         resource_rows: List[Dict[str, Any]] = []
         for event in events_to_insert:
             resource_rows.extend(event.as_database_resource_rows())
@@ -265,6 +277,10 @@ async def _write_postgres_events(
         )
         inserted_event_ids = set(result.all())
 
+        await _write_event_count_rollups(
+            session, [event for event in batch if event.id in inserted_event_ids]
+        )
+
         resource_rows: List[Dict[str, Any]] = []
         for event in batch:
             if event.id not in inserted_event_ids:
@@ -280,6 +296,93 @@ async def _write_postgres_events(
         await session.execute(db.insert(db.EventResource).values(resource_rows))
 
 
+def _resource_label(event: ReceivedEvent) -> str:
+    """The display name of an event's resource, as used for counting by resource"""
+    for label in ("syntask.resource.name", "syntask.name"):
+        value = event.resource.get(label)
+        if value is not None:
+            return value
+    return event.resource.id
+
+
+@db_injector
+async def _write_event_count_rollups(
+    db: SyntaskDBInterface, session: AsyncSession, events: List[ReceivedEvent]
+) -> None:
+    """
+    Adds newly written events to the per-minute, per-hour, and per-day counts of
+    events by name and resource.
+
+    Args:
+        session: a database session
+        events: the events that were inserted, excluding any duplicates
+    """
+    rollups: Dict[Tuple[str, DateTime, str, str], Dict[str, Any]] = {}
+    for event in events:
+        occurred = pendulum.instance(event.occurred).in_timezone("UTC")
+        label = _resource_label(event)
+        for granularity in ROLLUP_GRANULARITIES:
+            bucket_start = granularity.truncate(occurred)
+            key = (granularity.value, bucket_start, event.event, event.resource.id)
+            rollup = rollups.get(key)
+            if rollup is None:
+                rollups[key] = {
+                    "granularity": granularity.value,
+                    "bucket_start": bucket_start,
+                    "event": event.event,
+                    "resource_id": event.resource.id,
+                    "resource_label": label,
+                    "count": 1,
+                    "oldest": occurred,
+                    "latest": occurred,
+                }
+                continue
+
+            rollup["count"] += 1
+            if occurred < rollup["oldest"]:
+                rollup["oldest"] = occurred
+            if occurred >= rollup["latest"]:
+                rollup["latest"] = occurred
+                rollup["resource_label"] = label
+
+    if not rollups:
+        return
+
+    table = db.EventCountRollup
+    insert = db.insert(table.__table__)
+    # rows are written in a consistent order so that concurrent writers can't deadlock
+    await session.execute(
+        insert.on_conflict_do_update(
+            index_elements=[
+                table.granularity,
+                table.bucket_start,
+                table.event,
+                table.resource_id,
+            ],
+            set_=dict(
+                count=table.count + insert.excluded.count,
+                oldest=sa.case(
+                    (insert.excluded.oldest < table.oldest, insert.excluded.oldest),
+                    else_=table.oldest,
+                ),
+                latest=sa.case(
+                    (insert.excluded.latest > table.latest, insert.excluded.latest),
+                    else_=table.latest,
+                ),
+                resource_label=sa.case(
+                    (
+                        insert.excluded.latest >= table.latest,
+                        insert.excluded.resource_label,
+                    ),
+                    else_=table.resource_label,
+                ),
+                updated=pendulum.now("UTC"),
+            ),
+        ),
+        [rollups[key] for key in sorted(rollups)],
+    )
+
+
 def get_max_query_parameters() -> int:
     dialect = get_dialect(SYNTASK_API_DATABASE_CONNECTION_URL.value())
     if dialect.name == "postgresql":
@@ -321,3 +424,86 @@ def _in_safe_batches(
 
     if batch:
         yield batch
+
+
+# On Postgres, the events tables are partitioned by day on `occurred` so that old events
+# can be trimmed by dropping whole partitions, and so that queries bounded by
+# `occurred` only read the partitions for those days.
+PARTITIONED_EVENT_TABLES = ("events", "event_resources")
+
+# How many days of partitions to create ahead of today
+EVENT_PARTITIONS_AHEAD = 2
+
+_EVENT_PARTITIONS_LOCK = "syntask_event_partitions"
+
+
+@db_injector
+async def ensure_event_partitions(
+    db: SyntaskDBInterface,
+    session: AsyncSession,
+    now: Optional[DateTime] = None,
+) -> List[str]:
+    """
+    Creates the daily partitions of the events tables for today and the next few days,
+    moving any events for those days out of the default partition.  Does nothing on
+    SQLite, which doesn't support partitioning.
+
+    Returns:
+        the names of the partitions created
+    """
+    if db.dialect.name != "postgresql":
+        return []
+
+    await lock_partitions(session, _EVENT_PARTITIONS_LOCK)
+
+    today = (now or pendulum.now("UTC")).in_timezone("UTC").start_of("day")
+
+    created: List[str] = []
+    for table in PARTITIONED_EVENT_TABLES:
+        created += await ensure_daily_partitions(
+            session, table, "occurred", today, EVENT_PARTITIONS_AHEAD
+        )
+    return created
+
+
+@db_injector
+async def trim_events(
+    db: SyntaskDBInterface, session: AsyncSession, older_than: DateTime
+) -> int:
+    """
+    Removes the events, their resources, and their count rollups from before the given
+    time.  On Postgres, the partitions that only hold older events are dropped whole,
+    leaving only the partition that spans `older_than` to be trimmed row by row.
+
+    Returns:
+        the number of events deleted row by row
+    """
+    if db.dialect.name == "postgresql":
+        await lock_partitions(session, _EVENT_PARTITIONS_LOCK)
+        for table in PARTITIONED_EVENT_TABLES:
+            await drop_partitions_before(session, table, older_than)
+
+    result = await session.execute(
+        sa.delete(db.Event).where(db.Event.occurred < older_than)
+    )
+    await session.execute(
+        sa.delete(db.EventResource).where(db.EventResource.occurred < older_than)
+    )
+
+    # Only trim the rollups that cover nothing but trimmed events
+    await session.execute(
+        sa.delete(db.EventCountRollup).where(
+            sa.or_(
+                *[
+                    sa.and_(
+                        db.EventCountRollup.granularity == granularity.value,
+                        db.EventCountRollup.bucket_start
+                        <= older_than - granularity.as_timedelta(1),
+                    )
+                    for granularity in ROLLUP_GRANULARITIES
+                ]
+            )
+        )
+    )
+
+    return result.rowcount
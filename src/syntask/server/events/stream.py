@@ -1,23 +1,137 @@
 import asyncio
 from asyncio import Queue
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, AsyncIterable, Dict, Optional, Set
+from typing import AsyncGenerator, AsyncIterable, Dict, List, Optional, Set, Tuple
+
+from prometheus_client import Counter, Gauge
 
 from syntask.logging import get_logger
 from syntask.server.events.filters import EventFilter
+from syntask.server.events.messaging import event_from_message
 from syntask.server.events.schemas.events import ReceivedEvent
 from syntask.server.utilities import messaging
 
 logger = get_logger(__name__)
 
+EVENT_STREAM_SUBSCRIBERS = Gauge(
+    "syntask_event_stream_subscribers",
+    "The number of subscribers to the server's stream of events",
+)
+EVENT_STREAM_FILTER_CHECKS = Counter(
+    "syntask_event_stream_filter_checks",
+    "The number of times an event was checked against a subscriber's filter",
+)
+EVENT_STREAM_EVENTS_DELIVERED = Counter(
+    "syntask_event_stream_events_delivered",
+    "The number of events delivered to subscribers of the server's stream of events",
+)
+EVENT_STREAM_EVENTS_DROPPED = Counter(
+    "syntask_event_stream_events_dropped",
+    (
+        "The number of events dropped because a subscriber to the server's stream of "
+        "events had too large a backlog"
+    ),
+)
+
 subscribers: Set["Queue[ReceivedEvent]"] = set()
 filters: Dict["Queue[ReceivedEvent]", EventFilter] = {}
 
+# The number of events dropped for each subscriber since it last kept up
+dropped: Dict["Queue[ReceivedEvent]", int] = {}
+
 # The maximum number of message that can be waiting for one subscriber, after which
 # new messages will be dropped
 SUBSCRIPTION_BACKLOG = 256
 
 
+class SubscriptionIndex:
+    """
+    Indexes subscribers by the event names and resource IDs their filters require, so
+    that each event is only checked against the filters of subscribers that could
+    possibly want it.
+
+    Each subscriber is indexed by the most selective of its criteria: the exact
+    resource IDs it wants, then the exact event names, then the event name prefixes.
+    Subscribers with none of those criteria are candidates for every event.
+    """
+
+    def __init__(self) -> None:
+        self._by_resource_id: Dict[str, Set["Queue[ReceivedEvent]"]] = {}
+        self._by_name: Dict[str, Set["Queue[ReceivedEvent]"]] = {}
+        # prefixes are kept by length, so that each event only needs one lookup for
+        # each distinct prefix length
+        self._by_prefix: Dict[int, Dict[str, Set["Queue[ReceivedEvent]"]]] = {}
+        self._unindexed: Set["Queue[ReceivedEvent]"] = set()
+
+        # the index entries for each subscriber, so they can be removed later
+        self._entries: Dict[
+            "Queue[ReceivedEvent]",
+            List[Tuple[Dict[str, Set["Queue[ReceivedEvent]"]], str]],
+        ] = {}
+
+    def _entries_for(
+        self, filter: EventFilter
+    ) -> List[Tuple[Dict[str, Set["Queue[ReceivedEvent]"]], str]]:
+        if filter.resource and filter.resource.id:
+            return [(self._by_resource_id, id) for id in filter.resource.id]
+
+        if filter.event and filter.event.name:
+            return [(self._by_name, name) for name in filter.event.name]
+
+        if filter.event and filter.event.prefix:
+            return [
+                (self._by_prefix.setdefault(len(prefix), {}), prefix)
+                for prefix in filter.event.prefix
+            ]
+
+        return []
+
+    def add(self, queue: "Queue[ReceivedEvent]", filter: EventFilter) -> None:
+        entries = self._entries_for(filter)
+        if not entries:
+            self._unindexed.add(queue)
+
+        for index, key in entries:
+            index.setdefault(key, set()).add(queue)
+
+        self._entries[queue] = entries
+
+    def remove(self, queue: "Queue[ReceivedEvent]") -> None:
+        self._unindexed.discard(queue)
+
+        for index, key in self._entries.pop(queue, []):
+            bucket = index.get(key)
+            if bucket is None:
+                continue
+            bucket.discard(queue)
+            if not bucket:
+                del index[key]
+
+        for length in [
+            length for length, index in self._by_prefix.items() if not index
+        ]:
+            del self._by_prefix[length]
+
+    def candidates(self, event: ReceivedEvent) -> Set["Queue[ReceivedEvent]"]:
+        """The subscribers whose filters could include the given event"""
+        candidates = set(self._unindexed)
+
+        if queues := self._by_resource_id.get(event.resource.id):
+            candidates.update(queues)
+
+        if queues := self._by_name.get(event.event):
+            candidates.update(queues)
+
+        for length, by_prefix in self._by_prefix.items():
+            if queues := by_prefix.get(event.event[:length]):
+                candidates.update(queues)
+
+        return candidates
+
+
+index = SubscriptionIndex()
+
+
 @asynccontextmanager
 async def subscribed(
     filter: EventFilter,
@@ -26,12 +140,17 @@ async def subscribed(
 
     subscribers.add(queue)
     filters[queue] = filter
+    index.add(queue, filter)
+    EVENT_STREAM_SUBSCRIBERS.inc()
 
     try:
         yield queue
     finally:
         subscribers.remove(queue)
+        index.remove(queue)
         del filters[queue]
+        dropped.pop(queue, None)
+        EVENT_STREAM_SUBSCRIBERS.dec()
 
 
 @asynccontextmanager
@@ -72,8 +191,9 @@ async def distributor() -> AsyncGenerator[messaging.MessageHandler, None]:
             return
 
         if subscribers:
-            event = ReceivedEvent.model_validate_json(message.data)
-            for queue in subscribers:
+            event = event_from_message(message)
+            for queue in index.candidates(event):
+                EVENT_STREAM_FILTER_CHECKS.inc()
                 filter = filters[queue]
                 if filter.excludes(event):
                     continue
@@ -81,8 +201,26 @@ async def distributor() -> AsyncGenerator[messaging.MessageHandler, None]:
                 try:
                     queue.put_nowait(event)
                 except asyncio.QueueFull:
+                    EVENT_STREAM_EVENTS_DROPPED.inc()
+                    if queue not in dropped:
+                        logger.warning(
+                            "A subscriber to the event stream has a backlog of %s "
+                            "events and is not keeping up; dropping events for it "
+                            "until it catches up",
+                            queue.qsize(),
+                        )
+                        dropped[queue] = 0
+                    dropped[queue] += 1
                     continue
 
+                EVENT_STREAM_EVENTS_DELIVERED.inc()
+                if queue in dropped:
+                    logger.warning(
+                        "A subscriber to the event stream has caught up after %s "
+                        "events were dropped",
+                        dropped.pop(queue),
+                    )
+
     yield message_handler
 
 
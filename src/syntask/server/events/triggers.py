@@ -7,12 +7,12 @@ import asyncio
 from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import timedelta
 from typing import (
-    TYPE_CHECKING,
     AsyncGenerator,
     Collection,
     Dict,
     List,
     Optional,
+    Set,
     Tuple,
 )
 from uuid import UUID
@@ -29,6 +29,12 @@ from syntask.server.database.dependencies import db_injector
 from syntask.server.database.interface import SyntaskDBInterface
 from syntask.server.events import messaging
 from syntask.server.events.actions import ServerActionTypes
+from syntask.server.events.buckets import (
+    AUTOMATION_BUCKETS_CHECKPOINTED,
+    AutomationBucket,
+    BucketStore,
+    bucket_key,
+)
 from syntask.server.events.models.automations import (
     automations_session,
     read_automation,
@@ -54,14 +60,10 @@ from syntask.server.events.schemas.automations import (
     TriggeredAction,
     TriggerState,
 )
-from syntask.server.events.schemas.events import ReceivedEvent
+from syntask.server.events.schemas.events import ReceivedEvent, ResourceSpecification
 from syntask.server.utilities.messaging import Message, MessageHandler
 from syntask.settings import SYNTASK_EVENTS_EXPIRED_BUCKET_BUFFER
 
-if TYPE_CHECKING:
-    from syntask.server.database.orm_models import ORMAutomationBucket
-
-
 logger = get_logger(__name__)
 
 AutomationID: TypeAlias = UUID
@@ -74,10 +76,10 @@ AUTOMATION_BUCKET_BATCH_SIZE = 500
 async def evaluate(
     session: AsyncSession,
     trigger: EventTrigger,
-    bucket: "ORMAutomationBucket",
+    bucket: AutomationBucket,
     now: DateTime,
     triggering_event: Optional[ReceivedEvent],
-) -> Optional["ORMAutomationBucket"]:
+) -> Optional[AutomationBucket]:
     """Evaluates an Automation, either triggered by a specific event or proactively
     on a time interval.  Evaluating a Automation updates the associated counters for
     each automation, and will fire the associated action if it has met the threshold."""
@@ -507,7 +509,7 @@ async def reactive_evaluation(event: ReceivedEvent, depth: int = 0):
 
             async with automations_session(begin_transaction=True) as session:
                 try:
-                    bucket: Optional["ORMAutomationBucket"] = None
+                    bucket: Optional[AutomationBucket] = None
 
                     if trigger.after and trigger.starts_after(event.event):
                         # When an event matches both the after and expect, each event
@@ -601,12 +603,15 @@ async def periodic_evaluation(now: DateTime):
         await reactive_evaluation(event)
 
     async with automations_session() as session:
+        await checkpoint_buckets(session)
         await sweep_closed_buckets(
             session,
             as_of - SYNTASK_EVENTS_EXPIRED_BUCKET_BUFFER.value(),
         )
         await session.commit()
 
+    bucket_store.evict_idle()
+
 
 async def evaluate_periodically(periodic_granularity: timedelta):
     """Runs periodic evaluation on the given interval"""
@@ -642,8 +647,154 @@ def _automations_lock() -> asyncio.Lock:
     return __automations_lock
 
 
+_IndexEntries: TypeAlias = List[Tuple[Dict[str, Set[TriggerID]], str]]
+
+
+class TriggerIndex:
+    """
+    Indexes the loaded triggers by the event names and resource labels they require,
+    so that each event is only checked against the triggers that could cover it.
+
+    Each trigger is indexed by the most selective of its criteria: the exact IDs of
+    the resources it matches, then the exact IDs of the related resources it matches,
+    then the prefixes of the events it expects (or starts after), then the prefixes of
+    the IDs of the resources it matches.  Triggers with none of those criteria are
+    candidates for every event.  Candidates are still checked with `covers`, so the
+    index only has to be sure never to leave out a trigger that covers an event.
+    """
+
+    def __init__(self) -> None:
+        self._by_resource_id: Dict[str, Set[TriggerID]] = {}
+        self._by_related_resource_id: Dict[str, Set[TriggerID]] = {}
+        # prefixes are kept by length, so that each event only needs one lookup for
+        # each distinct prefix length
+        self._by_event_prefix: Dict[int, Dict[str, Set[TriggerID]]] = {}
+        self._by_resource_prefix: Dict[int, Dict[str, Set[TriggerID]]] = {}
+        self._unindexed: Set[TriggerID] = set()
+
+        # the index entries for each trigger, so they can be removed later
+        self._entries: Dict[TriggerID, _IndexEntries] = {}
+
+        # the order the triggers were added, so candidates are evaluated in that order
+        self._order: Dict[TriggerID, int] = {}
+        self._added = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _resource_ids(spec: ResourceSpecification) -> Optional[List[str]]:
+        """The resource IDs the specification requires, or None if it would match
+        resources with any ID"""
+        if "syntask.resource.id" not in spec:
+            return None
+        values = spec["syntask.resource.id"]
+        if not values or any(value.startswith("!") for value in values):
+            return None
+        return values
+
+    @staticmethod
+    def _event_prefixes(trigger: EventTrigger) -> Optional[List[str]]:
+        """The prefixes of the events the trigger covers, or None if it would cover
+        events with any name"""
+        if not trigger.expect:
+            return None
+        # Note: like `event_pattern`, these are matched at the start of the event name
+        prefixes = [name.split("*", 1)[0] for name in trigger.expect | trigger.after]
+        if not all(prefixes):
+            return None
+        return prefixes
+
+    def _entries_for(self, trigger: EventTrigger) -> _IndexEntries:
+        resource_ids = self._resource_ids(trigger.match)
+        if resource_ids and not any(id.endswith("*") for id in resource_ids):
+            return [(self._by_resource_id, id) for id in resource_ids]
+
+        related_ids = self._resource_ids(trigger.match_related)
+        if related_ids and not any(id.endswith("*") for id in related_ids):
+            return [(self._by_related_resource_id, id) for id in related_ids]
+
+        if event_prefixes := self._event_prefixes(trigger):
+            return [
+                (self._by_event_prefix.setdefault(len(prefix), {}), prefix)
+                for prefix in event_prefixes
+            ]
+
+        if resource_ids:
+            prefixes = [id[:-1] if id.endswith("*") else id for id in resource_ids]
+            if all(prefixes):
+                return [
+                    (self._by_resource_prefix.setdefault(len(prefix), {}), prefix)
+                    for prefix in prefixes
+                ]
+
+        return []
+
+    def add(self, trigger: EventTrigger) -> None:
+        self.remove(trigger.id)
+
+        entries = self._entries_for(trigger)
+        if not entries:
+            self._unindexed.add(trigger.id)
+
+        for index, key in entries:
+            index.setdefault(key, set()).add(trigger.id)
+
+        self._entries[trigger.id] = entries
+        self._order[trigger.id] = self._added
+        self._added += 1
+
+    def remove(self, trigger_id: TriggerID) -> None:
+        self._unindexed.discard(trigger_id)
+        self._order.pop(trigger_id, None)
+
+        for index, key in self._entries.pop(trigger_id, []):
+            bucket = index.get(key)
+            if bucket is None:
+                continue
+            bucket.discard(trigger_id)
+            if not bucket:
+                del index[key]
+
+        for by_prefix in (self._by_event_prefix, self._by_resource_prefix):
+            for length in [length for length, index in by_prefix.items() if not index]:
+                del by_prefix[length]
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def candidates(self, event: ReceivedEvent) -> List[TriggerID]:
+        """The triggers that could cover the given event, in the order they were
+        added"""
+        candidates = set(self._unindexed)
+
+        resource_id = event.resource.id
+        if found := self._by_resource_id.get(resource_id):
+            candidates.update(found)
+
+        for length, by_prefix in self._by_resource_prefix.items():
+            if found := by_prefix.get(resource_id[:length]):
+                candidates.update(found)
+
+        for length, by_prefix in self._by_event_prefix.items():
+            if found := by_prefix.get(event.event[:length]):
+                candidates.update(found)
+
+        if self._by_related_resource_id:
+            for related in event.related:
+                if found := self._by_related_resource_id.get(related.id):
+                    candidates.update(found)
+
+        return sorted(candidates, key=self._order.__getitem__)
+
+
+trigger_index = TriggerIndex()
+
+
 def find_interested_triggers(event: ReceivedEvent) -> Collection[EventTrigger]:
-    candidates = triggers.values()
+    candidates = [
+        triggers[trigger_id] for trigger_id in trigger_index.candidates(event)
+    ]
     return [trigger for trigger in candidates if trigger.covers(event)]
 
 
@@ -662,6 +813,7 @@ def load_automation(automation: Optional[Automation]):
 
     for trigger in event_triggers:
         triggers[trigger.id] = trigger
+        trigger_index.add(trigger)
         next_proactive_runs.pop(trigger.id, None)
 
 
@@ -670,6 +822,7 @@ def forget_automation(automation_id: UUID):
     if automation := automations_by_id.pop(automation_id, None):
         for trigger in automation.triggers():
             triggers.pop(trigger.id, None)
+            trigger_index.remove(trigger.id)
             next_proactive_runs.pop(trigger.id, None)
 
 
@@ -681,6 +834,9 @@ async def automation_changed(
         if event in ("automation__deleted", "automation__updated"):
             forget_automation(automation_id)
 
+        if event == "automation__deleted":
+            bucket_store.evict(automation_id)
+
         if event in ("automation__created", "automation__updated"):
             async with automations_session() as session:
                 automation = await read_automation(session, automation_id)
@@ -703,12 +859,85 @@ async def load_automations(db: SyntaskDBInterface, session: AsyncSession):
     )
 
 
+# The hot buckets for the loaded automations, which are checkpointed to the database by
+# `checkpoint_buckets`
+bucket_store = BucketStore()
+
+
+@db_injector
+async def checkpoint_buckets(
+    db: SyntaskDBInterface,
+    session: AsyncSession,
+    automation_id: Optional[UUID] = None,
+    trigger_id: Optional[UUID] = None,
+) -> int:
+    """Writes the buckets that have changed in memory back to the database, optionally
+    limited to one automation or trigger, and commits the session.  Returns the number
+    of buckets written."""
+    buckets = bucket_store.dirty(automation_id=automation_id, trigger_id=trigger_id)
+    if not buckets:
+        return 0
+
+    # Take a snapshot of the buckets and mark them clean before writing, so that any
+    # changes made while the checkpoint is in progress will be written by the next one
+    rows = [bucket.to_row() for bucket in buckets]
+    bucket_store.checkpointed(buckets)
+
+    try:
+        # The automation may have been deleted since its buckets were last changed
+        result = await session.execute(
+            sa.select(db.Automation.id).where(
+                db.Automation.id.in_({row["automation_id"] for row in rows})
+            )
+        )
+        existing = set(result.scalars().all())
+        rows = [row for row in rows if row["automation_id"] in existing]
+
+        now = pendulum.now("UTC")
+        for i in range(0, len(rows), AUTOMATION_BUCKET_BATCH_SIZE):
+            batch = rows[i : i + AUTOMATION_BUCKET_BATCH_SIZE]
+            insert = db.insert(db.AutomationBucket).values(
+                [{**row, "updated": now} for row in batch]
+            )
+            await session.execute(
+                insert.on_conflict_do_update(
+                    index_elements=[
+                        db.AutomationBucket.automation_id,
+                        db.AutomationBucket.trigger_id,
+                        db.AutomationBucket.bucketing_key,
+                    ],
+                    set_=dict(
+                        start=insert.excluded.start,
+                        end=insert.excluded.end,
+                        count=insert.excluded.count,
+                        last_event=insert.excluded.last_event,
+                        last_operation=insert.excluded.last_operation,
+                        triggered_at=insert.excluded.triggered_at,
+                        updated=insert.excluded.updated,
+                    ),
+                )
+            )
+        await session.commit()
+    except Exception:
+        for bucket in buckets:
+            if bucket_store.holds(bucket):
+                bucket_store.mark_dirty(bucket)
+        raise
+
+    AUTOMATION_BUCKETS_CHECKPOINTED.inc(len(rows))
+    logger.debug("Checkpointed %s automation buckets", len(rows))
+    return len(rows)
+
+
 @db_injector
 async def remove_buckets_exceeding_threshold(
     db: SyntaskDBInterface, session: AsyncSession, trigger: EventTrigger
 ):
     """Deletes bucket where the count has already exceeded the threshold"""
     assert isinstance(trigger, EventTrigger), repr(trigger)
+    await checkpoint_buckets(
+        session, automation_id=trigger.automation.id, trigger_id=trigger.id
+    )
     await session.execute(
         sa.delete(db.AutomationBucket).where(
             db.AutomationBucket.automation_id == trigger.automation.id,
@@ -716,6 +945,9 @@ async def remove_buckets_exceeding_threshold(
             db.AutomationBucket.count >= trigger.threshold,
         )
     )
+    bucket_store.remove_exceeding(
+        trigger.automation.id, trigger.id, threshold=trigger.threshold
+    )
 
 
 @db_injector
@@ -724,8 +956,12 @@ async def read_buckets_for_automation(
     session: AsyncSession,
     trigger: Trigger,
     batch_size: int = AUTOMATION_BUCKET_BATCH_SIZE,
-) -> AsyncGenerator["ORMAutomationBucket", None]:
+) -> AsyncGenerator[AutomationBucket, None]:
     """Yields buckets for the given automation and trigger in batches."""
+    await checkpoint_buckets(
+        session, automation_id=trigger.automation.id, trigger_id=trigger.id
+    )
+
     offset = 0
 
     while True:
@@ -741,13 +977,20 @@ async def read_buckets_for_automation(
         )
 
         result = await session.execute(query)
-        buckets = result.scalars().all()
+        rows = result.scalars().all()
 
-        if not buckets:
+        if not rows:
             break
 
-        for bucket in buckets:
-            yield bucket
+        for row in rows:
+            # prefer the copy in memory, which may have changed since the checkpoint
+            key = bucket_key(row.automation_id, row.trigger_id, row.bucketing_key)
+            if key in bucket_store:
+                bucket = bucket_store.get(key)
+            else:
+                bucket = bucket_store.loaded(key, AutomationBucket.from_orm(row))
+            if bucket:
+                yield bucket
 
         offset += batch_size
 
@@ -758,7 +1001,7 @@ async def read_bucket(
     session: AsyncSession,
     trigger: Trigger,
     bucketing_key: Tuple[str, ...],
-) -> Optional["ORMAutomationBucket"]:
+) -> Optional[AutomationBucket]:
     """Gets the bucket this event would fall into for the given Automation, if there is
     one currently"""
     return await read_bucket_by_trigger_id(
@@ -776,69 +1019,60 @@ async def read_bucket_by_trigger_id(
     automation_id: UUID,
     trigger_id: UUID,
     bucketing_key: Tuple[str, ...],
-) -> Optional["ORMAutomationBucket"]:
+) -> Optional[AutomationBucket]:
     """Gets the bucket this event would fall into for the given Automation, if there is
-    one currently"""
+    one currently, reading it from the database only if it isn't already in memory"""
+    key = bucket_key(automation_id, trigger_id, bucketing_key)
+    if key in bucket_store:
+        return bucket_store.get(key)
+
     query = sa.select(db.AutomationBucket).where(
         db.AutomationBucket.automation_id == automation_id,
         db.AutomationBucket.trigger_id == trigger_id,
         db.AutomationBucket.bucketing_key == bucketing_key,
     )
     result = await session.execute(query)
-    bucket = result.scalars().first()
-    if bucket:
-        await session.refresh(bucket)
+    row = result.scalars().first()
 
-    return bucket
+    # another evaluation may have loaded the bucket while we were reading it
+    if key in bucket_store:
+        return bucket_store.get(key)
+
+    return bucket_store.loaded(key, AutomationBucket.from_orm(row) if row else None)
 
 
-@db_injector
 async def increment_bucket(
-    db: SyntaskDBInterface,
     session: AsyncSession,
-    bucket: "ORMAutomationBucket",
+    bucket: AutomationBucket,
     count: int,
     last_event: Optional[ReceivedEvent],
-) -> "ORMAutomationBucket":
+) -> AutomationBucket:
     """Adds the given count to the bucket, returning the new bucket"""
-    additional_updates: dict = {"last_event": last_event} if last_event else {}
-    await session.execute(
-        db.insert(db.AutomationBucket)
-        .values(
-            automation_id=bucket.automation_id,
-            trigger_id=bucket.trigger_id,
-            bucketing_key=bucket.bucketing_key,
-            start=bucket.start,
-            end=bucket.end,
-            count=count,
-            last_operation="increment_bucket[insert]",
-        )
-        .on_conflict_do_update(
-            index_elements=[
-                db.AutomationBucket.automation_id,
-                db.AutomationBucket.trigger_id,
-                db.AutomationBucket.bucketing_key,
-            ],
-            set_=dict(
-                count=db.AutomationBucket.count + count,
-                last_operation="increment_bucket[update]",
-                updated=pendulum.now("UTC"),
-                **additional_updates,
-            ),
-        )
+    current = await read_bucket_by_trigger_id(
+        session, bucket.automation_id, bucket.trigger_id, bucket.bucketing_key
     )
+    if not current:
+        return bucket_store.put(
+            AutomationBucket(
+                automation_id=bucket.automation_id,
+                trigger_id=bucket.trigger_id,
+                bucketing_key=bucket.bucketing_key,
+                start=bucket.start,
+                end=bucket.end,
+                count=count,
+                last_operation="increment_bucket[insert]",
+            )
+        )
 
-    return await read_bucket_by_trigger_id(
-        session,
-        bucket.automation_id,
-        bucket.trigger_id,
-        bucket.bucketing_key,
-    )
+    current.count += count
+    current.last_operation = "increment_bucket[update]"
+    if last_event:
+        current.last_event = last_event
+    bucket_store.mark_dirty(current)
+    return current
 
 
-@db_injector
 async def start_new_bucket(
-    db: SyntaskDBInterface,
     session: AsyncSession,
     trigger: EventTrigger,
     bucketing_key: Tuple[str, ...],
@@ -846,51 +1080,33 @@ async def start_new_bucket(
     end: DateTime,
     count: int,
     triggered_at: Optional[DateTime] = None,
-) -> "ORMAutomationBucket":
+) -> AutomationBucket:
     """Ensures that a bucket with the given start and end exists with the given count,
     returning the new bucket"""
     automation = trigger.automation
 
-    await session.execute(
-        db.insert(db.AutomationBucket)
-        .values(
+    current = await read_bucket_by_trigger_id(
+        session, automation.id, trigger.id, bucketing_key
+    )
+
+    return bucket_store.put(
+        AutomationBucket(
             automation_id=automation.id,
             trigger_id=trigger.id,
             bucketing_key=bucketing_key,
             start=start,
             end=end,
             count=count,
-            last_operation="start_new_bucket[insert]",
-            triggered_at=triggered_at,
-        )
-        .on_conflict_do_update(
-            index_elements=[
-                db.AutomationBucket.automation_id,
-                db.AutomationBucket.trigger_id,
-                db.AutomationBucket.bucketing_key,
-            ],
-            set_=dict(
-                start=start,
-                end=end,
-                count=count,
-                last_operation="start_new_bucket[update]",
-                updated=pendulum.now("UTC"),
-                triggered_at=triggered_at,
+            last_event=current.last_event if current else None,
+            last_operation=(
+                "start_new_bucket[update]" if current else "start_new_bucket[insert]"
             ),
+            triggered_at=triggered_at,
         )
     )
 
-    return await read_bucket_by_trigger_id(
-        session,
-        automation.id,
-        trigger.id,
-        bucketing_key,
-    )
-
 
-@db_injector
 async def ensure_bucket(
-    db: SyntaskDBInterface,
     session: AsyncSession,
     trigger: EventTrigger,
     bucketing_key: Tuple[str, ...],
@@ -898,47 +1114,43 @@ async def ensure_bucket(
     end: DateTime,
     last_event: Optional[ReceivedEvent],
     initial_count: int = 0,
-) -> "ORMAutomationBucket":
+) -> AutomationBucket:
     """Ensures that a bucket has been started for the given automation and key,
     returning the current bucket.  Will not modify the existing bucket."""
     automation = trigger.automation
-    additional_updates: dict = {"last_event": last_event} if last_event else {}
-    await session.execute(
-        db.insert(db.AutomationBucket)
-        .values(
-            automation_id=automation.id,
-            trigger_id=trigger.id,
-            bucketing_key=bucketing_key,
-            last_event=last_event,
-            start=start,
-            end=end,
-            count=initial_count,
-            last_operation="ensure_bucket[insert]",
-        )
-        .on_conflict_do_update(
-            index_elements=[
-                db.AutomationBucket.automation_id,
-                db.AutomationBucket.trigger_id,
-                db.AutomationBucket.bucketing_key,
-            ],
-            set_=dict(
-                # no-op, but this counts as an update so the query returns a row
-                count=db.AutomationBucket.count,
-                **additional_updates,
-            ),
-        )
-    )
 
-    return await read_bucket_by_trigger_id(
+    current = await read_bucket_by_trigger_id(
         session, automation.id, trigger.id, bucketing_key
     )
+    if not current:
+        return bucket_store.put(
+            AutomationBucket(
+                automation_id=automation.id,
+                trigger_id=trigger.id,
+                bucketing_key=bucketing_key,
+                start=start,
+                end=end,
+                count=initial_count,
+                last_event=last_event,
+                last_operation="ensure_bucket[insert]",
+            )
+        )
+
+    if last_event:
+        current.last_event = last_event
+        bucket_store.mark_dirty(current)
+    return current
 
 
 @db_injector
 async def remove_bucket(
-    db: SyntaskDBInterface, session: AsyncSession, bucket: "ORMAutomationBucket"
+    db: SyntaskDBInterface, session: AsyncSession, bucket: AutomationBucket
 ):
-    """Removes the given bucket from the database"""
+    """Removes the given bucket from memory and the database"""
+    if not bucket_store.may_be_persisted(bucket.key):
+        bucket_store.removed(bucket.key)
+        return
+
     await session.execute(
         sa.delete(db.AutomationBucket).where(
             db.AutomationBucket.automation_id == bucket.automation_id,
@@ -946,12 +1158,14 @@ async def remove_bucket(
             db.AutomationBucket.bucketing_key == bucket.bucketing_key,
         )
     )
+    bucket_store.removed(bucket.key)
 
 
 @db_injector
 async def sweep_closed_buckets(
     db: SyntaskDBInterface, session: AsyncSession, older_than: DateTime
 ) -> None:
+    bucket_store.evict_closed(older_than)
     await session.execute(
         sa.delete(db.AutomationBucket).where(db.AutomationBucket.end <= older_than)
     )
@@ -962,7 +1176,9 @@ async def reset():
     reset_events_clock()
     automations_by_id.clear()
     triggers.clear()
+    trigger_index.clear()
     next_proactive_runs.clear()
+    bucket_store.clear()
 
 
 def causal_ordering() -> CausalOrdering:
@@ -1009,7 +1225,7 @@ async def consumer(
         if await ordering.event_has_been_seen(event_id):
             return
 
-        event = ReceivedEvent.model_validate_json(message.data)
+        event = messaging.event_from_message(message)
 
         try:
             await reactive_evaluation(event)
@@ -1022,6 +1238,12 @@ async def consumer(
     finally:
         proactive_task.cancel()
 
+        try:
+            async with automations_session() as session:
+                await checkpoint_buckets(session)
+        except Exception:
+            logger.exception("Error checkpointing automation buckets")
+
 
 async def proactive_evaluation(trigger: EventTrigger, as_of: DateTime) -> DateTime:
     """The core proactive evaluation operation for a single Automation"""
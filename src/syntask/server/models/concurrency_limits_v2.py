@@ -1,7 +1,9 @@
-from typing import List, Optional, Sequence, Union
+from typing import List, Optional, Sequence, Set, Tuple, Union
 from uuid import UUID
 
+import pendulum
 import sqlalchemy as sa
+from pendulum.datetime import DateTime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.elements import ColumnElement
 
@@ -325,3 +327,144 @@ async def bulk_update_denied_slots(
 
     result = await session.execute(query)
     return result.rowcount == len(concurrency_limit_ids)
+
+
+@db_injector
+async def read_available_slots(
+    db: SyntaskDBInterface,
+    session: AsyncSession,
+    concurrency_limit_ids: List[UUID],
+) -> int:
+    """The fewest slots that are free on any of the given active limits"""
+    query = sa.select(
+        sa.func.min(orm_models.ConcurrencyLimitV2.limit - active_slots_after_decay(db))
+    ).where(
+        orm_models.ConcurrencyLimitV2.id.in_(concurrency_limit_ids),
+        orm_models.ConcurrencyLimitV2.active == True,  # noqa
+    )
+    available = (await session.execute(query)).scalar()
+    return max(int(available or 0), 0)
+
+
+async def create_lease(
+    session: AsyncSession,
+    concurrency_limit_ids: List[UUID],
+    slots: int,
+    minimum_slots: int,
+    ttl_seconds: float,
+) -> Optional[orm_models.ConcurrencyLimitLease]:
+    """
+    Leases as many slots as are free on all of the given active limits, up to
+    `slots`, as long as at least `minimum_slots` are free.
+
+    Returns `None` if not enough slots were free, in which case the session must be
+    rolled back, because some of the limits may have been incremented.
+    """
+    if concurrency_limit_ids:
+        available = await read_available_slots(
+            session=session, concurrency_limit_ids=concurrency_limit_ids
+        )
+        slots = min(slots, available)
+        if slots < minimum_slots:
+            return None
+
+        if not await bulk_increment_active_slots(
+            session=session, concurrency_limit_ids=concurrency_limit_ids, slots=slots
+        ):
+            return None
+
+    lease = orm_models.ConcurrencyLimitLease(
+        expiration=pendulum.now("UTC").add(seconds=ttl_seconds),
+        slots=slots,
+        concurrency_limit_ids=[str(id) for id in concurrency_limit_ids],
+    )
+    session.add(lease)
+    await session.flush()
+    return lease
+
+
+async def renew_leases(
+    session: AsyncSession,
+    lease_ids: List[UUID],
+    ttl_seconds: float,
+) -> List[UUID]:
+    """Extends the leases that haven't expired yet, returning their IDs"""
+    now = pendulum.now("UTC")
+    query = sa.select(orm_models.ConcurrencyLimitLease.id).where(
+        orm_models.ConcurrencyLimitLease.id.in_(lease_ids),
+        orm_models.ConcurrencyLimitLease.expiration > now,
+    )
+    renewed = list((await session.execute(query)).scalars().all())
+    if renewed:
+        await session.execute(
+            sa.update(orm_models.ConcurrencyLimitLease)
+            .where(orm_models.ConcurrencyLimitLease.id.in_(renewed))
+            .values(expiration=now.add(seconds=ttl_seconds))
+            .execution_options(synchronize_session=False)
+        )
+    return renewed
+
+
+async def _end_leases(
+    session: AsyncSession,
+    leases: Sequence[orm_models.ConcurrencyLimitLease],
+) -> Tuple[int, Set[UUID]]:
+    ended = 0
+    released: Set[UUID] = set()
+    for lease in leases:
+        # Deleting the lease first means that only one of any concurrent attempts to
+        # end it will release its slots
+        deleted = await session.execute(
+            sa.delete(orm_models.ConcurrencyLimitLease).where(
+                orm_models.ConcurrencyLimitLease.id == lease.id
+            )
+        )
+        if deleted.rowcount != 1:
+            continue
+        ended += 1
+
+        if lease.concurrency_limit_ids:
+            concurrency_limit_ids = [UUID(id) for id in lease.concurrency_limit_ids]
+            await bulk_decrement_active_slots(
+                session=session,
+                concurrency_limit_ids=concurrency_limit_ids,
+                slots=lease.slots,
+            )
+            released.update(concurrency_limit_ids)
+
+    return ended, released
+
+
+async def release_leases(session: AsyncSession, lease_ids: List[UUID]) -> Set[UUID]:
+    """
+    Ends the given leases, releasing their slots and returning the IDs of the limits
+    whose slots were released
+    """
+    query = sa.select(orm_models.ConcurrencyLimitLease).where(
+        orm_models.ConcurrencyLimitLease.id.in_(lease_ids)
+    )
+    leases = (await session.execute(query)).scalars().all()
+    _, released = await _end_leases(session, leases)
+    return released
+
+
+async def expire_leases(
+    session: AsyncSession,
+    now: Optional[DateTime] = None,
+    limit: int = 100,
+) -> Tuple[int, Set[UUID]]:
+    """
+    Ends leases that weren't renewed before they expired, releasing their slots and
+    returning how many leases were ended along with the IDs of the limits whose
+    slots were released
+    """
+    query = (
+        sa.select(orm_models.ConcurrencyLimitLease)
+        .where(
+            orm_models.ConcurrencyLimitLease.expiration <= (now or pendulum.now("UTC"))
+        )
+        .order_by(orm_models.ConcurrencyLimitLease.expiration)
+        .limit(limit)
+    )
+    leases = (await session.execute(query)).scalars().all()
+    return await _end_leases(session, leases)
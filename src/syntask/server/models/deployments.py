@@ -665,6 +665,28 @@ async def _generate_scheduled_flow_runs(
         ),
     )
 
+    tags = deployment.tags
+    if auto_scheduled:
+        tags = ["auto-scheduled"] + tags
+
+    # everything but the ID and scheduled time is the same for every run and its
+    # state, so the state is only validated once rather than once per run
+    run_fields = {
+        "flow_id": deployment.flow_id,
+        "deployment_id": deployment_id,
+        "deployment_version": deployment.version,
+        "work_queue_name": deployment.work_queue_name,
+        "work_queue_id": deployment.work_queue_id,
+        "parameters": deployment.parameters,
+        "infrastructure_document_id": deployment.infrastructure_document_id,
+        "tags": tags,
+        "auto_scheduled": auto_scheduled,
+        "state_type": schemas.states.StateType.SCHEDULED,
+        "state_name": "Scheduled",
+    }
+    state_fields = schemas.states.Scheduled(message="Flow run scheduled").model_dump()
+    state_details = state_fields["state_details"]
+
     for deployment_schedule in active_deployment_schedules:
         dates = []
 
@@ -678,30 +700,17 @@ async def _generate_scheduled_flow_runs(
             if len(dates) >= min_runs and dt >= (start_time + min_time):
                 break
 
-        tags = deployment.tags
-        if auto_scheduled:
-            tags = ["auto-scheduled"] + tags
-
         for date in dates:
             runs.append(
                 {
+                    **run_fields,
                     "id": uuid4(),
-                    "flow_id": deployment.flow_id,
-                    "deployment_id": deployment_id,
-                    "deployment_version": deployment.version,
-                    "work_queue_name": deployment.work_queue_name,
-                    "work_queue_id": deployment.work_queue_id,
-                    "parameters": deployment.parameters,
-                    "infrastructure_document_id": deployment.infrastructure_document_id,
                     "idempotency_key": f"scheduled {deployment.id} {date}",
-                    "tags": tags,
-                    "auto_scheduled": auto_scheduled,
-                    "state": schemas.states.Scheduled(
-                        scheduled_time=date,
-                        message="Flow run scheduled",
-                    ).model_dump(),
-                    "state_type": schemas.states.StateType.SCHEDULED,
-                    "state_name": "Scheduled",
+                    "state": {
+                        **state_fields,
+                        "id": uuid4(),
+                        "state_details": {**state_details, "scheduled_time": date},
+                    },
                     "next_scheduled_start_time": date,
                     "expected_start_time": date,
                 }
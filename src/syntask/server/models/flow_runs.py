@@ -25,7 +25,10 @@ from syntask.server.exceptions import ObjectNotFoundError
 from syntask.server.orchestration.core_policy import MinimalFlowPolicy
 from syntask.server.orchestration.global_policy import GlobalFlowPolicy
 from syntask.server.orchestration.policies import BaseOrchestrationPolicy
-from syntask.server.orchestration.rules import FlowOrchestrationContext
+from syntask.server.orchestration.rules import (
+    FlowOrchestrationContext,
+    apply_universal_transforms,
+)
 from syntask.server.schemas.core import TaskRunResult
 from syntask.server.schemas.graph import Graph
 from syntask.server.schemas.responses import OrchestrationResult, SetStateStatus
@@ -540,12 +543,12 @@ async def set_flow_run_state(
                 rule(context, *intended_transition)
             )
 
-        for rule in global_rules:
-            context = await stack.enter_async_context(
-                rule(context, *intended_transition)
-            )
-
-        await context.validate_proposed_state()
+        # the global transforms are the innermost, and only do bookkeeping, so their
+        # hooks are called directly rather than each being entered as a context
+        async with apply_universal_transforms(
+            global_rules, context, *intended_transition
+        ):
+            await context.validate_proposed_state()
 
     if context.orchestration_error is not None:
         raise context.orchestration_error
@@ -4,7 +4,11 @@ Intended for internal use by the Syntask REST API.
 """
 
 from typing import Generator, List, Optional, Sequence, Tuple
+from uuid import uuid4
 
+import pendulum
+import sqlalchemy as sa
+from pendulum.datetime import DateTime
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,6 +17,12 @@ from syntask.logging import get_logger
 from syntask.server.database import orm_models
 from syntask.server.database.dependencies import db_injector
 from syntask.server.database.interface import SyntaskDBInterface
+from syntask.server.database.partitions import (
+    drop_partitions_before,
+    ensure_daily_partitions,
+    lock_partitions,
+    read_partitions,
+)
 from syntask.server.schemas.actions import LogCreate
 from syntask.utilities.collections import batched_iterable
 
@@ -63,16 +73,70 @@ async def create_logs(
             raise
 
 
+# The columns written by `bulk_create_logs`, in the order they are copied
+BULK_LOG_COLUMNS = (
+    "id",
+    "created",
+    "updated",
+    "name",
+    "level",
+    "flow_run_id",
+    "task_run_id",
+    "message",
+    "timestamp",
+)
+
+
+@db_injector
+async def bulk_create_logs(
+    db: SyntaskDBInterface, session: AsyncSession, logs: Sequence[LogCreate]
+) -> None:
+    """
+    Creates many logs at once, with `COPY` on PostgreSQL and with a single prepared
+    statement executed for each log on SQLite.  Unlike `create_logs`, there is no
+    limit on how many logs may be created at once.
+
+    Args:
+        session: a database session
+        logs: a list of log schemas
+    """
+    if not logs:
+        return
+
+    now = pendulum.now("UTC")
+    rows = [
+        {"id": uuid4(), "created": now, "updated": now, **log.model_dump()}
+        for log in logs
+    ]
+
+    if db.dialect.name == "postgresql":
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            orm_models.Log.__tablename__,
+            records=[tuple(row[column] for column in BULK_LOG_COLUMNS) for row in rows],
+            columns=BULK_LOG_COLUMNS,
+        )
+    else:
+        await session.execute(sa.insert(orm_models.Log.__table__), rows)
+
+
 async def read_logs(
     session: AsyncSession,
     log_filter: schemas.filters.LogFilter,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
     sort: schemas.sorting.LogSort = schemas.sorting.LogSort.TIMESTAMP_ASC,
+    after: Optional[schemas.core.LogCursor] = None,
 ) -> Sequence[orm_models.Log]:
     """
     Read logs.
 
+    Logs with the same timestamp are ordered by their ID, so that each log has a stable
+    position that can be used as a cursor for reading the logs after it.  Reading from
+    a cursor uses the timestamp index to skip straight to the next page of logs, where
+    an offset counts through every log before it.
+
     Args:
         session: a database session
         db: the database interface
@@ -80,16 +144,143 @@ async def read_logs(
         offset: Query offset
         limit: Query limit
         sort: Query sort
+        after: only select logs that follow this position in the sort
 
     Returns:
         List[orm_models.Log]: the matching logs
     """
+    descending = sort == schemas.sorting.LogSort.TIMESTAMP_DESC
     query = (
-        select(orm_models.Log).order_by(sort.as_sql_sort()).offset(offset).limit(limit)
+        select(orm_models.Log)
+        .order_by(
+            sort.as_sql_sort(),
+            orm_models.Log.id.desc() if descending else orm_models.Log.id.asc(),
+        )
+        .offset(offset)
+        .limit(limit)
     )
 
     if log_filter:
         query = query.where(log_filter.as_sql_filter())
 
+    if after is not None:
+        if descending:
+            query = query.where(
+                sa.or_(
+                    orm_models.Log.timestamp < after.timestamp,
+                    sa.and_(
+                        orm_models.Log.timestamp == after.timestamp,
+                        orm_models.Log.id < after.id,
+                    ),
+                )
+            )
+        else:
+            query = query.where(
+                sa.or_(
+                    orm_models.Log.timestamp > after.timestamp,
+                    sa.and_(
+                        orm_models.Log.timestamp == after.timestamp,
+                        orm_models.Log.id > after.id,
+                    ),
+                )
+            )
+
     result = await session.execute(query)
     return result.scalars().unique().all()
+
+
+# On PostgreSQL, the log table is partitioned by day on `timestamp` so that old logs
+# can be removed by dropping whole partitions, and so that reads bounded by timestamp
+# only scan the partitions for those days.
+LOG_PARTITIONS_AHEAD = 2
+
+_LOG_PARTITIONS_LOCK = "syntask_log_partitions"
+
+
+@db_injector
+async def ensure_log_partitions(
+    db: SyntaskDBInterface,
+    session: AsyncSession,
+    now: Optional[DateTime] = None,
+    search_index: bool = False,
+) -> List[str]:
+    """
+    Creates the daily partitions of the log table for today and the next few days,
+    moving any logs for those days out of the default partition.  Does nothing on
+    SQLite, which doesn't support partitioning.
+
+    Args:
+        session: a database session
+        now: the current time
+        search_index: whether to add a trigram index on the messages of partitions
+            that have yet to receive logs, for searching logs by their message
+
+    Returns:
+        the names of the partitions created
+    """
+    if db.dialect.name != "postgresql":
+        return []
+
+    await lock_partitions(session, _LOG_PARTITIONS_LOCK)
+
+    now = (now or pendulum.now("UTC")).in_timezone("UTC")
+    today = now.start_of("day")
+    created = await ensure_daily_partitions(
+        session, orm_models.Log.__tablename__, "timestamp", today, LOG_PARTITIONS_AHEAD
+    )
+
+    if search_index:
+        # Indexing a partition that is already receiving logs would block writes to it
+        # until the index is built, so only new and upcoming partitions are indexed
+        for name, lower, _ in await read_partitions(
+            session, orm_models.Log.__tablename__
+        ):
+            if name in created or (lower is not None and lower > now):
+                await session.execute(
+                    sa.text(
+                        f"CREATE INDEX IF NOT EXISTS ix_{name}__message_trgm "
+                        f"ON {name} USING gin (message gin_trgm_ops)"
+                    )
+                )
+
+    return created
+
+
+@db_injector
+async def trim_logs(
+    db: SyntaskDBInterface,
+    session: AsyncSession,
+    older_than: DateTime,
+    limit: Optional[int] = None,
+) -> int:
+    """
+    Removes logs with a timestamp before the given time.  On PostgreSQL, the partitions
+    that only hold older logs are dropped whole, leaving only the partition that spans
+    `older_than` to be trimmed row by row.
+
+    Args:
+        session: a database session
+        older_than: remove logs from before this time
+        limit: the most logs to delete row by row, so that trimming a large table
+            can be spread over several short transactions
+
+    Returns:
+        the number of logs deleted row by row
+    """
+    if db.dialect.name == "postgresql":
+        await lock_partitions(session, _LOG_PARTITIONS_LOCK)
+        await drop_partitions_before(session, orm_models.Log.__tablename__, older_than)
+
+    delete = sa.delete(orm_models.Log).where(orm_models.Log.timestamp < older_than)
+    if limit is not None:
+        delete = delete.where(
+            orm_models.Log.id.in_(
+                sa.select(orm_models.Log.id)
+                .where(orm_models.Log.timestamp < older_than)
+                .limit(limit)
+                .scalar_subquery()
+            )
+        )
+
+    result = await session.execute(delete)
+    return result.rowcount
@@ -26,7 +26,10 @@ from syntask.server.orchestration.core_policy import (
 )
 from syntask.server.orchestration.global_policy import GlobalTaskPolicy
 from syntask.server.orchestration.policies import BaseOrchestrationPolicy
-from syntask.server.orchestration.rules import TaskOrchestrationContext
+from syntask.server.orchestration.rules import (
+    TaskOrchestrationContext,
+    apply_universal_transforms,
+)
 from syntask.server.schemas.responses import OrchestrationResult
 
 T = TypeVar("T", bound=tuple)
@@ -464,12 +467,12 @@ async def set_task_run_state(
                 rule(context, *intended_transition)
             )
 
-        for rule in global_rules:
-            context = await stack.enter_async_context(
-                rule(context, *intended_transition)
-            )
-
-        await context.validate_proposed_state()
+        # the global transforms are the innermost, and only do bookkeeping, so their
+        # hooks are called directly rather than each being entered as a context
+        async with apply_universal_transforms(
+            global_rules, context, *intended_transition
+        ):
+            await context.validate_proposed_state()
 
     if context.orchestration_error is not None:
         raise context.orchestration_error
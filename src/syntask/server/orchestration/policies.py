@@ -37,10 +37,20 @@ class BaseOrchestrationPolicy(ABC):
     def compile_transition_rules(cls, from_state=None, to_state=None):
         """
         Returns rules in policy that are valid for the specified state transition.
+
+        The rules for each transition are only worked out the first time they're
+        needed, and are kept in a table of each policy's rules by transition.
         """
 
-        transition_rules = []
-        for rule in cls.priority():
-            if from_state in rule.FROM_STATES and to_state in rule.TO_STATES:
-                transition_rules.append(rule)
-        return transition_rules
+        transition_table = cls.__dict__.get("_transition_table")
+        if transition_table is None:
+            transition_table = cls._transition_table = {}
+
+        transition = (from_state, to_state)
+        if transition not in transition_table:
+            transition_table[transition] = [
+                rule
+                for rule in cls.priority()
+                if from_state in rule.FROM_STATES and to_state in rule.TO_STATES
+            ]
+        return list(transition_table[transition])
@@ -19,7 +19,7 @@ single line of user code.
 
 import contextlib
 from types import TracebackType
-from typing import Any, Dict, Iterable, List, Optional, Type, Union
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional, Type, Union
 
 import sqlalchemy as sa
 from pydantic import ConfigDict, Field
@@ -1015,3 +1015,48 @@ class BaseUniversalTransform(contextlib.AbstractAsyncContextManager):
         """
 
         return self.context.orchestration_error is not None
+
+
+def _implements(transform: Type[BaseUniversalTransform], hook: str) -> bool:
+    return getattr(transform, hook) is not getattr(BaseUniversalTransform, hook)
+
+
+@contextlib.asynccontextmanager
+async def apply_universal_transforms(
+    transforms: Iterable[Type[BaseUniversalTransform]],
+    context: OrchestrationContext,
+    from_state_type: Optional[states.StateType],
+    to_state_type: Optional[states.StateType],
+) -> AsyncGenerator[OrchestrationContext, None]:
+    """
+    Applies universal transforms to a state transition with the same effect as
+    entering each of them as a context, in order, but by calling their hooks directly.
+
+    Universal transforms are stateless bookkeeping, so there's no need to enter each
+    one as its own context, and hooks that a transform doesn't implement are skipped
+    entirely.  Only the `before_transition` and `after_transition` hooks are called,
+    so transforms applied this way must not override `__aenter__` or `__aexit__`.
+
+    Args:
+        transforms: the universal transforms to apply, in priority order
+        context: the orchestration context of the transition
+        from_state_type: the state type a run is currently in
+        to_state_type: the intended proposed state type prior to any orchestration
+    """
+    applied: List[BaseUniversalTransform] = []
+    try:
+        for transform_type in transforms:
+            transform = transform_type(context, from_state_type, to_state_type)
+            if _implements(transform_type, "before_transition"):
+                await transform.before_transition(context)
+            context.rule_signature.append(str(transform_type))
+            applied.append(transform)
+
+        yield context
+    finally:
+        for transform in reversed(applied):
+            if transform.exception_in_transition():
+                continue
+            if _implements(type(transform), "after_transition"):
+                await transform.after_transition(context)
+            context.finalization_signature.append(str(type(transform)))
@@ -904,6 +904,14 @@ class Log(ORMBaseModel):
     )
 
 
+class LogCursor(SyntaskBaseModel):
+    """The position of a log among logs sorted by timestamp, used to read the logs
+    that follow it without counting through the logs that precede it."""
+
+    timestamp: DateTime = Field(default=..., description="The log timestamp.")
+    id: UUID = Field(default=..., description="The log ID.")
+
+
 class QueueFilter(SyntaskBaseModel):
     """Filter criteria definition for a work queue."""
 
@@ -1261,6 +1261,26 @@ class LogFilterTaskRunId(SyntaskFilterBaseModel):
         return filters
 
 
+class LogFilterMessage(SyntaskFilterBaseModel):
+    """Filter by `Log.message`."""
+
+    like_: Optional[str] = Field(
+        default=None,
+        description=(
+            "A case-insensitive partial match. For example, "
+            " passing 'marvin' will match "
+            "'marvin', 'sad-Marvin', and 'marvin-robot'."
+        ),
+        examples=["marvin"],
+    )
+
+    def _get_filter_list(self) -> List:
+        filters = []
+        if self.like_ is not None:
+            filters.append(orm_models.Log.message.ilike(f"%{self.like_}%"))
+        return filters
+
+
 class LogFilter(SyntaskOperatorFilterBaseModel):
     """Filter logs. Only logs matching all criteria will be returned"""
 
@@ -1276,6 +1296,9 @@ class LogFilter(SyntaskOperatorFilterBaseModel):
     task_run_id: Optional[LogFilterTaskRunId] = Field(
         default=None, description="Filter criteria for `Log.task_run_id`"
     )
+    message: Optional[LogFilterMessage] = Field(
+        default=None, description="Filter criteria for `Log.message`"
+    )
 
     def _get_filter_list(self) -> List:
         filters = []
@@ -1288,6 +1311,8 @@ class LogFilter(SyntaskOperatorFilterBaseModel):
             filters.append(self.flow_run_id.as_sql_filter())
         if self.task_run_id is not None:
             filters.append(self.task_run_id.as_sql_filter())
+        if self.message is not None:
+            filters.append(self.message.as_sql_filter())
 
         return filters
 
@@ -3,13 +3,13 @@ Schedule schemas
 """
 
 import datetime
+import functools
 from typing import Annotated, Any, Generator, List, Optional, Tuple, Union
 
 import dateutil
 import dateutil.rrule
 import pendulum
-import pytz
-from croniter import croniter
+from croniter import CroniterBadCronError, CroniterBadDateError, croniter
 from pydantic import AfterValidator, ConfigDict, Field, field_validator, model_validator
 from pydantic_extra_types.pendulum_dt import DateTime
 
@@ -41,6 +41,125 @@ def _prepare_scheduling_start_and_end(
     return start, end
 
 
+def _to_pendulum(dt: datetime.datetime) -> pendulum.DateTime:
+    """Converts an aware datetime that has already been normalized to its timezone,
+    skipping the normalization `pendulum.instance` would repeat"""
+    return pendulum.DateTime(
+        dt.year,
+        dt.month,
+        dt.day,
+        dt.hour,
+        dt.minute,
+        dt.second,
+        dt.microsecond,
+        tzinfo=dt.tzinfo,
+        fold=dt.fold,
+    )
+
+
+class _CompiledCron:
+    """
+    A five-field cron expression, expanded into the values each of its fields match,
+    for finding the times it fires much faster than croniter does.  Times are naive,
+    and only expressions using plain values, ranges, steps and lists can be compiled.
+    """
+
+    # as with croniter, give up if an expression never matches, like `0 0 30 2 *`
+    MAX_YEARS_BETWEEN_MATCHES = 50
+
+    def __init__(self, expanded: List[List[Union[int, str]]], day_or: bool):
+        minutes, hours, days, months, weekdays = expanded
+        self.minutes = range(60) if minutes == ["*"] else sorted(minutes)
+        self.hours = range(24) if hours == ["*"] else sorted(hours)
+        self.months = None if months == ["*"] else frozenset(months)
+        self.days = None if days == ["*"] else frozenset(days)
+        self.weekdays = None if weekdays == ["*"] else frozenset(weekdays)
+        # like cron, an expression restricting both the day of the month and the
+        # day of the week matches days meeting either one, unless `day_or` is False
+        self.either_day = day_or and self.days is not None and self.weekdays is not None
+
+    def matches_date(self, date: datetime.date) -> bool:
+        if self.months is not None and date.month not in self.months:
+            return False
+        day_matches = self.days is None or date.day in self.days
+        weekday_matches = (
+            self.weekdays is None or date.isoweekday() % 7 in self.weekdays
+        )
+        if self.either_day:
+            return day_matches or weekday_matches
+        return day_matches and weekday_matches
+
+    def iter_after(
+        self, after: datetime.datetime
+    ) -> Generator[datetime.datetime, None, None]:
+        """Yields the times the expression fires after `after`, in order"""
+        one_day = datetime.timedelta(days=1)
+        date = after.date()
+        last_matched_year = date.year
+        while True:
+            if self.matches_date(date):
+                last_matched_year = date.year
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        time = datetime.datetime(
+                            date.year, date.month, date.day, hour, minute
+                        )
+                        if time > after:
+                            yield time
+            elif date.year - last_matched_year > self.MAX_YEARS_BETWEEN_MATCHES:
+                raise CroniterBadDateError("failed to find next date")
+            date += one_day
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_cron(cron: str, day_or: bool) -> Optional[_CompiledCron]:
+    """Compiles a cron expression, or returns `None` if it uses any features
+    (seconds, `L`, `#` and the like) that only croniter handles"""
+    try:
+        expanded, nth_weekday_of_month = croniter.expand(cron)
+    except CroniterBadCronError:
+        return None
+    if len(expanded) != 5 or nth_weekday_of_month:
+        return None
+    if not all(
+        field == ["*"] or all(isinstance(value, int) for value in field)
+        for field in expanded
+    ):
+        return None
+    return _CompiledCron(expanded, day_or=day_or)
+
+
+def _iter_intervals(
+    first: pendulum.DateTime, days: int, seconds: float
+) -> Generator[pendulum.DateTime, None, None]:
+    """Yields `first` and the dates following it, each `days` and `seconds` apart"""
+    if days:
+        next_date = first
+        while True:
+            yield next_date
+            next_date = next_date.add(days=days, seconds=seconds)
+
+    # intervals of less than a day are a fixed amount of elapsed time, which is much
+    # faster to add to a plain UTC datetime than to a pendulum one
+    yield first
+    tz = first.tz
+    interval = datetime.timedelta(seconds=seconds)
+    first_utc = first.in_tz("UTC")
+    next_utc = datetime.datetime(
+        first_utc.year,
+        first_utc.month,
+        first_utc.day,
+        first_utc.hour,
+        first_utc.minute,
+        first_utc.second,
+        first_utc.microsecond,
+        tzinfo=datetime.timezone.utc,
+    )
+    while True:
+        next_utc += interval
+        yield _to_pendulum(next_utc.astimezone(tz))
+
+
 class IntervalSchedule(SyntaskBaseModel):
     """
     A schedule formed by adding `interval` increments to an `anchor_date`. If no
@@ -164,7 +283,7 @@ class IntervalSchedule(SyntaskBaseModel):
         counter = 0
         dates = set()
 
-        while True:
+        for next_date in _iter_intervals(next_date, interval_days, interval_seconds):
             # if the end date was exceeded, exit
             if end and next_date > end:
                 break
@@ -180,8 +299,6 @@ class IntervalSchedule(SyntaskBaseModel):
 
             counter += 1
 
-            next_date = next_date.add(days=interval_days, seconds=interval_seconds)
-
 
 class CronSchedule(SyntaskBaseModel):
     """
@@ -297,32 +414,31 @@ class CronSchedule(SyntaskBaseModel):
         if start.microsecond > 0:
             start += datetime.timedelta(seconds=1)
 
-        # croniter's DST logic interferes with all other datetime libraries except pytz
-        start_localized = pytz.timezone(start.tz.name).localize(
-            datetime.datetime(
-                year=start.year,
-                month=start.month,
-                day=start.day,
-                hour=start.hour,
-                minute=start.minute,
-                second=start.second,
-                microsecond=start.microsecond,
-            )
+        # croniter does not handle DST properly when the start time is in and around
+        # when the actual shift occurs. To work around this, we find the next cron
+        # times from the naive start time, then read them as wall-clock times in the
+        # schedule's timezone.
+        start_naive = datetime.datetime(
+            year=start.year,
+            month=start.month,
+            day=start.day,
+            hour=start.hour,
+            minute=start.minute,
+            second=start.second,
+            microsecond=start.microsecond,
         )
-        start_naive_tz = start.naive()
+        compiled = _compile_cron(self.cron, self.day_or)
+        if compiled:
+            next_times = compiled.iter_after(start_naive)
+        else:
+            cron = croniter(self.cron, start_naive, day_or=self.day_or)  # type: ignore
+            next_times = iter(lambda: cron.get_next(datetime.datetime), None)
 
-        cron = croniter(self.cron, start_naive_tz, day_or=self.day_or)  # type: ignore
         dates = set()
         counter = 0
 
-        while True:
-            # croniter does not handle DST properly when the start time is
-            # in and around when the actual shift occurs. To work around this,
-            # we use the naive start time to get the next cron date delta, then
-            # add that time to the original scheduling anchor.
-            next_time = cron.get_next(datetime.datetime)
-            delta = next_time - start_naive_tz
-            next_date = pendulum.instance(start_localized + delta)
+        for next_time in next_times:
+            next_date = _to_pendulum(start.tz.convert(next_time))
 
             # if the end date was exceeded, exit
             if end and next_date > end:
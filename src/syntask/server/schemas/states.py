@@ -139,7 +139,7 @@ class State(StateBaseModel):
         field.
         """
 
-        field_keys = cls.model_json_schema()["properties"].keys()
+        field_keys = cls.model_fields.keys()
         state_data = {
             field: getattr(orm_state, field, None)
             for field in field_keys
@@ -2,6 +2,8 @@ import syntask.server.services.cancellation_cleanup
 import syntask.server.services.flow_run_notifications
 import syntask.server.services.foreman
 import syntask.server.services.late_runs
+import syntask.server.services.lease_expirations
+import syntask.server.services.log_retention
 import syntask.server.services.pause_expirations
 import syntask.server.services.scheduler
 import syntask.server.services.telemetry
@@ -0,0 +1,60 @@
+"""
+The ExpireConcurrencyLimitLeases service. Responsible for releasing the slots of
+concurrency limit leases that weren't renewed before they expired.
+"""
+
+import asyncio
+from typing import Optional
+
+import syntask.server.models as models
+from syntask.server.database.dependencies import inject_db
+from syntask.server.database.interface import SyntaskDBInterface
+from syntask.server.services.loop_service import LoopService
+from syntask.settings import SYNTASK_API_SERVICES_LEASE_EXPIRATIONS_LOOP_SECONDS
+
+
+class ExpireConcurrencyLimitLeases(LoopService):
+    """
+    A simple loop service responsible for ending concurrency limit leases that have
+    expired, usually because the client holding them has gone away, and for waking the
+    requests waiting in line for the slots they held.
+    """
+
+    def __init__(self, loop_seconds: Optional[float] = None, **kwargs):
+        super().__init__(
+            loop_seconds=loop_seconds
+            or SYNTASK_API_SERVICES_LEASE_EXPIRATIONS_LOOP_SECONDS.value(),
+            **kwargs,
+        )
+
+        # end this many leases at once
+        self.batch_size = 100
+
+    @inject_db
+    async def run_once(self, db: SyntaskDBInterface):
+        """
+        Release the slots of expired leases by:
+
+        - Ending the leases that expired before now, a batch at a time
+        - Waking the requests waiting for slots on the limits those leases held
+        """
+        # avoid circular import
+        from syntask.server.api.concurrency_limits_v2 import slot_waiters
+
+        while True:
+            async with db.session_context(begin_transaction=True) as session:
+                ended, released = await models.concurrency_limits_v2.expire_leases(
+                    session=session, limit=self.batch_size
+                )
+
+            # if no leases were ended, exit the loop
+            if not ended:
+                break
+
+            slot_waiters.notify(released)
+
+        self.logger.info("Finished expiring concurrency limit leases.")
+
+
+if __name__ == "__main__":
+    asyncio.run(ExpireConcurrencyLimitLeases(handle_signals=True).start())
@@ -0,0 +1,79 @@
+"""
+The LogRetention service. Responsible for creating the daily partitions of the log table
+on PostgreSQL, and for removing logs older than `SYNTASK_API_LOGS_RETENTION_PERIOD`.
+"""
+
+import asyncio
+from typing import Optional
+
+import pendulum
+
+import syntask.server.models as models
+from syntask.server.database.dependencies import inject_db
+from syntask.server.database.interface import SyntaskDBInterface
+from syntask.server.services.loop_service import LoopService
+from syntask.settings import (
+    SYNTASK_API_LOGS_RETENTION_PERIOD,
+    SYNTASK_API_LOGS_SEARCH_INDEX_ENABLED,
+    SYNTASK_API_SERVICES_LOG_RETENTION_LOOP_SECONDS,
+)
+
+
+class LogRetention(LoopService):
+    """
+    A loop service that maintains the partitions of the log table and removes logs
+    that are older than the retention period.
+
+    On PostgreSQL, logs older than the retention period are removed by dropping the
+    daily partitions that hold them, so that only the logs in the partition spanning
+    the retention cutoff are deleted row by row.  On SQLite, old logs are deleted in
+    batches, each in its own transaction, so that trimming a large table doesn't hold
+    the database's write lock for long.
+    """
+
+    def __init__(self, loop_seconds: Optional[float] = None, **kwargs):
+        super().__init__(
+            loop_seconds=loop_seconds
+            or SYNTASK_API_SERVICES_LOG_RETENTION_LOOP_SECONDS.value(),
+            **kwargs,
+        )
+
+        # delete this many logs at once
+        self.batch_size = 10_000
+
+    @inject_db
+    async def run_once(self, db: SyntaskDBInterface):
+        """
+        Maintain the log table by:
+
+        - Creating the daily partitions of logs for today and the next few days
+        - Removing logs from before the retention period, if one is set
+        """
+        async with db.session_context(begin_transaction=True) as session:
+            created = await models.logs.ensure_log_partitions(
+                session=session,
+                search_index=SYNTASK_API_LOGS_SEARCH_INDEX_ENABLED.value(),
+            )
+        if created:
+            self.logger.info("Created log partitions %s.", ", ".join(created))
+
+        retention_period = SYNTASK_API_LOGS_RETENTION_PERIOD.value()
+        if retention_period is None:
+            return
+
+        older_than = pendulum.now("UTC") - retention_period
+        trimmed = 0
+        while True:
+            async with db.session_context(begin_transaction=True) as session:
+                deleted = await models.logs.trim_logs(
+                    session=session, older_than=older_than, limit=self.batch_size
+                )
+            trimmed += deleted
+            if deleted < self.batch_size:
+                break
+
+        self.logger.info("Removed %s logs older than %s.", trimmed, older_than)
+
+
+if __name__ == "__main__":
+    asyncio.run(LogRetention(handle_signals=True).start())
@@ -4,11 +4,13 @@ The Scheduler service.
 
 import asyncio
 import datetime
-from typing import Dict, List, Optional
+import heapq
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
 import pendulum
 import sqlalchemy as sa
+from pendulum.datetime import DateTime
 
 import syntask.server.models as models
 from syntask.server.database.dependencies import inject_db
@@ -17,6 +19,7 @@ from syntask.server.schemas.states import StateType
 from syntask.server.services.loop_service import LoopService, run_multiple_services
 from syntask.settings import (
     SYNTASK_API_SERVICES_SCHEDULER_DEPLOYMENT_BATCH_SIZE,
+    SYNTASK_API_SERVICES_SCHEDULER_FULL_SCAN_SECONDS,
     SYNTASK_API_SERVICES_SCHEDULER_INSERT_BATCH_SIZE,
     SYNTASK_API_SERVICES_SCHEDULER_LOOP_SECONDS,
     SYNTASK_API_SERVICES_SCHEDULER_MAX_RUNS,
@@ -34,6 +37,15 @@ class TryAgain(Exception):
 class Scheduler(LoopService):
     """
     A loop service that schedules flow runs from deployments.
+
+    Rather than looking at every deployment on every loop, the scheduler keeps track
+    of when each deployment will next need more runs: when its latest auto-scheduled
+    run is less than `min_scheduled_time` away, or when it will have fewer than
+    `min_runs` runs left.  Each loop only schedules the deployments that are due,
+    along with any whose schedules were changed since the last loop.  Every
+    `SYNTASK_API_SERVICES_SCHEDULER_FULL_SCAN_SECONDS` it goes back to looking at
+    every deployment, which picks up any changes it couldn't have seen, like
+    scheduled runs being deleted.
     """
 
     # the main scheduler takes its loop interval from
@@ -63,19 +75,53 @@ class Scheduler(LoopService):
         self.insert_batch_size = (
             SYNTASK_API_SERVICES_SCHEDULER_INSERT_BATCH_SIZE.value()
         )
+        self.full_scan_interval = datetime.timedelta(
+            seconds=SYNTASK_API_SERVICES_SCHEDULER_FULL_SCAN_SECONDS.value()
+        )
 
-    @inject_db
-    async def run_once(self, db: SyntaskDBInterface):
+        # The time at which each schedulable deployment will need more runs, with a
+        # heap of the same to find the deployments that are due.  The heap may hold
+        # entries that have since been superseded, which are skipped.
+        self._due_times: Dict[UUID, DateTime] = {}
+        self._due_queue: List[Tuple[DateTime, UUID]] = []
+        self._last_full_scan: Optional[DateTime] = None
+        self._last_checked_for_changes: Optional[DateTime] = None
+
+    async def run_once(self):
         """
         Schedule flow runs by:
 
-        - Querying for deployments with active schedules
+        - Finding the deployments that need more runs, which are those whose
+          schedules changed or that are due, or every deployment with active
+          schedules when it's time for a full scan
         - Generating the next set of flow runs based on each deployments schedule
         - Inserting all scheduled flow runs into the database
 
         All inserted flow runs are committed to the database at the termination of the
         loop.
         """
+        now = pendulum.now("UTC")
+        if (
+            self._last_full_scan is None
+            or now - self._last_full_scan >= self.full_scan_interval
+        ):
+            total_inserted_runs = await self._schedule_deployments_from_query()
+            await self._read_all_due_times(not_before=now)
+            self._last_full_scan = now
+        else:
+            await self._check_for_changed_deployments(now=now)
+            total_inserted_runs = await self._schedule_due_deployments(now=now)
+        self._last_checked_for_changes = now
+
+        self.logger.info(f"Scheduled {total_inserted_runs} runs.")
+
+    @inject_db
+    async def _schedule_deployments_from_query(self, db: SyntaskDBInterface) -> int:
+        """
+        Schedules runs for every deployment selected by
+        `_get_select_deployments_to_schedule_query`, a page at a time, returning the
+        number of runs inserted.
+        """
         total_inserted_runs = 0
 
         last_id = None
@@ -113,7 +159,203 @@ class Scheduler(LoopService):
                 # record the last deployment ID
                 last_id = deployment_ids[-1]
 
-        self.logger.info(f"Scheduled {total_inserted_runs} runs.")
+        return total_inserted_runs
+
+    @inject_db
+    async def _schedule_due_deployments(
+        self, now: DateTime, db: SyntaskDBInterface
+    ) -> int:
+        """
+        Schedules runs for the deployments that are due, a batch at a time, returning
+        the number of runs inserted.
+        """
+        total_inserted_runs = 0
+        # Deployments that are still due after being scheduled (because their
+        # schedules can't produce enough runs, for example) wait for the next loop
+        not_before = now.add(seconds=self.loop_seconds)
+
+        while deployment_ids := self._pop_due_deployments(now):
+            async with db.session_context(begin_transaction=False) as session:
+                schedulable_ids = (
+                    (
+                        await session.execute(
+                            sa.select(db.Deployment.id).where(
+                                db.Deployment.id.in_(deployment_ids),
+                                self._deployment_is_schedulable(),
+                            )
+                        )
+                    )
+                    .scalars()
+                    .all()
+                )
+                try:
+                    runs_to_insert = await self._collect_flow_runs(
+                        session=session, deployment_ids=schedulable_ids
+                    )
+                except TryAgain:
+                    for deployment_id in deployment_ids:
+                        self._set_due_time(deployment_id, not_before)
+                    continue
+
+            for batch in batched_iterable(runs_to_insert, self.insert_batch_size):
+                async with db.session_context(begin_transaction=True) as session:
+                    inserted_runs = await self._insert_scheduled_flow_runs(
+                        session=session, runs=batch
+                    )
+                    total_inserted_runs += len(inserted_runs)
+
+            await self._read_due_times(deployment_ids, not_before=not_before)
+
+        return total_inserted_runs
+
+    @inject_db
+    async def _check_for_changed_deployments(
+        self, now: DateTime, db: SyntaskDBInterface
+    ) -> None:
+        """
+        Finds the deployments that changed since the last loop.  Deployments whose
+        schedules changed are due now, and the due times of other deployments that
+        changed are read again, since they may have been paused or resumed or had
+        their scheduled runs deleted.
+        """
+        # Look back a little further than the last check, for changes that were made
+        # just before it but committed just after
+        since = (self._last_checked_for_changes or now).subtract(
+            seconds=self.loop_seconds
+        )
+        async with db.session_context() as session:
+            updated_ids = (
+                (
+                    await session.execute(
+                        sa.select(db.Deployment.id).where(
+                            db.Deployment.updated >= since
+                        )
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            rescheduled_ids = (
+                (
+                    await session.execute(
+                        sa.select(db.DeploymentSchedule.deployment_id)
+                        .where(db.DeploymentSchedule.updated >= since)
+                        .distinct()
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
+        for batch in batched_iterable(updated_ids, self.deployment_batch_size):
+            await self._read_due_times(list(batch), not_before=now)
+        for deployment_id in rescheduled_ids:
+            self._set_due_time(deployment_id, now)
+
+    def _set_due_time(self, deployment_id: UUID, due: DateTime) -> None:
+        self._due_times[deployment_id] = due
+        heapq.heappush(self._due_queue, (due, deployment_id))
+
+    def _pop_due_deployments(self, now: DateTime) -> List[UUID]:
+        """Removes and returns up to a batch of the deployments due by `now`"""
+        deployment_ids: List[UUID] = []
+        while (
+            self._due_queue
+            and self._due_queue[0][0] <= now
+            and len(deployment_ids) < self.deployment_batch_size
+        ):
+            due, deployment_id = heapq.heappop(self._due_queue)
+            if self._due_times.get(deployment_id) != due:
+                continue
+            del self._due_times[deployment_id]
+            deployment_ids.append(deployment_id)
+        return deployment_ids
+
+    async def _read_all_due_times(self, not_before: DateTime) -> None:
+        """Replaces the due times of all deployments with those read from the
+        database"""
+        self._due_times.clear()
+        self._due_queue.clear()
+        await self._read_due_times(deployment_ids=None, not_before=not_before)
+
+    @inject_db
+    async def _read_due_times(
+        self,
+        deployment_ids: Optional[List[UUID]],
+        not_before: DateTime,
+        db: SyntaskDBInterface,
+    ) -> None:
+        """
+        Reads the times at which the given deployments (or all deployments, if `None`)
+        will need more runs, based on their current auto-scheduled runs.  Deployments
+        that can't be scheduled, because they are paused or have no active schedules,
+        are forgotten until they change.
+
+        Args:
+            deployment_ids: the deployments to read, or `None` for all of them
+            not_before: the earliest time any deployment will be due
+        """
+        now = pendulum.now("UTC")
+        future_runs = sa.and_(
+            db.FlowRun.deployment_id == db.Deployment.id,
+            db.FlowRun.state_type == StateType.SCHEDULED,
+            db.FlowRun.next_scheduled_start_time >= now,
+            db.FlowRun.auto_scheduled.is_(True),
+        )
+        latest = (
+            sa.select(sa.func.max(db.FlowRun.next_scheduled_start_time))
+            .where(future_runs)
+            .scalar_subquery()
+        )
+        # The time at which the deployment will have fewer than `min_runs` runs left
+        last_of_min_runs = (
+            sa.select(db.FlowRun.next_scheduled_start_time)
+            .where(future_runs)
+            .order_by(db.FlowRun.next_scheduled_start_time.desc())
+            .offset(max(self.min_runs - 1, 0))
+            .limit(1)
+            .scalar_subquery()
+        )
+        query = sa.select(db.Deployment.id, latest, last_of_min_runs).where(
+            self._deployment_is_schedulable()
+        )
+        if deployment_ids is not None:
+            query = query.where(db.Deployment.id.in_(deployment_ids))
+
+        async with db.session_context() as session:
+            result = await session.execute(query)
+            rows = result.all()
+
+        for deployment_id in deployment_ids or ():
+            self._due_times.pop(deployment_id, None)
+
+        for deployment_id, latest_time, last_of_min_runs_time in rows:
+            if latest_time is None or (
+                self.min_runs > 0 and last_of_min_runs_time is None
+            ):
+                due = not_before
+            else:
+                due = latest_time - self.min_scheduled_time
+                if self.min_runs > 0:
+                    due = min(due, last_of_min_runs_time)
+                due = max(due, not_before)
+            self._set_due_time(deployment_id, due)
+
+    @inject_db
+    def _deployment_is_schedulable(self, db: SyntaskDBInterface):
+        """Returns a filter for deployments that are not paused and have at least one
+        active schedule"""
+        return sa.and_(
+            db.Deployment.paused.is_not(True),
+            sa.select(db.DeploymentSchedule.deployment_id)
+            .where(
+                sa.and_(
+                    db.DeploymentSchedule.deployment_id == db.Deployment.id,
+                    db.DeploymentSchedule.active.is_(True),
+                )
+            )
+            .exists(),
+        )
 
     @inject_db
     def _get_select_deployments_to_schedule_query(self, db: SyntaskDBInterface):
@@ -308,6 +550,14 @@ class RecentDeploymentsScheduler(Scheduler):
     # this scheduler runs on a tight loop
     loop_seconds = 5
 
+    async def run_once(self):
+        """
+        Schedule flow runs for the deployments that were created or updated since
+        the last loop.
+        """
+        total_inserted_runs = await self._schedule_deployments_from_query()
+        self.logger.info(f"Scheduled {total_inserted_runs} runs.")
+
     @inject_db
     def _get_select_deployments_to_schedule_query(self, db: SyntaskDBInterface):
         """
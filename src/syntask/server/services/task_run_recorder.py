@@ -1,23 +1,57 @@
 import asyncio
+import time
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Dict, Optional
+from datetime import timedelta
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 import pendulum
 import sqlalchemy as sa
+from prometheus_client import Counter, Histogram
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from syntask.logging import get_logger
 from syntask.server.database.dependencies import db_injector, provide_database_interface
 from syntask.server.database.interface import SyntaskDBInterface
+from syntask.server.events.messaging import event_from_message
 from syntask.server.events.ordering import CausalOrdering, EventArrivedEarly
 from syntask.server.events.schemas.events import ReceivedEvent
 from syntask.server.schemas.core import TaskRun
 from syntask.server.schemas.states import State
 from syntask.server.utilities.messaging import Message, MessageHandler, create_consumer
+from syntask.settings import (
+    SYNTASK_API_SERVICES_TASK_RUN_RECORDER_BATCH_SIZE,
+    SYNTASK_API_SERVICES_TASK_RUN_RECORDER_FLUSH_INTERVAL,
+)
 
 logger = get_logger(__name__)
 
+TASK_RUN_EVENTS_RECORDED = Counter(
+    "syntask_task_run_recorder_events_recorded",
+    "The number of task run events recorded by the task run recorder",
+)
+TASK_RUN_EVENTS_FAILED = Counter(
+    "syntask_task_run_recorder_events_failed",
+    "The number of task run events the task run recorder failed to record",
+)
+TASK_RUN_RECORDER_BATCH_SIZE = Histogram(
+    "syntask_task_run_recorder_batch_size",
+    "The number of task run events recorded in each batch",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+TASK_RUN_RECORDER_FLUSH_SECONDS = Histogram(
+    "syntask_task_run_recorder_flush_seconds",
+    "The number of seconds taken to record each batch of task run events",
+)
+TASK_RUN_RECORDER_LAG_SECONDS = Histogram(
+    "syntask_task_run_recorder_lag_seconds",
+    (
+        "The number of seconds between the server receiving a task run event and the "
+        "task run recorder recording it"
+    ),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
 
 def causal_ordering():
     return CausalOrdering(
@@ -118,10 +152,8 @@ def task_run_from_event(event: ReceivedEvent) -> TaskRun:
     )
 
 
-async def record_task_run_event(event: ReceivedEvent):
-    task_run = task_run_from_event(event)
-
-    task_run_attributes = task_run.model_dump_for_orm(
+def _task_run_attributes(task_run: TaskRun) -> Dict[str, Any]:
+    return task_run.model_dump_for_orm(
         exclude={
             "state_id",
             "state",
@@ -132,15 +164,27 @@ async def record_task_run_event(event: ReceivedEvent):
         exclude_unset=True,
     )
 
+
+def _denormalized_state_attributes(task_run: TaskRun) -> Dict[str, Any]:
     assert task_run.state
 
-    denormalized_state_attributes = {
+    return {
         "state_id": task_run.state.id,
         "state_type": task_run.state.type,
         "state_name": task_run.state.name,
         "state_timestamp": task_run.state.timestamp,
     }
 
+
+async def record_task_run_event(event: ReceivedEvent):
+    task_run = task_run_from_event(event)
+
+    task_run_attributes = _task_run_attributes(task_run)
+
+    assert task_run.state
+
+    denormalized_state_attributes = _denormalized_state_attributes(task_run)
+
     db = provide_database_interface()
     async with db.session_context(begin_transaction=True) as session:
         await _insert_task_run(session, task_run, task_run_attributes)
@@ -164,10 +208,283 @@ async def record_task_run_event(event: ReceivedEvent):
     )
 
 
+def _collapse_task_runs(
+    task_runs: Sequence[TaskRun],
+) -> List[Tuple[TaskRun, Dict[str, Any]]]:
+    """
+    Collapses a batch of task runs to one entry per task run, pairing the task run with
+    the newest state with the attributes of all of its events applied in the order
+    their states occurred, as if each event had been recorded one at a time
+    """
+    by_id: Dict[UUID, List[TaskRun]] = {}
+    for task_run in task_runs:
+        by_id.setdefault(task_run.id, []).append(task_run)
+
+    collapsed: List[Tuple[TaskRun, Dict[str, Any]]] = []
+    for versions in by_id.values():
+        # a stable sort, so that events with the same timestamp keep their arrival order
+        versions.sort(key=lambda task_run: task_run.state.timestamp)
+        attributes: Dict[str, Any] = {}
+        for task_run in versions:
+            attributes.update(_task_run_attributes(task_run))
+        collapsed.append((versions[-1], attributes))
+
+    return collapsed
+
+
+@db_injector
+async def _insert_task_runs(
+    db: SyntaskDBInterface,
+    session: AsyncSession,
+    task_runs: Sequence[Tuple[TaskRun, Dict[str, Any]]],
+):
+    """
+    Upserts a batch of task runs, updating an existing task run only when its current
+    state is older than the incoming one
+    """
+    now = pendulum.now("UTC")
+
+    # each statement is executed for many rows at once, which must all have the same
+    # columns, so group the task runs by the attributes their events have set
+    by_columns: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for task_run, attributes in task_runs:
+        assert task_run.state
+        by_columns.setdefault(tuple(sorted(attributes)), []).append(
+            {
+                "created": now,
+                **attributes,
+                "incoming_state_timestamp": task_run.state.timestamp,
+            }
+        )
+
+    table = db.TaskRun.__table__
+    for columns, rows in by_columns.items():
+        insert = db.insert(table)
+        await session.execute(
+            insert.on_conflict_do_update(
+                index_elements=[
+                    "id",
+                ],
+                set_={
+                    "updated": now,
+                    **{column: insert.excluded[column] for column in columns},
+                },
+                where=table.c.state_timestamp
+                < sa.bindparam("incoming_state_timestamp"),
+            ),
+            rows,
+        )
+
+
+@db_injector
+async def _insert_task_run_states(
+    db: SyntaskDBInterface, session: AsyncSession, task_runs: Sequence[TaskRun]
+):
+    now = pendulum.now("UTC")
+    await session.execute(
+        db.insert(db.TaskRunState.__table__).on_conflict_do_nothing(
+            index_elements=[
+                "id",
+            ]
+        ),
+        [
+            {
+                "created": now,
+                "task_run_id": task_run.id,
+                **task_run.state.model_dump(),
+            }
+            for task_run in task_runs
+            if task_run.state
+        ],
+    )
+
+
+@db_injector
+async def _update_task_runs_with_states(
+    db: SyntaskDBInterface,
+    session: AsyncSession,
+    task_runs: Sequence[TaskRun],
+):
+    table = db.TaskRun.__table__
+    await session.execute(
+        sa.update(table)
+        .where(
+            table.c.id == sa.bindparam("task_run_id"),
+            sa.or_(
+                table.c.state_timestamp.is_(None),
+                table.c.state_timestamp < sa.bindparam("incoming_state_timestamp"),
+            ),
+        )
+        .values(
+            state_id=sa.bindparam("incoming_state_id"),
+            state_type=sa.bindparam("incoming_state_type"),
+            state_name=sa.bindparam("incoming_state_name"),
+            state_timestamp=sa.bindparam("incoming_state_timestamp"),
+        ),
+        [
+            {
+                "task_run_id": task_run.id,
+                **{
+                    f"incoming_{key}": value
+                    for key, value in _denormalized_state_attributes(task_run).items()
+                },
+            }
+            for task_run in task_runs
+        ],
+    )
+
+
+async def record_task_run_events(events: Sequence[ReceivedEvent]):
+    """
+    Records a batch of task run events in a single transaction, using one statement
+    per table for the whole batch where possible.  The outcome is the same as recording
+    each event with `record_task_run_event`: every state is recorded, and each task run
+    reflects its newest state.
+    """
+    if not events:
+        return
+
+    task_runs = [task_run_from_event(event) for event in events]
+    collapsed = _collapse_task_runs(task_runs)
+
+    db = provide_database_interface()
+    async with db.session_context(begin_transaction=True) as session:
+        await _insert_task_runs(session, collapsed)
+        await _insert_task_run_states(session, task_runs)
+        await _update_task_runs_with_states(
+            session, [task_run for task_run, _ in collapsed]
+        )
+
+    logger.debug(
+        "Recorded %s task run state changes for %s task runs",
+        len(task_runs),
+        len(collapsed),
+    )
+
+
 @asynccontextmanager
-async def consumer() -> AsyncGenerator[MessageHandler, None]:
+async def consumer(
+    batch_size: int = 1,
+    flush_every: timedelta = timedelta(seconds=0.5),
+    wait_for_recording: bool = True,
+) -> AsyncGenerator[MessageHandler, None]:
+    """
+    Set up a message handler that will record task run events every `batch_size`
+    messages, or every `flush_every` interval to flush any remaining messages.
+
+    With `wait_for_recording`, the handler only returns once its event has been
+    recorded, and raises if it could not be, so that messages are acknowledged after
+    they are saved and redelivered if they weren't.  To fill batches, messages must
+    then be handled concurrently (see the `concurrency` of the consumer).  Without it,
+    the handler returns as soon as its event is queued, and events that fail to record
+    are logged and dropped.
+    """
+    batch: List[Tuple[ReceivedEvent, "asyncio.Future[None]"]] = []
+    batch_full = asyncio.Event()
+    lock = asyncio.Lock()
+
+    async def record_one(event: ReceivedEvent) -> int:
+        try:
+            await record_task_run_event(event)
+        except EventArrivedEarly:
+            # We're safe to ACK this message because it has been parked by the
+            # causal ordering mechanism and will be reprocessed when the preceding
+            # event arrives.
+            return 0
+        except Exception:
+            TASK_RUN_EVENTS_FAILED.inc()
+            raise
+        return 1
+
+    async def record_many(
+        pending: Sequence[Tuple[ReceivedEvent, "asyncio.Future[None]"]],
+    ) -> int:
+        """Records the events, settling each event's future with its outcome"""
+        if len(pending) > 1:
+            try:
+                await record_task_run_events([event for event, _ in pending])
+            except Exception:
+                logger.debug(
+                    "Error recording task run events in bulk, "
+                    "recording them one at a time",
+                    exc_info=True,
+                )
+            else:
+                for _, recorded in pending:
+                    if not recorded.done():
+                        recorded.set_result(None)
+                return len(pending)
+
+        count = 0
+        for event, recorded in pending:
+            try:
+                count += await record_one(event)
+            except Exception as exc:
+                logger.exception(
+                    "Error recording task run event %s for resource %s",
+                    event.id,
+                    event.resource.get("syntask.resource.id"),
+                )
+                if not recorded.done():
+                    recorded.set_exception(exc)
+            else:
+                if not recorded.done():
+                    recorded.set_result(None)
+        return count
+
+    async def flush() -> None:
+        async with lock:
+            # events whose handlers have gone away (and so whose messages were never
+            # acknowledged) are left to be redelivered
+            pending = [
+                (event, recorded) for event, recorded in batch if not recorded.done()
+            ]
+            batch.clear()
+            batch_full.clear()
+            if not pending:
+                return
+
+            logger.debug(f"Recording {len(pending)} task run events...")
+            started = time.monotonic()
+
+            try:
+                recorded = await record_many(pending)
+            finally:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(
+                            RuntimeError("Task run event was not recorded")
+                        )
+
+            TASK_RUN_RECORDER_FLUSH_SECONDS.observe(time.monotonic() - started)
+            TASK_RUN_RECORDER_BATCH_SIZE.observe(len(pending))
+            TASK_RUN_EVENTS_RECORDED.inc(recorded)
+
+            now = pendulum.now("UTC")
+            for event, _ in pending:
+                TASK_RUN_RECORDER_LAG_SECONDS.observe(
+                    max((now - event.received).total_seconds(), 0)
+                )
+
+    async def flush_periodically():
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        batch_full.wait(), flush_every.total_seconds()
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+                try:
+                    await flush()
+                except Exception:
+                    logger.exception("Error recording task run events")
+        except asyncio.CancelledError:
+            return
+
     async def message_handler(message: Message):
-        event: ReceivedEvent = ReceivedEvent.model_validate_json(message.data)
+        event: ReceivedEvent = event_from_message(message)
 
         if not event.event.startswith("syntask.task-run"):
             return
@@ -182,15 +499,28 @@ async def consumer() -> AsyncGenerator[MessageHandler, None]:
             event.resource.get("syntask.resource.id"),
         )
 
-        try:
-            await record_task_run_event(event)
-        except EventArrivedEarly:
-            # We're safe to ACK this message because it has been parked by the
-            # causal ordering mechanism and will be reprocessed when the preceding
-            # event arrives.
-            pass
+        recorded: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        batch.append((event, recorded))
+
+        if len(batch) >= batch_size:
+            batch_full.set()
 
-    yield message_handler
+        if not wait_for_recording:
+            # failures are already logged by the flush
+            recorded.add_done_callback(lambda f: f.cancelled() or f.exception())
+            return
+
+        # the flush happens in its own task, so that cancelling this handler doesn't
+        # interrupt the writing of the events of other handlers
+        await recorded
+
+    periodic_flush = asyncio.create_task(flush_periodically())
+
+    try:
+        yield message_handler
+    finally:
+        periodic_flush.cancel()
+        await flush()
 
 
 class TaskRunRecorder:
@@ -215,9 +545,21 @@ class TaskRunRecorder:
 
     async def start(self):
         assert self.consumer_task is None, "TaskRunRecorder already started"
-        self.consumer = create_consumer("events")
-
-        async with consumer() as handler:
+        batch_size = SYNTASK_API_SERVICES_TASK_RUN_RECORDER_BATCH_SIZE.value()
+
+        # messages are only acknowledged once they are recorded, so enough of them
+        # must be handled at once to fill a batch; consumers that handle messages one
+        # at a time acknowledge them as soon as they are queued instead, rather than
+        # waiting out a flush interval for each one
+        self.consumer = create_consumer("events", concurrency=batch_size)
+
+        async with consumer(
+            batch_size=batch_size,
+            flush_every=timedelta(
+                seconds=SYNTASK_API_SERVICES_TASK_RUN_RECORDER_FLUSH_INTERVAL.value()
+            ),
+            wait_for_recording=self.consumer.concurrency >= batch_size,
+        ) as handler:
             self.consumer_task = asyncio.create_task(self.consumer.run(handler))
             logger.debug("TaskRunRecorder started")
             self.started_event.set()
@@ -0,0 +1,309 @@
+"""
+Implements a task queue for delivering background task runs to TaskWorkers.
+
+The storage of queued task runs is delegated to a pluggable `TaskQueueBackend`,
+configured with `SYNTASK_TASK_SCHEDULING_QUEUE_BACKEND`.  The default backend keeps
+task runs in memory, while `syntask.server.task_queue.database` stores them in the
+Syntask database so that they survive server restarts and can be shared by several
+API replicas.
+"""
+
+import abc
+import asyncio
+import importlib
+from datetime import timedelta
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    runtime_checkable,
+)
+from uuid import UUID
+
+from typing_extensions import Self
+
+import syntask.server.schemas as schemas
+from syntask.settings import (
+    SYNTASK_TASK_SCHEDULING_MAX_RETRY_QUEUE_SIZE,
+    SYNTASK_TASK_SCHEDULING_MAX_SCHEDULED_QUEUE_SIZE,
+    SYNTASK_TASK_SCHEDULING_QUEUE_BACKEND,
+)
+
+
+class TaskQueueBackend(abc.ABC):
+    """
+    Abstract base class for the storage of queued background task runs.
+
+    Task runs are queued per task key, either as newly scheduled runs or as retries.
+    Retries are always delivered before scheduled runs of the same task key.  A task
+    run that has been delivered by `get` stays invisible to other callers until it is
+    acknowledged with `ack`, or until its visibility timeout expires, at which point it
+    will be delivered again.
+
+    Implementations call `_notify` whenever task runs are added for a task key, which
+    wakes any callers blocked in `wait`.
+    """
+
+    # The longest `TaskQueue.get` and `MultiQueue.get` will wait for a notification
+    # before checking the backend again, which bounds how long it takes to notice task
+    # runs that were added without a notification (for example, by another server)
+    poll_interval: float = 1.0
+
+    _waiters: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]]
+    _generation: int
+
+    def __init__(self) -> None:
+        self._waiters = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """A counter that changes every time task runs are added to the backend"""
+        return self._generation
+
+    def _notify(self, task_key: str) -> None:
+        """Wakes any callers waiting on the given task key"""
+        self._generation += 1
+        for loop, event in self._waiters.get(task_key, ()):
+            loop.call_soon_threadsafe(event.set)
+
+    async def wait(
+        self, task_keys: Sequence[str], generation: int, timeout: float
+    ) -> None:
+        """
+        Waits up to `timeout` seconds for task runs to be added for any of the given
+        task keys.  Returns immediately if any task runs have been added since the
+        given `generation` was read.
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        for task_key in task_keys:
+            self._waiters.setdefault(task_key, set()).add(waiter)
+
+        try:
+            if self._generation != generation:
+                return
+            try:
+                await asyncio.wait_for(waiter[1].wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            for task_key in task_keys:
+                waiters = self._waiters.get(task_key)
+                if waiters is not None:
+                    waiters.discard(waiter)
+                    if not waiters:
+                        del self._waiters[task_key]
+
+    def configure_task_key(
+        self, task_key: str, scheduled_size: int, retry_size: int
+    ) -> None:
+        """Configures the maximum queue sizes for a task key, if the backend has any"""
+
+    @abc.abstractmethod
+    async def put(
+        self, task_key: str, task_runs: Sequence[schemas.core.TaskRun]
+    ) -> None:
+        """Adds scheduled task runs to the queue for the given task key"""
+
+    @abc.abstractmethod
+    async def retry(
+        self, task_key: str, task_runs: Sequence[schemas.core.TaskRun]
+    ) -> None:
+        """
+        Adds task runs to the retry queue for the given task key, releasing them if
+        they were previously delivered and not yet acknowledged
+        """
+
+    @abc.abstractmethod
+    async def get(
+        self,
+        task_keys: Sequence[str],
+        limit: int = 1,
+        visibility_timeout: Optional[timedelta] = None,
+    ) -> List[schemas.core.TaskRun]:
+        """
+        Takes up to `limit` task runs from the queues for the given task keys without
+        waiting, returning an empty list if there are none available.  Backends should
+        serve the task keys fairly, preferring earlier keys in `task_keys` when they
+        must choose.  The task runs are hidden for `visibility_timeout`, which defaults
+        to `SYNTASK_TASK_SCHEDULING_VISIBILITY_TIMEOUT`.
+        """
+
+    @abc.abstractmethod
+    async def ack(self, task_run_ids: Iterable[UUID]) -> None:
+        """Acknowledges delivered task runs so they will not be delivered again"""
+
+    @abc.abstractmethod
+    async def size(self, task_key: str) -> int:
+        """Returns the number of task runs waiting to be delivered for a task key"""
+
+
+@runtime_checkable
+class TaskQueueBackendModule(Protocol):
+    TaskQueueBackend: Type[TaskQueueBackend]
+
+
+def create_task_queue_backend() -> TaskQueueBackend:
+    """
+    Creates a new task queue backend with the application's default settings.
+
+    Returns:
+        a new TaskQueueBackend instance
+    """
+    module = importlib.import_module(SYNTASK_TASK_SCHEDULING_QUEUE_BACKEND.value())
+    assert isinstance(module, TaskQueueBackendModule)
+    return module.TaskQueueBackend()
+
+
+class TaskQueue:
+    _task_queues: Dict[str, Self] = {}
+    _backend: Optional[TaskQueueBackend] = None
+
+    default_scheduled_max_size: int = (
+        SYNTASK_TASK_SCHEDULING_MAX_SCHEDULED_QUEUE_SIZE.value()
+    )
+    default_retry_max_size: int = SYNTASK_TASK_SCHEDULING_MAX_RETRY_QUEUE_SIZE.value()
+
+    _queue_size_configs: Dict[str, Tuple[int, int]] = {}
+
+    task_key: str
+
+    @classmethod
+    def backend(cls) -> TaskQueueBackend:
+        if cls._backend is None:
+            cls._backend = create_task_queue_backend()
+            for task_key, sizes in cls._queue_size_configs.items():
+                cls._backend.configure_task_key(task_key, *sizes)
+        return cls._backend
+
+    @classmethod
+    async def enqueue(cls, task_run: schemas.core.TaskRun) -> None:
+        await cls.for_key(task_run.task_key).put(task_run)
+
+    @classmethod
+    async def enqueue_many(cls, task_runs: Iterable[schemas.core.TaskRun]) -> None:
+        """Enqueues a batch of task runs, which may be for several task keys"""
+        by_key: Dict[str, List[schemas.core.TaskRun]] = {}
+        for task_run in task_runs:
+            by_key.setdefault(task_run.task_key, []).append(task_run)
+
+        for task_key, runs in by_key.items():
+            await cls.backend().put(task_key, runs)
+
+    @classmethod
+    async def retry_many(cls, task_runs: Iterable[schemas.core.TaskRun]) -> None:
+        """Retries a batch of task runs, which may be for several task keys"""
+        by_key: Dict[str, List[schemas.core.TaskRun]] = {}
+        for task_run in task_runs:
+            by_key.setdefault(task_run.task_key, []).append(task_run)
+
+        for task_key, runs in by_key.items():
+            await cls.backend().retry(task_key, runs)
+
+    @classmethod
+    def configure_task_key(
+        cls,
+        task_key: str,
+        scheduled_size: Optional[int] = None,
+        retry_size: Optional[int] = None,
+    ):
+        scheduled_size = scheduled_size or cls.default_scheduled_max_size
+        retry_size = retry_size or cls.default_retry_max_size
+        cls._queue_size_configs[task_key] = (scheduled_size, retry_size)
+        cls.backend().configure_task_key(task_key, scheduled_size, retry_size)
+
+    @classmethod
+    def for_key(cls, task_key: str) -> Self:
+        if task_key not in cls._task_queues:
+            cls._task_queues[task_key] = cls(task_key)
+        return cls._task_queues[task_key]
+
+    @classmethod
+    def reset(cls) -> None:
+        """A unit testing utility to reset the state of the task queues subsystem"""
+        cls._task_queues.clear()
+        cls._backend = None
+
+    def __init__(self, task_key: str):
+        self.task_key = task_key
+
+    async def get(self) -> schemas.core.TaskRun:
+        backend = self.backend()
+        while True:
+            generation = backend.generation
+            task_runs = await backend.get([self.task_key])
+            if task_runs:
+                return task_runs[0]
+            await backend.wait([self.task_key], generation, backend.poll_interval)
+
+    async def get_nowait(self) -> schemas.core.TaskRun:
+        task_runs = await self.backend().get([self.task_key])
+        if not task_runs:
+            raise asyncio.QueueEmpty()
+        return task_runs[0]
+
+    async def put(self, task_run: schemas.core.TaskRun) -> None:
+        await self.backend().put(self.task_key, [task_run])
+
+    async def retry(self, task_run: schemas.core.TaskRun) -> None:
+        await self.backend().retry(self.task_key, [task_run])
+
+    async def ack(self, task_run: schemas.core.TaskRun) -> None:
+        await self.backend().ack([task_run.id])
+
+    async def size(self) -> int:
+        return await self.backend().size(self.task_key)
+
+
+class MultiQueue:
+    """
+    A queue that can pull tasks from from any of a number of task queues.
+
+    Waiting callers are woken as soon as task runs are added to any of the queues, and
+    the queues are served round-robin, so that a busy task key can't starve the others.
+    """
+
+    _task_keys: List[str]
+    _next_index: int
+
+    def __init__(self, task_keys: List[str]):
+        self._task_keys = list(task_keys)
+        self._next_index = 0
+
+    def _keys_in_turn(self) -> List[str]:
+        """The task keys, starting with the one whose turn it is to be served"""
+        return self._task_keys[self._next_index :] + self._task_keys[: self._next_index]
+
+    async def get(self) -> schemas.core.TaskRun:
+        """Gets the next task_run from any of the given queues"""
+        (task_run,) = await self.get_many(1)
+        return task_run
+
+    async def get_many(self, limit: int) -> List[schemas.core.TaskRun]:
+        """Gets between 1 and `limit` task runs from any of the given queues"""
+        backend = TaskQueue.backend()
+        while True:
+            generation = backend.generation
+            task_runs = await backend.get(self._keys_in_turn(), limit=limit)
+            if task_runs:
+                last_key = task_runs[-1].task_key
+                if last_key in self._task_keys:
+                    self._next_index = (self._task_keys.index(last_key) + 1) % len(
+                        self._task_keys
+                    )
+                return task_runs
+            await backend.wait(self._task_keys, generation, backend.poll_interval)
+
+    async def ack(self, task_run: schemas.core.TaskRun) -> None:
+        """Acknowledges that a task_run was received by a task worker"""
+        await self.ack_many([task_run])
+
+    async def ack_many(self, task_runs: Iterable[schemas.core.TaskRun]) -> None:
+        """Acknowledges that task runs were received by a task worker"""
+        await TaskQueue.backend().ack([task_run.id for task_run in task_runs])
@@ -0,0 +1,201 @@
+"""
+A task queue backend that stores queued task runs in the Syntask database, so that they
+survive server restarts and can be shared by several API replicas.
+"""
+
+import itertools
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+from uuid import UUID
+
+import pendulum
+import sqlalchemy as sa
+from typing_extensions import Self
+
+import syntask.server.schemas as schemas
+from syntask.server.database.dependencies import db_injector
+from syntask.server.database.interface import SyntaskDBInterface
+from syntask.server.task_queue import TaskQueueBackend as _TaskQueueBackend
+from syntask.settings import SYNTASK_TASK_SCHEDULING_VISIBILITY_TIMEOUT
+
+
+class TaskQueueBackend(_TaskQueueBackend):
+    """
+    Stores queued task runs in the `task_queue_item` table.  Delivered task runs are
+    claimed by moving their `visible_after` time forward by the visibility timeout, and
+    are deleted when they are acknowledged.  Unlike the in-memory backend, queue sizes
+    are not bounded, and task runs are served in the order they were enqueued across
+    all of the requested task keys.
+    """
+
+    # other servers may add task runs without notifying this one
+    poll_interval: float = 0.5
+
+    @db_injector
+    async def _enqueue(
+        db: SyntaskDBInterface,
+        self: Self,
+        task_key: str,
+        task_runs: Sequence[schemas.core.TaskRun],
+        is_retry: bool,
+    ) -> None:
+        if not task_runs:
+            return
+
+        now = pendulum.now("UTC")
+        insert = db.insert(db.TaskQueueItem).values(
+            [
+                {
+                    "task_key": task_key,
+                    "task_run_id": task_run.id,
+                    "task_run": task_run,
+                    "is_retry": is_retry,
+                    "visible_after": now,
+                    # items are delivered in `created` order, so offset each item in
+                    # the batch to preserve the order in which they were enqueued
+                    "created": now.add(microseconds=i),
+                }
+                for i, task_run in enumerate(task_runs)
+            ]
+        )
+        # a task run that is enqueued again (for example, when it is being retried
+        # after a failed delivery) replaces its existing queue item
+        insert = insert.on_conflict_do_update(
+            index_elements=[db.TaskQueueItem.task_run_id],
+            set_={
+                "task_key": insert.excluded.task_key,
+                "task_run": insert.excluded.task_run,
+                "is_retry": insert.excluded.is_retry,
+                "visible_after": insert.excluded.visible_after,
+            },
+        )
+
+        async with db.session_context(begin_transaction=True) as session:
+            await session.execute(insert)
+
+        self._notify(task_key)
+
+    async def put(
+        self, task_key: str, task_runs: Sequence[schemas.core.TaskRun]
+    ) -> None:
+        await self._enqueue(task_key, task_runs, is_retry=False)
+
+    async def retry(
+        self, task_key: str, task_runs: Sequence[schemas.core.TaskRun]
+    ) -> None:
+        await self._enqueue(task_key, task_runs, is_retry=True)
+
+    @db_injector
+    async def get(
+        db: SyntaskDBInterface,
+        self: Self,
+        task_keys: Sequence[str],
+        limit: int = 1,
+        visibility_timeout: Optional[timedelta] = None,
+    ) -> List[schemas.core.TaskRun]:
+        if not task_keys or limit < 1:
+            return []
+
+        now = pendulum.now("UTC")
+        visible_after = now + (
+            visibility_timeout or SYNTASK_TASK_SCHEDULING_VISIBILITY_TIMEOUT.value()
+        )
+
+        # rank each task key's visible items in the order it would deliver them, so
+        # that a batch takes one task run from each task key in turn, like the
+        # in-memory backend does
+        ranked = (
+            sa.select(
+                db.TaskQueueItem.id,
+                sa.func.row_number()
+                .over(
+                    partition_by=db.TaskQueueItem.task_key,
+                    order_by=(
+                        db.TaskQueueItem.is_retry.desc(),
+                        db.TaskQueueItem.created,
+                    ),
+                )
+                .label("turn"),
+            )
+            .where(
+                db.TaskQueueItem.task_key.in_(task_keys),
+                db.TaskQueueItem.visible_after <= now,
+            )
+            .subquery()
+        )
+        key_order = {task_key: i for i, task_key in enumerate(task_keys)}
+        available = (
+            sa.select(db.TaskQueueItem.id)
+            .join(ranked, ranked.c.id == db.TaskQueueItem.id)
+            .order_by(
+                ranked.c.turn,
+                sa.case(key_order, value=db.TaskQueueItem.task_key),
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=db.TaskQueueItem)
+        )
+
+        async with db.session_context(
+            begin_transaction=True, with_for_update=True
+        ) as session:
+            result = await session.execute(
+                sa.update(db.TaskQueueItem)
+                .where(
+                    db.TaskQueueItem.id.in_(available.scalar_subquery()),
+                    # guards against another replica claiming the same items between
+                    # the subquery and the update on databases without SKIP LOCKED
+                    db.TaskQueueItem.visible_after <= now,
+                )
+                .values(
+                    visible_after=visible_after,
+                    delivery_count=db.TaskQueueItem.delivery_count + 1,
+                )
+                .returning(
+                    db.TaskQueueItem.task_key,
+                    db.TaskQueueItem.task_run,
+                    db.TaskQueueItem.is_retry,
+                    db.TaskQueueItem.created,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            claimed = result.all()
+
+        # RETURNING does not preserve the order of the subquery, so put each task
+        # key's task runs back in order and take them from each task key in turn
+        by_key: Dict[str, List[schemas.core.TaskRun]] = {}
+        for row in sorted(claimed, key=lambda row: (not row.is_retry, row.created)):
+            by_key.setdefault(row.task_key, []).append(row.task_run)
+
+        in_turn = [by_key[task_key] for task_key in task_keys if task_key in by_key]
+        return [
+            task_run
+            for turn in itertools.zip_longest(*in_turn)
+            for task_run in turn
+            if task_run is not None
+        ]
+
+    @db_injector
+    async def ack(
+        db: SyntaskDBInterface, self: Self, task_run_ids: Iterable[UUID]
+    ) -> None:
+        task_run_ids = list(task_run_ids)
+        if not task_run_ids:
+            return
+
+        async with db.session_context(begin_transaction=True) as session:
+            await session.execute(
+                sa.delete(db.TaskQueueItem).where(
+                    db.TaskQueueItem.task_run_id.in_(task_run_ids)
+                )
+            )
+
+    @db_injector
+    async def size(db: SyntaskDBInterface, self: Self, task_key: str) -> int:
+        async with db.session_context() as session:
+            result = await session.execute(
+                sa.select(sa.func.count(db.TaskQueueItem.id)).where(
+                    db.TaskQueueItem.task_key == task_key,
+                    db.TaskQueueItem.visible_after <= pendulum.now("UTC"),
+                )
+            )
+            return result.scalar_one()
@@ -0,0 +1,135 @@
+"""
+An in-memory task queue backend, where queued task runs are lost when the server
+process exits.
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import pendulum
+
+import syntask.server.schemas as schemas
+from syntask.server.task_queue import TaskQueueBackend as _TaskQueueBackend
+from syntask.settings import (
+    SYNTASK_TASK_SCHEDULING_MAX_RETRY_QUEUE_SIZE,
+    SYNTASK_TASK_SCHEDULING_MAX_SCHEDULED_QUEUE_SIZE,
+    SYNTASK_TASK_SCHEDULING_VISIBILITY_TIMEOUT,
+)
+
+
+class _KeyQueues:
+    scheduled: asyncio.Queue
+    retry: asyncio.Queue
+
+    def __init__(self, scheduled_size: int, retry_size: int):
+        self.scheduled = asyncio.Queue(maxsize=scheduled_size)
+        self.retry = asyncio.Queue(maxsize=retry_size)
+
+
+class TaskQueueBackend(_TaskQueueBackend):
+    _queues: Dict[str, _KeyQueues]
+    _queue_size_configs: Dict[str, Tuple[int, int]]
+
+    # task runs that have been delivered but not acknowledged, by task run ID, along
+    # with the time at which they become visible again
+    _in_flight: Dict[UUID, Tuple[pendulum.DateTime, schemas.core.TaskRun]]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._queues = {}
+        self._queue_size_configs = {}
+        self._in_flight = {}
+
+    def configure_task_key(
+        self, task_key: str, scheduled_size: int, retry_size: int
+    ) -> None:
+        self._queue_size_configs[task_key] = (scheduled_size, retry_size)
+
+    def _for_key(self, task_key: str) -> _KeyQueues:
+        if task_key not in self._queues:
+            sizes = self._queue_size_configs.get(
+                task_key,
+                (
+                    SYNTASK_TASK_SCHEDULING_MAX_SCHEDULED_QUEUE_SIZE.value(),
+                    SYNTASK_TASK_SCHEDULING_MAX_RETRY_QUEUE_SIZE.value(),
+                ),
+            )
+            self._queues[task_key] = _KeyQueues(*sizes)
+        return self._queues[task_key]
+
+    async def put(
+        self, task_key: str, task_runs: Sequence[schemas.core.TaskRun]
+    ) -> None:
+        queues = self._for_key(task_key)
+        for task_run in task_runs:
+            await queues.scheduled.put(task_run)
+            self._notify(task_key)
+
+    async def retry(
+        self, task_key: str, task_runs: Sequence[schemas.core.TaskRun]
+    ) -> None:
+        queues = self._for_key(task_key)
+        for task_run in task_runs:
+            self._in_flight.pop(task_run.id, None)
+            await queues.retry.put(task_run)
+            self._notify(task_key)
+
+    def _redeliver_expired(self) -> None:
+        """Moves task runs whose visibility timeout has expired to their retry queue"""
+        if not self._in_flight:
+            return
+
+        now = pendulum.now("UTC")
+        for task_run_id, (visible_at, task_run) in list(self._in_flight.items()):
+            if visible_at > now:
+                continue
+            try:
+                self._for_key(task_run.task_key).retry.put_nowait(task_run)
+            except asyncio.QueueFull:
+                # leave it in flight and try again on the next `get`
+                continue
+            del self._in_flight[task_run_id]
+
+    async def get(
+        self,
+        task_keys: Sequence[str],
+        limit: int = 1,
+        visibility_timeout: Optional[timedelta] = None,
+    ) -> List[schemas.core.TaskRun]:
+        self._redeliver_expired()
+
+        # take one task run from each task key in turn, so that a batch is shared
+        # fairly between the task keys
+        task_runs: List[schemas.core.TaskRun] = []
+        candidates = [self._for_key(task_key) for task_key in task_keys]
+        while candidates and len(task_runs) < limit:
+            still_queued = []
+            for queues in candidates:
+                if len(task_runs) >= limit:
+                    break
+                for queue in (queues.retry, queues.scheduled):
+                    try:
+                        task_runs.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        continue
+                    still_queued.append(queues)
+                    break
+            candidates = still_queued
+
+        visible_at = pendulum.now("UTC") + (
+            visibility_timeout or SYNTASK_TASK_SCHEDULING_VISIBILITY_TIMEOUT.value()
+        )
+        for task_run in task_runs:
+            self._in_flight[task_run.id] = (visible_at, task_run)
+
+        return task_runs
+
+    async def ack(self, task_run_ids: Iterable[UUID]) -> None:
+        for task_run_id in task_run_ids:
+            self._in_flight.pop(task_run_id, None)
+
+    async def size(self, task_key: str) -> int:
+        queues = self._for_key(task_key)
+        return queues.scheduled.qsize() + queues.retry.qsize()
@@ -68,6 +68,9 @@ def _generate_uuid_sqlite(element, compiler, **kwargs):
     """
 
 
+_ZERO_OFFSET = datetime.timedelta(0)
+
+
 class Timestamp(TypeDecorator):
     """TypeDecorator that ensures that timestamps have a timezone.
 
@@ -113,6 +116,9 @@ class Timestamp(TypeDecorator):
             if value.tzinfo is None:
                 raise ValueError("Timestamps must have a timezone.")
             elif dialect.name == "sqlite":
+                if value.utcoffset() == _ZERO_OFFSET:
+                    # already in UTC, which is the common case
+                    return value
                 return pendulum.instance(value).in_timezone("UTC")
             else:
                 return value
@@ -5,6 +5,7 @@ import importlib
 from typing import (
     Any,
     AsyncContextManager,
+    ClassVar,
     AsyncGenerator,
     Awaitable,
     Callable,
@@ -114,8 +115,14 @@ class Consumer(abc.ABC):
     """
     Abstract base class for consumers that receive messages from a message broker and
     call a handler function for each message received.
+
+    Consumers that can handle several messages at once set `supports_concurrency` and
+    accept a `concurrency` argument, the most messages they will handle at a time.
     """
 
+    supports_concurrency: ClassVar[bool] = False
+    concurrency: int = 1
+
     @abc.abstractmethod
     async def run(self, handler: MessageHandler) -> None:
         """Runs the consumer (indefinitely)"""
@@ -178,14 +185,21 @@ async def ephemeral_subscription(topic: str) -> AsyncGenerator[Dict[str, Any], N
         yield consumer_create_kwargs
 
 
-def create_consumer(topic: str, **kwargs) -> Consumer:
+def create_consumer(
+    topic: str, concurrency: Optional[int] = None, **kwargs
+) -> Consumer:
     """
     Creates a new consumer with the applications default settings.
     Args:
         topic: the topic to consume from
+        concurrency: the most messages to handle at once, if the broker's consumer
+            supports handling messages concurrently; otherwise they are handled one at
+            a time (check the `concurrency` of the returned consumer)
     Returns:
         a new Consumer instance
     """
     module = importlib.import_module(SYNTASK_MESSAGING_BROKER.value())
     assert isinstance(module, BrokerModule)
+    if concurrency is not None and module.Consumer.supports_concurrency:
+        kwargs["concurrency"] = concurrency
     return module.Consumer(topic, **kwargs)
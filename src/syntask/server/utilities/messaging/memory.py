@@ -5,10 +5,12 @@ from datetime import timedelta
 from typing import (
     Any,
     AsyncGenerator,
+    ClassVar,
     Dict,
     List,
     MutableMapping,
     Optional,
+    Set,
     TypeVar,
     Union,
 )
@@ -184,14 +186,33 @@ class Publisher(_Publisher):
 
 
 class Consumer(_Consumer):
-    def __init__(self, topic: str, subscription: Optional[Subscription] = None):
+    """
+    Consumes messages from a topic, acknowledging each one when its handler returns
+    and retrying it when its handler raises.  With a `concurrency` above 1, up to that
+    many messages are handled at once, which lets a handler hold on to a message (and
+    its acknowledgement) while it waits for others to arrive, for example to save
+    them in one batch.
+    """
+
+    supports_concurrency: ClassVar[bool] = True
+
+    def __init__(
+        self,
+        topic: str,
+        subscription: Optional[Subscription] = None,
+        concurrency: int = 1,
+    ):
         self.topic = Topic.by_name(topic)
         if not subscription:
             subscription = self.topic.subscribe()
         assert subscription.topic is self.topic
         self.subscription = subscription
+        self.concurrency = max(concurrency, 1)
 
     async def run(self, handler: MessageHandler) -> None:
+        if self.concurrency > 1:
+            return await self._run_concurrently(handler)
+
         while True:
             message = await self.subscription.get()
             try:
@@ -203,6 +224,59 @@ class Consumer(_Consumer):
             except Exception:
                 await self.subscription.retry(message)
 
+    async def _run_concurrently(self, handler: MessageHandler) -> None:
+        slots = asyncio.Semaphore(self.concurrency)
+        stopped = asyncio.Event()
+        handling: Set[asyncio.Task] = set()
+
+        async def handle(message: MemoryMessage) -> None:
+            try:
+                await handler(message)
+            except StopConsumer as e:
+                if not e.ack:
+                    await self.subscription.retry(message)
+                stopped.set()
+            except Exception:
+                await self.subscription.retry(message)
+            finally:
+                slots.release()
+
+        receiving: Optional[asyncio.Task] = None
+        stopping = asyncio.create_task(stopped.wait())
+        try:
+            while not stopped.is_set():
+                await slots.acquire()
+                if stopped.is_set():
+                    break
+
+                receiving = asyncio.create_task(self.subscription.get())
+                await asyncio.wait(
+                    [receiving, stopping], return_when=asyncio.FIRST_COMPLETED
+                )
+                if not receiving.done():
+                    break
+
+                message = receiving.result()
+                receiving = None
+                if stopped.is_set():
+                    await self.subscription.retry(message)
+                    break
+
+                task = asyncio.create_task(handle(message))
+                handling.add(task)
+                task.add_done_callback(handling.discard)
+
+            # let the messages already being handled finish before returning
+            await asyncio.gather(*handling, return_exceptions=True)
+        finally:
+            stopping.cancel()
+            if receiving is not None:
+                receiving.cancel()
+                if receiving.done() and not receiving.cancelled():
+                    await self.subscription.retry(receiving.result())
+            for task in handling:
+                task.cancel()
+
 
 @asynccontextmanager
 async def ephemeral_subscription(topic: str) -> AsyncGenerator[Dict[str, Any], None]:
@@ -501,6 +501,21 @@ class Settings(BaseSettings):
         description="The default setting for persisting results when not otherwise specified.",
     )
 
+    results_cache_index_enabled: bool = Field(
+        default=False,
+        description="Whether to remember the cache keys of persisted results in a local index, so that cache hits don't have to read result records from storage.",
+    )
+
+    results_cache_index_path: Optional[Path] = Field(
+        default=None,
+        description="The path to the SQLite database of known cache keys, shared by every process on this machine.",
+    )
+
+    results_streaming_chunk_size: int = Field(
+        default=8 * 1024 * 1024,
+        description="The size, in bytes, of the chunks that result records are streamed to and from storage in. Local result records at least this large are memory-mapped when read.",
+    )
+
     ###########################################################################
     # API settings
 
@@ -543,6 +558,41 @@ class Settings(BaseSettings):
         description="If `True`, log retryable errors in the API and it's services.",
     )
 
+    api_logs_bulk_ingestion_enabled: bool = Field(
+        default=False,
+        description="""
+        If `True`, logs from concurrent requests to `POST /logs/` are gathered into a
+        shared buffer and written together, with `COPY` on PostgreSQL.  Each request
+        still returns only once its logs have been written.
+        """,
+    )
+
+    api_logs_bulk_ingestion_buffer_size: int = Field(
+        default=50_000,
+        gt=0,
+        description="""
+        The most logs that bulk log ingestion buffers at once; requests wait for room
+        in the buffer beyond this.
+        """,
+    )
+
+    api_logs_retention_period: Optional[timedelta] = Field(
+        default=None,
+        description="""
+        The amount of time to retain logs in the database.  Older logs are removed by the
+        log retention service.  If not set, logs are retained forever.
+        """,
+    )
+
+    api_logs_search_index_enabled: bool = Field(
+        default=False,
+        description="""
+        If `True`, the log retention service adds a trigram index on the message of each
+        daily partition of logs it creates on PostgreSQL, which keeps searching logs by
+        their message fast on large tables at the cost of slower log ingestion.
+        """,
+    )
+
     api_default_limit: int = Field(
         default=200,
         description="The default limit applied to queries that can return multiple objects, such as `POST /flow_runs/filter`.",
@@ -715,6 +765,16 @@ class Settings(BaseSettings):
         """,
     )
 
+    api_services_scheduler_full_scan_seconds: float = Field(
+        default=600,
+        description="""
+        The scheduler only schedules runs for deployments whose scheduled runs are
+        running out, or whose schedules have changed, but it will also check every
+        deployment with an active schedule this often, to catch anything it would
+        otherwise miss. Defaults to `600`.
+        """,
+    )
+
     api_services_late_runs_enabled: bool = Field(
         default=True,
         description="Whether or not to start the late runs service in the server application.",
@@ -753,6 +813,38 @@ class Settings(BaseSettings):
         """,
     )
 
+    api_services_lease_expirations_enabled: bool = Field(
+        default=True,
+        description="""
+        Whether or not to start the concurrency limit lease expiration service in the
+        server application. If disabled, the slots of expired leases are only released
+        when another lease is requested.
+        """,
+    )
+
+    api_services_lease_expirations_loop_seconds: float = Field(
+        default=5,
+        description="""
+        The lease expiration service will look for expired concurrency limit leases this often. Defaults to `5`.
+        """,
+    )
+
+    api_services_log_retention_enabled: bool = Field(
+        default=True,
+        description="""
+        Whether or not to start the log retention service in the server application,
+        which creates the daily partitions of logs on PostgreSQL and removes logs older
+        than `SYNTASK_API_LOGS_RETENTION_PERIOD`.
+        """,
+    )
+
+    api_services_log_retention_loop_seconds: float = Field(
+        default=3600,
+        description="""
+        The log retention service will maintain partitions and remove old logs this often. Defaults to `3600`.
+        """,
+    )
+
     api_services_foreman_enabled: bool = Field(
         default=True,
         description="Whether or not to start the Foreman service in the server application.",
@@ -802,6 +894,18 @@ class Settings(BaseSettings):
         description="Whether or not to start the task run recorder service in the server application.",
     )
 
+    api_services_task_run_recorder_batch_size: int = Field(
+        default=100,
+        gt=0,
+        description="The number of task run events the task run recorder will attempt to record in one batch.",
+    )
+
+    api_services_task_run_recorder_flush_interval: float = Field(
+        default=0.5,
+        gt=0.0,
+        description="The maximum number of seconds between flushes of the task run recorder.",
+    )
+
     api_services_flow_run_notifications_enabled: bool = Field(
         default=True,
         description="""
@@ -888,6 +992,15 @@ class Settings(BaseSettings):
         description="The maximum size in bytes for a single log.",
     )
 
+    logging_to_api_compact_transport: bool = Field(
+        default=False,
+        description="""
+        If `True`, batches of logs are sent to the API in a compact encoding that lists
+        repeated values once and is compressed.  Logs are sent as JSON instead if the
+        API doesn't accept the compact encoding.
+        """,
+    )
+
     logging_to_api_when_missing_flow: Literal["warn", "error", "ignore"] = Field(
         default="warn",
         description="""
@@ -1124,6 +1237,15 @@ class Settings(BaseSettings):
         description="The maximum size of an Event when serialized to JSON",
     )
 
+    events_compact_wire_format: bool = Field(
+        default=False,
+        description="""
+        Whether or not events clients should offer to stream events to the Syntask
+        server in a compact binary encoding, rather than as JSON.  Servers that don't
+        support the compact encoding will continue to receive JSON.
+        """,
+    )
+
     events_expired_bucket_buffer: timedelta = Field(
         default=timedelta(seconds=60),
         description="The amount of time to retain expired automation buckets",
@@ -1214,6 +1336,41 @@ class Settings(BaseSettings):
         """,
     )
 
+    client_concurrency_wait_seconds: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=30.0,
+        description="""
+        How long the API may hold a request for concurrency slots while it waits in
+        line for them, instead of the client retrying after a delay.  Slots are granted
+        to waiting clients in the order they asked, as soon as they're released.  When
+        `0`, requests for slots don't wait.  Waits are kept under half of the API
+        request timeout, so the API answers before the request times out.
+        """,
+    )
+
+    client_concurrency_leases_enabled: bool = Field(
+        default=False,
+        description="""
+        If `True`, concurrency slots are acquired from leases on batches of slots, which
+        each client process holds and hands out to its own tasks, instead of with a
+        request to the API for each acquisition.  Requires a server that supports
+        concurrency limit leases.
+        """,
+    )
+
+    client_concurrency_lease_slots: int = Field(
+        default=10,
+        gt=0,
+        description="The most slots to lease at once when concurrency leases are enabled.",
+    )
+
+    client_concurrency_lease_ttl_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="How long concurrency leases last before they must be renewed.",
+    )
+
     experimental_warn: bool = Field(
         default=True,
         description="If `True`, warn on usage of experimental features.",
@@ -1305,6 +1462,14 @@ class Settings(BaseSettings):
         description="Number of seconds a runner should wait between queries for scheduled work.",
     )
 
+    runner_cancellation_fallback_poll_frequency: int = Field(
+        default=300,
+        description=(
+            "Number of seconds a runner should wait between queries for cancelling flow"
+            " runs while it's subscribed to flow run cancellation events."
+        ),
+    )
+
     runner_server_missed_polls_tolerance: int = Field(
         default=2,
         description="Number of missed polls before a runner is considered unhealthy by its webserver.",
@@ -1330,6 +1495,24 @@ class Settings(BaseSettings):
         description="Whether or not to enable the runner's webserver.",
     )
 
+    runner_prefork_enabled: bool = Field(
+        default=False,
+        description=(
+            "Whether runners start flow run processes by forking a process that has"
+            " already imported Syntask, rather than starting a new Python process for"
+            " each flow run. Only supported on POSIX systems."
+        ),
+    )
+
+    runner_prefork_preload_entrypoints: bool = Field(
+        default=False,
+        description=(
+            "Whether the process that runners fork flow run processes from also"
+            " imports the flows of the runner's deployments, along with the modules"
+            " they import. Only used when `SYNTASK_RUNNER_PREFORK_ENABLED` is set."
+        ),
+    )
+
     deployment_concurrency_slot_wait_seconds: float = Field(
         default=30.0,
         ge=0.0,
@@ -1354,6 +1537,14 @@ class Settings(BaseSettings):
         description="Number of seconds a worker should wait between queries for scheduled work.",
     )
 
+    worker_cancellation_fallback_query_seconds: float = Field(
+        default=300,
+        description=(
+            "Number of seconds a worker should wait between queries for cancelling flow"
+            " runs while it's subscribed to flow run cancellation events."
+        ),
+    )
+
     worker_prefetch_seconds: float = Field(
         default=10,
         description="The number of seconds into the future a worker should query for scheduled work.",
@@ -1394,6 +1585,21 @@ class Settings(BaseSettings):
         description="How long before a PENDING task are made available to another task worker.",
     )
 
+    task_scheduling_queue_backend: str = Field(
+        default="syntask.server.task_queue.memory",
+        description="Which backend to use for queueing background task runs. Should point to a module that exports a TaskQueueBackend class. Use `syntask.server.task_queue.database` to persist queued task runs in the database.",
+    )
+
+    task_scheduling_delivery_batch_size: int = Field(
+        default=1,
+        description="The maximum number of task runs a task worker asks the server to deliver in each websocket message.",
+    )
+
+    task_scheduling_visibility_timeout: timedelta = Field(
+        default=timedelta(seconds=60),
+        description="How long a task run delivered to a task worker is hidden from other task workers before it is redelivered, unless the task worker acknowledges it.",
+    )
+
     experimental_enable_schedule_concurrency: bool = Field(
         default=False,
         description="Whether or not to enable concurrency for scheduled tasks.",
@@ -1473,6 +1679,9 @@ class Settings(BaseSettings):
         if self.memo_store_path is None:
             self.memo_store_path = Path(f"{self.home}/memo_store.toml")
             self.__pydantic_fields_set__.remove("memo_store_path")
+        if self.results_cache_index_path is None:
+            self.results_cache_index_path = Path(f"{self.home}/results_index.db")
+            self.__pydantic_fields_set__.remove("results_cache_index_path")
         if self.debug_mode or self.test_mode:
             self.logging_level = "DEBUG"
             self.logging_internal_level = "DEBUG"
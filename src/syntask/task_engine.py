@@ -48,6 +48,7 @@ from syntask.context import (
 from syntask.events.schemas.events import Event as SyntaskEvent
 from syntask.exceptions import (
     Abort,
+    MissingResult,
     Pause,
     SyntaskException,
     TerminationSignal,
@@ -55,6 +56,7 @@ from syntask.exceptions import (
 )
 from syntask.futures import SyntaskFuture
 from syntask.logging.loggers import get_logger, patch_print, task_run_logger
+from syntask.object_handles import ObjectHandles
 from syntask.results import (
     BaseResult,
     ResultRecord,
@@ -77,7 +79,12 @@ from syntask.states import (
     exception_to_failed_state,
     return_value_to_state,
 )
-from syntask.transactions import IsolationLevel, Transaction, transaction
+from syntask.transactions import (
+    IsolationLevel,
+    Transaction,
+    TransactionState,
+    transaction,
+)
 from syntask.utilities.annotations import NotSet
 from syntask.utilities.asyncutils import run_coro_as_sync
 from syntask.utilities.callables import call_with_parameters, parameters_to_args_kwargs
@@ -85,6 +92,7 @@ from syntask.utilities.collections import visit_collection
 from syntask.utilities.engine import (
     _get_hook_name,
     emit_task_run_state_change_event,
+    has_inputs_to_resolve,
     link_state_to_result,
     resolve_to_final_result,
 )
@@ -158,12 +166,33 @@ class BaseTaskRunEngine(Generic[P, R]):
             key = _format_user_supplied_storage_key(self.task.result_storage_key)
         return key
 
+    @property
+    def object_handles(self) -> Optional[ObjectHandles]:
+        """The handles to results held in memory by the task runner this task run
+        was submitted to, if any"""
+        if self.context and isinstance(
+            self.context.get("object_handles"), ObjectHandles
+        ):
+            return self.context["object_handles"]
+        return None
+
     def _resolve_parameters(self):
         if not self.parameters:
             return {}
 
+        object_handles = self.object_handles
         resolved_parameters = {}
         for parameter, value in self.parameters.items():
+            # Results held by the task runner are handed over by reference
+            handle = object_handles.find(value) if object_handles is not None else None
+            if handle is not None and not handle.needs_resolving():
+                resolved_parameters[parameter] = handle.value
+                continue
+
+            if not has_inputs_to_resolve(value):
+                resolved_parameters[parameter] = value
+                continue
+
             try:
                 resolved_parameters[parameter] = visit_collection(
                     value,
@@ -250,6 +279,24 @@ class BaseTaskRunEngine(Generic[P, R]):
             msg=msg,
         )
 
+    def read_cached_result(self, transaction: Transaction) -> Any:
+        """
+        Reads the result of a committed transaction.  If its record is no longer in
+        result storage (e.g. it expired or was deleted after the cache was checked), the
+        transaction is reopened so that the task runs instead.
+        """
+        try:
+            return transaction.read()
+        except MissingResult:
+            self.logger.info(
+                "Cached result for key %r is no longer in result storage; running the"
+                " task.",
+                transaction.key,
+            )
+            self.logger.debug("Error reading the cached result:", exc_info=True)
+            transaction.state = TransactionState.ACTIVE
+            return None
+
     def handle_rollback(self, txn: Transaction) -> None:
         assert self.task_run is not None
 
@@ -647,6 +694,7 @@ class SyncTaskRunEngine(BaseTaskRunEngine[P, R]):
                                 parent_task_run_context=TaskRunContext.get(),
                                 wait_for=self.wait_for,
                                 extra_task_inputs=dependencies,
+                                object_handles=self.object_handles,
                             )
                         )
                         # Emit an event to capture that the task run was in the `PENDING` state.
@@ -775,8 +823,8 @@ class SyncTaskRunEngine(BaseTaskRunEngine[P, R]):
         """
         parameters = self.parameters or {}
         if transaction.is_committed():
-            result = transaction.read()
-        else:
+            result = self.read_cached_result(transaction)
+        if not transaction.is_committed():
             if self.task_run.tags:
                 # Acquire a concurrency slot for each tag, but only if a limit
                 # matching the tag already exists.
@@ -1157,6 +1205,7 @@ class AsyncTaskRunEngine(BaseTaskRunEngine[P, R]):
                             parent_task_run_context=TaskRunContext.get(),
                             wait_for=self.wait_for,
                             extra_task_inputs=dependencies,
+                            object_handles=self.object_handles,
                         )
                         # Emit an event to capture that the task run was in the `PENDING` state.
                         self._last_event = emit_task_run_state_change_event(
@@ -1285,8 +1334,8 @@ class AsyncTaskRunEngine(BaseTaskRunEngine[P, R]):
         """
         parameters = self.parameters or {}
         if transaction.is_committed():
-            result = transaction.read()
-        else:
+            result = self.read_cached_result(transaction)
+        if not transaction.is_committed():
             if self.task_run.tags:
                 # Acquire a concurrency slot for each tag, but only if a limit
                 # matching the tag already exists.
@@ -3,6 +3,7 @@ import asyncio
 import sys
 import threading
 import uuid
+import weakref
 from concurrent.futures import ThreadPoolExecutor
 from contextvars import copy_context
 from typing import (
@@ -20,7 +21,7 @@ from typing import (
 
 from typing_extensions import ParamSpec, Self, TypeVar
 
-from syntask.client.schemas.objects import TaskRunInput
+from syntask.client.schemas.objects import State, TaskRunInput
 from syntask.exceptions import MappingLengthMismatch, MappingMissingIterable
 from syntask.futures import (
     SyntaskConcurrentFuture,
@@ -29,6 +30,7 @@ from syntask.futures import (
     SyntaskFutureList,
 )
 from syntask.logging.loggers import get_logger, get_run_logger
+from syntask.object_handles import ObjectHandles
 from syntask.utilities.annotations import allow_failure, quote, unmapped
 from syntask.utilities.callables import (
     collapse_variadic_parameters,
@@ -222,6 +224,7 @@ class ThreadPoolTaskRunner(TaskRunner[SyntaskConcurrentFuture]):
         self._executor: Optional[ThreadPoolExecutor] = None
         self._max_workers = sys.maxsize if max_workers is None else max_workers
         self._cancel_events: Dict[uuid.UUID, threading.Event] = {}
+        self._object_handles = ObjectHandles()
 
     def duplicate(self) -> "ThreadPoolTaskRunner":
         return type(self)(max_workers=self._max_workers)
@@ -254,6 +257,9 @@ class ThreadPoolTaskRunner(TaskRunner[SyntaskConcurrentFuture]):
         """
         Submit a task to the task run engine running in a separate thread.
 
+        Parameters that are futures for, or results of, other tasks submitted to this
+        runner are handed to the task by reference once those tasks complete.
+
         Args:
             task: The task to submit.
             parameters: The parameters to use when running the task.
@@ -289,28 +295,66 @@ class ThreadPoolTaskRunner(TaskRunner[SyntaskConcurrentFuture]):
             wait_for=wait_for,
             return_type="state",
             dependencies=dependencies,
-            context=dict(cancel_event=cancel_event),
+            context=dict(
+                cancel_event=cancel_event, object_handles=self._object_handles
+            ),
         )
 
+        # Hold on to the results passed as parameters until this task run finishes, and
+        # to this task run's own result for as long as its future is around
+        upstream_task_run_ids = [
+            upstream_task_run_id
+            for value in parameters.values()
+            if (upstream_task_run_id := self._object_handles.references(value))
+        ]
+        self._object_handles.acquire([task_run_id, *upstream_task_run_ids])
+
         if task.isasync:
             # TODO: Explore possibly using a long-lived thread with an event loop
             # for better performance
             future = self._executor.submit(
                 context.run,
+                self._run_and_add_handle,
+                task_run_id,
+                upstream_task_run_ids,
                 asyncio.run,
                 run_task_async(**submit_kwargs),
             )
         else:
             future = self._executor.submit(
                 context.run,
+                self._run_and_add_handle,
+                task_run_id,
+                upstream_task_run_ids,
                 run_task_sync,
                 **submit_kwargs,
             )
         syntask_future = SyntaskConcurrentFuture(
             task_run_id=task_run_id, wrapped_future=future
         )
+        weakref.finalize(syntask_future, self._object_handles.release, [task_run_id])
         return syntask_future
 
+    def _run_and_add_handle(
+        self,
+        task_run_id: uuid.UUID,
+        upstream_task_run_ids: List[uuid.UUID],
+        fn,
+        /,
+        *args,
+        **kwargs,
+    ):
+        """Runs a task run, releasing the results it was passed once it finishes and
+        adding a handle to its own result before its future is resolved, so that
+        downstream task runs always find it"""
+        try:
+            state = fn(*args, **kwargs)
+        finally:
+            self._object_handles.release(upstream_task_run_ids)
+        if isinstance(state, State):
+            self._object_handles.add(task_run_id, state)
+        return state
+
     @overload
     def map(
         self,
@@ -354,6 +398,7 @@ class ThreadPoolTaskRunner(TaskRunner[SyntaskConcurrentFuture]):
         if self._executor is not None:
             self._executor.shutdown(cancel_futures=True)
             self._executor = None
+        self._object_handles.clear()
         super().__exit__(exc_type, exc_value, traceback)
 
     def __eq__(self, value: object) -> bool:
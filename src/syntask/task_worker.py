@@ -29,6 +29,7 @@ from syntask.results import ResultStore, get_or_create_default_task_scheduling_s
 from syntask.settings import (
     SYNTASK_API_URL,
     SYNTASK_TASK_SCHEDULING_DELETE_FAILED_SUBMISSIONS,
+    SYNTASK_TASK_SCHEDULING_DELIVERY_BATCH_SIZE,
 )
 from syntask.states import Pending
 from syntask.task_engine import run_task_async, run_task_sync
@@ -219,12 +220,16 @@ class TaskWorker:
             task_key.split(".")[-1].split("-")[0] for task_key in sorted(self.task_keys)
         )
         logger.info(f"Subscribing to runs of task(s): {task_keys_repr}")
+        batch_size = SYNTASK_TASK_SCHEDULING_DELIVERY_BATCH_SIZE.value()
         async for task_run in Subscription(
             model=TaskRun,
             path="/task_runs/subscriptions/scheduled",
             keys=self.task_keys,
             client_id=self.client_id,
             base_url=base_url,
+            # only ask for batches when needed, so that we stay compatible with
+            # servers that deliver one task run per message
+            batch_size=batch_size if batch_size > 1 else None,
         ):
             logger.info(f"Received task run: {task_run.id} - {task_run.name}")
 
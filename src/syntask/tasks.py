@@ -78,6 +78,7 @@ from syntask.utilities.urls import url_for
 if TYPE_CHECKING:
     from syntask.client.orchestration import SyntaskClient
     from syntask.context import TaskRunContext
+    from syntask.object_handles import ObjectHandles
     from syntask.transactions import Transaction
 
 T = TypeVar("T")  # Generic type var for capturing the inner return type of async funcs
@@ -829,6 +830,7 @@ class Task(Generic[P, R]):
         wait_for: Optional[Iterable[SyntaskFuture]] = None,
         extra_task_inputs: Optional[Dict[str, Set[TaskRunInput]]] = None,
         deferred: bool = False,
+        object_handles: Optional["ObjectHandles"] = None,
     ) -> TaskRun:
         from syntask.utilities.engine import (
             _dynamic_key_for_task_run,
@@ -880,10 +882,19 @@ class Task(Generic[P, R]):
                     data["wait_for"] = wait_for
                 await store.store_parameters(parameters_id, data)
 
-            # collect task inputs
-            task_inputs = {
-                k: collect_task_run_inputs_sync(v) for k, v in parameters.items()
-            }
+            # collect task inputs, attributing results held by the task runner to the
+            # task runs that returned them rather than walking them
+            task_inputs = {}
+            for k, v in parameters.items():
+                handle = (
+                    object_handles.find(v, wait=False)
+                    if object_handles is not None
+                    else None
+                )
+                if handle is not None and not handle.needs_resolving():
+                    task_inputs[k] = {TaskRunResult(id=handle.task_run_id)}
+                else:
+                    task_inputs[k] = collect_task_run_inputs_sync(v)
 
             # collect all parent dependencies
             if task_parents := _infer_parent_task_runs(
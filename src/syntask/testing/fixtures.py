@@ -13,6 +13,7 @@ import httpx
 import pendulum
 import pytest
 from starlette.status import WS_1008_POLICY_VIOLATION
+from websockets import Subprotocol
 from websockets.exceptions import ConnectionClosed
 from websockets.legacy.server import WebSocketServer, WebSocketServerProtocol, serve
 
@@ -21,6 +22,7 @@ from syntask.events.clients import (
     AssertingEventsClient,
     AssertingPassthroughEventsClient,
 )
+from syntask.events.compact import COMPACT_EVENTS_SUBPROTOCOL, CompactEventDecoder
 from syntask.events.filters import EventFilter
 from syntask.events.worker import EventsWorker
 from syntask.server.api.server import SubprocessASGIServer
@@ -305,13 +307,20 @@ async def events_server(
             await outgoing_events(socket)
 
     async def incoming_events(socket: WebSocketServerProtocol):
+        decoder: Optional[CompactEventDecoder] = None
+        if socket.subprotocol == COMPACT_EVENTS_SUBPROTOCOL:
+            decoder = CompactEventDecoder()
+
         while True:
             try:
                 message = await socket.recv()
             except ConnectionClosed:
                 return
 
-            event = Event.model_validate_json(message)
+            if decoder:
+                event = Event.model_validate(decoder.decode(message))
+            else:
+                event = Event.model_validate_json(message)
             recorder.events.append(event)
 
             if puppeteer.hard_disconnect_after == event.id:
@@ -352,7 +361,12 @@ async def events_server(
                 puppeteer.hard_disconnect_after = None
                 raise ValueError("zonk")
 
-    async with serve(handler, host="localhost", port=unused_tcp_port) as server:
+    async with serve(
+        handler,
+        host="localhost",
+        port=unused_tcp_port,
+        subprotocols=[Subprotocol(COMPACT_EVENTS_SUBPROTOCOL)],
+    ) as server:
         yield server
 
 
@@ -221,6 +221,132 @@ class StopVisiting(BaseException):
     """
 
 
+# The kinds of collections whose children `visit_collection` visits
+_ANNOTATION = 1
+_SEQUENCE = 2
+_DICT = 3
+_DATACLASS = 4
+_MODEL = 5
+
+# Types whose values never have children to visit
+_ATOMIC_TYPES = frozenset({type(None), bool, int, float, complex, str, bytes})
+
+_COLLECTION_KINDS: Dict[type, Optional[int]] = {
+    **{typ: None for typ in _ATOMIC_TYPES},
+    list: _SEQUENCE,
+    tuple: _SEQUENCE,
+    set: _SEQUENCE,
+    dict: _DICT,
+    OrderedDict: _DICT,
+}
+
+
+def _collection_kind(typ: type) -> Optional[int]:
+    """Returns the kind of collection that values of the given type are, or `None` if
+    their children aren't visited"""
+    try:
+        return _COLLECTION_KINDS[typ]
+    except KeyError:
+        pass
+
+    if issubclass(typ, (types.GeneratorType, types.AsyncGeneratorType)):
+        # Do not attempt to iterate over generators, as it will exhaust them
+        kind = None
+    elif issubclass(typ, Mock):
+        # Do not attempt to recurse into mock objects, which also have a class of
+        # their own, so aren't remembered
+        return None
+    elif issubclass(typ, BaseAnnotation):
+        kind = _ANNOTATION
+    elif issubclass(typ, (list, tuple, set)):
+        kind = _SEQUENCE
+    elif is_dataclass(typ):
+        kind = _DATACLASS
+    elif issubclass(typ, pydantic.BaseModel):
+        kind = _MODEL
+    else:
+        kind = None
+
+    _COLLECTION_KINDS[typ] = kind
+    return kind
+
+
+def _model_fields(model: pydantic.BaseModel) -> Set[str]:
+    # when extra=allow, fields not in model_fields may be in model_fields_set
+    return model.model_fields_set.union(model.model_fields.keys())
+
+
+class _Frame:
+    """A collection whose children are being visited by `visit_collection`"""
+
+    __slots__ = (
+        "expr",
+        "kind",
+        "children",
+        "results",
+        "index",
+        "context",
+        "max_depth",
+        "names",
+    )
+
+    def __init__(
+        self,
+        expr: Any,
+        kind: int,
+        children: List[Any],
+        context: Optional[dict],
+        max_depth: int,
+    ):
+        self.expr = expr
+        self.kind = kind
+        self.children = children
+        self.results: List[Any] = []
+        self.index = 0
+        self.context = context
+        self.max_depth = max_depth
+        # The names of a model's fields, in the order its children are visited
+        self.names: List[str] = []
+
+    def finish(self, remove_annotations: bool) -> Any:
+        """Returns the collection with its visited children, which is a copy only if
+        any of its children were modified"""
+        expr, children, results = self.expr, self.children, self.results
+
+        if self.kind == _ANNOTATION:
+            (value,) = results
+            # if we are removing annotations, return the value
+            if remove_annotations:
+                return value
+            # if the value was modified, rewrap it
+            if value is not children[0]:
+                return expr.rewrap(value)
+            return expr
+
+        if all(result is child for result, child in zip(results, children)):
+            return expr
+
+        typ = type(expr)
+        if self.kind == _SEQUENCE:
+            # treat iterators like lists
+            if isinstance(expr, IteratorABC) and isiterable(expr):
+                typ = list
+            return typ(results)
+        elif self.kind == _DICT:
+            return typ(zip(results[::2], results[1::2]))
+        elif self.kind == _DATACLASS:
+            return typ(**{f.name: v for f, v in zip(fields(expr), results)})
+        else:
+            # Use construct to avoid validation and handle immutability
+            model_instance = typ.model_construct(
+                _fields_set=expr.model_fields_set,
+                **dict(zip(self.names, results)),
+            )
+            for private_attr in expr.__private_attributes__:
+                setattr(model_instance, private_attr, getattr(expr, private_attr))
+            return model_instance
+
+
 def visit_collection(
     expr: Any,
     visit_fn: Union[Callable[[Any, Optional[dict]], Any], Callable[[Any], Any]],
@@ -257,6 +383,12 @@ def visit_collection(
     Note that visit_collection will not consume generators or async generators, as it would prevent
     the caller from iterating over them.
 
+    Collections are visited with an explicit stack rather than by recursion, so deeply
+    nested collections don't exhaust Python's recursion limit, and elements of common
+    types that can't hold other elements (like numbers and strings) are passed straight
+    to `visit_fn`.  To skip visiting altogether when a collection can't hold anything
+    of interest, check it first with `collection_contains`.
+
     Args:
         expr (Any): A Python object or expression.
         visit_fn (Callable[[Any, Optional[dict]], Any] or Callable[[Any], Any]): A function
@@ -289,150 +421,164 @@ def visit_collection(
     if _seen is None:
         _seen = set()
 
-    def visit_nested(expr):
-        # Utility for a recursive call, preserving options and updating the depth.
-        return visit_collection(
-            expr,
-            visit_fn=visit_fn,
-            return_data=return_data,
-            remove_annotations=remove_annotations,
-            max_depth=max_depth - 1,
-            # Copy the context on nested calls so it does not "propagate up"
-            context=context.copy() if context is not None else None,
-            _seen=_seen,
-        )
-
-    def visit_expression(expr):
-        if context is not None:
-            return visit_fn(expr, context)
-        else:
-            return visit_fn(expr)
-
-    # --- 1. Visit every expression
-    try:
-        result = visit_expression(expr)
-    except StopVisiting:
-        max_depth = 0
-        result = expr
-
-    if return_data:
-        # Only mutate the root expression if the user indicated we're returning data,
-        # otherwise the function could return null and we have no collection to check
-        expr = result
-
-    # --- 2. Visit every child of the expression recursively
-
-    # If we have reached the maximum depth or we have already visited this object,
-    # return the result if we are returning data, otherwise return None
-    if max_depth == 0 or id(expr) in _seen:
-        return result if return_data else None
-    else:
-        _seen.add(id(expr))
-
-    # Get the expression type; treat iterators like lists
-    typ = list if isinstance(expr, IteratorABC) and isiterable(expr) else type(expr)
-    typ = cast(type, typ)  # mypy treats this as 'object' otherwise and complains
-
-    # Then visit every item in the expression if it is a collection
-
-    # presume that the result is the original expression.
-    # in each of the following cases, we will update the result if we need to.
-    result = expr
-
-    # --- Generators
-
-    if isinstance(expr, (types.GeneratorType, types.AsyncGeneratorType)):
-        # Do not attempt to iterate over generators, as it will exhaust them
-        pass
-
-    # --- Mocks
-
-    elif isinstance(expr, Mock):
-        # Do not attempt to recurse into mock objects
-        pass
-
-    # --- Annotations (unmapped, quote, etc.)
-
-    elif isinstance(expr, BaseAnnotation):
-        if context is not None:
-            context["annotation"] = expr
-        unwrapped = expr.unwrap()
-        value = visit_nested(unwrapped)
-
-        if return_data:
-            # if we are removing annotations, return the value
-            if remove_annotations:
-                result = value
-            # if the value was modified, rewrap it
-            elif value is not unwrapped:
-                result = expr.rewrap(value)
-            # otherwise return the expr
-
-    # --- Sequences
-
-    elif isinstance(expr, (list, tuple, set)):
-        items = [visit_nested(o) for o in expr]
+    def descend(expr, result, context, max_depth):
+        # Returns the final value of an expression that `visit_fn` has returned
+        # `result` for, along with a frame for visiting its children if it has any
         if return_data:
-            modified = any(item is not orig for item, orig in zip(items, expr))
-            if modified:
-                result = typ(items)
-
-    # --- Dictionaries
+            # Only mutate the expression if the user indicated we're returning data,
+            # otherwise the function could return null and we have no collection to
+            # check
+            expr = result
+
+        # If we have reached the maximum depth or we have already visited this
+        # object, the result is final
+        if max_depth == 0:
+            return result, None
+
+        kind = _collection_kind(type(expr))
+        if kind is None:
+            return expr, None
+
+        if id(expr) in _seen:
+            return result, None
+        _seen.add(id(expr))
 
-    elif typ in (dict, OrderedDict):
-        assert isinstance(expr, (dict, OrderedDict))  # typecheck assertion
-        items = [(visit_nested(k), visit_nested(v)) for k, v in expr.items()]
-        if return_data:
-            modified = any(
-                k1 is not k2 or v1 is not v2
-                for (k1, v1), (k2, v2) in zip(items, expr.items())
-            )
-            if modified:
-                result = typ(items)
+        if kind == _ANNOTATION:
+            if context is not None:
+                context["annotation"] = expr
+            children = [expr.unwrap()]
+        elif kind == _SEQUENCE:
+            children = list(expr)
+        elif kind == _DICT:
+            children = [item for pair in expr.items() for item in pair]
+        elif kind == _DATACLASS:
+            children = [getattr(expr, f.name) for f in fields(expr)]
+        else:
+            # We may encounter a deprecated field here, but this isn't the caller's
+            # fault
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", category=DeprecationWarning)
+                names = list(_model_fields(expr))
+                children = [getattr(expr, name) for name in names]
+
+        frame = _Frame(expr, kind, children, context, max_depth)
+        if kind == _MODEL:
+            frame.names = names
+        return expr, frame
+
+    def visit(expr, context, max_depth):
+        try:
+            result = visit_fn(expr, context) if context is not None else visit_fn(expr)
+        except StopVisiting:
+            return expr, None
+        return descend(expr, result, context, max_depth)
+
+    value, frame = visit(expr, context, max_depth)
+    if frame is None:
+        return value if return_data else None
+
+    stack = [frame]
+    while stack:
+        frame = stack[-1]
+        children = frame.children
+        results = frame.results
+        context = frame.context
+        child_depth = frame.max_depth - 1
+
+        while frame.index < len(children):
+            child = children[frame.index]
+            frame.index += 1
+            # Copy the context for each child so it does not "propagate up"
+            child_context = context.copy() if context is not None else None
+
+            if type(child) not in _ATOMIC_TYPES:
+                value, child_frame = visit(child, child_context, child_depth)
+                if child_frame is not None:
+                    stack.append(child_frame)
+                    break
+                results.append(value)
+                continue
+
+            # Atomic values have no children, so unless `visit_fn` replaces them with
+            # something that does, they're done as soon as they've been visited
+            try:
+                if child_context is not None:
+                    result = visit_fn(child, child_context)
+                else:
+                    result = visit_fn(child)
+            except StopVisiting:
+                results.append(child)
+                continue
+
+            if not return_data or type(result) in _ATOMIC_TYPES:
+                results.append(result)
+                continue
+
+            value, child_frame = descend(child, result, child_context, child_depth)
+            if child_frame is not None:
+                stack.append(child_frame)
+                break
+            results.append(value)
+        else:
+            stack.pop()
+            value = frame.finish(remove_annotations) if return_data else None
+            if not stack:
+                return value
+            stack[-1].results.append(value)
 
-    # --- Dataclasses
 
-    elif is_dataclass(expr) and not isinstance(expr, type):
-        values = [visit_nested(getattr(expr, f.name)) for f in fields(expr)]
-        if return_data:
-            modified = any(
-                getattr(expr, f.name) is not v for f, v in zip(fields(expr), values)
-            )
-            if modified:
-                result = typ(**{f.name: v for f, v in zip(fields(expr), values)})
+def collection_contains(expr: Any, types: Union[type, Tuple[type, ...]]) -> bool:
+    """
+    Returns whether an arbitrary Python collection, or anything nested in it, is an
+    instance of any of the given types.
 
-    # --- Pydantic models
+    Looks through the same collections that `visit_collection` visits, but without
+    calling anything for each element, and skips over lists, tuples, sets and dicts
+    that only hold numbers, strings and the like all at once.  This makes it much
+    faster than `visit_collection`, so it can be used to skip visiting collections that
+    hold nothing the visit would act on.
 
-    elif isinstance(expr, pydantic.BaseModel):
-        typ = cast(Type[pydantic.BaseModel], typ)
+    Args:
+        expr (Any): A Python object or expression.
+        types: A type or tuple of types to look for.
 
-        # when extra=allow, fields not in model_fields may be in model_fields_set
-        model_fields = expr.model_fields_set.union(expr.model_fields.keys())
+    Returns:
+        bool: `True` if `expr` or anything nested in it is an instance of `types`.
+    """
+    # Atomic values can only be skipped in bulk if none of them are being looked for
+    skip_atomic = not any(issubclass(typ, types) for typ in _ATOMIC_TYPES)
+
+    seen: Set[int] = set()
+    stack = [expr]
+    while stack:
+        expr = stack.pop()
+        if isinstance(expr, types):
+            return True
+
+        kind = _collection_kind(type(expr))
+        if kind is None or id(expr) in seen:
+            continue
+        seen.add(id(expr))
 
-        # We may encounter a deprecated field here, but this isn't the caller's fault
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", category=DeprecationWarning)
+        if kind == _ANNOTATION:
+            stack.append(expr.unwrap())
+            continue
+        elif kind == _SEQUENCE:
+            children = list(expr)
+        elif kind == _DICT:
+            children = [*expr.keys(), *expr.values()]
+        elif kind == _DATACLASS:
+            children = [getattr(expr, f.name) for f in fields(expr)]
+        else:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", category=DeprecationWarning)
+                children = [getattr(expr, field) for field in _model_fields(expr)]
 
-            updated_data = {
-                field: visit_nested(getattr(expr, field)) for field in model_fields
-            }
+        if skip_atomic and _ATOMIC_TYPES.issuperset(map(type, children)):
+            continue
+        stack.extend(children)
 
-        if return_data:
-            modified = any(
-                getattr(expr, field) is not updated_data[field]
-                for field in model_fields
-            )
-            if modified:
-                # Use construct to avoid validation and handle immutability
-                model_instance = typ.model_construct(
-                    _fields_set=expr.model_fields_set, **updated_data
-                )
-                for private_attr in expr.__private_attributes__:
-                    setattr(model_instance, private_attr, getattr(expr, private_attr))
-                result = model_instance
-
-    if return_data:
-        return result
+    return False
 
 
 def remove_nested_keys(keys_to_remove: List[Hashable], obj):
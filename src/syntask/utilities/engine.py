@@ -57,12 +57,16 @@ from syntask.states import (
     get_state_exception,
 )
 from syntask.tasks import Task
-from syntask.utilities.annotations import allow_failure, quote
+from syntask.utilities.annotations import BaseAnnotation, allow_failure, quote
 from syntask.utilities.asyncutils import (
     gather,
     run_coro_as_sync,
 )
-from syntask.utilities.collections import StopVisiting, visit_collection
+from syntask.utilities.collections import (
+    StopVisiting,
+    collection_contains,
+    visit_collection,
+)
 from syntask.utilities.text import truncated_to
 
 if TYPE_CHECKING:
@@ -261,6 +265,9 @@ async def resolve_inputs(
     if not parameters:
         return {}
 
+    if return_data and not has_inputs_to_resolve(parameters):
+        return dict(parameters)
+
     def collect_futures_and_states(expr, context):
         # Expressions inside quotes should not be traversed
         if isinstance(context.get("annotation"), quote):
@@ -822,6 +829,15 @@ def emit_task_run_state_change_event(
     )
 
 
+def has_inputs_to_resolve(expr: Any) -> bool:
+    """
+    Returns whether an expression holds any futures, states or annotations.  Resolving
+    the inputs of an expression that holds none of them returns it unchanged, so it
+    doesn't need to be visited at all.
+    """
+    return collection_contains(expr, (SyntaskFuture, State, BaseAnnotation))
+
+
 def resolve_to_final_result(expr, context):
     """
     Resolve any `SyntaskFuture`, or `State` types nested in parameters into
@@ -894,6 +910,10 @@ def resolve_inputs_sync(
 
     resolved_parameters = {}
     for parameter, value in parameters.items():
+        if return_data and not has_inputs_to_resolve(value):
+            resolved_parameters[parameter] = value
+            continue
+
         try:
             resolved_parameters[parameter] = visit_collection(
                 value,
@@ -1,18 +1,66 @@
 import hashlib
+import operator
 import sys
 from functools import partial
 from pathlib import Path
-from typing import Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import cloudpickle
+from cachetools import LRUCache
 
 from syntask.serializers import JSONSerializer
+from syntask.utilities.importtools import to_qualified_name
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 if sys.version_info[:2] >= (3, 9):
     _md5 = partial(hashlib.md5, usedforsecurity=False)
 else:
     _md5 = hashlib.md5
 
+# A fast hash algorithm for use as `hash_algo` where a cryptographic hash isn't needed:
+# the non-cryptographic XXH3 (128-bit) when `xxhash` is installed, and otherwise SHA-1,
+# which is faster than MD5 on CPUs with SHA extensions
+if xxhash is not None:
+    fast_hash = xxhash.xxh3_128
+elif sys.version_info[:2] >= (3, 9):
+    fast_hash = partial(hashlib.sha1, usedforsecurity=False)
+else:
+    fast_hash = hashlib.sha1
+
+# A function that feeds the contents of an object into a hash, or raises a `TypeError`
+# if it can't
+Hasher = Callable[[Any, Any], None]
+
+_hashers: Dict[str, Hasher] = {}
+_hashers_by_type: Dict[type, Optional[Hasher]] = {}
+
+# Immutable objects at least this large have their hashes memoized
+_MEMOIZE_MIN_SIZE = 64 * 1024
+
+# Memoized objects are kept alive by the memo (so that their IDs can't be reused), so
+# the memo is bounded by the total size of the objects it holds, and objects too large
+# to be worth keeping alive aren't memoized at all
+_MEMO_MAX_SIZE = 128 * 1024 * 1024
+_MEMOIZE_MAX_SIZE = 32 * 1024 * 1024
+
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+_json_serializer = JSONSerializer(dumps_kwargs={"sort_keys": True})
+
 
 def stable_hash(*args: Union[str, bytes], hash_algo=_md5) -> str:
     """Given some arguments, produces a stable 64-bit hash of their contents.
@@ -48,14 +96,185 @@ def file_hash(path: str, hash_algo=_md5) -> str:
     return stable_hash(contents, hash_algo=hash_algo)
 
 
-def hash_objects(*args, hash_algo=_md5, **kwargs) -> Optional[str]:
+def register_hasher(type_: Union[Type, str], hasher: Hasher) -> None:
+    """
+    Registers a function that hashes objects of a type (and its subclasses) in place,
+    rather than by serializing them.
+
+    Args:
+        type_: the type, or its fully qualified name (so that types from optional
+            libraries can be registered without importing them)
+        hasher: a function taking the object and a hash object from `hashlib`, which
+            feeds the object's contents into the hash with `update`, or raises a
+            `TypeError` if it can't hash that object
+    """
+    name = type_ if isinstance(type_, str) else to_qualified_name(type_)
+    _hashers[name] = hasher
+    _hashers_by_type.clear()
+
+
+def _get_hasher(cls: type) -> Optional[Hasher]:
+    try:
+        return _hashers_by_type[cls]
+    except KeyError:
+        pass
+
+    hasher = None
+    for base in cls.__mro__:
+        hasher = _hashers.get(f"{base.__module__}.{base.__qualname__}")
+        if hasher is not None:
+            break
+    _hashers_by_type[cls] = hasher
+    return hasher
+
+
+def _hash_buffer(obj: Union[bytes, bytearray, memoryview], h) -> None:
+    if isinstance(obj, memoryview) and not obj.c_contiguous:
+        obj = obj.tobytes()
+    h.update(obj)
+
+
+def _hash_ndarray(obj, h) -> None:
+    if obj.dtype.hasobject:
+        raise TypeError("Arrays of Python objects can't be hashed in place.")
+    h.update(f"{obj.dtype.str}{obj.shape}".encode())
+    if not obj.flags.c_contiguous:
+        obj = obj.copy(order="C")
+    h.update(obj.reshape(-1).view("uint8"))
+
+
+def _hash_pandas(obj, h) -> None:
+    import pandas
+
+    if isinstance(obj, pandas.DataFrame):
+        h.update(repr(list(obj.columns)).encode())
+        h.update(repr([str(dtype) for dtype in obj.dtypes]).encode())
+    else:
+        h.update(repr(getattr(obj, "name", None)).encode())
+        h.update(str(obj.dtype).encode())
+    h.update(pandas.util.hash_pandas_object(obj, index=True).to_numpy())
+
+
+register_hasher(bytes, _hash_buffer)
+register_hasher(bytearray, _hash_buffer)
+register_hasher(memoryview, _hash_buffer)
+register_hasher("numpy.ndarray", _hash_ndarray)
+register_hasher("pandas.core.frame.DataFrame", _hash_pandas)
+register_hasher("pandas.core.series.Series", _hash_pandas)
+register_hasher("pandas.core.indexes.base.Index", _hash_pandas)
+
+
+def hash_memo() -> MutableMapping[Any, Tuple[Any, str]]:
+    """
+    Returns a new memo of hashes for `hash_objects`, which holds up to 128 MiB of
+    objects, forgetting the least recently used ones first.
+    """
+    return LRUCache(maxsize=_MEMO_MAX_SIZE, getsizeof=lambda entry: len(entry[0]))
+
+
+def _hash_in_place(
+    obj: Any,
+    hasher: Hasher,
+    hash_algo: Callable,
+    memo: Optional[MutableMapping[Any, Tuple[Any, str]]],
+) -> str:
+    # Only `bytes` are both immutable and large enough to be worth remembering; the
+    # object is kept alongside its hash so that its ID can't be reused
+    memoize = (
+        memo is not None
+        and type(obj) is bytes
+        and _MEMOIZE_MIN_SIZE <= len(obj) <= _MEMOIZE_MAX_SIZE
+    )
+    if memoize and (known := memo.get((id(obj), hash_algo))):
+        return known[1]
+
+    h = hash_algo()
+    hasher(obj, h)
+    digest = h.hexdigest()
+
+    if memoize:
+        memo[(id(obj), hash_algo)] = (obj, digest)
+    return digest
+
+
+def _replace_hashable_in_place(
+    obj: Any,
+    hash_algo: Callable,
+    memo: Optional[MutableMapping[Any, Tuple[Any, str]]],
+    visiting: Set[int],
+) -> Any:
+    """
+    Replaces each object in `obj` that has a registered hasher with a small
+    placeholder holding its hash, descending into dicts, lists, and tuples.  Objects
+    without any such objects are returned as is, so that they hash as they always
+    have.
+    """
+    cls = type(obj)
+    if cls in _SCALAR_TYPES:
+        return obj
+
+    hasher = _get_hasher(cls)
+    if hasher is not None:
+        try:
+            digest = _hash_in_place(obj, hasher, hash_algo, memo)
+        except TypeError:
+            return obj
+        return {"__hash__": digest, "__type__": to_qualified_name(cls)}
+
+    if not isinstance(obj, (dict, list, tuple)) or id(obj) in visiting:
+        return obj
+
+    items = obj.values() if isinstance(obj, dict) else obj
+    # most collections are entirely scalars, which can be ruled out without visiting
+    # each item
+    if _SCALAR_TYPES.issuperset(map(type, items)):
+        return obj
+
+    visiting.add(id(obj))
+    try:
+        if isinstance(obj, dict):
+            replaced = {
+                key: _replace_hashable_in_place(value, hash_algo, memo, visiting)
+                for key, value in obj.items()
+            }
+            changed = any(map(operator.is_not, replaced.values(), obj.values()))
+        else:
+            replaced = [
+                _replace_hashable_in_place(item, hash_algo, memo, visiting)
+                for item in obj
+            ]
+            changed = any(map(operator.is_not, replaced, obj))
+            if changed and isinstance(obj, tuple):
+                replaced = tuple(replaced)
+    finally:
+        visiting.discard(id(obj))
+
+    return replaced if changed else obj
+
+
+def hash_objects(
+    *args,
+    hash_algo=_md5,
+    memo: Optional[MutableMapping[Any, Tuple[Any, str]]] = None,
+    **kwargs,
+) -> Optional[str]:
     """
     Attempt to hash objects by dumping to JSON or serializing with cloudpickle.
     On failure of both, `None` will be returned
+
+    Objects with a registered hasher (like bytes, NumPy arrays, and pandas objects) are
+    hashed in place instead of being serialized, and large immutable ones have their
+    hashes remembered in `memo`, if one is given.
     """
     try:
-        serializer = JSONSerializer(dumps_kwargs={"sort_keys": True})
-        return stable_hash(serializer.dumps((args, kwargs)), hash_algo=hash_algo)
+        args, kwargs = _replace_hashable_in_place(
+            (args, kwargs), hash_algo=hash_algo, memo=memo, visiting=set()
+        )
+    except RecursionError:
+        pass
+
+    try:
+        return stable_hash(_json_serializer.dumps((args, kwargs)), hash_algo=hash_algo)
     except Exception:
         pass
 
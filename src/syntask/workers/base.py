@@ -20,6 +20,7 @@ from syntask.client.schemas.actions import WorkPoolCreate, WorkPoolUpdate
 from syntask.client.schemas.objects import StateType, WorkPool
 from syntask.client.utilities import inject_client
 from syntask.events import Event, RelatedResource, emit_event
+from syntask.events.cancellation import CancellationWatcher
 from syntask.events.related import object_as_related_resource, tags_as_related_resources
 from syntask.exceptions import (
     Abort,
@@ -30,6 +31,7 @@ from syntask.plugins import load_syntask_collections
 from syntask.settings import (
     SYNTASK_API_URL,
     SYNTASK_TEST_MODE,
+    SYNTASK_WORKER_CANCELLATION_FALLBACK_QUERY_SECONDS,
     SYNTASK_WORKER_HEARTBEAT_SECONDS,
     SYNTASK_WORKER_PREFETCH_SECONDS,
     SYNTASK_WORKER_QUERY_SECONDS,
@@ -424,6 +426,15 @@ class BaseWorker(abc.ABC):
         self._limiter: Optional[anyio.CapacityLimiter] = None
         self._submitting_flow_run_ids = set()
         self._cancelling_flow_run_ids = set()
+        # Workers that cancel flow runs can watch for them with this rather than
+        # only querying for them
+        self._cancellation_watcher = CancellationWatcher(
+            client_name="worker",
+            poll_interval=SYNTASK_WORKER_QUERY_SECONDS.value() * 2,
+            fallback_poll_interval=(
+                SYNTASK_WORKER_CANCELLATION_FALLBACK_QUERY_SECONDS.value()
+            ),
+        )
         self._scheduled_task_scopes = set()
 
     @classmethod
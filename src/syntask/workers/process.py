@@ -15,6 +15,7 @@ checkout out the [Syntask docs](/concepts/work-pools/).
 """
 
 import contextlib
+import datetime
 import os
 import signal
 import socket
@@ -25,6 +26,7 @@ import threading
 from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+from uuid import UUID
 
 import anyio
 import anyio.abc
@@ -44,6 +46,7 @@ from syntask.client.schemas.filters import (
     WorkQueueFilterName,
 )
 from syntask.client.schemas.objects import StateType
+from syntask.events.filters import EventRelatedFilter
 from syntask.events.utilities import emit_event
 from syntask.exceptions import (
     InfrastructureNotAvailable,
@@ -211,6 +214,16 @@ class ProcessWorker(BaseWorker):
                             backoff=4,
                         )
                     )
+                    if not run_once:
+                        loops_task_group.start_soon(
+                            partial(
+                                self._cancellation_watcher.watch,
+                                self._on_cancelling_flow_run,
+                                related=EventRelatedFilter(
+                                    id=[f"syntask.work-pool.{self._work_pool.id}"]
+                                ),
+                            )
+                        )
 
                     self._started_event = await self._emit_worker_started_event()
 
@@ -381,6 +394,10 @@ class ProcessWorker(BaseWorker):
                 "as an async context manager."
             )
 
+        if not self._cancellation_watcher.should_poll():
+            # Cancellations are found as they happen while subscribed to events
+            return []
+
         self._logger.debug("Checking for cancelled flow runs...")
 
         work_queue_filter = (
@@ -427,10 +444,52 @@ class ProcessWorker(BaseWorker):
 
         for flow_run in cancelling_flow_runs:
             self._cancelling_flow_run_ids.add(flow_run.id)
+            self._cancellation_watcher.observe(
+                "poll", flow_run.state.timestamp if flow_run.state else None
+            )
             self._runs_task_group.start_soon(self.cancel_run, flow_run)
 
         return cancelling_flow_runs
 
+    async def _on_cancelling_flow_run(
+        self, flow_run_id: UUID, cancelling_since: datetime.datetime
+    ):
+        """
+        Cancels a flow run that's been moved into a Cancelling state, if it was
+        submitted from one of this worker's work queues.
+        """
+        if flow_run_id in self._cancelling_flow_run_ids:
+            return
+
+        try:
+            flow_run = await self._client.read_flow_run(flow_run_id)
+        except ObjectNotFound:
+            # The flow run was deleted since the event was emitted
+            return
+        except Exception:
+            self._logger.exception(
+                "Unable to read flow run %s after its cancellation was requested; it"
+                " will be cancelled when querying for cancelling flow runs finds it.",
+                flow_run_id,
+            )
+            return
+
+        if flow_run.work_pool_name != self._work_pool_name or (
+            self._work_queues and flow_run.work_queue_name not in self._work_queues
+        ):
+            return
+        if not flow_run.state or not (
+            flow_run.state.is_cancelling()
+            or (flow_run.state.is_cancelled() and flow_run.state.name == "Cancelling")
+        ):
+            # The flow run has moved on since the event was emitted
+            return
+
+        self._logger.info(f"Flow run '{flow_run.name}' is awaiting cancellation.")
+        self._cancelling_flow_run_ids.add(flow_run.id)
+        self._cancellation_watcher.observe("event", cancelling_since)
+        self._runs_task_group.start_soon(self.cancel_run, flow_run)
+
     async def cancel_run(self, flow_run: "FlowRun"):
         run_logger = self.get_flow_run_logger(flow_run)
 
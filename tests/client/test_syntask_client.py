@@ -1383,6 +1383,36 @@ async def test_read_filtered_logs(session, syntask_client, deployment):
         assert log.flow_run_id not in flow_runs[3:]
 
 
+async def test_read_logs_page_by_page(syntask_client):
+    flow_run_id = uuid4()
+    await syntask_client.create_logs(
+        [
+            LogCreate(
+                name="syntask.flow_runs",
+                level=20,
+                message=f"Log {i}",
+                timestamp=DateTime.now(),
+                flow_run_id=flow_run_id,
+            )
+            for i in range(5)
+        ]
+    )
+    log_filter = LogFilter(flow_run_id=LogFilterFlowRunId(any_=[flow_run_id]))
+
+    pages = []
+    after = None
+    while page := await syntask_client.read_logs(
+        log_filter=log_filter, limit=2, after=after
+    ):
+        pages.append(page)
+        after = page[-1]
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sorted(log.message for page in pages for log in page) == [
+        f"Log {i}" for i in range(5)
+    ]
+
+
 async def test_syntask_api_tls_insecure_skip_verify_setting_set_to_true(monkeypatch):
     with temporary_settings(updates={SYNTASK_API_TLS_INSECURE_SKIP_VERIFY: True}):
         mock = Mock()
@@ -2401,6 +2431,20 @@ async def test_global_concurrency_limit_read_nonexistent_by_name(syntask_client)
         await syntask_client.read_global_concurrency_limit_by_name(name="not-here")
 
 
+async def test_increment_concurrency_slots_waits_less_than_the_request_timeout(
+    syntask_client, monkeypatch
+):
+    post = AsyncMock()
+    monkeypatch.setattr(syntask_client._client, "post", post)
+
+    await syntask_client.increment_concurrency_slots(
+        names=["a-limit"], slots=1, mode="concurrency", wait_seconds=45
+    )
+
+    assert syntask_client._client.timeout.read == 60
+    assert post.call_args.kwargs["json"]["wait_seconds"] == 30
+
+
 class TestSyntaskClientDeploymentSchedules:
     @pytest.fixture
     async def deployment(self, syntask_client):
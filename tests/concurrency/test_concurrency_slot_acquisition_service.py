@@ -1,4 +1,5 @@
 import asyncio
+import time
 from unittest import mock
 
 import pytest
@@ -6,6 +7,7 @@ from httpx import HTTPStatusError, Request, Response
 
 from syntask.client.orchestration import get_client
 from syntask.concurrency.services import ConcurrencySlotAcquisitionService
+from syntask.settings import SYNTASK_CLIENT_CONCURRENCY_WAIT_SECONDS, temporary_settings
 
 
 @pytest.fixture
@@ -115,3 +117,40 @@ async def test_basic_exception_returns_exception(mocked_client):
 
     assert isinstance(exception, Exception)
     assert exception == exc
+
+
+async def test_waits_in_line_on_the_server_when_configured(mocked_client):
+    locked = HTTPStatusError(
+        "Limit is locked",
+        request=Request("get", "/"),
+        response=Response(423, headers={"Retry-After": "0.1"}),
+    )
+    success = Response(200)
+
+    def wait_in_line(*args, **kwargs):
+        if mocked_client.client.increment_concurrency_slots.call_count == 1:
+            # the server holds the request for longer than the Retry-After
+            time.sleep(0.2)
+            raise locked
+        return success
+
+    mocked_client.client.increment_concurrency_slots.side_effect = wait_in_line
+
+    limit_names = sorted(["api", "database"])
+    service = ConcurrencySlotAcquisitionService.instance(frozenset(limit_names))
+
+    with temporary_settings({SYNTASK_CLIENT_CONCURRENCY_WAIT_SECONDS: 10}):
+        with mock.patch("syntask.concurrency.asyncio.asyncio.sleep") as sleep:
+            future = service.send((1, "concurrency", None, True, None))
+            await service.drain()
+            assert await asyncio.wrap_future(future) == success
+
+    # having already waited longer than the Retry-After, the client doesn't sleep
+    sleep.assert_called_once_with(0.0)
+    mocked_client.client.increment_concurrency_slots.assert_called_with(
+        names=limit_names,
+        slots=1,
+        mode="concurrency",
+        create_if_missing=True,
+        wait_seconds=10,
+    )
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+import httpx
+import pytest
+from starlette import status
+
+from syntask.client.orchestration import SyntaskClient, get_client
+from syntask.client.schemas.actions import GlobalConcurrencyLimitCreate
+from syntask.concurrency.services import ConcurrencySlotLeaseService
+
+
+@pytest.fixture
+async def concurrency_limit(test_database_connection_url) -> str:
+    async with get_client() as client:
+        await client.create_global_concurrency_limit(
+            GlobalConcurrencyLimitCreate(name="leased", limit=1)
+        )
+        yield "leased"
+
+
+async def test_leased_slots_are_reused_locally(concurrency_limit: str):
+    service = ConcurrencySlotLeaseService.instance(
+        frozenset([concurrency_limit]), 1, 30.0
+    )
+    with mock.patch.object(
+        SyntaskClient,
+        "acquire_concurrency_slot_lease",
+        autospec=True,
+        side_effect=SyntaskClient.acquire_concurrency_slot_lease,
+    ) as acquire_lease:
+        for _ in range(3):
+            limits = await asyncio.wrap_future(service.send((1, None, None, None)))
+            assert [limit.name for limit in limits] == [concurrency_limit]
+            assert service.release(1, limits) == 0
+
+        await service.drain()
+
+    acquire_lease.assert_called_once()
+
+    async with get_client() as client:
+        limit = await client.read_global_concurrency_limit_by_name(concurrency_limit)
+        assert limit.active_slots == 0
+
+
+async def test_waiters_are_woken_when_slots_are_released(concurrency_limit: str):
+    service = ConcurrencySlotLeaseService.instance(
+        frozenset([concurrency_limit]), 1, 30.0
+    )
+
+    held = await asyncio.wrap_future(service.send((1, None, None, None)))
+
+    with mock.patch.object(
+        ConcurrencySlotLeaseService, "_wait_for_slots", autospec=True
+    ) as wait_for_slots:
+        # Only a released slot can wake the waiter
+        wait_for_slots.side_effect = lambda self, timeout: self._slots_returned.wait()
+        waiting = service.send((1, None, None, None))
+
+        # Give the waiter a chance to be turned away by the server
+        while not wait_for_slots.called:
+            await asyncio.sleep(0.01)
+
+        released_at = time.monotonic()
+        threading.Thread(target=service.release, args=(1, held)).start()
+        limits = await asyncio.wrap_future(waiting)
+
+    assert time.monotonic() - released_at < 1
+    assert service.release(1, limits) == 0
+    await service.drain()
+
+
+async def test_slots_that_were_not_leased_are_released_with_the_api(
+    concurrency_limit: str,
+):
+    service = ConcurrencySlotLeaseService.instance(
+        frozenset([concurrency_limit]), 1, 30.0
+    )
+    try:
+        assert service.release(1, None) == 1
+    finally:
+        await service.drain()
+
+
+async def test_directly_acquired_slots_do_not_free_pooled_slots(
+    test_database_connection_url,
+):
+    async with get_client() as client:
+        await client.create_global_concurrency_limit(
+            GlobalConcurrencyLimitCreate(name="mixed", limit=2)
+        )
+
+    service = ConcurrencySlotLeaseService.instance(frozenset(["mixed"]), 1, 30.0)
+    try:
+        pooled = await asyncio.wrap_future(service.send((1, None, None, None)))
+
+        # The server stops leasing slots while the pooled slot is still held
+        with mock.patch.object(
+            SyntaskClient,
+            "acquire_concurrency_slot_lease",
+            autospec=True,
+            side_effect=httpx.HTTPStatusError(
+                "Not Found",
+                request=httpx.Request("POST", "http://test"),
+                response=httpx.Response(status.HTTP_404_NOT_FOUND),
+            ),
+        ):
+            direct = await asyncio.wrap_future(service.send((1, None, None, None)))
+
+        # Releasing the direct slot leaves the pooled slot in use
+        assert service.release(1, direct) == 1
+        assert service._in_use == 1
+
+        assert service.release(1, pooled) == 0
+        assert service._in_use == 0
+    finally:
+        await service.drain()
@@ -47,6 +47,8 @@ from syntask.settings import (
     SYNTASK_API_SERVICES_FLOW_RUN_NOTIFICATIONS_ENABLED,
     SYNTASK_API_SERVICES_FOREMAN_ENABLED,
     SYNTASK_API_SERVICES_LATE_RUNS_ENABLED,
+    SYNTASK_API_SERVICES_LEASE_EXPIRATIONS_ENABLED,
+    SYNTASK_API_SERVICES_LOG_RETENTION_ENABLED,
     SYNTASK_API_SERVICES_PAUSE_EXPIRATIONS_ENABLED,
     SYNTASK_API_SERVICES_SCHEDULER_ENABLED,
     SYNTASK_API_SERVICES_TASK_RUN_RECORDER_ENABLED,
@@ -328,6 +330,8 @@ def pytest_sessionstart(session):
             # Disable services for test runs
             SYNTASK_SERVER_ANALYTICS_ENABLED: False,
             SYNTASK_API_SERVICES_LATE_RUNS_ENABLED: False,
+            SYNTASK_API_SERVICES_LEASE_EXPIRATIONS_ENABLED: False,
+            SYNTASK_API_SERVICES_LOG_RETENTION_ENABLED: False,
             SYNTASK_API_SERVICES_SCHEDULER_ENABLED: False,
             SYNTASK_API_SERVICES_FLOW_RUN_NOTIFICATIONS_ENABLED: False,
             SYNTASK_API_SERVICES_PAUSE_EXPIRATIONS_ENABLED: False,
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import List, Tuple
+from uuid import UUID, uuid4
+
+import anyio
+import pendulum
+import pytest
+from prometheus_client import REGISTRY
+
+from syntask.events import Event
+from syntask.events.cancellation import CANCELLING_EVENT, CancellationWatcher
+from syntask.settings import SYNTASK_API_KEY, SYNTASK_API_URL, temporary_settings
+from syntask.testing.fixtures import Puppeteer, Recorder
+
+
+@pytest.fixture
+def watcher() -> CancellationWatcher:
+    return CancellationWatcher(
+        client_name="test", poll_interval=0.1, fallback_poll_interval=60
+    )
+
+
+def test_polls_every_time_when_not_subscribed(watcher: CancellationWatcher):
+    assert watcher.should_poll()
+    assert watcher.should_poll()
+
+
+def test_polls_as_a_fallback_when_subscribed(watcher: CancellationWatcher):
+    watcher.subscribed = True
+
+    assert watcher.should_poll()
+    assert not watcher.should_poll()
+
+    watcher.fallback_poll_interval = 0
+    assert watcher.should_poll()
+
+
+def test_observes_cancellation_latency(watcher: CancellationWatcher):
+    def count() -> float:
+        return (
+            REGISTRY.get_sample_value(
+                "syntask_flow_run_cancellation_latency_seconds_count",
+                {"client": "test", "source": "event"},
+            )
+            or 0
+        )
+
+    before = count()
+    watcher.observe("event", pendulum.now("UTC").subtract(seconds=2))
+    watcher.observe("event", None)
+
+    assert count() == before + 1
+
+
+async def test_watches_for_cancelling_flow_runs(
+    watcher: CancellationWatcher,
+    events_api_url: str,
+    recorder: Recorder,
+    puppeteer: Puppeteer,
+):
+    flow_run_id = uuid4()
+    occurred = pendulum.now("UTC")
+    puppeteer.token = None
+    puppeteer.outgoing_events = [
+        Event(
+            event=CANCELLING_EVENT,
+            occurred=occurred,
+            resource={"syntask.resource.id": f"syntask.flow-run.{flow_run_id}"},
+        )
+    ]
+
+    cancelling: List[Tuple[UUID, datetime]] = []
+
+    async def on_cancelling(flow_run_id: UUID, cancelling_since: datetime):
+        cancelling.append((flow_run_id, cancelling_since))
+
+    with temporary_settings({SYNTASK_API_URL: events_api_url, SYNTASK_API_KEY: None}):
+        with anyio.move_on_after(5):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(watcher.watch, on_cancelling)
+                while not cancelling:
+                    await anyio.sleep(0.05)
+                tg.cancel_scope.cancel()
+
+    assert cancelling == [(flow_run_id, occurred)]
+    assert recorder.filter.event.name == [CANCELLING_EVENT]
+    assert not watcher.subscribed
+
+
+async def test_does_not_watch_without_an_api_url(watcher: CancellationWatcher):
+    async def on_cancelling(flow_run_id: UUID, cancelling_since: datetime):
+        raise AssertionError("Should not be called")
+
+    with temporary_settings({SYNTASK_API_URL: None}):
+        with anyio.fail_after(1):
+            await watcher.watch(on_cancelling)
@@ -15,6 +15,7 @@ from syntask.settings import (
     SYNTASK_API_KEY,
     SYNTASK_API_URL,
     SYNTASK_CLOUD_API_URL,
+    SYNTASK_EVENTS_COMPACT_WIRE_FORMAT,
     SYNTASK_SERVER_ALLOW_EPHEMERAL_MODE,
     temporary_settings,
 )
@@ -369,3 +370,42 @@ async def test_events_client_warn_if_connect_fails(
     assert any(
         "Unable to connect to 'ws" in record.message for record in caplog.records
     )
+
+
+async def test_events_client_can_emit_with_compact_encoding(
+    events_api_url: str,
+    example_event_1: Event,
+    example_event_2: Event,
+    example_event_3: Event,
+    recorder: Recorder,
+    puppeteer: Puppeteer,
+):
+    with temporary_settings(updates={SYNTASK_EVENTS_COMPACT_WIRE_FORMAT: True}):
+        client = SyntaskEventsClient(events_api_url, checkpoint_every=1)
+
+    async with client:
+        await client.emit(example_event_1)
+        assert client._encoder is not None
+
+        puppeteer.hard_disconnect_after = example_event_2.id
+        await client.emit(example_event_2)
+        await client.emit(example_event_3)
+
+    assert recorder.connections == 2
+    # the new connection starts with a fresh interning table
+    assert recorder.events == [
+        example_event_1,
+        example_event_2,
+        example_event_3,
+        example_event_3,  # resent due to the hard disconnect after event 2
+    ]
+
+
+async def test_events_client_uses_json_by_default(
+    events_api_url: str, example_event_1: Event, recorder: Recorder
+):
+    async with SyntaskEventsClient(events_api_url) as client:
+        await client.emit(example_event_1)
+        assert client._encoder is None
+
+    assert recorder.events == [example_event_1]
@@ -0,0 +1,116 @@
+from uuid import uuid4
+
+import orjson
+import pendulum
+import pytest
+
+from syntask.events import Event
+from syntask.events.compact import (
+    COMPACT_EVENTS_SUBPROTOCOL,
+    MAXIMUM_INTERNED_STRINGS,
+    CompactEncodingError,
+    CompactEventDecoder,
+    CompactEventEncoder,
+    negotiate,
+)
+
+
+def make_event(i: int = 0) -> Event:
+    return Event(
+        occurred=pendulum.now("UTC"),
+        event="syntask.task-run.Completed",
+        resource={
+            "syntask.resource.id": f"syntask.task-run.{uuid4()}",
+            "syntask.resource.name": f"my-task-{i}",
+            "syntask.state-type": "COMPLETED",
+        },
+        related=[
+            {
+                "syntask.resource.id": "syntask.flow-run.abc",
+                "syntask.resource.role": "flow-run",
+            },
+            {
+                "syntask.resource.id": "syntask.tag.hello",
+                "syntask.resource.role": "tag",
+            },
+        ],
+        payload={"hello": "world", "i": i, "nested": {"list": [1, 2.5, None]}},
+        id=uuid4(),
+        follows=uuid4() if i % 2 else None,
+    )
+
+
+def test_round_trips_events():
+    encoder = CompactEventEncoder()
+    decoder = CompactEventDecoder()
+
+    events = [make_event(i) for i in range(10)]
+    decoded = [Event.model_validate(decoder.decode(encoder.encode(e))) for e in events]
+
+    assert decoded == events
+
+
+def test_repeated_strings_are_interned():
+    encoder = CompactEventEncoder()
+
+    first = encoder.encode(make_event(0))
+    second = encoder.encode(make_event(0))
+
+    assert len(second) < len(first)
+    assert len(second) < len(make_event(0).model_dump_json())
+
+    (_, event_name, resource, related, *_) = orjson.loads(second)
+    assert event_name == 0
+    assert isinstance(resource[0], int)
+    assert all(isinstance(label, int) for label in related[0])
+
+
+def test_interning_stops_when_the_table_is_full():
+    encoder = CompactEventEncoder()
+    decoder = CompactEventDecoder()
+
+    events = []
+    for i in range(MAXIMUM_INTERNED_STRINGS // 2 + 10):
+        event = make_event(i)
+        events.append(event)
+        assert Event.model_validate(decoder.decode(encoder.encode(event))) == event
+
+
+def test_long_strings_are_not_interned():
+    encoder = CompactEventEncoder()
+    decoder = CompactEventDecoder()
+
+    event = make_event()
+    event.resource.root["syntask.resource.name"] = "x" * 1000
+
+    for _ in range(2):
+        frame = encoder.encode(event)
+        assert "x" * 1000 in frame.decode()
+        assert Event.model_validate(decoder.decode(frame)) == event
+
+
+def test_invalid_frames_are_rejected():
+    decoder = CompactEventDecoder()
+
+    with pytest.raises(CompactEncodingError):
+        decoder.decode(b"{not json")
+
+    with pytest.raises(CompactEncodingError):
+        decoder.decode(b"[1, 2]")
+
+
+def test_unknown_interned_strings_are_rejected():
+    encoder = CompactEventEncoder()
+    encoder.encode(make_event())
+    frame = encoder.encode(make_event())
+
+    with pytest.raises(CompactEncodingError, match="Unknown interned string"):
+        CompactEventDecoder().decode(frame)
+
+
+def test_negotiation():
+    assert negotiate([]) is None
+    assert negotiate(["syntask"]) is None
+    assert negotiate(["syntask", COMPACT_EVENTS_SUBPROTOCOL]) == (
+        COMPACT_EVENTS_SUBPROTOCOL
+    )
@@ -7,6 +7,7 @@ from fastapi.testclient import TestClient
 from httpx import AsyncClient
 from starlette.testclient import WebSocketTestSession
 
+from syntask.events.compact import COMPACT_EVENTS_SUBPROTOCOL, CompactEventEncoder
 from syntask.server.events import messaging
 from syntask.server.events.schemas.events import Event
 from syntask.server.events.storage import database
@@ -106,3 +107,27 @@ async def test_post_events_ephemeral(
     )
     assert response.status_code == 204
     pipeline_mock.assert_awaited_once_with([event1, event2])
+
+
+def test_stream_events_in_with_compact_encoding(
+    test_client: TestClient,
+    frozen_time: pendulum.DateTime,
+    event1: Event,
+    event2: Event,
+    stream_publish: mock.AsyncMock,
+):
+    encoder = CompactEventEncoder()
+
+    websocket: WebSocketTestSession
+    with test_client.websocket_connect(
+        "/api/events/in", subprotocols=["syntask", COMPACT_EVENTS_SUBPROTOCOL]
+    ) as websocket:
+        assert websocket.accepted_subprotocol == COMPACT_EVENTS_SUBPROTOCOL
+        websocket.send_bytes(encoder.encode(event1))
+        websocket.send_bytes(encoder.encode(event2))
+
+    server_events = [
+        event1.receive(received=frozen_time),
+        event2.receive(received=frozen_time),
+    ]
+    stream_publish.assert_has_awaits([mock.call(event) for event in server_events])
@@ -15,10 +15,12 @@ from syntask.server.events.filters import (
 )
 from syntask.server.events.schemas.events import ReceivedEvent
 from syntask.server.events.storage.database import (
+    ensure_event_partitions,
     get_max_query_parameters,
     get_number_of_event_fields,
     get_number_of_resource_fields,
     read_events,
+    trim_events,
     write_events,
 )
 
@@ -246,3 +248,26 @@ class TestReadEvents:
                 ),
             )
             assert len(events) == 0
+
+
+async def test_trim_events_removes_events_and_their_resources(
+    session: AsyncSession, db: SyntaskDBInterface, event: ReceivedEvent
+):
+    old_event = event.model_copy(
+        update={"id": uuid4(), "occurred": pendulum.now("UTC").subtract(days=10)}
+    )
+    await write_events(session, [event, old_event])
+
+    created = await ensure_event_partitions(session)
+    if db.dialect.name == "sqlite":
+        # partitions are only maintained on Postgres
+        assert created == []
+
+    trimmed = await trim_events(session, pendulum.now("UTC").subtract(days=5))
+    assert trimmed == 1
+
+    result = await session.execute(sa.select(db.EventResource.event_id).distinct())
+    assert set(result.scalars().all()) == {event.id}
+
+    (remaining,) = await read_events(session, EventFilter())
+    assert remaining.id == event.id
@@ -333,3 +333,44 @@ async def test_trims_messages_periodically(
     assert len(remaining_events) == 5
 
     assert all(event.occurred >= five_days_ago for event in remaining_events)
+
+
+async def test_trims_event_count_rollups_with_the_events(
+    event: ReceivedEvent,
+    session: AsyncSession,
+    db: SyntaskDBInterface,
+):
+    await write_events(
+        session,
+        [
+            event.model_copy(
+                update={
+                    "id": uuid4(),
+                    "occurred": DateTime.now("UTC") - timedelta(days=i),
+                }
+            )
+            for i in range(10)
+        ],
+    )
+    await session.commit()
+
+    with temporary_settings({SYNTASK_EVENTS_RETENTION_PERIOD: timedelta(days=5)}):
+        async with event_persister.create_handler(
+            flush_every=timedelta(seconds=0.001),
+            trim_every=timedelta(seconds=0.001),
+        ):
+            await asyncio.sleep(0.1)  # this is 100x the time necessary
+
+    result = await session.execute(
+        sa.select(
+            db.EventCountRollup.granularity,
+            sa.func.sum(db.EventCountRollup.count),
+        ).group_by(db.EventCountRollup.granularity)
+    )
+    counts = dict(result.all())
+
+    # only a rollup that straddles the cutoff may still count the one trimmed event
+    # just before it
+    assert counts["minute"] in (5, 6)
+    assert counts["hour"] in (5, 6)
+    assert counts["day"] in (5, 6)
@@ -5,12 +5,21 @@ from uuid import uuid4
 
 import pendulum
 import pytest
+import sqlalchemy as sa
 from pydantic_extra_types.pendulum_dt import Date, DateTime
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from syntask.server.events.counting import PIVOT_DATETIME, Countable, TimeUnit
+from syntask.server.database.interface import SyntaskDBInterface
+from syntask.server.events.counting import (
+    PIVOT_DATETIME,
+    ROLLUP_GRANULARITIES,
+    Countable,
+    TimeUnit,
+    plan_rollup_spans,
+)
 from syntask.server.events.filters import (
     EventFilter,
+    EventNameFilter,
     EventOccurredFilter,
 )
 from syntask.server.events.schemas.events import EventCount, ReceivedEvent
@@ -881,3 +890,115 @@ async def test_counting_by_time_must_result_in_reasonable_number_of_buckets(
             time_unit=TimeUnit.second,
             time_interval=0.01,
         )
+
+
+def test_planning_rollup_spans_uses_the_coarsest_whole_buckets():
+    start = pendulum.datetime(2024, 5, 1, 22, 58, 30)
+    end = pendulum.datetime(2024, 5, 3, 1, 2, 15)
+
+    rollups, raw = plan_rollup_spans(start, end, ROLLUP_GRANULARITIES)
+
+    assert rollups == [
+        (
+            TimeUnit.minute,
+            pendulum.datetime(2024, 5, 1, 22, 59),
+            pendulum.datetime(2024, 5, 1, 23),
+        ),
+        (
+            TimeUnit.hour,
+            pendulum.datetime(2024, 5, 1, 23),
+            pendulum.datetime(2024, 5, 2),
+        ),
+        (TimeUnit.day, pendulum.datetime(2024, 5, 2), pendulum.datetime(2024, 5, 3)),
+        (
+            TimeUnit.hour,
+            pendulum.datetime(2024, 5, 3),
+            pendulum.datetime(2024, 5, 3, 1),
+        ),
+        (
+            TimeUnit.minute,
+            pendulum.datetime(2024, 5, 3, 1),
+            pendulum.datetime(2024, 5, 3, 1, 2),
+        ),
+    ]
+    assert raw == [
+        (start, pendulum.datetime(2024, 5, 1, 22, 59)),
+        (pendulum.datetime(2024, 5, 3, 1, 2), end),
+    ]
+
+
+async def test_rollups_are_written_once_per_event(
+    events_query_session: AsyncSession,
+    all_events: List[ReceivedEvent],
+    db: SyntaskDBInterface,
+):
+    # writing the same events again must not count them twice
+    await write_events(events_query_session, all_events)
+
+    result = await events_query_session.execute(
+        sa.select(
+            db.EventCountRollup.granularity,
+            sa.func.sum(db.EventCountRollup.count),
+        ).group_by(db.EventCountRollup.granularity)
+    )
+    assert dict(result.all()) == {
+        "day": len(all_events),
+        "hour": len(all_events),
+        "minute": len(all_events),
+    }
+
+
+@pytest.mark.parametrize("countable", [Countable.event, Countable.resource])
+async def test_counting_across_unaligned_edges(
+    events_query_session: AsyncSession,
+    all_events: List[ReceivedEvent],
+    known_dates: Tuple[Date, ...],
+    countable: Countable,
+):
+    since = datetime_from_date(known_dates[1], 3, 6, 6, 500000)
+    until = datetime_from_date(known_dates[3], 12, 24, 23)
+
+    counts = await count_events(
+        session=events_query_session,
+        filter=EventFilter(occurred=EventOccurredFilter(since=since, until=until)),
+        countable=countable,
+        time_unit=TimeUnit.day,
+        time_interval=1.0,
+    )
+
+    expected: Dict[str, int] = {}
+    for event in all_events:
+        if since <= event.occurred <= until:
+            value = event.event if countable == Countable.event else event.resource.id
+            expected[value] = expected.get(value, 0) + 1
+
+    assert {count.value: count.count for count in counts} == expected
+
+
+async def test_counting_by_hour_across_unaligned_edges(
+    events_query_session: AsyncSession,
+    all_events: List[ReceivedEvent],
+    known_dates: Tuple[Date, ...],
+):
+    since = datetime_from_date(known_dates[2], 1, 2, 3)
+    until = datetime_from_date(known_dates[2], 19, 38, 37)
+
+    counts = await count_events(
+        session=events_query_session,
+        filter=EventFilter(
+            occurred=EventOccurredFilter(since=since, until=until),
+            event=EventNameFilter(prefix=["things."]),
+        ),
+        countable=Countable.time,
+        time_unit=TimeUnit.hour,
+        time_interval=1.0,
+    )
+
+    expected: Dict[int, int] = {}
+    for event in all_events:
+        if since <= event.occurred <= until and event.event.startswith("things."):
+            expected[event.occurred.hour] = expected.get(event.occurred.hour, 0) + 1
+
+    assert {
+        count.start_time.hour: count.count for count in counts if count.count
+    } == expected
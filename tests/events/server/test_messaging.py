@@ -9,6 +9,7 @@ from syntask.server.events import messaging
 from syntask.server.events.messaging import create_event_publisher
 from syntask.server.events.schemas.events import ReceivedEvent, Resource
 from syntask.server.utilities.messaging import CapturingPublisher
+from syntask.server.utilities.messaging.memory import MemoryMessage
 from syntask.settings import SYNTASK_EVENTS_MAXIMUM_SIZE_BYTES, temporary_settings
 
 from .conftest import assert_message_represents_event
@@ -125,3 +126,27 @@ async def test_will_not_publish_duplicate_messages(
     assert_message_represents_event(one, event1)
     assert_message_represents_event(two, event2)
     assert_message_represents_event(three, event3)
+
+
+def test_event_from_message_decodes_once(event1: ReceivedEvent):
+    message = MemoryMessage(
+        data=event1.model_dump_json().encode(),
+        attributes={"id": str(event1.id), "event": event1.event},
+    )
+
+    first = messaging.event_from_message(message)
+    assert first == event1
+
+    with mock.patch.object(
+        ReceivedEvent,
+        "model_validate_json",
+        side_effect=AssertionError("should not decode again"),
+    ):
+        assert messaging.event_from_message(message) is first
+
+
+def test_event_from_message_uses_attached_event(event1: ReceivedEvent):
+    message = MemoryMessage(data=b"not even json", attributes={})
+    messaging.attach_event(message, event1)
+
+    assert messaging.event_from_message(message) is event1
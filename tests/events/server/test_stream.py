@@ -10,6 +10,7 @@ from syntask.server.events.filters import (
     EventFilter,
     EventNameFilter,
     EventOccurredFilter,
+    EventResourceFilter,
 )
 from syntask.server.events.schemas.events import Event, ReceivedEvent, Resource
 
@@ -230,3 +231,130 @@ async def test_event_filter_is_applied_to_event_stream(
     # event 2 will be skipped because it doesn't match the filter
     streamed = await filtered_subscription.__anext__()
     assert streamed == received_event3
+
+
+def test_subscription_index_finds_candidates_by_resource_id(
+    default_liberal_filter: EventFilter,
+    received_event1: ReceivedEvent,
+):
+    index = stream.SubscriptionIndex()
+    mine: asyncio.Queue = asyncio.Queue()
+    theirs: asyncio.Queue = asyncio.Queue()
+
+    index.add(
+        mine,
+        default_liberal_filter.model_copy(
+            update={"resource": EventResourceFilter(id=["my.resources"])}
+        ),
+    )
+    index.add(
+        theirs,
+        default_liberal_filter.model_copy(
+            update={"resource": EventResourceFilter(id=["their.resources"])}
+        ),
+    )
+
+    assert index.candidates(received_event1) == {mine}
+
+
+def test_subscription_index_finds_candidates_by_event_name(
+    default_liberal_filter: EventFilter,
+    received_event1: ReceivedEvent,
+    received_event2: ReceivedEvent,
+    received_event3: ReceivedEvent,
+):
+    index = stream.SubscriptionIndex()
+    by_name: asyncio.Queue = asyncio.Queue()
+    by_prefix: asyncio.Queue = asyncio.Queue()
+    everything: asyncio.Queue = asyncio.Queue()
+
+    index.add(
+        by_name,
+        default_liberal_filter.model_copy(
+            update={"event": EventNameFilter(name=["was.radical"])}
+        ),
+    )
+    index.add(
+        by_prefix,
+        default_liberal_filter.model_copy(
+            update={"event": EventNameFilter(prefix=["was.", "nope."])}
+        ),
+    )
+    index.add(everything, default_liberal_filter)
+
+    assert index.candidates(received_event1) == {by_name, by_prefix, everything}
+    assert index.candidates(received_event2) == {by_prefix, everything}
+    assert index.candidates(received_event3) == {everything}
+
+
+def test_subscription_index_removes_subscribers(
+    default_liberal_filter: EventFilter,
+    received_event1: ReceivedEvent,
+):
+    index = stream.SubscriptionIndex()
+    queues = [asyncio.Queue() for _ in range(4)]
+
+    index.add(
+        queues[0],
+        default_liberal_filter.model_copy(
+            update={"resource": EventResourceFilter(id=["my.resources"])}
+        ),
+    )
+    index.add(
+        queues[1],
+        default_liberal_filter.model_copy(
+            update={"event": EventNameFilter(name=["was.radical"])}
+        ),
+    )
+    index.add(
+        queues[2],
+        default_liberal_filter.model_copy(
+            update={"event": EventNameFilter(prefix=["was."])}
+        ),
+    )
+    index.add(queues[3], default_liberal_filter)
+    assert index.candidates(received_event1) == set(queues)
+
+    for queue in queues:
+        index.remove(queue)
+
+    assert index.candidates(received_event1) == set()
+    assert not index._by_resource_id
+    assert not index._by_name
+    assert not index._by_prefix
+
+
+async def test_only_candidate_filters_are_checked(
+    distributor_running: None,
+    default_liberal_filter: EventFilter,
+    received_event1: ReceivedEvent,
+):
+    elsewhere = default_liberal_filter.model_copy(
+        update={"resource": EventResourceFilter(id=["their.resources"])}
+    )
+    async with stream.subscribed(elsewhere):
+        async with stream.events(default_liberal_filter) as subscription:
+            before = stream.EVENT_STREAM_FILTER_CHECKS._value.get()
+
+            await messaging.publish([received_event1])
+            assert await subscription.__anext__() == received_event1
+
+            assert stream.EVENT_STREAM_FILTER_CHECKS._value.get() - before == 1
+
+
+async def test_dropped_events_are_counted(
+    subscription1: AsyncIterator[ReceivedEvent],
+    received_event1: ReceivedEvent,
+    caplog: pytest.LogCaptureFixture,
+):
+    before = stream.EVENT_STREAM_EVENTS_DROPPED._value.get()
+
+    for i in range(stream.SUBSCRIPTION_BACKLOG + 3):
+        await messaging.publish(
+            [received_event1.model_copy(update={"id": uuid4(), "event": str(i)})]
+        )
+
+    await asyncio.sleep(0.25)
+
+    assert stream.EVENT_STREAM_EVENTS_DROPPED._value.get() - before == 3
+    assert "is not keeping up" in caplog.text
@@ -0,0 +1,204 @@
+from datetime import timedelta
+from typing import List
+from unittest import mock
+from uuid import UUID, uuid4
+
+import pendulum
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from syntask.server.database.interface import SyntaskDBInterface
+from syntask.server.events import actions, triggers
+from syntask.server.events.models import automations
+from syntask.server.events.schemas.automations import (
+    Automation,
+    EventTrigger,
+    Posture,
+)
+from syntask.server.events.schemas.events import Event, ReceivedEvent
+
+
+@pytest.fixture
+async def counting_automation(
+    cleared_buckets: None,
+    cleared_automations: None,
+    automations_session: AsyncSession,
+) -> Automation:
+    automation = await automations.create_automation(
+        automations_session,
+        Automation(
+            name="Expects 10 events within sixty seconds",
+            trigger=EventTrigger(
+                expect={"some-event"},
+                posture=Posture.Reactive,
+                threshold=10,
+                within=timedelta(seconds=60),
+            ),
+            actions=[actions.DoNothing()],
+        ),
+    )
+    triggers.load_automation(automation)
+    await automations_session.commit()
+    return automation
+
+
+@pytest.fixture
+def some_events(start_of_test: pendulum.DateTime) -> List[ReceivedEvent]:
+    return [
+        Event(
+            occurred=start_of_test + timedelta(microseconds=i),
+            event="some-event",
+            resource={"syntask.resource.id": "some.resource"},
+            id=UUID(int=i),
+        ).receive()
+        for i in range(5)
+    ]
+
+
+async def read_bucket_rows(db: SyntaskDBInterface, session: AsyncSession) -> list:
+    result = await session.execute(sa.select(db.AutomationBucket))
+    return list(result.scalars().all())
+
+
+async def test_increments_are_kept_in_memory_until_checkpointed(
+    db: SyntaskDBInterface,
+    act: mock.AsyncMock,
+    counting_automation: Automation,
+    some_events: List[ReceivedEvent],
+    automations_session: AsyncSession,
+):
+    for event in some_events:
+        await triggers.reactive_evaluation(event)
+
+    bucket = await triggers.read_bucket(
+        automations_session, counting_automation.trigger, ()
+    )
+    assert bucket
+    assert bucket.count == 5
+
+    assert await read_bucket_rows(db, automations_session) == []
+
+    assert await triggers.checkpoint_buckets(automations_session) == 1
+
+    (row,) = await read_bucket_rows(db, automations_session)
+    assert row.count == 5
+    assert row.last_event.id == some_events[-1].id
+
+    # nothing has changed since, so there is nothing more to write
+    assert await triggers.checkpoint_buckets(automations_session) == 0
+
+    act.assert_not_awaited()
+
+
+async def test_checkpointed_buckets_survive_a_restart(
+    act: mock.AsyncMock,
+    counting_automation: Automation,
+    some_events: List[ReceivedEvent],
+    automations_session: AsyncSession,
+):
+    for event in some_events:
+        await triggers.reactive_evaluation(event)
+
+    await triggers.checkpoint_buckets(automations_session)
+
+    # simulate a restart of the service, which discards all in-memory state
+    await triggers.reset()
+    triggers.load_automation(counting_automation)
+
+    bucket = await triggers.read_bucket(
+        automations_session, counting_automation.trigger, ()
+    )
+    assert bucket
+    assert bucket.count == 5
+
+    for event in some_events:
+        await triggers.reactive_evaluation(
+            Event(
+                occurred=event.occurred + timedelta(seconds=1),
+                event=event.event,
+                resource=event.resource,
+                id=uuid4(),
+            ).receive()
+        )
+
+    act.assert_awaited_once()
+
+
+async def test_periodic_evaluation_checkpoints_buckets(
+    db: SyntaskDBInterface,
+    act: mock.AsyncMock,
+    counting_automation: Automation,
+    some_events: List[ReceivedEvent],
+    automations_session: AsyncSession,
+    start_of_test: pendulum.DateTime,
+):
+    for event in some_events:
+        await triggers.reactive_evaluation(event)
+
+    await triggers.periodic_evaluation(start_of_test)
+
+    (row,) = await read_bucket_rows(db, automations_session)
+    assert row.count == 5
+
+
+async def test_consumer_checkpoints_buckets_on_shutdown(
+    db: SyntaskDBInterface,
+    act: mock.AsyncMock,
+    counting_automation: Automation,
+    some_events: List[ReceivedEvent],
+    automations_session: AsyncSession,
+):
+    async with triggers.consumer(periodic_granularity=timedelta(hours=1)):
+        for event in some_events:
+            await triggers.reactive_evaluation(event)
+
+    (row,) = await read_bucket_rows(db, automations_session)
+    assert row.count == 5
+
+
+async def test_buckets_of_deleted_automations_are_not_checkpointed(
+    db: SyntaskDBInterface,
+    act: mock.AsyncMock,
+    counting_automation: Automation,
+    some_events: List[ReceivedEvent],
+    automations_session: AsyncSession,
+):
+    for event in some_events:
+        await triggers.reactive_evaluation(event)
+
+    assert await automations.delete_automation(
+        automations_session, counting_automation.id
+    )
+    await automations_session.commit()
+
+    assert await triggers.checkpoint_buckets(automations_session) == 0
+    assert await read_bucket_rows(db, automations_session) == []
+
+
+async def test_buckets_that_fired_are_not_written_to_the_database(
+    db: SyntaskDBInterface,
+    act: mock.AsyncMock,
+    counting_automation: Automation,
+    start_of_test: pendulum.DateTime,
+    automations_session: AsyncSession,
+):
+    for i in range(10):
+        await triggers.reactive_evaluation(
+            Event(
+                occurred=start_of_test + timedelta(microseconds=i),
+                event="some-event",
+                resource={"syntask.resource.id": "some.resource"},
+                id=uuid4(),
+            ).receive()
+        )
+
+    act.assert_awaited_once()
+
+    # the next bucket was started in memory, and the full one never reached the DB
+    bucket = await triggers.read_bucket(
+        automations_session, counting_automation.trigger, ()
+    )
+    assert bucket
+    assert bucket.count == 0
+    assert await read_bucket_rows(db, automations_session) == []
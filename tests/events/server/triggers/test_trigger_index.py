@@ -0,0 +1,151 @@
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import pendulum
+import pytest
+
+from syntask.server.events import actions, triggers
+from syntask.server.events.schemas.automations import (
+    Automation,
+    EventTrigger,
+    Posture,
+)
+from syntask.server.events.schemas.events import ReceivedEvent
+from syntask.server.events.triggers import TriggerIndex
+
+
+def make_trigger(**kwargs: Any) -> EventTrigger:
+    automation = Automation(
+        name="indexed",
+        trigger=EventTrigger(posture=Posture.Reactive, threshold=1, **kwargs),
+        actions=[actions.DoNothing()],
+    )
+    assert isinstance(automation.trigger, EventTrigger)
+    return automation.trigger
+
+
+def make_event(
+    event: str,
+    resource_id: str,
+    related: Optional[List[Dict[str, str]]] = None,
+) -> ReceivedEvent:
+    return ReceivedEvent(
+        occurred=pendulum.now("UTC"),
+        event=event,
+        resource={"syntask.resource.id": resource_id},
+        related=related or [],
+        id=uuid4(),
+    )
+
+
+TRIGGERS = {
+    "by-resource-id": dict(match={"syntask.resource.id": "syntask.flow-run.1"}),
+    "by-event-name": dict(expect={"syntask.flow-run.Failed"}),
+    "by-event-wildcard": dict(expect={"syntask.flow-run.*"}),
+    "by-event-after": dict(
+        expect={"syntask.flow-run.Failed"}, after={"syntask.deployment.*"}
+    ),
+    "by-related-id": dict(
+        match_related={
+            "syntask.resource.id": "syntask.flow.1",
+            "syntask.resource.role": "flow",
+        }
+    ),
+    "by-resource-prefix": dict(match={"syntask.resource.id": "syntask.work-pool.*"}),
+    "negated-resource": dict(match={"syntask.resource.id": "!syntask.flow-run.1"}),
+    "everything": dict(),
+}
+
+EVENTS = [
+    make_event("syntask.flow-run.Failed", "syntask.flow-run.1"),
+    make_event("syntask.flow-run.Failed", "syntask.flow-run.2"),
+    make_event("syntask.flow-run.Running", "syntask.flow-run.2"),
+    make_event("syntask.deployment.created", "syntask.deployment.1"),
+    make_event(
+        "syntask.task-run.Completed",
+        "syntask.task-run.1",
+        related=[
+            {"syntask.resource.id": "syntask.flow.1", "syntask.resource.role": "flow"}
+        ],
+    ),
+    make_event("syntask.work-pool.ready", "syntask.work-pool.1"),
+    make_event("syntask.work-pool.ready", "syntask.work-queue.1"),
+    make_event("something.else", "other"),
+]
+
+
+@pytest.fixture
+def loaded() -> Dict[str, EventTrigger]:
+    return {name: make_trigger(**kwargs) for name, kwargs in TRIGGERS.items()}
+
+
+@pytest.fixture
+def index(loaded: Dict[str, EventTrigger]) -> TriggerIndex:
+    index = TriggerIndex()
+    for trigger in loaded.values():
+        index.add(trigger)
+    return index
+
+
+@pytest.mark.parametrize("event", EVENTS, ids=[e.event for e in EVENTS])
+def test_candidates_include_every_covering_trigger(
+    index: TriggerIndex, loaded: Dict[str, EventTrigger], event: ReceivedEvent
+):
+    candidates = set(index.candidates(event))
+    for name, trigger in loaded.items():
+        if trigger.covers(event):
+            assert trigger.id in candidates, name
+
+
+def test_candidates_exclude_unrelated_triggers(
+    index: TriggerIndex, loaded: Dict[str, EventTrigger]
+):
+    candidates = index.candidates(make_event("something.else", "other"))
+    assert candidates == [loaded["negated-resource"].id, loaded["everything"].id]
+
+
+def test_candidates_are_in_the_order_they_were_added(
+    index: TriggerIndex, loaded: Dict[str, EventTrigger]
+):
+    candidates = index.candidates(
+        make_event("syntask.flow-run.Failed", "syntask.flow-run.1")
+    )
+    expected = [
+        trigger.id
+        for name, trigger in loaded.items()
+        if name not in ("by-related-id", "by-resource-prefix")
+    ]
+    assert candidates == expected
+
+
+def test_removed_triggers_are_not_candidates(
+    index: TriggerIndex, loaded: Dict[str, EventTrigger]
+):
+    for trigger in loaded.values():
+        index.remove(trigger.id)
+
+    assert len(index) == 0
+    for event in EVENTS:
+        assert index.candidates(event) == []
+
+
+def test_readding_a_trigger_replaces_its_entries(index: TriggerIndex):
+    trigger = make_trigger(expect={"first.event"})
+    index.add(trigger)
+    index.add(trigger.model_copy(update={"expect": {"second.event"}}))
+
+    assert trigger.id not in index.candidates(make_event("first.event", "x"))
+    assert trigger.id in index.candidates(make_event("second.event", "x"))
+
+
+async def test_loading_and_forgetting_automations_maintains_the_index(
+    arachnophobia: Automation, daddy_long_legs_walked: ReceivedEvent
+):
+    triggers.load_automation(arachnophobia)
+    assert triggers.find_interested_triggers(daddy_long_legs_walked) == [
+        arachnophobia.trigger
+    ]
+
+    triggers.forget_automation(arachnophobia.id)
+    assert triggers.find_interested_triggers(daddy_long_legs_walked) == []
+    assert len(triggers.trigger_index) == 0
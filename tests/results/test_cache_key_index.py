@@ -0,0 +1,217 @@
+from pathlib import Path
+from unittest import mock
+
+import pendulum
+import pytest
+
+from syntask import task
+from syntask.cache_index import CacheKeyIndex, get_cache_key_index
+from syntask.exceptions import MissingResult
+from syntask.filesystems import LocalFileSystem, RemoteFileSystem
+from syntask.results import ResultStore
+from syntask.settings import (
+    SYNTASK_RESULTS_CACHE_INDEX_ENABLED,
+    SYNTASK_RESULTS_CACHE_INDEX_PATH,
+    temporary_settings,
+)
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> CacheKeyIndex:
+    index = CacheKeyIndex(tmp_path / "index.db")
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def isolated_index(tmp_path: Path):
+    with temporary_settings(
+        {
+            SYNTASK_RESULTS_CACHE_INDEX_ENABLED: True,
+            SYNTASK_RESULTS_CACHE_INDEX_PATH: tmp_path / "index.db",
+        }
+    ):
+        yield get_cache_key_index()
+
+
+def test_index_answers_only_for_unexpired_keys(index: CacheKeyIndex):
+    index.add("storage", "forever", None)
+    index.add("storage", "later", pendulum.now("UTC").add(hours=1))
+    index.add("storage", "earlier", pendulum.now("UTC").subtract(hours=1))
+
+    assert index.cached("storage", ["forever", "later", "earlier", "unknown"]) == {
+        "forever",
+        "later",
+    }
+    assert index.cached("other-storage", ["forever"]) == set()
+
+
+def test_index_is_shared_between_instances(index: CacheKeyIndex):
+    index.add("storage", "key", None)
+
+    other = CacheKeyIndex(index.path)
+    try:
+        assert other.cached("storage", ["key", "unknown"]) == {"key"}
+    finally:
+        other.close()
+
+
+def test_index_checks_many_keys_at_once(index: CacheKeyIndex):
+    for i in range(2000):
+        index.add("storage", f"key-{i}", None)
+
+    other = CacheKeyIndex(index.path)
+    try:
+        keys = [f"key-{i}" for i in range(0, 4000, 2)]
+        assert other.cached("storage", keys) == {f"key-{i}" for i in range(0, 2000, 2)}
+    finally:
+        other.close()
+
+
+def test_discarded_keys_are_forgotten(index: CacheKeyIndex):
+    index.add("storage", "key", None)
+    index.discard("storage", "key")
+
+    assert index.cached("storage", ["key"]) == set()
+
+
+def test_index_is_disabled_by_default():
+    assert get_cache_key_index() is None
+
+
+async def test_cache_hits_are_answered_without_reading_storage(
+    tmp_path: Path, isolated_index: CacheKeyIndex
+):
+    store = ResultStore(result_storage=LocalFileSystem(basepath=str(tmp_path)))
+    await store.awrite(obj="hello", key="written")
+
+    fresh = ResultStore(result_storage=LocalFileSystem(basepath=str(tmp_path)))
+    with mock.patch.object(LocalFileSystem, "read_path") as read_path:
+        assert await fresh.aexists("written")
+        read_path.assert_not_called()
+
+
+async def test_records_found_in_storage_are_indexed(
+    tmp_path: Path, isolated_index: CacheKeyIndex
+):
+    store = ResultStore(result_storage=LocalFileSystem(basepath=str(tmp_path)))
+
+    # a record that was written without the index, which must be found in storage
+    with temporary_settings({SYNTASK_RESULTS_CACHE_INDEX_ENABLED: False}):
+        await store.awrite(obj="hello", key="unindexed")
+
+    assert await store.aexists("unindexed")
+    assert not await store.aexists("missing")
+
+    storage = store._cache_key_storage()
+    assert storage
+    assert isolated_index.cached(storage, ["unindexed", "missing"]) == {"unindexed"}
+
+
+async def test_batch_existence_checks(tmp_path: Path, isolated_index: CacheKeyIndex):
+    store = ResultStore(result_storage=LocalFileSystem(basepath=str(tmp_path)))
+    await store.awrite(obj="hello", key="indexed")
+    with temporary_settings({SYNTASK_RESULTS_CACHE_INDEX_ENABLED: False}):
+        await store.awrite(obj="hello", key="unindexed")
+
+    storage = store._cache_key_storage()
+    assert storage
+    with mock.patch.object(
+        isolated_index, "cached", wraps=isolated_index.cached
+    ) as cached:
+        assert await store.aexists_many(["indexed", "unindexed", "missing"]) == {
+            "indexed": True,
+            "unindexed": True,
+            "missing": False,
+        }
+        # the index is consulted once for the whole batch
+        cached.assert_called_once_with(storage, ["indexed", "unindexed", "missing"])
+
+    # the record found in storage is now in the index
+    assert isolated_index.cached(storage, ["indexed", "unindexed"]) == {
+        "indexed",
+        "unindexed",
+    }
+    assert store.exists_many(["missing"]) == {"missing": False}
+
+
+def test_memory_holds_a_bounded_number_of_keys(index: CacheKeyIndex):
+    with mock.patch("syntask.cache_index._MAX_KNOWN_KEYS", 10):
+        bounded = CacheKeyIndex(index.path)
+    try:
+        for i in range(100):
+            bounded.add("storage", f"key-{i}", None)
+
+        assert len(bounded._known) == 10
+
+        # keys that were evicted from memory are still in the shared index
+        assert bounded.cached("storage", ["key-0", "key-99"]) == {"key-0", "key-99"}
+    finally:
+        bounded.close()
+
+
+async def test_stale_remote_cache_hits_are_forgotten_when_read(
+    isolated_index: CacheKeyIndex,
+):
+    storage = RemoteFileSystem(basepath="memory://stale-cache-hits")
+    store = ResultStore(result_storage=storage, cache_result_in_memory=False)
+    await store.awrite(obj="hello", key="deleted")
+
+    storage.filesystem.rm(storage._resolve_path("deleted"))
+
+    # remote hits are taken from the index without reading storage...
+    assert await store.aexists("deleted")
+
+    # ...so a record that is gone is only noticed when it's read
+    with pytest.raises(MissingResult):
+        await store.aread("deleted")
+
+    assert not await store.aexists("deleted")
+
+
+async def test_deleted_local_records_are_not_cache_hits(
+    tmp_path: Path, isolated_index: CacheKeyIndex
+):
+    store = ResultStore(result_storage=LocalFileSystem(basepath=str(tmp_path)))
+    await store.awrite(obj="hello", key="deleted")
+
+    (tmp_path / "deleted").unlink()
+
+    assert not await store.aexists("deleted")
+
+
+async def test_expired_records_are_not_cache_hits(
+    tmp_path: Path, isolated_index: CacheKeyIndex
+):
+    store = ResultStore(result_storage=LocalFileSystem(basepath=str(tmp_path)))
+    await store.awrite(
+        obj="hello",
+        key="expired",
+        expiration=pendulum.now("UTC").subtract(seconds=1),
+    )
+
+    assert not store.exists("expired")
+
+
+def test_tasks_run_again_when_a_cached_record_is_gone(isolated_index: CacheKeyIndex):
+    storage = RemoteFileSystem(basepath="memory://stale-cached-tasks")
+    storage.save("stale-cached-tasks", overwrite=True)
+    calls = []
+
+    @task(
+        cache_key_fn=lambda *_: "stale-cached-task",
+        result_storage=storage,
+        persist_result=True,
+    )
+    def add_one(x: int) -> int:
+        calls.append(x)
+        return x + 1
+
+    assert add_one(1) == 2
+    assert add_one(1) == 2
+    assert calls == [1]
+
+    storage.filesystem.rm(storage._resolve_path("stale-cached-task"))
+
+    assert add_one(1) == 2
+    assert calls == [1, 1]
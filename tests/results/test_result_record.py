@@ -1,9 +1,22 @@
+import io
+import mmap
+import struct
+
 import pytest
 from pydantic import ValidationError
 
 from syntask.filesystems import NullFileSystem
-from syntask.results import ResultRecord, ResultRecordMetadata, ResultStore
-from syntask.serializers import JSONSerializer
+from syntask.results import (
+    RESULT_RECORD_MAGIC,
+    ResultRecord,
+    ResultRecordMetadata,
+    ResultStore,
+)
+from syntask.serializers import (
+    CompressedPickleSerializer,
+    JSONSerializer,
+    PickleSerializer,
+)
 from syntask.settings import SYNTASK_LOCAL_STORAGE_PATH
 
 
@@ -58,3 +71,112 @@ class TestResultRecord:
             )
             == "The results are in..."
         )
+
+
+class TestBinaryResultRecord:
+    @pytest.fixture
+    def record(self) -> ResultRecord:
+        return ResultRecord(
+            result={"numbers": list(range(1000)), "payload": b"\x00" * 10_000},
+            metadata=ResultRecordMetadata(
+                storage_key="my-storage-key", serializer=PickleSerializer()
+            ),
+        )
+
+    def test_binary_records_hold_the_raw_result(self, record: ResultRecord):
+        serialized = record.serialize()
+
+        assert serialized.startswith(RESULT_RECORD_MAGIC)
+        assert serialized.endswith(PickleSerializer().dumps_binary(record.result))
+
+        # smaller than the same record as JSON with a base64-encoded result
+        json_record = (
+            record.model_copy(update={"result": record.serialize_result()})
+            .model_dump_json()
+            .encode()
+        )
+        assert len(serialized) < len(json_record) * 0.8
+
+    def test_binary_records_round_trip(self, record: ResultRecord):
+        deserialized = ResultRecord.deserialize(record.serialize())
+        assert deserialized == record
+
+    def test_binary_records_can_be_read_from_memory_maps(
+        self, record: ResultRecord, tmp_path
+    ):
+        path = tmp_path / "record"
+        path.write_bytes(record.serialize())
+
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as m:
+            view = memoryview(m)
+            try:
+                deserialized = ResultRecord.deserialize(view)
+            finally:
+                view.release()
+
+        assert deserialized.result == record.result
+
+    def test_json_records_are_still_readable(self, record: ResultRecord):
+        json_record = (
+            record.model_copy(update={"result": record.serialize_result()})
+            .model_dump_json(serialize_as_any=True)
+            .encode()
+        )
+
+        deserialized = ResultRecord.deserialize(json_record)
+        assert deserialized == record
+
+    def test_compressed_results_are_binary_records(self):
+        record = ResultRecord(
+            result="hello " * 1000,
+            metadata=ResultRecordMetadata(serializer=CompressedPickleSerializer()),
+        )
+
+        serialized = record.serialize()
+        assert serialized.startswith(RESULT_RECORD_MAGIC)
+        assert ResultRecord.deserialize(serialized).result == record.result
+
+    def test_json_results_are_json_records(self):
+        record = ResultRecord(
+            result="hello", metadata=ResultRecordMetadata(serializer=JSONSerializer())
+        )
+        assert record.serialize().startswith(b"{")
+
+    def test_records_from_newer_formats_are_rejected(self, record: ResultRecord):
+        serialized = bytearray(record.serialize())
+        serialized[len(RESULT_RECORD_MAGIC)] = 99
+        with pytest.raises(ValueError, match="format version 99"):
+            ResultRecord.deserialize(bytes(serialized))
+
+    def test_binary_header_layout(self, record: ResultRecord):
+        serialized = record.serialize()
+        magic, version, metadata_length = struct.unpack_from(">4sBI", serialized)
+        assert (magic, version) == (RESULT_RECORD_MAGIC, 1)
+        metadata = serialized[9 : 9 + metadata_length]
+        assert ResultRecordMetadata.load_bytes(metadata) == record.metadata
+
+    def test_binary_records_stream_to_and_from_files(self, record: ResultRecord):
+        file = io.BytesIO()
+        record.serialize_to(file)
+        assert file.getvalue() == record.serialize()
+
+        file.seek(0)
+        assert ResultRecord.deserialize_from(file) == record
+
+    def test_json_records_stream_to_and_from_files(self):
+        record = ResultRecord(
+            result="hello", metadata=ResultRecordMetadata(serializer=JSONSerializer())
+        )
+        file = io.BytesIO()
+        record.serialize_to(file)
+        assert file.getvalue() == record.serialize()
+
+        file.seek(0)
+        assert ResultRecord.deserialize_from(file) == record
+
+    def test_metadata_is_read_without_the_result(self, record: ResultRecord):
+        file = io.BytesIO(record.serialize())
+        assert ResultRecord.deserialize_metadata_from(file) == record.metadata
+        assert file.tell() < len(file.getvalue()) / 2
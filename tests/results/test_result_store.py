@@ -1,10 +1,12 @@
+from unittest import mock
+
 import pytest
 
 import syntask.exceptions
 import syntask.results
 from syntask import flow, task
 from syntask.context import FlowRunContext, get_run_context
-from syntask.filesystems import LocalFileSystem
+from syntask.filesystems import LocalFileSystem, RemoteFileSystem
 from syntask.locking.memory import MemoryLockManager
 from syntask.results import (
     ResultRecord,
@@ -16,6 +18,7 @@ from syntask.settings import (
     SYNTASK_LOCAL_STORAGE_PATH,
     SYNTASK_RESULTS_DEFAULT_SERIALIZER,
     SYNTASK_RESULTS_PERSIST_BY_DEFAULT,
+    SYNTASK_RESULTS_STREAMING_CHUNK_SIZE,
     temporary_settings,
 )
 from syntask.testing.utilities import assert_blocks_equal
@@ -839,3 +842,59 @@ async def test_deprecation_warning_on_persist_result():
 
     with pytest.warns(DeprecationWarning):
         ResultStore(persist_result=False)
+
+
+class TestStreamingResults:
+    @pytest.fixture
+    def large_result(self):
+        return {"payload": b"\x01" * 100_000, "numbers": list(range(1000))}
+
+    @pytest.fixture(autouse=True)
+    def small_chunks(self):
+        with temporary_settings({SYNTASK_RESULTS_STREAMING_CHUNK_SIZE: 1024}):
+            yield
+
+    async def test_results_are_streamed_into_storage(self, tmp_path, large_result):
+        store = ResultStore(result_storage=LocalFileSystem(basepath=str(tmp_path)))
+        with mock.patch.object(
+            PickleSerializer, "dumps_binary", side_effect=AssertionError
+        ), mock.patch.object(LocalFileSystem, "write_path", side_effect=AssertionError):
+            await store.awrite(obj=large_result, key="large")
+
+        assert [p.name for p in tmp_path.iterdir()] == ["large"]
+        assert store.read("large").result == large_result
+
+    async def test_large_local_results_are_memory_mapped(self, tmp_path, large_result):
+        await ResultStore(
+            result_storage=LocalFileSystem(basepath=str(tmp_path))
+        ).awrite(obj=large_result, key="large")
+
+        store = ResultStore(result_storage=LocalFileSystem(basepath=str(tmp_path)))
+        with mock.patch.object(
+            LocalFileSystem, "read_path", side_effect=AssertionError
+        ), mock.patch(
+            "syntask.results.mmap.mmap", wraps=syntask.results.mmap.mmap
+        ) as m:
+            assert (await store.aread("large")).result == large_result
+        m.assert_called_once()
+
+    async def test_remote_results_are_streamed(self, large_result):
+        storage = RemoteFileSystem(basepath="memory://streamed-results")
+        store = ResultStore(result_storage=storage)
+        await store.awrite(obj=large_result, key="large")
+
+        store = ResultStore(result_storage=storage)
+        with mock.patch.object(
+            RemoteFileSystem, "read_path", side_effect=AssertionError
+        ):
+            assert (await store.aread("large")).result == large_result
+
+    async def test_existence_checks_do_not_read_results(self, tmp_path, large_result):
+        store = ResultStore(result_storage=LocalFileSystem(basepath=str(tmp_path)))
+        await store.awrite(obj=large_result, key="large")
+
+        store = ResultStore(result_storage=LocalFileSystem(basepath=str(tmp_path)))
+        with mock.patch.object(
+            PickleSerializer, "load_binary", side_effect=AssertionError
+        ):
+            assert await store._probe("large")
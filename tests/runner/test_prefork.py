@@ -0,0 +1,97 @@
+import io
+import os
+import subprocess
+import sys
+
+import anyio
+import anyio.to_thread
+import pytest
+
+from syntask.runner.prefork import (
+    UNKNOWN_EXIT_CODE,
+    ForkedProcess,
+    ForkServer,
+    _PipeReceiveStream,
+    is_supported,
+)
+
+pytestmark = pytest.mark.skipif(
+    not is_supported(), reason="Pre-forking is only supported on POSIX"
+)
+
+
+@pytest.fixture
+def fork_server():
+    server = ForkServer()
+    server.start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+@pytest.fixture
+def engine_env():
+    env = dict(os.environ)
+    env["SYNTASK__FLOW_RUN_ID"] = "not-a-flow-run-id"
+    return env
+
+
+class TestForkServer:
+    async def test_runs_engine_in_forked_process(self, fork_server, engine_env):
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        process = await fork_server.run_process(
+            env=engine_env, stream_output=(stdout, stderr)
+        )
+
+        assert process is not None
+        assert process.returncode == 1
+        assert "Invalid flow run id" in stderr.getvalue()
+
+    async def test_forks_a_process_for_each_request(self, fork_server, engine_env):
+        pids = []
+
+        async def run():
+            async with anyio.create_task_group() as tg:
+                pids.append(
+                    await tg.start(
+                        lambda task_status: fork_server.run_process(
+                            env=engine_env, task_status=task_status
+                        )
+                    )
+                )
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(run)
+
+        assert len(set(pids)) == 3
+        assert os.getpid() not in pids
+        assert fork_server.is_running
+
+    async def test_does_not_fork_once_stopped(self, fork_server, engine_env):
+        fork_server.stop()
+
+        assert not fork_server.is_running
+        assert await fork_server.run_process(env=engine_env) is None
+
+
+class TestForkedProcess:
+    async def test_waits_for_processes_that_outlive_the_fork_server(self):
+        process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(1)"])
+
+        # The fork server reports nothing before it exits
+        streams = []
+        for _ in range(3):
+            read_fd, write_fd = os.pipe()
+            os.close(write_fd)
+            streams.append(await _PipeReceiveStream.open(read_fd))
+        forked = ForkedProcess(process.pid, *streams)
+
+        async with anyio.create_task_group() as tg:
+            # Reap the process once it exits, as whatever adopts it would
+            tg.start_soon(anyio.to_thread.run_sync, process.wait)
+
+            assert await forked.wait() == UNKNOWN_EXIT_CODE
+            assert process.poll() == 0
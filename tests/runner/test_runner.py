@@ -6,6 +6,7 @@ import signal
 import sys
 import tempfile
 import time
+import uuid
 import warnings
 from itertools import combinations
 from pathlib import Path
@@ -18,6 +19,7 @@ from unittest.mock import MagicMock
 import anyio
 import pendulum
 import pytest
+from prometheus_client import REGISTRY
 from starlette import status
 
 import syntask.runner
@@ -35,14 +37,17 @@ from syntask.deployments.runner import (
 from syntask.docker.docker_image import DockerImage
 from syntask.events.clients import AssertingEventsClient
 from syntask.events.worker import EventsWorker
+from syntask.exceptions import ObjectNotFound
 from syntask.flows import load_flow_from_entrypoint
 from syntask.logging.loggers import flow_run_logger
+from syntask.runner import prefork
 from syntask.runner.runner import Runner
 from syntask.runner.server import perform_health_check
 from syntask.settings import (
     SYNTASK_DEFAULT_DOCKER_BUILD_NAMESPACE,
     SYNTASK_DEFAULT_WORK_POOL_NAME,
     SYNTASK_RUNNER_POLL_FREQUENCY,
+    SYNTASK_RUNNER_PREFORK_ENABLED,
     SYNTASK_RUNNER_PROCESS_LIMIT,
     SYNTASK_RUNNER_SERVER_ENABLE,
     temporary_settings,
@@ -470,6 +475,69 @@ class TestRunner:
         # check to make sure on_cancellation hook was called
         assert "This flow was cancelled!" in caplog.text
 
+    @pytest.mark.parametrize(
+        "error", [ObjectNotFound(http_exc=Exception()), RuntimeError("Oh no")]
+    )
+    async def test_runner_skips_cancelling_flow_runs_it_cannot_read(self, error):
+        runner = Runner()
+        flow_run_id = uuid.uuid4()
+        runner._flow_run_process_map[flow_run_id] = dict(pid=1234, flow_run=None)
+        runner._runs_task_group = MagicMock()
+        runner._client = MagicMock()
+        runner._client.read_flow_run = AsyncMock(side_effect=error)
+
+        await runner._on_cancelling_flow_run(flow_run_id, pendulum.now("UTC"))
+
+        runner._runs_task_group.start_soon.assert_not_called()
+        assert flow_run_id not in runner._cancelling_flow_run_ids
+
+    @pytest.mark.usefixtures("use_hosted_api_server")
+    async def test_runner_cancels_flow_runs_as_soon_as_cancellation_is_requested(
+        self, syntask_client: SyntaskClient
+    ):
+        def cancellations_found_by_events() -> float:
+            return (
+                REGISTRY.get_sample_value(
+                    "syntask_flow_run_cancellation_latency_seconds_count",
+                    {"client": "runner", "source": "event"},
+                )
+                or 0
+            )
+
+        # Long enough that the flow run could only be cancelled in time by an event
+        runner = Runner(query_seconds=60)
+        deployment_id = await runner.add_deployment(
+            await tired_flow.to_deployment(__file__)
+        )
+        found_by_events = cancellations_found_by_events()
+
+        async with runner:
+            flow_run = await syntask_client.create_flow_run_from_deployment(
+                deployment_id=deployment_id
+            )
+
+            execute_task = asyncio.create_task(runner.execute_flow_run(flow_run.id))
+            while True:
+                await anyio.sleep(0.5)
+                flow_run = await syntask_client.read_flow_run(flow_run_id=flow_run.id)
+                assert flow_run.state
+                if flow_run.state.is_running():
+                    break
+
+            await syntask_client.set_flow_run_state(
+                flow_run_id=flow_run.id,
+                state=flow_run.state.model_copy(
+                    update={"name": "Cancelling", "type": StateType.CANCELLING}
+                ),
+            )
+
+            with anyio.fail_after(30):
+                await execute_task
+
+        flow_run = await syntask_client.read_flow_run(flow_run_id=flow_run.id)
+        assert flow_run.state.is_cancelled()
+        assert cancellations_found_by_events() == found_by_events + 1
+
     @pytest.mark.usefixtures("use_hosted_api_server")
     async def test_runner_warns_if_unable_to_load_cancellation_hooks(
         self,
@@ -790,6 +858,117 @@ class TestRunner:
             await runner._cancel_run(flow_run)
 
 
+@pytest.mark.skipif(
+    not prefork.is_supported(), reason="Pre-forking is only supported on POSIX"
+)
+class TestPrefork:
+    @pytest.fixture(autouse=True)
+    def enable_prefork(self):
+        with temporary_settings({SYNTASK_RUNNER_PREFORK_ENABLED: True}):
+            yield
+
+    @pytest.fixture
+    def run_process_spy(self, monkeypatch):
+        spy = AsyncMock(side_effect=AssertionError("Flow run was not forked"))
+        monkeypatch.setattr("syntask.runner.runner.run_process", spy)
+        return spy
+
+    @pytest.mark.usefixtures("use_hosted_api_server")
+    async def test_runner_executes_flow_runs_in_forked_processes(
+        self, syntask_client: SyntaskClient, run_process_spy
+    ):
+        runner = Runner()
+
+        deployment_id = await runner.add_deployment(
+            await dummy_flow_1.to_deployment(__file__)
+        )
+        flow_runs = [
+            await syntask_client.create_flow_run_from_deployment(
+                deployment_id=deployment_id
+            )
+            for _ in range(2)
+        ]
+
+        await runner.start(run_once=True)
+
+        for flow_run in flow_runs:
+            flow_run = await syntask_client.read_flow_run(flow_run_id=flow_run.id)
+            assert flow_run.state
+            assert flow_run.state.is_completed()
+
+        run_process_spy.assert_not_called()
+        assert runner._fork_server is None
+
+    @pytest.mark.usefixtures("use_hosted_api_server")
+    async def test_runner_reports_forked_processes_that_crash(
+        self, syntask_client: SyntaskClient, run_process_spy, caplog
+    ):
+        runner = Runner()
+
+        deployment_id = await runner.add_deployment(
+            await crashing_flow.to_deployment(__file__)
+        )
+        flow_run = await syntask_client.create_flow_run_from_deployment(
+            deployment_id=deployment_id
+        )
+
+        await runner.start(run_once=True)
+
+        flow_run = await syntask_client.read_flow_run(flow_run_id=flow_run.id)
+        assert flow_run.state
+        assert flow_run.state.is_crashed()
+        assert "exited due to a SIGTERM signal" in caplog.text
+        run_process_spy.assert_not_called()
+
+    @pytest.mark.usefixtures("use_hosted_api_server")
+    async def test_runner_falls_back_to_new_processes_when_forking_fails(
+        self, syntask_client: SyntaskClient, monkeypatch, caplog
+    ):
+        async def fail_to_fork(self, *args, **kwargs):
+            return None
+
+        monkeypatch.setattr(prefork.ForkServer, "run_process", fail_to_fork)
+        runner = Runner()
+
+        deployment_id = await runner.add_deployment(
+            await dummy_flow_1.to_deployment(__file__)
+        )
+        flow_run = await syntask_client.create_flow_run_from_deployment(
+            deployment_id=deployment_id
+        )
+
+        await runner.start(run_once=True)
+
+        flow_run = await syntask_client.read_flow_run(flow_run_id=flow_run.id)
+        assert flow_run.state
+        assert flow_run.state.is_completed()
+        assert "Unable to fork a process" in caplog.text
+        assert await runner._get_fork_server() is None
+
+    @pytest.mark.usefixtures("use_hosted_api_server")
+    async def test_runner_can_kill_forked_processes(
+        self, syntask_client: SyntaskClient, run_process_spy
+    ):
+        async with Runner(pause_on_shutdown=False) as runner:
+            deployment_id = await runner.add_deployment(
+                await tired_flow.to_deployment(__file__)
+            )
+            flow_run = await syntask_client.create_flow_run_from_deployment(
+                deployment_id=deployment_id
+            )
+
+            async with anyio.create_task_group() as tg:
+                runner._acquire_limit_slot(flow_run.id)
+                pid = await tg.start(runner._submit_run_and_capture_errors, flow_run)
+                os.kill(pid, 0)
+                await runner._kill_process(pid, grace_seconds=5)
+
+            with pytest.raises(ProcessLookupError):
+                os.kill(pid, 0)
+
+        run_process_spy.assert_not_called()
+
+
 @pytest.mark.usefixtures("use_hosted_api_server")
 async def test_runner_emits_cancelled_event(
     asserting_events_worker: EventsWorker,
@@ -6,6 +6,7 @@ order. This is purely so that we can test sorting by flow run and
 task run ID with a stable order across test machines.
 """
 
+import asyncio
 from datetime import timedelta
 from unittest import mock
 from uuid import uuid1
@@ -14,13 +15,17 @@ import pendulum
 import pytest
 from sqlalchemy.orm.exc import FlushError
 
+from syntask.logging.compact import COMPACT_LOGS_CONTENT_TYPE, compress, encode_logs
 from syntask.server import models
+from syntask.server.api.logs import LogIngestionBuffer
 from syntask.server.schemas.actions import LogCreate
 from syntask.server.schemas.core import Log
 from syntask.server.schemas.filters import LogFilter
+from syntask.settings import SYNTASK_API_LOGS_BULK_INGESTION_ENABLED, temporary_settings
 
 NOW = pendulum.now("UTC")
 CREATE_LOGS_URL = "/logs/"
+COMPACT_LOGS_URL = "/logs/compact"
 READ_LOGS_URL = "/logs/filter"
 
 
@@ -106,6 +111,160 @@ class TestCreateLogs:
             assert response.status_code == 500
 
 
+class TestCreateLogsCompact:
+    async def test_create_logs(self, session, client, log_data, flow_run_id):
+        response = await client.post(
+            COMPACT_LOGS_URL,
+            content=compress(encode_logs(log_data), "gzip"),
+            headers={
+                "Content-Type": COMPACT_LOGS_CONTENT_TYPE,
+                "Content-Encoding": "gzip",
+            },
+        )
+        assert response.status_code == 201
+
+        log_filter = LogFilter(flow_run_id={"any_": [flow_run_id]})
+        logs = await models.logs.read_logs(session=session, log_filter=log_filter)
+        assert [
+            Log.model_validate(log, from_attributes=True).model_dump(
+                mode="json", exclude={"created", "id", "updated"}
+            )
+            for log in logs
+        ] == log_data
+
+    async def test_unsupported_encoding(self, client, log_data):
+        response = await client.post(
+            COMPACT_LOGS_URL,
+            content=encode_logs(log_data),
+            headers={
+                "Content-Type": COMPACT_LOGS_CONTENT_TYPE,
+                "Content-Encoding": "br",
+            },
+        )
+        assert response.status_code == 415
+        assert "gzip" in response.headers["Accept-Encoding"]
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"not gzip",
+            compress(b"not a batch", "gzip"),
+            compress(
+                b'{"names": ["x"], "run_ids": [null], "logs": [[0, "loud", 0, null, "now", 1]]}',
+                "gzip",
+            ),
+        ],
+    )
+    async def test_malformed_batch(self, client, content):
+        response = await client.post(
+            COMPACT_LOGS_URL,
+            content=content,
+            headers={
+                "Content-Type": COMPACT_LOGS_CONTENT_TYPE,
+                "Content-Encoding": "gzip",
+            },
+        )
+        assert response.status_code == 422
+
+
+class TestBulkLogIngestion:
+    @pytest.fixture(autouse=True)
+    def bulk_ingestion(self):
+        with temporary_settings({SYNTASK_API_LOGS_BULK_INGESTION_ENABLED: True}):
+            yield
+
+    async def test_create_logs(self, session, client, log_data, flow_run_id):
+        response = await client.post(CREATE_LOGS_URL, json=log_data)
+        assert response.status_code == 201
+
+        log_filter = LogFilter(flow_run_id={"any_": [flow_run_id]})
+        logs = await models.logs.read_logs(session=session, log_filter=log_filter)
+        assert [
+            Log.model_validate(log, from_attributes=True).model_dump(
+                mode="json", exclude={"created", "id", "updated"}
+            )
+            for log in logs
+        ] == log_data
+
+    async def test_concurrent_requests_are_written_together(
+        self, session, client, log_data, flow_run_id
+    ):
+        with mock.patch(
+            "syntask.server.models.logs.bulk_create_logs",
+            wraps=models.logs.bulk_create_logs,
+        ) as bulk_create_logs:
+            responses = await asyncio.gather(
+                *[client.post(CREATE_LOGS_URL, json=log_data) for _ in range(10)]
+            )
+
+        assert all(response.status_code == 201 for response in responses)
+        assert bulk_create_logs.call_count < 10
+
+        log_filter = LogFilter(flow_run_id={"any_": [flow_run_id]})
+        logs = await models.logs.read_logs(session=session, log_filter=log_filter)
+        assert len(logs) == 20
+
+    async def test_database_failure(self, client_without_exceptions, log_data):
+        with mock.patch(
+            "syntask.server.models.logs.bulk_create_logs", side_effect=FlushError
+        ):
+            response = await client_without_exceptions.post(
+                CREATE_LOGS_URL, json=log_data
+            )
+            assert response.status_code == 500
+
+    async def test_buffer_waits_for_room(self, log_data):
+        buffer = LogIngestionBuffer(max_buffered_logs=2)
+        db = mock.MagicMock()
+        released = asyncio.Event()
+
+        async def bulk_create_logs(session, logs):
+            await released.wait()
+
+        with mock.patch(
+            "syntask.server.models.logs.bulk_create_logs", side_effect=bulk_create_logs
+        ):
+            first = asyncio.create_task(buffer.write(db, log_data[:2]))
+            second = asyncio.create_task(buffer.write(db, log_data[:1]))
+            await asyncio.sleep(0.1)
+
+            # the first write is holding the whole buffer
+            assert buffer._buffered == 2
+            assert not second.done()
+
+            released.set()
+            await asyncio.gather(first, second)
+            assert buffer._buffered == 0
+
+    async def test_cancelled_requests_dont_cancel_the_writes_of_others(self, log_data):
+        buffer = LogIngestionBuffer(max_buffered_logs=10)
+        db = mock.MagicMock()
+        released = asyncio.Event()
+        written = []
+
+        async def bulk_create_logs(session, logs):
+            await released.wait()
+            written.extend(logs)
+
+        with mock.patch(
+            "syntask.server.models.logs.bulk_create_logs", side_effect=bulk_create_logs
+        ) as mocked:
+            # the first request writes the logs of both
+            first = asyncio.create_task(buffer.write(db, log_data[:1]))
+            second = asyncio.create_task(buffer.write(db, log_data[1:]))
+            await asyncio.sleep(0.1)
+            assert mocked.call_count == 1
+
+            first.cancel()
+            await asyncio.sleep(0.1)
+            released.set()
+
+            await asyncio.wait_for(second, timeout=5)
+            assert len(written) == 2
+            with pytest.raises(asyncio.CancelledError):
+                await first
+
+
 class TestReadLogs:
     @pytest.fixture()
     async def logs(self, client, log_data):
@@ -175,3 +334,24 @@ class TestReadLogs:
         api_logs = [Log(**log_data) for log_data in response.json()]
         assert api_logs[0].timestamp > api_logs[1].timestamp
         assert api_logs[0].message == "Black flag ahead, captain!"
+
+    async def test_read_logs_after_cursor(self, client, logs):
+        response = await client.post(READ_LOGS_URL, json={"limit": 1})
+        (first,) = [Log(**log_data) for log_data in response.json()]
+        assert first.message == "Ahoy, captain"
+
+        response = await client.post(
+            READ_LOGS_URL,
+            json={
+                "after": {"timestamp": first.timestamp.isoformat(), "id": str(first.id)}
+            },
+        )
+        api_logs = [Log(**log_data) for log_data in response.json()]
+        assert [log.message for log in api_logs] == ["Black flag ahead, captain!"]
+
+    async def test_read_logs_by_message(self, client, logs):
+        response = await client.post(
+            READ_LOGS_URL, json={"logs": {"message": {"like_": "black FLAG"}}}
+        )
+        api_logs = [Log(**log_data) for log_data in response.json()]
+        assert [log.message for log in api_logs] == ["Black flag ahead, captain!"]
@@ -0,0 +1,26 @@
+import pendulum
+import pytest
+
+from syntask.server.database.partitions import parse_partition_bound
+
+
+@pytest.mark.parametrize(
+    "bound, expected",
+    [
+        (
+            "FOR VALUES FROM ('2026-10-19 00:00:00+00') TO ('2026-10-20 00:00:00+00')",
+            (pendulum.datetime(2026, 10, 19), pendulum.datetime(2026, 10, 20)),
+        ),
+        (
+            "FOR VALUES FROM ('2026-10-18 20:00:00-04') TO ('2026-10-19 20:00:00-04')",
+            (pendulum.datetime(2026, 10, 19), pendulum.datetime(2026, 10, 20)),
+        ),
+        (
+            "FOR VALUES FROM (MINVALUE) TO ('2026-10-19 00:00:00+00')",
+            (None, pendulum.datetime(2026, 10, 19)),
+        ),
+        ("DEFAULT", (None, None)),
+    ],
+)
+def test_parsing_partition_bounds(bound: str, expected):
+    assert parse_partition_bound(bound) == expected
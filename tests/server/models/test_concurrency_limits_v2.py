@@ -1,6 +1,7 @@
 import asyncio
 from uuid import UUID
 
+import pendulum
 import pytest
 from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError
@@ -15,7 +16,9 @@ from syntask.server.models.concurrency_limits_v2 import (
     bulk_read_or_create_concurrency_limits,
     bulk_update_denied_slots,
     create_concurrency_limit,
+    create_lease,
     delete_concurrency_limit,
+    expire_leases,
     read_all_concurrency_limits,
     read_concurrency_limit,
     update_concurrency_limit,
@@ -631,3 +634,37 @@ async def test_bulk_update_denied_slots(
     )
     assert refreshed
     assert refreshed.denied_slots == 10
+
+
+async def test_leases_hold_slots_until_they_expire(
+    session: AsyncSession,
+    concurrency_limit: ConcurrencyLimitV2,
+):
+    lease = await create_lease(
+        session=session,
+        concurrency_limit_ids=[concurrency_limit.id],
+        slots=15,
+        minimum_slots=5,
+        ttl_seconds=60,
+    )
+    assert lease
+    assert lease.slots == 10
+
+    assert not await create_lease(
+        session=session,
+        concurrency_limit_ids=[concurrency_limit.id],
+        slots=1,
+        minimum_slots=1,
+        ttl_seconds=60,
+    )
+
+    assert await expire_leases(session=session) == (0, set())
+    assert await expire_leases(
+        session=session, now=pendulum.now("UTC").add(seconds=61)
+    ) == (1, {concurrency_limit.id})
+
+    refreshed = await read_concurrency_limit(
+        session=session, concurrency_limit_id=concurrency_limit.id
+    )
+    assert refreshed
+    assert refreshed.active_slots == 0
@@ -7,7 +7,7 @@ from sqlalchemy import select
 
 from syntask.server import models
 from syntask.server.schemas.actions import LogCreate
-from syntask.server.schemas.core import Log
+from syntask.server.schemas.core import Log, LogCursor
 from syntask.server.schemas.filters import LogFilter, LogFilterTaskRunId
 from syntask.server.schemas.sorting import LogSort
 
@@ -76,6 +76,23 @@ class TestCreateLogs:
                 == log_data[i]
             )
 
+    async def test_bulk_create_logs_succeeds(self, session, flow_run_id, log_data, db):
+        await models.logs.bulk_create_logs(session=session, logs=log_data)
+
+        query = select(db.Log).order_by(db.Log.timestamp.asc())
+        result = await session.execute(query)
+        read_logs = result.scalars().unique().all()
+
+        assert len(read_logs) == len(log_data)
+        assert len({log.id for log in read_logs}) == len(log_data)
+        for i, log in enumerate(read_logs):
+            assert (
+                Log.model_validate(log, from_attributes=True).model_dump(
+                    exclude={"created", "id", "updated"},
+                )
+                == log_data[i]
+            )
+
 
 class TestReadLogs:
     async def test_read_logs_timestamp_after_inclusive(self, session, logs, log_data):
@@ -138,3 +155,74 @@ class TestReadLogs:
 
         assert len(logs) == 1
         assert all([log.task_run_id is not None for log in logs])
+
+    async def test_read_logs_message(self, session, logs):
+        log_filter = LogFilter(message={"like_": "CAPTAIN!"})
+        logs = await models.logs.read_logs(
+            session=session, log_filter=log_filter, sort=LogSort.TIMESTAMP_ASC
+        )
+
+        assert [log.message for log in logs] == [
+            "Aye-aye, captain!",
+            "Black flag ahead, captain!",
+        ]
+
+    @pytest.mark.parametrize("sort", [LogSort.TIMESTAMP_ASC, LogSort.TIMESTAMP_DESC])
+    async def test_read_logs_after_cursor(self, session, flow_run_id, sort):
+        # logs that share a timestamp are paged through by their ID
+        await models.logs.create_logs(
+            session=session,
+            logs=[
+                LogCreate(
+                    name="syntask.flow_run",
+                    level=20,
+                    message=f"Log {i}",
+                    timestamp=NOW + timedelta(seconds=i // 3),
+                    flow_run_id=flow_run_id,
+                )
+                for i in range(10)
+            ],
+        )
+        log_filter = LogFilter(flow_run_id={"any_": [flow_run_id]})
+        everything = await models.logs.read_logs(
+            session=session, log_filter=log_filter, sort=sort
+        )
+
+        paged = []
+        after = None
+        while True:
+            page = await models.logs.read_logs(
+                session=session, log_filter=log_filter, limit=4, sort=sort, after=after
+            )
+            if not page:
+                break
+            paged += page
+            after = LogCursor(timestamp=page[-1].timestamp, id=page[-1].id)
+
+        assert [log.id for log in paged] == [log.id for log in everything]
+        assert len(paged) == 10
+
+
+class TestTrimLogs:
+    async def test_trim_logs(self, session, logs, flow_run_id):
+        trimmed = await models.logs.trim_logs(
+            session=session, older_than=NOW + timedelta(minutes=30)
+        )
+        assert trimmed == 2
+
+        remaining = await models.logs.read_logs(
+            session=session, log_filter=LogFilter(flow_run_id={"any_": [flow_run_id]})
+        )
+        assert [log.message for log in remaining] == ["Black flag ahead, captain!"]
+
+    async def test_trim_logs_in_batches(self, session, logs):
+        older_than = NOW + timedelta(days=1)
+        assert await models.logs.trim_logs(session, older_than=older_than, limit=2) == 2
+        assert await models.logs.trim_logs(session, older_than=older_than, limit=2) == 1
+        assert await models.logs.trim_logs(session, older_than=older_than, limit=2) == 0
+
+    async def test_ensure_log_partitions(self, session, db):
+        created = await models.logs.ensure_log_partitions(session, search_index=True)
+        if db.dialect.name == "sqlite":
+            # partitions are only maintained on Postgres
+            assert created == []
@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 
 import pytest
@@ -5,6 +6,7 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from syntask.client import schemas as client_schemas
+from syntask.server.api.concurrency_limits_v2 import slot_waiters
 from syntask.server.database.interface import SyntaskDBInterface
 from syntask.server.models.concurrency_limits_v2 import (
     bulk_update_denied_slots,
@@ -12,6 +14,8 @@ from syntask.server.models.concurrency_limits_v2 import (
     read_concurrency_limit,
 )
 from syntask.server.schemas.core import ConcurrencyLimitV2
+from syntask.server.services.lease_expirations import ExpireConcurrencyLimitLeases
+from syntask.settings import SYNTASK_API_REQUEST_TIMEOUT, temporary_settings
 
 
 @pytest.fixture
@@ -578,3 +582,333 @@ async def test_decrement_concurrency_limit(
     )
     assert refreshed_limit
     assert refreshed_limit.active_slots == refreshed_limit.limit - 1
+
+
+async def test_lease_concurrency_limit_slots(
+    concurrency_limit: ConcurrencyLimitV2,
+    client: AsyncClient,
+    session: AsyncSession,
+):
+    response = await client.post(
+        "/v2/concurrency_limits/leases",
+        json={"names": [concurrency_limit.name], "slots": 4, "ttl_seconds": 30},
+    )
+    assert response.status_code == 200
+    lease = response.json()
+    assert lease["slots"] == 4
+    assert [limit["id"] for limit in lease["limits"]] == [str(concurrency_limit.id)]
+
+    refreshed_limit = await read_concurrency_limit(
+        session=session, concurrency_limit_id=concurrency_limit.id
+    )
+    assert refreshed_limit
+    assert refreshed_limit.active_slots == 4
+
+
+async def test_lease_concurrency_limit_slots_leases_what_is_free(
+    concurrency_limit: ConcurrencyLimitV2,
+    client: AsyncClient,
+):
+    response = await client.post(
+        "/v2/concurrency_limits/increment",
+        json={"names": [concurrency_limit.name], "slots": 7},
+    )
+    assert response.status_code == 200
+
+    response = await client.post(
+        "/v2/concurrency_limits/leases",
+        json={"names": [concurrency_limit.name], "slots": 10, "minimum_slots": 2},
+    )
+    assert response.status_code == 200
+    assert response.json()["slots"] == 3
+
+    response = await client.post(
+        "/v2/concurrency_limits/leases",
+        json={"names": [concurrency_limit.name], "slots": 10, "minimum_slots": 1},
+    )
+    assert response.status_code == 423
+    assert float(response.headers["Retry-After"]) > 0
+
+
+async def test_lease_concurrency_limit_implicitly_created_limit(
+    client: AsyncClient,
+    session: AsyncSession,
+    ignore_syntask_deprecation_warnings,
+):
+    # DEPRECATED BEHAVIOR
+    response = await client.post(
+        "/v2/concurrency_limits/leases",
+        json={
+            "names": ["implicitly_created_limit"],
+            "slots": 1,
+            "create_if_missing": True,
+        },
+    )
+    assert response.status_code == 200
+    assert [limit["name"] for limit in response.json()["limits"]] == [
+        "implicitly_created_limit"
+    ]
+
+    refreshed_limit = await read_concurrency_limit(
+        session=session, name="implicitly_created_limit"
+    )
+    assert refreshed_limit
+    assert not bool(refreshed_limit.active)
+    assert refreshed_limit.active_slots == 0  # Inactive limits are not leased from
+
+
+async def test_lease_concurrency_limit_doesnt_create_by_default(
+    client: AsyncClient,
+    session: AsyncSession,
+):
+    response = await client.post(
+        "/v2/concurrency_limits/leases",
+        json={"names": ["ignored_limit"], "slots": 1},
+    )
+    assert response.status_code == 200
+    assert response.json()["limits"] == []
+
+    assert not await read_concurrency_limit(session=session, name="ignored_limit")
+
+
+async def test_lease_concurrency_limit_with_decay_422(
+    concurrency_limit_with_decay: ConcurrencyLimitV2,
+    client: AsyncClient,
+):
+    response = await client.post(
+        "/v2/concurrency_limits/leases",
+        json={"names": [concurrency_limit_with_decay.name], "slots": 1},
+    )
+    assert response.status_code == 422
+
+
+async def test_renew_and_release_concurrency_limit_leases(
+    concurrency_limit: ConcurrencyLimitV2,
+    client: AsyncClient,
+    session: AsyncSession,
+):
+    response = await client.post(
+        "/v2/concurrency_limits/leases",
+        json={"names": [concurrency_limit.name], "slots": 5},
+    )
+    lease_id = response.json()["id"]
+
+    response = await client.post(
+        "/v2/concurrency_limits/leases/renew",
+        json={"lease_ids": [lease_id, str(uuid.uuid4())], "ttl_seconds": 30},
+    )
+    assert response.status_code == 200
+    assert response.json() == [lease_id]
+
+    response = await client.post(
+        "/v2/concurrency_limits/leases/release", json={"lease_ids": [lease_id]}
+    )
+    assert response.status_code == 204
+
+    # releasing a lease twice only releases its slots once
+    response = await client.post(
+        "/v2/concurrency_limits/leases/release", json={"lease_ids": [lease_id]}
+    )
+    assert response.status_code == 204
+
+    refreshed_limit = await read_concurrency_limit(
+        session=session, concurrency_limit_id=concurrency_limit.id
+    )
+    assert refreshed_limit
+    assert refreshed_limit.active_slots == 0
+
+
+async def test_expired_leases_release_their_slots(
+    concurrency_limit: ConcurrencyLimitV2,
+    client: AsyncClient,
+):
+    response = await client.post(
+        "/v2/concurrency_limits/leases",
+        json={"names": [concurrency_limit.name], "slots": 10, "ttl_seconds": 0.1},
+    )
+    assert response.status_code == 200
+    lease_id = response.json()["id"]
+
+    await asyncio.sleep(0.2)
+
+    # new leases end expired ones first
+    response = await client.post(
+        "/v2/concurrency_limits/leases",
+        json={"names": [concurrency_limit.name], "slots": 1},
+    )
+    assert response.status_code == 200
+
+    response = await client.post(
+        "/v2/concurrency_limits/leases/renew", json={"lease_ids": [lease_id]}
+    )
+    assert response.json() == []
+
+
+async def test_increment_concurrency_limit_waits_for_released_slots(
+    locked_concurrency_limit: ConcurrencyLimitV2,
+    client: AsyncClient,
+    ignore_syntask_deprecation_warnings,
+):
+    waiting = asyncio.create_task(
+        client.post(
+            "/v2/concurrency_limits/increment",
+            json={
+                "names": [locked_concurrency_limit.name],
+                "slots": 1,
+                "wait_seconds": 30,
+            },
+        )
+    )
+    await asyncio.sleep(0.5)
+    assert not waiting.done()
+
+    response = await client.post(
+        "/v2/concurrency_limits/decrement",
+        json={"names": [locked_concurrency_limit.name], "slots": 1},
+    )
+    assert response.status_code == 200
+
+    response = await asyncio.wait_for(waiting, timeout=5)
+    assert response.status_code == 200
+
+
+async def test_increment_concurrency_limit_waits_for_released_leases(
+    concurrency_limit: ConcurrencyLimitV2,
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+    ignore_syntask_deprecation_warnings,
+):
+    # waiters only hear about the released slots by being notified
+    monkeypatch.setattr(slot_waiters, "poll_interval", 60.0)
+
+    response = await client.post(
+        "/v2/concurrency_limits/leases",
+        json={"names": [concurrency_limit.name], "slots": 10},
+    )
+    lease_id = response.json()["id"]
+
+    waiting = asyncio.create_task(
+        client.post(
+            "/v2/concurrency_limits/increment",
+            json={
+                "names": [concurrency_limit.name],
+                "slots": 1,
+                "wait_seconds": 30,
+            },
+        )
+    )
+    await asyncio.sleep(0.5)
+    assert not waiting.done()
+
+    response = await client.post(
+        "/v2/concurrency_limits/leases/release", json={"lease_ids": [lease_id]}
+    )
+    assert response.status_code == 204
+
+    response = await asyncio.wait_for(waiting, timeout=5)
+    assert response.status_code == 200
+
+
+async def test_increment_concurrency_limit_waits_for_expired_leases(
+    concurrency_limit: ConcurrencyLimitV2,
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+    ignore_syntask_deprecation_warnings,
+):
+    # waiters only hear about the expired slots by being notified
+    monkeypatch.setattr(slot_waiters, "poll_interval", 60.0)
+
+    response = await client.post(
+        "/v2/concurrency_limits/leases",
+        json={"names": [concurrency_limit.name], "slots": 10, "ttl_seconds": 0.1},
+    )
+    assert response.status_code == 200
+
+    waiting = asyncio.create_task(
+        client.post(
+            "/v2/concurrency_limits/increment",
+            json={
+                "names": [concurrency_limit.name],
+                "slots": 1,
+                "wait_seconds": 30,
+            },
+        )
+    )
+    await asyncio.sleep(0.5)
+    assert not waiting.done()
+
+    await ExpireConcurrencyLimitLeases().start(loops=1)
+
+    response = await asyncio.wait_for(waiting, timeout=5)
+    assert response.status_code == 200
+
+
+async def test_increment_concurrency_limit_grants_waiters_in_order(
+    locked_concurrency_limit: ConcurrencyLimitV2,
+    client: AsyncClient,
+    ignore_syntask_deprecation_warnings,
+):
+    async def wait_for_slot():
+        return await client.post(
+            "/v2/concurrency_limits/increment",
+            json={
+                "names": [locked_concurrency_limit.name],
+                "slots": 1,
+                "wait_seconds": 30,
+            },
+        )
+
+    first = asyncio.create_task(wait_for_slot())
+    await asyncio.sleep(0.5)
+    second = asyncio.create_task(wait_for_slot())
+    await asyncio.sleep(0.5)
+
+    await client.post(
+        "/v2/concurrency_limits/decrement",
+        json={"names": [locked_concurrency_limit.name], "slots": 1},
+    )
+    response = await asyncio.wait_for(first, timeout=5)
+    assert response.status_code == 200
+    assert not second.done()
+
+    await client.post(
+        "/v2/concurrency_limits/decrement",
+        json={"names": [locked_concurrency_limit.name], "slots": 1},
+    )
+    response = await asyncio.wait_for(second, timeout=5)
+    assert response.status_code == 200
+
+
+async def test_increment_concurrency_limit_gives_up_waiting(
+    locked_concurrency_limit: ConcurrencyLimitV2,
+    client: AsyncClient,
+):
+    response = await client.post(
+        "/v2/concurrency_limits/increment",
+        json={
+            "names": [locked_concurrency_limit.name],
+            "slots": 1,
+            "wait_seconds": 0.5,
+        },
+    )
+    assert response.status_code == 423
+    assert "Retry-After" in response.headers
+
+
+async def test_increment_concurrency_limit_waits_less_than_the_request_timeout(
+    locked_concurrency_limit: ConcurrencyLimitV2,
+    client: AsyncClient,
+):
+    with temporary_settings({SYNTASK_API_REQUEST_TIMEOUT: 1}):
+        response = await asyncio.wait_for(
+            client.post(
+                "/v2/concurrency_limits/increment",
+                json={
+                    "names": [locked_concurrency_limit.name],
+                    "slots": 1,
+                    "wait_seconds": 30,
+                },
+            ),
+            timeout=5,
+        )
+    assert response.status_code == 423
@@ -11,6 +11,7 @@ import pytest
 from fastapi import FastAPI
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.testclient import TestClient, WebSocketTestSession
+from starlette.websockets import WebSocketDisconnect
 
 from syntask.client.schemas import TaskRun
 from syntask.server import models
@@ -183,6 +184,54 @@ def test_server_only_delivers_tasks_for_subscribed_keys(
     }
 
 
+def test_server_delivers_batches_when_asked(
+    app: FastAPI,
+    mixed_bag_of_tasks: List[TaskRun],
+    client_id: str,
+):
+    with authenticated_socket(app) as socket:
+        socket.send_json(
+            {
+                "type": "subscribe",
+                "keys": ["mytasks.taskA", "other_tasks.taskB"],
+                "client_id": client_id,
+                "batch_size": 5,
+            }
+        )
+
+        batch = socket.receive_json()
+        socket.send_json({"type": "quit"})
+
+    assert isinstance(batch, list)
+    received = [TaskRun.model_validate(message) for message in batch]
+
+    # the batch is shared fairly between the task keys
+    assert [r.task_key for r in received] == [
+        "mytasks.taskA",
+        "other_tasks.taskB",
+        "mytasks.taskA",
+    ]
+
+
+@pytest.mark.parametrize("batch_size", [0, -1, "two", True])
+def test_server_rejects_invalid_batch_sizes(app: FastAPI, client_id: str, batch_size):
+    with authenticated_socket(app) as socket:
+        socket.send_json(
+            {
+                "type": "subscribe",
+                "keys": ["mytasks.taskA"],
+                "client_id": client_id,
+                "batch_size": batch_size,
+            }
+        )
+
+        with pytest.raises(WebSocketDisconnect) as exc:
+            socket.receive_json()
+
+    assert exc.value.code == 4001
+    assert "batch_size" in exc.value.reason
+
+
 @pytest.fixture
 async def ten_task_A_runs(reset_task_queues) -> List[ServerTaskRun]:
     queued: List[ServerTaskRun] = []
@@ -338,7 +387,7 @@ class TestQueueLimit:
             await asyncio.wait_for(queue.put(extra_task_run), timeout=0.01)
 
         assert (
-            queue._scheduled_queue.qsize() == max_scheduled_size
+            await queue.size() == max_scheduled_size
         ), "Queue size should be at its configured limit"
 
     async def test_task_queue_retry_size_limit(self):
@@ -368,7 +417,7 @@ class TestQueueLimit:
             await asyncio.wait_for(queue.retry(extra_task_run), timeout=0.01)
 
         assert (
-            queue._retry_queue.qsize() == max_retry_size
+            await queue.size() == max_retry_size
         ), "Retry queue size should be at its configured limit"
 
 
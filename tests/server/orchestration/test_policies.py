@@ -79,3 +79,51 @@ class TestPoliciesRespectOrdering:
 
         transition = (states.StateType.PENDING, states.StateType.RUNNING)
         assert Bureaucracy.compile_transition_rules(*transition) == [ValidRule]
+
+
+class TestPoliciesCacheTransitionRules:
+    def test_rules_are_computed_once_per_transition(self):
+        calls = []
+
+        class RunningRule(BaseOrchestrationRule):
+            FROM_STATES = ALL_ORCHESTRATION_STATES
+            TO_STATES = [states.StateType.RUNNING]
+
+        class CountingPolicy(BaseOrchestrationPolicy):
+            @staticmethod
+            def priority():
+                calls.append(True)
+                return [RunningRule]
+
+        to_running = (states.StateType.PENDING, states.StateType.RUNNING)
+        to_completed = (states.StateType.RUNNING, states.StateType.COMPLETED)
+
+        assert CountingPolicy.compile_transition_rules(*to_running) == [RunningRule]
+        assert CountingPolicy.compile_transition_rules(*to_running) == [RunningRule]
+        assert len(calls) == 1
+
+        assert CountingPolicy.compile_transition_rules(*to_completed) == []
+        assert len(calls) == 2
+
+    def test_cached_rules_are_not_shared_between_policies(self):
+        class RunningRule(BaseOrchestrationRule):
+            FROM_STATES = ALL_ORCHESTRATION_STATES
+            TO_STATES = [states.StateType.RUNNING]
+
+        class ParentPolicy(BaseOrchestrationPolicy):
+            @staticmethod
+            def priority():
+                return [RunningRule]
+
+        class ChildPolicy(ParentPolicy):
+            @staticmethod
+            def priority():
+                return []
+
+        transition = (states.StateType.PENDING, states.StateType.RUNNING)
+        assert ParentPolicy.compile_transition_rules(*transition) == [RunningRule]
+        assert ChildPolicy.compile_transition_rules(*transition) == []
+
+        rules = ParentPolicy.compile_transition_rules(*transition)
+        rules.clear()
+        assert ParentPolicy.compile_transition_rules(*transition) == [RunningRule]
@@ -6,6 +6,7 @@ from unittest import mock
 import dateutil
 import pendulum
 import pytest
+from croniter import CroniterBadDateError, croniter
 from dateutil import rrule
 from packaging import version
 from pendulum import datetime, now
@@ -17,6 +18,7 @@ from syntask.server.schemas.schedules import (
     CronSchedule,
     IntervalSchedule,
     RRuleSchedule,
+    _compile_cron,
 )
 
 dt = pendulum.datetime(2020, 1, 1)
@@ -327,6 +329,46 @@ class TestCronSchedule:
         dates = await clock.get_dates(start=datetime(2018, 1, 1, 6))
         assert dates == [datetime(2018, 1, 2)]
 
+    @pytest.mark.parametrize(
+        "cron",
+        [
+            "* * * * *",
+            "*/7 3-5 * * *",
+            "0 9 * * mon-fri",
+            "0 0 1,15 * 0",
+            "30 12 29 2 *",
+            "0 0 31 */2 *",
+            "@weekly",
+        ],
+    )
+    @pytest.mark.parametrize("day_or", [True, False])
+    async def test_compiled_cron_matches_croniter(self, cron, day_or):
+        assert _compile_cron(cron, day_or) is not None
+
+        start = pydatetime(2024, 2, 27, 4, 59, 59)
+        expected = croniter(cron, start, day_or=day_or)
+        times = _compile_cron(cron, day_or).iter_after(start)
+        assert [next(times) for _ in range(200)] == [
+            expected.get_next(pydatetime) for _ in range(200)
+        ]
+
+    @pytest.mark.parametrize("cron", ["0 0 L * *", "0 0 * * 5#2", "* * * * * 30"])
+    async def test_cron_features_only_croniter_handles(self, cron):
+        assert _compile_cron(cron, True) is None
+
+        clock = CronSchedule(cron=cron)
+        start = datetime(2024, 1, 1)
+        dates = await clock.get_dates(n=5, start=start)
+        expected = croniter(cron, start.subtract(seconds=1).naive())
+        assert dates == [
+            pendulum.instance(expected.get_next(pydatetime)) for _ in range(5)
+        ]
+
+    async def test_cron_that_never_fires(self):
+        clock = CronSchedule(cron="0 0 30 2 *")
+        with pytest.raises(CroniterBadDateError):
+            await clock.get_dates(n=5, start=datetime(2024, 1, 1))
+
 
 class TestIntervalScheduleDaylightSavingsTime:
     async def test_interval_schedule_always_has_the_right_offset(self):
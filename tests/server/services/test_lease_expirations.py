@@ -0,0 +1,80 @@
+import pytest
+
+from syntask.server import models
+from syntask.server.schemas.core import ConcurrencyLimitV2
+from syntask.server.services.lease_expirations import ExpireConcurrencyLimitLeases
+
+
+@pytest.fixture
+async def concurrency_limit(session) -> ConcurrencyLimitV2:
+    async with session.begin():
+        limit = await models.concurrency_limits_v2.create_concurrency_limit(
+            session=session,
+            concurrency_limit=ConcurrencyLimitV2(name="leased", limit=10),
+        )
+    return ConcurrencyLimitV2.model_validate(limit)
+
+
+async def create_lease(session, concurrency_limit, ttl_seconds):
+    async with session.begin():
+        lease = await models.concurrency_limits_v2.create_lease(
+            session=session,
+            concurrency_limit_ids=[concurrency_limit.id],
+            slots=2,
+            minimum_slots=2,
+            ttl_seconds=ttl_seconds,
+        )
+    assert lease
+    return lease
+
+
+async def read_active_slots(session, concurrency_limit):
+    session.expire_all()
+    refreshed = await models.concurrency_limits_v2.read_concurrency_limit(
+        session=session, concurrency_limit_id=concurrency_limit.id
+    )
+    assert refreshed
+    return refreshed.active_slots
+
+
+async def test_releases_the_slots_of_expired_leases(session, concurrency_limit):
+    for _ in range(3):
+        await create_lease(session, concurrency_limit, ttl_seconds=-1)
+    await create_lease(session, concurrency_limit, ttl_seconds=60)
+    assert await read_active_slots(session, concurrency_limit) == 8
+
+    service = ExpireConcurrencyLimitLeases()
+    service.batch_size = 2
+    await service.start(loops=1)
+
+    assert await read_active_slots(session, concurrency_limit) == 2
+
+
+async def test_keeps_going_past_expired_leases_without_limits(
+    session, concurrency_limit
+):
+    async with session.begin():
+        for _ in range(2):
+            await models.concurrency_limits_v2.create_lease(
+                session=session,
+                concurrency_limit_ids=[],
+                slots=2,
+                minimum_slots=2,
+                ttl_seconds=-2,
+            )
+    await create_lease(session, concurrency_limit, ttl_seconds=-1)
+    assert await read_active_slots(session, concurrency_limit) == 2
+
+    service = ExpireConcurrencyLimitLeases()
+    service.batch_size = 2
+    await service.start(loops=1)
+
+    assert await read_active_slots(session, concurrency_limit) == 0
+
+
+async def test_ignores_leases_that_have_not_expired(session, concurrency_limit):
+    await create_lease(session, concurrency_limit, ttl_seconds=60)
+
+    await ExpireConcurrencyLimitLeases().start(loops=1)
+
+    assert await read_active_slots(session, concurrency_limit) == 2
@@ -0,0 +1,62 @@
+from datetime import timedelta
+from uuid import uuid4
+
+import pendulum
+import pytest
+import sqlalchemy as sa
+
+from syntask.server import models
+from syntask.server.schemas.actions import LogCreate
+from syntask.server.services.log_retention import LogRetention
+from syntask.settings import SYNTASK_API_LOGS_RETENTION_PERIOD, temporary_settings
+
+
+@pytest.fixture
+async def old_and_new_logs(session):
+    now = pendulum.now("UTC")
+    async with session.begin():
+        await models.logs.create_logs(
+            session=session,
+            logs=[
+                LogCreate(
+                    name="syntask.flow_run",
+                    level=20,
+                    message=f"{age} days old",
+                    timestamp=now - timedelta(days=age),
+                    flow_run_id=uuid4(),
+                )
+                for age in (0, 1, 10, 11, 12)
+            ],
+        )
+
+
+async def read_messages(session, db):
+    result = await session.execute(
+        sa.select(db.Log.message).order_by(db.Log.timestamp.desc())
+    )
+    return result.scalars().all()
+
+
+async def test_logs_are_kept_without_a_retention_period(session, db, old_and_new_logs):
+    await LogRetention().start(loops=1)
+
+    assert len(await read_messages(session, db)) == 5
+
+
+async def test_logs_older_than_the_retention_period_are_removed(
+    session, db, old_and_new_logs
+):
+    with temporary_settings({SYNTASK_API_LOGS_RETENTION_PERIOD: timedelta(days=7)}):
+        await LogRetention().start(loops=1)
+
+    assert await read_messages(session, db) == ["0 days old", "1 days old"]
+
+
+async def test_logs_are_removed_in_batches(session, db, old_and_new_logs):
+    service = LogRetention()
+    service.batch_size = 2
+
+    with temporary_settings({SYNTASK_API_LOGS_RETENTION_PERIOD: timedelta(days=7)}):
+        await service.start(loops=1)
+
+    assert await read_messages(session, db) == ["0 days old", "1 days old"]
@@ -463,6 +463,123 @@ class TestRecentDeploymentsScheduler:
         assert deployment_ids[0] == deployment_with_active_schedules.id
 
 
+class TestIncrementalScheduling:
+    @pytest.fixture
+    async def scheduler(self, deployment, session, db):
+        scheduler = Scheduler()
+        await scheduler.run_once()
+
+        # artificially move the updated times back, so that the deployment isn't seen
+        # as having changed since the scheduler's last loop
+        await session.execute(
+            sa.update(db.Deployment)
+            .where(db.Deployment.id == deployment.id)
+            .values(updated=pendulum.now("UTC").subtract(hours=1))
+        )
+        await session.execute(
+            sa.update(db.DeploymentSchedule)
+            .where(db.DeploymentSchedule.deployment_id == deployment.id)
+            .values(updated=pendulum.now("UTC").subtract(hours=1))
+        )
+        await session.commit()
+        return scheduler
+
+    @pytest.fixture
+    def scheduled_deployment_ids(self, scheduler, monkeypatch):
+        scheduled = []
+        generate = scheduler._generate_scheduled_flow_runs
+
+        async def spy(**kwargs):
+            scheduled.append(kwargs["deployment_id"])
+            return await generate(**kwargs)
+
+        monkeypatch.setattr(scheduler, "_generate_scheduled_flow_runs", spy)
+        return scheduled
+
+    async def test_tracks_when_deployments_need_more_runs(
+        self, scheduler, deployment, session
+    ):
+        runs = await models.flow_runs.read_flow_runs(
+            session,
+            flow_run_filter=schemas.filters.FlowRunFilter(
+                deployment_id=dict(any_=[deployment.id])
+            ),
+        )
+        assert len(runs) == scheduler.min_runs
+
+        # the deployment will have fewer than `min_runs` runs once its first one starts
+        assert scheduler._due_times[deployment.id] == min(
+            r.next_scheduled_start_time for r in runs
+        )
+
+    async def test_does_not_schedule_deployments_that_are_not_due(
+        self, scheduler, scheduled_deployment_ids
+    ):
+        await scheduler.run_once()
+        assert scheduled_deployment_ids == []
+
+    async def test_schedules_deployments_that_are_due(
+        self, scheduler, scheduled_deployment_ids, deployment
+    ):
+        scheduler._set_due_time(deployment.id, pendulum.now("UTC"))
+
+        await scheduler.run_once()
+        assert scheduled_deployment_ids == [deployment.id]
+
+    async def test_schedules_deployments_whose_schedules_changed(
+        self, scheduler, scheduled_deployment_ids, deployment, session
+    ):
+        await models.deployments.update_deployment_schedule(
+            session=session,
+            deployment_id=deployment.id,
+            deployment_schedule_id=deployment.schedules[0].id,
+            schedule=schemas.actions.DeploymentScheduleUpdate(
+                schedule=schemas.schedules.IntervalSchedule(
+                    interval=datetime.timedelta(hours=1)
+                )
+            ),
+        )
+        await session.commit()
+
+        await scheduler.run_once()
+        assert scheduled_deployment_ids == [deployment.id]
+
+    async def test_forgets_deployments_that_are_paused(
+        self, scheduler, scheduled_deployment_ids, deployment, session
+    ):
+        await models.deployments.update_deployment(
+            session=session,
+            deployment_id=deployment.id,
+            deployment=schemas.actions.DeploymentUpdate(paused=True),
+        )
+        await session.commit()
+
+        await scheduler.run_once()
+        assert deployment.id not in scheduler._due_times
+        assert scheduled_deployment_ids == []
+
+    async def test_replaces_deleted_runs_on_full_scans(
+        self, scheduler, deployment, session, db
+    ):
+        await session.execute(
+            sa.delete(db.FlowRun).where(db.FlowRun.deployment_id == deployment.id)
+        )
+        await session.commit()
+
+        count_query = (
+            sa.select(sa.func.count())
+            .select_from(db.FlowRun)
+            .where(db.FlowRun.deployment_id == deployment.id)
+        )
+
+        await scheduler.run_once()
+        assert (await session.execute(count_query)).scalar() == 0
+
+        scheduler.full_scan_interval = datetime.timedelta(0)
+        await scheduler.run_once()
+        assert (await session.execute(count_query)).scalar() == scheduler.min_runs
+
+
 class TestScheduleRulesWaterfall:
     @pytest.mark.parametrize(
         "interval,n",
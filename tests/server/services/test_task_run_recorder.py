@@ -1,7 +1,7 @@
 import asyncio
 from datetime import timedelta
 from itertools import permutations
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List
 from uuid import UUID
 
 import pendulum
@@ -18,8 +18,20 @@ from syntask.server.models.task_runs import read_task_run
 from syntask.server.schemas.core import FlowRun, TaskRunPolicy
 from syntask.server.schemas.states import StateDetails, StateType
 from syntask.server.services import task_run_recorder
-from syntask.server.utilities.messaging import MessageHandler
+from syntask.server.utilities.messaging import (
+    Message,
+    MessageHandler,
+    StopConsumer,
+    create_consumer,
+    create_publisher,
+    memory,
+)
 from syntask.server.utilities.messaging.memory import MemoryMessage
+from syntask.settings import (
+    SYNTASK_API_SERVICES_TASK_RUN_RECORDER_BATCH_SIZE,
+    SYNTASK_API_SERVICES_TASK_RUN_RECORDER_FLUSH_INTERVAL,
+    temporary_settings,
+)
 
 
 async def test_start_and_stop_service():
@@ -753,3 +765,313 @@ async def test_task_run_recorder_handles_all_out_of_order_permutations(
 
     state_types = set(state.type for state in states)
     assert state_types == {StateType.PENDING, StateType.RUNNING, StateType.COMPLETED}
+
+
+@pytest.mark.parametrize(
+    "event_order",
+    list(permutations(["PENDING", "RUNNING", "COMPLETED"])),
+    ids=lambda x: "->".join(x),
+)
+async def test_task_run_recorder_records_batches_in_any_order(
+    session: AsyncSession,
+    pending_event: ReceivedEvent,
+    running_event: ReceivedEvent,
+    completed_event: ReceivedEvent,
+    event_order: tuple,
+):
+    event_map = {
+        "PENDING": pending_event,
+        "RUNNING": running_event,
+        "COMPLETED": completed_event,
+    }
+
+    async with task_run_recorder.consumer(batch_size=3) as handler:
+        await asyncio.gather(
+            *[handler(message(event_map[event_name])) for event_name in event_order]
+        )
+
+    task_run = await read_task_run(
+        session=session,
+        task_run_id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+    )
+
+    assert task_run
+    assert task_run.state_type == StateType.COMPLETED
+    assert task_run.state_name == "Completed"
+    assert task_run.state_timestamp == completed_event.occurred
+    assert task_run.state_id == completed_event.id
+
+    # fields set by earlier events are kept when later events don't set them
+    assert task_run.run_count == 8
+    assert task_run.start_time == pendulum.datetime(2024, 1, 1, 0, 1, 0, 0, "UTC")
+    assert task_run.end_time == pendulum.datetime(2024, 1, 1, 0, 2, 0, 0, "UTC")
+
+    states = await read_task_run_states(session, task_run.id)
+    assert {state.type for state in states} == {
+        StateType.PENDING,
+        StateType.RUNNING,
+        StateType.COMPLETED,
+    }
+
+
+async def test_task_run_recorder_waits_to_fill_a_batch(
+    session: AsyncSession,
+    pending_event: ReceivedEvent,
+):
+    async with task_run_recorder.consumer(
+        batch_size=10, flush_every=timedelta(minutes=5)
+    ) as handler:
+        handling = asyncio.create_task(handler(message(pending_event)))
+        await asyncio.sleep(0.1)
+
+        task_run = await read_task_run(
+            session=session,
+            task_run_id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+        )
+        assert not task_run
+
+        # the message isn't acknowledged until its event is recorded
+        assert not handling.done()
+
+    # remaining events are flushed when the handler exits
+    await handling
+    task_run = await read_task_run(
+        session=session,
+        task_run_id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+    )
+    assert task_run
+    assert task_run.state_type == StateType.PENDING
+
+
+async def test_task_run_recorder_flushes_periodically(
+    session: AsyncSession,
+    pending_event: ReceivedEvent,
+):
+    async with task_run_recorder.consumer(
+        batch_size=10, flush_every=timedelta(seconds=0.1)
+    ) as handler:
+        await asyncio.wait_for(handler(message(pending_event)), 5)
+
+        task_run = await read_task_run(
+            session=session,
+            task_run_id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+        )
+        assert task_run
+        assert task_run.state_type == StateType.PENDING
+
+
+async def test_batches_do_not_overwrite_newer_recorded_states(
+    session: AsyncSession,
+    pending_event: ReceivedEvent,
+    running_event: ReceivedEvent,
+    completed_event: ReceivedEvent,
+    task_run_recorder_handler: MessageHandler,
+):
+    await task_run_recorder_handler(message(completed_event))
+
+    async with task_run_recorder.consumer(batch_size=2) as handler:
+        await asyncio.gather(
+            handler(message(pending_event)), handler(message(running_event))
+        )
+
+    task_run = await read_task_run(
+        session=session,
+        task_run_id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+    )
+
+    assert task_run
+    assert task_run.state_type == StateType.COMPLETED
+    assert task_run.state_timestamp == completed_event.occurred
+
+    states = await read_task_run_states(session, task_run.id)
+    assert len(states) == 3
+
+
+async def test_failed_batches_are_recorded_one_at_a_time(
+    session: AsyncSession,
+    pending_event: ReceivedEvent,
+    running_event: ReceivedEvent,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    async def fail(events):
+        raise ValueError("whoops")
+
+    monkeypatch.setattr(task_run_recorder, "record_task_run_events", fail)
+
+    async with task_run_recorder.consumer(batch_size=2) as handler:
+        await asyncio.gather(
+            handler(message(pending_event)), handler(message(running_event))
+        )
+
+    task_run = await read_task_run(
+        session=session,
+        task_run_id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+    )
+
+    assert task_run
+    assert task_run.state_type == StateType.RUNNING
+
+    states = await read_task_run_states(session, task_run.id)
+    assert len(states) == 2
+
+
+async def test_task_run_recorder_counts_recorded_events(
+    pending_event: ReceivedEvent,
+    running_event: ReceivedEvent,
+):
+    before = task_run_recorder.TASK_RUN_EVENTS_RECORDED._value.get()
+
+    async with task_run_recorder.consumer(batch_size=2) as handler:
+        await asyncio.gather(
+            handler(message(pending_event)), handler(message(running_event))
+        )
+
+    after = task_run_recorder.TASK_RUN_EVENTS_RECORDED._value.get()
+    assert after - before == 2
+
+
+async def test_events_that_fail_to_record_are_not_acknowledged(
+    session: AsyncSession,
+    pending_event: ReceivedEvent,
+    running_event: ReceivedEvent,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    async def fail_in_bulk(events):
+        raise ValueError("whoops")
+
+    record_task_run_event = task_run_recorder.record_task_run_event
+
+    async def fail_running(event: ReceivedEvent):
+        if event.id == running_event.id:
+            raise ValueError("whoops")
+        await record_task_run_event(event)
+
+    monkeypatch.setattr(task_run_recorder, "record_task_run_events", fail_in_bulk)
+    monkeypatch.setattr(task_run_recorder, "record_task_run_event", fail_running)
+
+    async with task_run_recorder.consumer(batch_size=2) as handler:
+        pending, running = await asyncio.gather(
+            handler(message(pending_event)),
+            handler(message(running_event)),
+            return_exceptions=True,
+        )
+
+    assert pending is None
+    assert isinstance(running, ValueError)
+
+    task_run = await read_task_run(
+        session=session,
+        task_run_id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+    )
+    assert task_run
+    assert task_run.state_type == StateType.PENDING
+
+
+async def test_task_run_recorder_acknowledges_batches_after_recording_them(
+    session: AsyncSession,
+    pending_event: ReceivedEvent,
+    running_event: ReceivedEvent,
+):
+    consumer = create_consumer("events", concurrency=2)
+
+    async with task_run_recorder.consumer(
+        batch_size=2, flush_every=timedelta(minutes=5)
+    ) as handler:
+        acked: List[Message] = []
+
+        async def handle(m: Message):
+            await handler(m)
+            acked.append(m)
+            if len(acked) == 2:
+                raise StopConsumer(ack=True)
+
+        consuming = asyncio.create_task(consumer.run(handle))
+        async with create_publisher("events") as publisher:
+            await publisher.publish_data(message(pending_event).data, {})
+            await publisher.publish_data(message(running_event).data, {})
+
+        await asyncio.wait_for(consuming, 5)
+
+    task_run = await read_task_run(
+        session=session,
+        task_run_id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+    )
+    assert task_run
+    assert task_run.state_type == StateType.RUNNING
+
+
+async def test_task_run_recorder_does_not_wait_for_recording_when_asked_not_to(
+    session: AsyncSession,
+    pending_event: ReceivedEvent,
+):
+    async with task_run_recorder.consumer(
+        batch_size=10, flush_every=timedelta(minutes=5), wait_for_recording=False
+    ) as handler:
+        # the handler returns as soon as the event is queued
+        await asyncio.wait_for(handler(message(pending_event)), 1)
+
+        task_run = await read_task_run(
+            session=session,
+            task_run_id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+        )
+        assert not task_run
+
+    task_run = await read_task_run(
+        session=session,
+        task_run_id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+    )
+    assert task_run
+    assert task_run.state_type == StateType.PENDING
+
+
+class SerialConsumer(memory.Consumer):
+    """A consumer from a broker that can only handle one message at a time"""
+
+    supports_concurrency = False
+
+    def __init__(self, topic: str):
+        super().__init__(topic)
+
+
+async def test_task_run_recorder_with_a_consumer_without_concurrency(
+    session: AsyncSession,
+    pending_event: ReceivedEvent,
+    running_event: ReceivedEvent,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(memory, "Consumer", SerialConsumer)
+
+    service = task_run_recorder.TaskRunRecorder()
+    with temporary_settings(
+        updates={
+            SYNTASK_API_SERVICES_TASK_RUN_RECORDER_BATCH_SIZE: 2,
+            SYNTASK_API_SERVICES_TASK_RUN_RECORDER_FLUSH_INTERVAL: 300,
+        }
+    ):
+        service_task = asyncio.create_task(service.start())
+        await service.started_event.wait()
+
+    assert isinstance(service.consumer, SerialConsumer)
+    assert service.consumer.concurrency == 1
+
+    # without waiting on each event to be recorded, a serial consumer can still
+    # fill a batch, which is recorded without waiting for the flush interval
+    async with create_publisher("events") as publisher:
+        await publisher.publish_data(message(pending_event).data, {})
+        await publisher.publish_data(message(running_event).data, {})
+
+    async def recorded() -> None:
+        while True:
+            task_run = await read_task_run(
+                session=session,
+                task_run_id=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+            )
+            if task_run and task_run.state_type == StateType.RUNNING:
+                return
+            await asyncio.sleep(0.1)
+
+    try:
+        await asyncio.wait_for(recorded(), 5)
+    finally:
+        await service.stop()
+        await service_task
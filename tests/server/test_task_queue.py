@@ -0,0 +1,253 @@
+import asyncio
+from datetime import timedelta
+from typing import Generator, List
+from uuid import uuid4
+
+import pytest
+
+from syntask.server.schemas.core import TaskRun
+from syntask.server.task_queue import (
+    MultiQueue,
+    TaskQueue,
+    TaskQueueBackend,
+    create_task_queue_backend,
+)
+from syntask.settings import (
+    SYNTASK_TASK_SCHEDULING_QUEUE_BACKEND,
+    SYNTASK_TASK_SCHEDULING_VISIBILITY_TIMEOUT,
+    temporary_settings,
+)
+
+
+@pytest.fixture(
+    params=[
+        "syntask.server.task_queue.memory",
+        "syntask.server.task_queue.database",
+    ]
+)
+def backend_module(request) -> Generator[str, None, None]:
+    TaskQueue.reset()
+    with temporary_settings(
+        updates={
+            SYNTASK_TASK_SCHEDULING_QUEUE_BACKEND: request.param,
+            SYNTASK_TASK_SCHEDULING_VISIBILITY_TIMEOUT: timedelta(seconds=60),
+        }
+    ):
+        yield request.param
+    TaskQueue.reset()
+
+
+@pytest.fixture
+def backend(backend_module: str) -> TaskQueueBackend:
+    return TaskQueue.backend()
+
+
+@pytest.fixture
+def task_key() -> str:
+    return f"mytasks.task-{uuid4()}"
+
+
+def make_runs(task_key: str, count: int) -> List[TaskRun]:
+    return [
+        TaskRun(
+            id=uuid4(),
+            flow_run_id=None,
+            task_key=task_key,
+            dynamic_key=f"{task_key}-{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def test_unknown_backend_raises():
+    with temporary_settings(updates={SYNTASK_TASK_SCHEDULING_QUEUE_BACKEND: "whodis"}):
+        with pytest.raises(ImportError, match="whodis"):
+            create_task_queue_backend()
+
+
+def test_backend_is_created_from_settings(backend_module: str, backend):
+    assert type(backend).__module__ == backend_module
+
+
+async def test_get_from_empty_queue(backend: TaskQueueBackend, task_key: str):
+    assert await backend.get([task_key]) == []
+
+    with pytest.raises(asyncio.QueueEmpty):
+        await TaskQueue.for_key(task_key).get_nowait()
+
+
+async def test_delivers_in_order(backend: TaskQueueBackend, task_key: str):
+    runs = make_runs(task_key, 3)
+    for run in runs:
+        await TaskQueue.enqueue(run)
+
+    received = [await TaskQueue.for_key(task_key).get() for _ in runs]
+
+    assert [r.id for r in received] == [r.id for r in runs]
+
+
+async def test_batch_enqueue_and_dequeue(backend: TaskQueueBackend, task_key: str):
+    runs = make_runs(task_key, 5)
+    await TaskQueue.enqueue_many(runs)
+
+    assert await backend.size(task_key) == 5
+
+    first = await backend.get([task_key], limit=3)
+    second = await backend.get([task_key], limit=3)
+
+    assert [r.id for r in first + second] == [r.id for r in runs]
+    assert await backend.get([task_key], limit=3) == []
+
+
+async def test_retries_are_delivered_first(backend: TaskQueueBackend, task_key: str):
+    scheduled, retried = make_runs(task_key, 2)
+    await TaskQueue.for_key(task_key).put(scheduled)
+    await TaskQueue.for_key(task_key).retry(retried)
+
+    (first,) = await backend.get([task_key])
+    assert first.id == retried.id
+
+
+async def test_delivered_runs_are_invisible_until_timeout(
+    backend: TaskQueueBackend, task_key: str
+):
+    (run,) = make_runs(task_key, 1)
+    await TaskQueue.enqueue(run)
+
+    (delivered,) = await backend.get(
+        [task_key], visibility_timeout=timedelta(seconds=60)
+    )
+    assert delivered.id == run.id
+
+    assert await backend.get([task_key]) == []
+
+
+async def test_unacknowledged_runs_are_redelivered(
+    backend: TaskQueueBackend, task_key: str
+):
+    (run,) = make_runs(task_key, 1)
+    await TaskQueue.enqueue(run)
+
+    (delivered,) = await backend.get(
+        [task_key], visibility_timeout=timedelta(milliseconds=10)
+    )
+    assert delivered.id == run.id
+
+    await asyncio.sleep(0.05)
+
+    (redelivered,) = await backend.get([task_key])
+    assert redelivered.id == run.id
+
+
+async def test_acknowledged_runs_are_not_redelivered(
+    backend: TaskQueueBackend, task_key: str
+):
+    (run,) = make_runs(task_key, 1)
+    await TaskQueue.enqueue(run)
+
+    queue = MultiQueue([task_key])
+    delivered = await queue.get()
+    await queue.ack(delivered)
+
+    await asyncio.sleep(0.05)
+
+    assert await backend.get([task_key]) == []
+
+
+async def test_multiqueue_gets_from_any_key(backend: TaskQueueBackend):
+    key_a = f"mytasks.a-{uuid4()}"
+    key_b = f"mytasks.b-{uuid4()}"
+    (run_b,) = make_runs(key_b, 1)
+    await TaskQueue.enqueue(run_b)
+
+    received = await asyncio.wait_for(MultiQueue([key_a, key_b]).get(), timeout=5)
+    assert received.id == run_b.id
+
+
+async def test_database_backend_survives_reset(task_key: str):
+    with temporary_settings(
+        updates={
+            SYNTASK_TASK_SCHEDULING_QUEUE_BACKEND: "syntask.server.task_queue.database"
+        }
+    ):
+        TaskQueue.reset()
+        try:
+            (run,) = make_runs(task_key, 1)
+            await TaskQueue.enqueue(run)
+
+            # simulate a server restart, which discards all in-process state
+            TaskQueue.reset()
+
+            received = await TaskQueue.for_key(task_key).get()
+            assert received.id == run.id
+        finally:
+            TaskQueue.reset()
+
+
+async def test_multiqueue_serves_keys_round_robin(backend: TaskQueueBackend):
+    key_a = f"mytasks.a-{uuid4()}"
+    key_b = f"mytasks.b-{uuid4()}"
+    await TaskQueue.enqueue_many(make_runs(key_a, 3))
+    await TaskQueue.enqueue_many(make_runs(key_b, 3))
+
+    queue = MultiQueue([key_a, key_b])
+    received = [await queue.get() for _ in range(4)]
+
+    assert [r.task_key for r in received] == [key_a, key_b, key_a, key_b]
+
+
+async def test_batches_are_shared_between_keys(backend: TaskQueueBackend):
+    key_a = f"mytasks.a-{uuid4()}"
+    key_b = f"mytasks.b-{uuid4()}"
+    runs_a = make_runs(key_a, 3)
+    runs_b = make_runs(key_b, 3)
+    await TaskQueue.enqueue_many(runs_a)
+    await TaskQueue.enqueue_many(runs_b)
+    await TaskQueue.retry_many(runs_b[2:])
+
+    received = await backend.get([key_b, key_a], limit=5)
+
+    assert [r.id for r in received] == [
+        runs_b[2].id,
+        runs_a[0].id,
+        runs_b[0].id,
+        runs_a[1].id,
+        runs_b[1].id,
+    ]
+
+
+async def test_multiqueue_get_many(backend: TaskQueueBackend, task_key: str):
+    runs = make_runs(task_key, 3)
+    await TaskQueue.enqueue_many(runs)
+
+    queue = MultiQueue([task_key])
+    received = await queue.get_many(10)
+    assert [r.id for r in received] == [r.id for r in runs]
+
+    await queue.ack_many(received)
+    assert await backend.get([task_key]) == []
+
+
+async def test_multiqueue_wakes_on_put(backend: TaskQueueBackend, task_key: str):
+    # make polling too slow to be the reason the waiting getter wakes up
+    backend.poll_interval = 30
+
+    queue = MultiQueue([task_key])
+    getter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0.1)
+    assert not getter.done()
+
+    (run,) = make_runs(task_key, 1)
+    await TaskQueue.enqueue(run)
+
+    received = await asyncio.wait_for(getter, timeout=5)
+    assert received.id == run.id
+
+
+async def test_wait_returns_immediately_when_runs_were_added(
+    backend: TaskQueueBackend, task_key: str
+):
+    generation = backend.generation
+    await TaskQueue.enqueue(make_runs(task_key, 1)[0])
+
+    await asyncio.wait_for(backend.wait([task_key], generation, timeout=30), 5)
@@ -207,6 +207,58 @@ async def test_erroring_handler_does_not_ack(
     assert not remaining_message
 
 
+async def test_concurrent_consumer_handles_messages_at_once(
+    broker: str, publisher: Publisher, clear_topics: None
+) -> None:
+    consumer = create_consumer("my-topic", concurrency=2)
+    both_received = asyncio.Event()
+    captured_messages: List[Message] = []
+
+    async def handler(message: Message):
+        captured_messages.append(message)
+        if len(captured_messages) == 2:
+            both_received.set()
+        # neither message is acknowledged until both have arrived
+        await both_received.wait()
+        if message.data == b"two":
+            raise ValueError("oops")
+        raise StopConsumer(ack=True)
+
+    consumer_task = asyncio.create_task(consumer.run(handler))
+
+    async with publisher as p:
+        await p.publish_data(b"one", {})
+        await p.publish_data(b"two", {})
+
+    await asyncio.wait_for(consumer_task, 5)
+
+    assert [m.data for m in captured_messages] == [b"one", b"two"]
+
+    # the message whose handler failed is redelivered
+    remaining_message = await drain_one(consumer)
+    assert remaining_message
+    assert remaining_message.data == b"two"
+
+
+def test_concurrency_is_not_passed_to_consumers_that_do_not_support_it(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    from syntask.server.utilities.messaging import memory
+
+    class SerialConsumer(memory.Consumer):
+        supports_concurrency = False
+
+        def __init__(self, topic: str):
+            super().__init__(topic)
+
+    monkeypatch.setattr(memory, "Consumer", SerialConsumer)
+
+    consumer = create_consumer("my-topic", concurrency=10)
+
+    assert isinstance(consumer, SerialConsumer)
+    assert consumer.concurrency == 1
+
+
 @pytest.fixture
 def deduplicating_publisher(broker: str, cache: Cache) -> Publisher:
     return create_publisher("my-topic", cache, deduplicate_by="my-message-id")
@@ -223,7 +223,7 @@ async def test_tasks_are_not_enqueued_server_side_when_executed_directly(
     foo_task(x=42)
 
     with pytest.raises(asyncio.QueueEmpty):
-        TaskQueue.for_key(foo_task.task_key).get_nowait()
+        await TaskQueue.for_key(foo_task.task_key).get_nowait()
 
 
 @pytest.fixture
@@ -3,7 +3,10 @@ from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import Tuple
 
+import fsspec
 import pytest
+from fsspec.implementations.memory import MemoryFile, MemoryFileSystem
+from fsspec.spec import AbstractBufferedFile
 
 import syntask
 from syntask.filesystems import (
@@ -16,6 +19,57 @@ from syntask.utilities.filesystem import tmpchdir
 TEST_PROJECTS_DIR = syntask.__development_base_path__ / "tests" / "test-projects"
 
 
+class BufferedMemoryFile(AbstractBufferedFile):
+    """A file that, like those of S3 or GCS, is uploaded in parts and only published
+    when it's committed"""
+
+    def _initiate_upload(self):
+        self.parts = []
+
+    def _upload_chunk(self, final=False):
+        self.parts.append(self.buffer.getvalue())
+        if final and self.autocommit:
+            self.commit()
+        return True
+
+    def commit(self):
+        self.fs.store[self.path] = MemoryFile(self.fs, self.path, b"".join(self.parts))
+
+    def discard(self):
+        self.fs.discarded.append(self.path)
+        self.parts = None
+
+    def _fetch_range(self, start, end):
+        return self.fs.cat_file(self.path, start, end)
+
+
+class BufferedMemoryFileSystem(MemoryFileSystem):
+    protocol = "buffered-memory"
+    discarded = []
+
+    @classmethod
+    def _strip_protocol(cls, path):
+        if path.startswith("buffered-memory://"):
+            path = "memory://" + path[len("buffered-memory://") :]
+        return super()._strip_protocol(path)
+
+    def _open(self, path, mode="rb", block_size=None, autocommit=True, **kwargs):
+        if mode == "rb":
+            return super()._open(path, mode, block_size=block_size, **kwargs)
+        return BufferedMemoryFile(
+            self, path, mode, block_size=block_size or 5, autocommit=autocommit
+        )
+
+
+@pytest.fixture
+def buffered_memory_filesystem():
+    fsspec.register_implementation(
+        "buffered-memory", BufferedMemoryFileSystem, clobber=True
+    )
+    BufferedMemoryFileSystem.discarded.clear()
+    yield BufferedMemoryFileSystem
+
+
 def setup_test_directory(tmp_src: str, sub_dir: str = "puppy") -> Tuple[str, str]:
     """Add files and directories to a temporary directory. Returns a tuple with the
     expected parent-level contents and the expected child-level contents.
@@ -73,6 +127,33 @@ class TestLocalFileSystem:
         with pytest.raises(ValueError, match="not a file"):
             await fs.read_path(tmp_path / "folder")
 
+    def test_open_path_roundtrip(self, tmp_path):
+        fs = LocalFileSystem(basepath=str(tmp_path))
+        with fs.open_path("folder/test.txt", "wb") as f:
+            f.write(b"hello ")
+            f.write(b"world")
+
+        with fs.open_path("folder/test.txt") as f:
+            assert f.read() == b"hello world"
+
+    def test_failed_streaming_writes_leave_no_trace(self, tmp_path):
+        fs = LocalFileSystem(basepath=str(tmp_path))
+        (tmp_path / "test.txt").write_bytes(b"original")
+
+        with pytest.raises(RuntimeError):
+            with fs.open_path("test.txt", "wb") as f:
+                f.write(b"partial")
+                raise RuntimeError()
+
+        assert (tmp_path / "test.txt").read_bytes() == b"original"
+        assert os.listdir(tmp_path) == ["test.txt"]
+
+    def test_open_path_fails_does_not_exist(self, tmp_path):
+        fs = LocalFileSystem(basepath=str(tmp_path))
+        with pytest.raises(ValueError, match="does not exist"):
+            with fs.open_path("test.txt"):
+                pass
+
     async def test_resolve_path(self, tmp_path):
         fs = LocalFileSystem(basepath=str(tmp_path))
 
@@ -275,6 +356,72 @@ class TestRemoteFileSystem:
         with pytest.raises(FileNotFoundError):
             await fs.read_path("foo/bar")
 
+    def test_open_path_roundtrip(self):
+        fs = RemoteFileSystem(basepath="memory://streamed")
+        with fs.open_path("folder/test.txt", "wb") as f:
+            f.write(b"hello ")
+            f.write(b"world")
+
+        with fs.open_path("folder/test.txt") as f:
+            assert f.read() == b"hello world"
+        assert fs.read_path("folder/test.txt") == b"hello world"
+
+    def test_failed_streaming_writes_leave_no_trace(self):
+        fs = RemoteFileSystem(basepath="memory://failed-streams")
+        fs.write_path("folder/test.txt", b"original")
+
+        with pytest.raises(RuntimeError):
+            with fs.open_path("folder/test.txt", "wb") as f:
+                f.write(b"partial")
+                raise RuntimeError()
+
+        assert fs.read_path("folder/test.txt") == b"original"
+        assert fs.filesystem.ls(fs._resolve_path("folder"), detail=False) == [
+            "/failed-streams/folder/test.txt"
+        ]
+
+    def test_streaming_writes_are_not_visible_until_done(self):
+        fs = RemoteFileSystem(basepath="memory://unfinished-streams")
+        with fs.open_path("test.txt", "wb") as f:
+            f.write(b"partial")
+            assert not fs.filesystem.exists(fs._resolve_path("test.txt"))
+
+        assert fs.read_path("test.txt") == b"partial"
+
+    def test_streaming_writes_go_straight_to_buffered_files(
+        self, buffered_memory_filesystem
+    ):
+        fs = RemoteFileSystem(basepath="buffered-memory://straight")
+        with fs.open_path("folder/test.txt", "wb") as f:
+            assert isinstance(f, BufferedMemoryFile)
+            f.write(b"hello ")
+            f.write(b"world")
+            assert not fs.filesystem.exists(fs._resolve_path("folder/test.txt"))
+
+        assert fs.read_path("folder/test.txt") == b"hello world"
+        # nothing was written anywhere else and moved into place
+        assert fs.filesystem.ls(fs._resolve_path("folder"), detail=False) == [
+            "/straight/folder/test.txt"
+        ]
+
+    def test_failed_streaming_writes_to_buffered_files_are_discarded(
+        self, buffered_memory_filesystem
+    ):
+        fs = RemoteFileSystem(basepath="buffered-memory://discarded")
+        fs.write_path("folder/test.txt", b"original")
+
+        with pytest.raises(RuntimeError):
+            with fs.open_path("folder/test.txt", "wb") as f:
+                f.write(b"partial upload")
+                raise RuntimeError()
+
+        assert buffered_memory_filesystem.discarded == ["/discarded/folder/test.txt"]
+        assert f.closed
+        assert fs.read_path("folder/test.txt") == b"original"
+        assert fs.filesystem.ls(fs._resolve_path("folder"), detail=False) == [
+            "/discarded/folder/test.txt"
+        ]
+
     async def test_resolve_path(self):
         base = "memory://root"
         fs = RemoteFileSystem(basepath=base)
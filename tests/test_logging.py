@@ -8,6 +8,7 @@ from functools import partial
 from io import StringIO
 from unittest.mock import ANY, MagicMock
 
+import httpx
 import pendulum
 import pytest
 from rich.color import Color, ColorType
@@ -23,6 +24,14 @@ from syntask._internal.concurrency.api import create_call, from_sync
 from syntask.context import FlowRunContext, TaskRunContext
 from syntask.exceptions import MissingContextError
 from syntask.logging import LogEavesdropper
+from syntask.logging.compact import (
+    CompactLogsError,
+    compress,
+    decode_logs,
+    decompress,
+    encode_logs,
+    supported_encodings,
+)
 from syntask.logging.configuration import (
     DEFAULT_LOGGING_SETTINGS_PATH,
     load_logging_config,
@@ -51,6 +60,7 @@ from syntask.settings import (
     SYNTASK_LOGGING_SETTINGS_PATH,
     SYNTASK_LOGGING_TO_API_BATCH_INTERVAL,
     SYNTASK_LOGGING_TO_API_BATCH_SIZE,
+    SYNTASK_LOGGING_TO_API_COMPACT_TRANSPORT,
     SYNTASK_LOGGING_TO_API_ENABLED,
     SYNTASK_LOGGING_TO_API_MAX_LOG_SIZE,
     SYNTASK_LOGGING_TO_API_WHEN_MISSING_FLOW,
@@ -746,6 +756,141 @@ class TestAPILogWorker:
         logs = await syntask_client.read_logs()
         assert len(logs) == 2
 
+    async def test_send_logs_compact(self, log_dict, syntask_client, monkeypatch):
+        create_logs = AsyncMock()
+        monkeypatch.setattr(
+            "syntask.client.orchestration.SyntaskClient.create_logs", create_logs
+        )
+
+        with temporary_settings(
+            updates={SYNTASK_LOGGING_TO_API_COMPACT_TRANSPORT: True}
+        ):
+            worker = APILogWorker.instance()
+            worker.send(log_dict)
+            worker.send(log_dict)
+            await worker.drain()
+
+        create_logs.assert_not_called()
+        logs = await syntask_client.read_logs()
+        assert len(logs) == 2
+        for log in logs:
+            assert log.model_dump(include=log_dict.keys(), mode="json") == log_dict
+
+    async def test_send_logs_falls_back_to_json(self, log_dict, monkeypatch):
+        create_logs = AsyncMock()
+        create_logs_compact = AsyncMock(
+            side_effect=httpx.HTTPStatusError(
+                "Not Found",
+                request=httpx.Request("POST", "/logs/compact"),
+                response=httpx.Response(404),
+            )
+        )
+        monkeypatch.setattr(
+            "syntask.client.orchestration.SyntaskClient.create_logs", create_logs
+        )
+        monkeypatch.setattr(
+            "syntask.client.orchestration.SyntaskClient.create_logs_compact",
+            create_logs_compact,
+        )
+
+        with temporary_settings(
+            updates={
+                SYNTASK_LOGGING_TO_API_COMPACT_TRANSPORT: True,
+                SYNTASK_LOGGING_TO_API_BATCH_INTERVAL: "10",
+            }
+        ):
+            worker = APILogWorker.instance()
+            worker.send(log_dict)
+            await worker.drain()
+
+        # the batch the server turned down is sent again as JSON
+        create_logs_compact.assert_called_once()
+        create_logs.assert_called_once_with([log_dict])
+        assert worker._compact_encoding is None
+
+    async def test_send_logs_negotiates_compression(self, log_dict, monkeypatch):
+        create_logs = AsyncMock()
+        create_logs_compact = AsyncMock(
+            side_effect=[
+                httpx.HTTPStatusError(
+                    "Unsupported Media Type",
+                    request=httpx.Request("POST", "/logs/compact"),
+                    response=httpx.Response(415, headers={"Accept-Encoding": "gzip"}),
+                ),
+                None,
+            ]
+        )
+        monkeypatch.setattr(
+            "syntask.client.orchestration.SyntaskClient.create_logs", create_logs
+        )
+        monkeypatch.setattr(
+            "syntask.client.orchestration.SyntaskClient.create_logs_compact",
+            create_logs_compact,
+        )
+        monkeypatch.setattr(
+            "syntask.logging.handlers.supported_encodings", lambda: ["zstd", "gzip"]
+        )
+
+        with temporary_settings(
+            updates={SYNTASK_LOGGING_TO_API_COMPACT_TRANSPORT: True}
+        ):
+            worker = APILogWorker.instance()
+            worker.send(log_dict)
+            await worker.drain()
+
+        assert [
+            call.kwargs["encoding"] for call in create_logs_compact.call_args_list
+        ] == [
+            "zstd",
+            "gzip",
+        ]
+        create_logs.assert_not_called()
+
+
+class TestCompactLogs:
+    @pytest.fixture
+    def logs(self):
+        flow_run_id = str(uuid.uuid4())
+        task_run_id = str(uuid.uuid4())
+        return [
+            LogCreate(
+                flow_run_id=flow_run_id,
+                task_run_id=task_run_id if i % 2 else None,
+                name="syntask.task_runs" if i % 2 else "syntask.flow_runs",
+                level=20,
+                timestamp=pendulum.now("utc"),
+                message=f"hello {i}",
+            ).model_dump(mode="json")
+            for i in range(100)
+        ]
+
+    def test_round_trip(self, logs):
+        assert decode_logs(encode_logs(logs)) == logs
+
+    def test_repeated_values_are_listed_once(self, logs):
+        encoded = encode_logs(logs)
+        assert encoded.count(logs[0]["flow_run_id"].encode()) == 1
+        assert encoded.count(b"syntask.task_runs") == 1
+        assert len(encoded) < len(json.dumps(logs))
+
+    @pytest.mark.parametrize("encoding", supported_encodings())
+    def test_compression_round_trip(self, logs, encoding):
+        compressed = compress(encode_logs(logs), encoding)
+        assert len(compressed) < len(json.dumps(logs)) / 5
+        assert decode_logs(decompress(compressed, encoding)) == logs
+
+    def test_decompression_is_bounded(self):
+        compressed = compress(b" " * 10_000, "gzip")
+        with pytest.raises(CompactLogsError, match="more than 1000 bytes"):
+            decompress(compressed, "gzip", maximum_size=1000)
+
+    @pytest.mark.parametrize(
+        "data", [b"not json", b"{}", b'{"names": [], "run_ids": [], "logs": [[0]]}']
+    )
+    def test_malformed_batches(self, data):
+        with pytest.raises(CompactLogsError):
+            decode_logs(data)
+
 
 def test_flow_run_logger(flow_run):
     logger = flow_run_logger(flow_run)
@@ -0,0 +1,127 @@
+import pickle
+import uuid
+from concurrent.futures import Future
+
+from syntask.futures import SyntaskConcurrentFuture
+from syntask.object_handles import ObjectHandles
+from syntask.results import ResultRecord, ResultStore
+from syntask.states import Completed, Failed
+
+
+def completed_with(value):
+    return Completed(data=ResultStore().create_result_record(value))
+
+
+class TestObjectHandles:
+    def test_adds_handles_for_referenced_results(self):
+        handles = ObjectHandles()
+        task_run_id = uuid.uuid4()
+        data = ["data"]
+
+        handles.acquire([task_run_id])
+        handle = handles.add(task_run_id, completed_with(data))
+
+        assert handle.task_run_id == task_run_id
+        assert handle.value is data
+        assert handles.find(data) is handle
+        assert handles.references(data) == task_run_id
+
+    def test_does_not_add_handles_for_unreferenced_results(self):
+        handles = ObjectHandles()
+        data = ["data"]
+
+        assert handles.add(uuid.uuid4(), completed_with(data)) is None
+        assert handles.find(data) is None
+
+    def test_does_not_add_handles_for_runs_that_did_not_complete(self):
+        handles = ObjectHandles()
+        task_run_id = uuid.uuid4()
+
+        handles.acquire([task_run_id])
+
+        assert handles.add(task_run_id, Failed(data=ValueError())) is None
+
+    def test_does_not_find_equal_objects(self):
+        handles = ObjectHandles()
+        task_run_id = uuid.uuid4()
+
+        handles.acquire([task_run_id])
+        handles.add(task_run_id, completed_with(["data"]))
+
+        assert handles.find(["data"]) is None
+
+    def test_does_not_find_scalars_by_identity(self):
+        handles = ObjectHandles()
+        task_run_id = uuid.uuid4()
+
+        handles.acquire([task_run_id])
+        handles.add(task_run_id, completed_with(1))
+
+        assert handles.find(1) is None
+
+    def test_finds_results_of_futures(self):
+        handles = ObjectHandles()
+        task_run_id = uuid.uuid4()
+        state = completed_with(["data"])
+        wrapped_future = Future()
+        wrapped_future.set_result(state)
+        future = SyntaskConcurrentFuture(
+            task_run_id=task_run_id, wrapped_future=wrapped_future
+        )
+
+        assert handles.find(future) is None
+
+        handles.acquire([task_run_id])
+        handles.add(task_run_id, state)
+
+        assert handles.find(future).value == ["data"]
+
+    def test_drops_handles_with_their_last_reference(self):
+        handles = ObjectHandles()
+        task_run_id = uuid.uuid4()
+        data = ["data"]
+
+        handles.acquire([task_run_id, task_run_id])
+        handles.add(task_run_id, completed_with(data))
+
+        handles.release([task_run_id])
+        assert handles.find(data) is not None
+
+        handles.release([task_run_id])
+        assert handles.find(data) is None
+
+    def test_remembers_whether_values_need_resolving(self):
+        handles = ObjectHandles()
+        plain, holding_state = uuid.uuid4(), uuid.uuid4()
+
+        handles.acquire([plain, holding_state])
+        plain_handle = handles.add(plain, completed_with([1, 2, 3]))
+        holding_state_handle = handles.add(
+            holding_state, completed_with([1, Completed(data=2)])
+        )
+
+        assert not plain_handle.needs_resolving()
+        assert holding_state_handle.needs_resolving()
+
+    def test_only_handles_results_held_in_memory(self):
+        handles = ObjectHandles()
+        task_run_id = uuid.uuid4()
+
+        handles.acquire([task_run_id])
+        state = Completed(data=ResultStore().create_result_record(["data"]))
+        state.data = state.data.metadata
+
+        assert not isinstance(state.data, ResultRecord)
+        assert handles.add(task_run_id, state) is None
+
+    def test_copies_are_empty(self):
+        handles = ObjectHandles()
+        task_run_id = uuid.uuid4()
+        data = ["data"]
+
+        handles.acquire([task_run_id])
+        handles.add(task_run_id, completed_with(data))
+
+        copy = pickle.loads(pickle.dumps(handles))
+        assert copy.references(data) is None
+        assert handles.references(data) == task_run_id
@@ -1,4 +1,5 @@
 import asyncio
+import gc
 import time
 import uuid
 from concurrent.futures import Future
@@ -7,6 +8,7 @@ from uuid import UUID
 
 import pytest
 
+import syntask.utilities.engine
 from syntask._internal.concurrency.api import create_call, from_async
 from syntask.context import TagsContext, tags
 from syntask.filesystems import LocalFileSystem
@@ -22,6 +24,7 @@ from syntask.states import Completed, Running
 from syntask.task_runners import SyntaskTaskRunner, ThreadPoolTaskRunner
 from syntask.task_worker import serve
 from syntask.tasks import task
+from syntask.utilities.annotations import quote
 
 
 @task
@@ -226,6 +229,74 @@ class TestThreadPoolTaskRunner:
 
         assert test_flow().result() == 0
 
+    def test_downstream_tasks_receive_results_by_reference(self, monkeypatch):
+        @task
+        def produce():
+            return [{"value": i} for i in range(100)]
+
+        @task
+        def consume(data):
+            return data
+
+        walked = []
+        original_visit_collection = syntask.utilities.engine.visit_collection
+
+        def visit_collection(expr, *args, **kwargs):
+            walked.append(expr)
+            return original_visit_collection(expr, *args, **kwargs)
+
+        monkeypatch.setattr(
+            syntask.utilities.engine, "visit_collection", visit_collection
+        )
+
+        with ThreadPoolTaskRunner() as runner:
+            upstream = runner.submit(produce, {})
+            data = upstream.result()
+            walked.clear()
+
+            from_future = runner.submit(consume, {"data": upstream})
+            from_result = runner.submit(consume, {"data": data})
+
+            assert from_future.result() is data
+            assert from_result.result() is data
+
+        # the result was never walked to resolve inputs or to collect dependencies
+        assert not any(expr is data for expr in walked)
+
+    def test_results_are_released_with_their_futures(self):
+        @task
+        def produce():
+            return ["data"]
+
+        with ThreadPoolTaskRunner() as runner:
+            future = runner.submit(produce, {})
+            data = future.result()
+            task_run_id = future.task_run_id
+            assert runner._object_handles.find(data).task_run_id == task_run_id
+
+            del future
+            gc.collect()
+
+            assert runner._object_handles.find(data) is None
+
+    def test_results_holding_futures_are_still_resolved(self):
+        @task
+        def produce():
+            return 42
+
+        @task
+        def wrap(future):
+            return [future]
+
+        @task
+        def consume(data):
+            return data
+
+        with ThreadPoolTaskRunner() as runner:
+            inner = runner.submit(produce, {})
+            wrapped = runner.submit(wrap, {"future": quote(inner)})
+            assert runner.submit(consume, {"data": wrapped}).result() == [42]
+
 
 class TestSyntaskTaskRunner:
     @pytest.fixture(autouse=True)
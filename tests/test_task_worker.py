@@ -14,6 +14,7 @@ from syntask.filesystems import LocalFileSystem
 from syntask.futures import SyntaskDistributedFuture
 from syntask.settings import (
     SYNTASK_API_URL,
+    SYNTASK_TASK_SCHEDULING_DELIVERY_BATCH_SIZE,
     SYNTASK_UI_URL,
     temporary_settings,
 )
@@ -227,6 +228,25 @@ async def test_task_worker_can_execute_a_single_sync_single_task_run(
     assert await updated_task_run.state.result() == 42
 
 
+async def test_task_worker_can_receive_task_runs_in_batches(
+    foo_task, syntask_client, events_pipeline
+):
+    task_worker = TaskWorker(foo_task)
+
+    futures = [foo_task.apply_async((i,)) for i in range(3)]
+
+    with temporary_settings({SYNTASK_TASK_SCHEDULING_DELIVERY_BATCH_SIZE: 3}):
+        with anyio.move_on_after(5):
+            await task_worker.start()
+
+    await events_pipeline.process_events()
+
+    for i, future in enumerate(futures):
+        updated_task_run = await syntask_client.read_task_run(future.task_run_id)
+        assert updated_task_run.state.is_completed()
+        assert await updated_task_run.state.result() == i
+
+
 class TestTaskWorkerTaskRunRetries:
     async def test_task_run_via_task_worker_respects_retry_policy(
         self, syntask_client, events_pipeline
@@ -11,6 +11,7 @@ from syntask.utilities.annotations import BaseAnnotation, quote
 from syntask.utilities.collections import (
     AutoEnum,
     StopVisiting,
+    collection_contains,
     dict_to_flatdict,
     flatdict_to_dict,
     get_from_dict,
@@ -546,6 +547,97 @@ class TestVisitCollection:
         assert result.y["a"] is not val.y["a"]
         assert result.y["d"] is val.y["d"]
 
+    def test_visit_collection_deeply_nested(self):
+        # deeper than the recursion limit
+        val = 0
+        for _ in range(5000):
+            val = [val]
+
+        result = visit_collection(
+            val, lambda x: x + 1 if x == 0 else x, return_data=True
+        )
+
+        for _ in range(5000):
+            result = result[0]
+        assert result == 1
+
+    def test_visit_collection_visits_children_of_transformed_values(self):
+        def visit(expr):
+            if expr == 1:
+                return [2, 3]
+            if isinstance(expr, int):
+                return expr * 10
+            return expr
+
+        result = visit_collection([1, 4], visit, return_data=True)
+        assert result == [[20, 30], 40]
+
+    def test_visit_collection_context_is_not_shared_between_siblings(self):
+        seen = []
+
+        def visit(expr, context):
+            seen.append((expr, context.get("sibling")))
+            context["sibling"] = expr
+            return expr
+
+        visit_collection(["a", "b", ["c"]], visit, context={})
+
+        assert seen == [
+            (["a", "b", ["c"]], None),
+            ("a", ["a", "b", ["c"]]),
+            ("b", ["a", "b", ["c"]]),
+            (["c"], ["a", "b", ["c"]]),
+            ("c", ["c"]),
+        ]
+
+    def test_visit_collection_visits_in_order(self):
+        visited = []
+        val = {"a": [1, SimpleDataclass(x=2, y=[3])], 4: (5, {6})}
+
+        visit_collection(val, lambda expr: visited.append(expr))
+
+        assert [expr for expr in visited if isinstance(expr, int)] == [1, 2, 3, 4, 5, 6]
+
+
+class TestCollectionContains:
+    @pytest.mark.parametrize(
+        "val",
+        [
+            Foo(x=1),
+            [1, "a", Foo(x=1)],
+            {"a": {"b": (1, Foo(x=1))}},
+            SimpleDataclass(x=1, y=[Foo(x=1)]),
+            ExtraPydantic(x=1, y=Foo(x=1)),
+            quote([Foo(x=1)]),
+        ],
+    )
+    def test_contains(self, val):
+        assert collection_contains(val, Foo)
+
+    @pytest.mark.parametrize(
+        "val",
+        [
+            1,
+            list(range(1000)),
+            {"a": [1, 2.0, None, "b"], "c": {"d": (True, b"e")}},
+            SimpleDataclass(x=1, y=[Bar(y=1)]),
+            quote([1, 2]),
+            (Foo(x=1) for _ in range(1)),
+        ],
+    )
+    def test_does_not_contain(self, val):
+        assert not collection_contains(val, Foo)
+
+    def test_contains_atomic_types(self):
+        assert collection_contains([1, [2, "a"]], str)
+        assert not collection_contains([1, [2, 3]], (str, float))
+
+    def test_recursive_collection(self):
+        val = [1]
+        val.append(val)
+
+        assert not collection_contains(val, Foo)
+
 
 class TestRemoveKeys:
     def test_remove_single_key(self):
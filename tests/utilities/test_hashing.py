@@ -1,8 +1,18 @@
 import hashlib
+import threading
+from unittest import mock
 
 import pytest
 
-from syntask.utilities.hashing import file_hash, stable_hash
+from syntask.serializers import JSONSerializer
+from syntask.utilities.hashing import (
+    fast_hash,
+    file_hash,
+    hash_memo,
+    hash_objects,
+    register_hasher,
+    stable_hash,
+)
 
 
 @pytest.mark.parametrize(
@@ -55,3 +65,115 @@ class TestFileHash:
         assert val == hashlib.md5(b"0").hexdigest()
         # Check if the hash is stable
         assert val == "cfcd208495d565ef66e7dff9f98764da"
+
+
+class TestHashObjects:
+    def test_json_inputs_hash_as_json(self):
+        args = ({"a": 1, "b": [1, 2, (3, "x")]}, "key")
+        kwargs = {"x": None}
+        expected = stable_hash(
+            JSONSerializer(dumps_kwargs={"sort_keys": True}).dumps((args, kwargs))
+        )
+        assert hash_objects(*args, **kwargs) == expected
+
+    def test_unhashable_inputs(self):
+        assert hash_objects(lambda: None) is not None
+
+        with mock.patch("cloudpickle.dumps", side_effect=TypeError):
+            assert hash_objects(threading.Lock()) is None
+
+    @pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview])
+    def test_buffers_are_hashed_in_place(self, buffer_type):
+        data = bytes(range(256)) * 1000
+
+        with mock.patch("cloudpickle.dumps", side_effect=AssertionError):
+            digest = hash_objects({"data": buffer_type(data)})
+
+        assert digest == hash_objects({"data": buffer_type(data)})
+        assert digest != hash_objects({"data": buffer_type(data[:-1])})
+        assert digest != hash_objects({"other": buffer_type(data)})
+
+    def test_non_contiguous_memoryviews(self):
+        view = memoryview(bytes(range(100)))[::2]
+        assert hash_objects(view) == hash_objects(memoryview(view.tobytes()))
+
+    def test_numpy_arrays_are_hashed_in_place(self):
+        np = pytest.importorskip("numpy")
+        array = np.arange(100_000, dtype="int64")
+
+        with mock.patch("cloudpickle.dumps", side_effect=AssertionError):
+            digest = hash_objects(array)
+
+        assert digest == hash_objects(array.copy())
+        assert digest != hash_objects(array.astype("int32"))
+        assert digest != hash_objects(array.reshape(1000, 100))
+        assert hash_objects(array[::2]) == hash_objects(array[::2].copy())
+
+    def test_numpy_arrays_of_objects_are_pickled(self):
+        np = pytest.importorskip("numpy")
+        array = np.array([{"a": 1}, None], dtype=object)
+        assert hash_objects(array) == hash_objects(array.copy())
+
+    def test_pandas_objects_are_hashed_in_place(self):
+        pd = pytest.importorskip("pandas")
+        frame = pd.DataFrame({"a": range(1000), "b": ["x"] * 1000})
+
+        with mock.patch("cloudpickle.dumps", side_effect=AssertionError):
+            digest = hash_objects(frame)
+
+        assert digest == hash_objects(frame.copy())
+        assert digest != hash_objects(frame.rename(columns={"b": "c"}))
+        assert hash_objects(frame["a"]) != hash_objects(frame["a"] + 1)
+
+    def test_large_immutable_inputs_are_hashed_once(self):
+        data = b"x" * 100_000
+        memo = {}
+
+        first = hash_objects(data, memo=memo)
+        with mock.patch("syntask.utilities.hashing._hash_buffer") as hasher:
+            assert hash_objects([data], memo=memo) != first
+            hasher.assert_not_called()
+
+    def test_memo_holds_a_bounded_size_of_inputs(self):
+        memo = hash_memo()
+        with mock.patch("syntask.utilities.hashing._MEMOIZE_MAX_SIZE", 200_000):
+            small = [bytes([i]) * 100_000 for i in range(3)]
+            for data in small:
+                hash_objects(data, memo=memo)
+
+            # inputs above the per-object limit aren't kept alive by the memo
+            hash_objects(b"x" * 300_000, memo=memo)
+
+        assert sorted(len(data) for data, _ in memo.values()) == [100_000] * 3
+
+        with mock.patch("syntask.utilities.hashing._MEMO_MAX_SIZE", 250_000):
+            bounded = hash_memo()
+        for data in small:
+            hash_objects(data, memo=bounded)
+        assert len(bounded) == 2
+        assert sum(len(data) for data, _ in bounded.values()) <= 250_000
+
+    def test_fast_hash(self):
+        data = b"x" * 100_000
+        assert hash_objects(data, hash_algo=fast_hash) == hash_objects(
+            data, hash_algo=fast_hash
+        )
+        assert hash_objects(data, hash_algo=fast_hash) != hash_objects(data)
+
+    def test_register_hasher(self):
+        class Point:
+            def __init__(self, x, y):
+                self.x, self.y = x, y
+
+        def hash_point(point, h):
+            h.update(f"{point.x},{point.y}".encode())
+
+        register_hasher(Point, hash_point)
+        with mock.patch("cloudpickle.dumps", side_effect=AssertionError):
+            assert hash_objects(Point(1, 2)) == hash_objects(Point(1, 2))
+            assert hash_objects(Point(1, 2)) != hash_objects(Point(2, 1))
+
+    def test_cyclic_inputs(self):
+        cyclic = [1]
+        cyclic.append(cyclic)
+        assert hash_objects(cyclic, b"data") is not None
@@ -22,7 +22,11 @@ from syntask.client import schemas as client_schemas
 from syntask.client.orchestration import SyntaskClient
 from syntask.client.schemas import State
 from syntask.client.schemas.objects import StateType
-from syntask.exceptions import InfrastructureNotAvailable, InfrastructureNotFound
+from syntask.exceptions import (
+    InfrastructureNotAvailable,
+    InfrastructureNotFound,
+    ObjectNotFound,
+)
 from syntask.server import models
 from syntask.server.schemas.actions import (
     DeploymentUpdate,
@@ -722,6 +726,104 @@ class TestCancellation:
 
         worker.cancel_run.assert_not_called()
 
+    @pytest.mark.parametrize(
+        "cancelling_constructor", [legacy_named_cancelling_state, Cancelling]
+    )
+    async def test_worker_cancel_run_called_for_cancelling_event(
+        self,
+        syntask_client: SyntaskClient,
+        worker_deployment_wq1,
+        cancelling_constructor,
+        work_pool,
+    ):
+        flow_run = await syntask_client.create_flow_run_from_deployment(
+            worker_deployment_wq1.id,
+            state=cancelling_constructor(),
+        )
+
+        async with ProcessWorker(work_pool_name=work_pool.name) as worker:
+            await worker.sync_with_backend()
+            worker.cancel_run = AsyncMock()
+            await worker._on_cancelling_flow_run(flow_run.id, pendulum.now("UTC"))
+            # Flow runs already being cancelled are skipped
+            await worker._on_cancelling_flow_run(flow_run.id, pendulum.now("UTC"))
+
+        worker.cancel_run.assert_awaited_once_with(flow_run)
+
+    @pytest.mark.parametrize("state", [Cancelled(), Completed(name="Cancelling")])
+    async def test_worker_cancel_run_not_called_for_stale_cancelling_event(
+        self, syntask_client: SyntaskClient, worker_deployment_wq1, state, work_pool
+    ):
+        flow_run = await syntask_client.create_flow_run_from_deployment(
+            worker_deployment_wq1.id,
+            state=state,
+        )
+
+        async with ProcessWorker(work_pool_name=work_pool.name) as worker:
+            await worker.sync_with_backend()
+            worker.cancel_run = AsyncMock()
+            await worker._on_cancelling_flow_run(flow_run.id, pendulum.now("UTC"))
+
+        worker.cancel_run.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "error", [ObjectNotFound(http_exc=Exception()), RuntimeError("Oh no")]
+    )
+    async def test_worker_cancel_run_not_called_for_unreadable_flow_run(
+        self, error, work_pool
+    ):
+        async with ProcessWorker(work_pool_name=work_pool.name) as worker:
+            await worker.sync_with_backend()
+            worker.cancel_run = AsyncMock()
+            worker._client.read_flow_run = AsyncMock(side_effect=error)
+            await worker._on_cancelling_flow_run(uuid.uuid4(), pendulum.now("UTC"))
+
+        worker.cancel_run.assert_not_called()
+
+    async def test_worker_cancel_run_not_called_for_cancelling_event_in_other_queue(
+        self,
+        syntask_client: SyntaskClient,
+        worker_deployment_wq1,
+        work_pool,
+    ):
+        flow_run = await syntask_client.create_flow_run_from_deployment(
+            worker_deployment_wq1.id,
+            state=Cancelling(),
+        )
+
+        async with ProcessWorker(
+            work_pool_name=work_pool.name, work_queues=["some-other-queue"]
+        ) as worker:
+            await worker.sync_with_backend()
+            worker.cancel_run = AsyncMock()
+            await worker._on_cancelling_flow_run(flow_run.id, pendulum.now("UTC"))
+
+        worker.cancel_run.assert_not_called()
+
+    async def test_worker_only_queries_for_cancelling_runs_as_fallback_when_subscribed(
+        self,
+        syntask_client: SyntaskClient,
+        worker_deployment_wq1,
+        work_pool,
+    ):
+        async with ProcessWorker(work_pool_name=work_pool.name) as worker:
+            await worker.sync_with_backend()
+            worker.cancel_run = AsyncMock()
+            worker._cancellation_watcher.subscribed = True
+
+            await worker.check_for_cancelled_flow_runs()
+            flow_run = await syntask_client.create_flow_run_from_deployment(
+                worker_deployment_wq1.id,
+                state=Cancelling(),
+            )
+            await worker.check_for_cancelled_flow_runs()
+            worker.cancel_run.assert_not_called()
+
+            worker._cancellation_watcher.subscribed = False
+            await worker.check_for_cancelled_flow_runs()
+
+        worker.cancel_run.assert_awaited_once_with(flow_run)
+
     @pytest.mark.parametrize(
         "cancelling_constructor", [legacy_named_cancelling_state, Cancelling]
     )